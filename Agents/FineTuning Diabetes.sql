@@ -54,6 +54,13 @@ LIMIT 3;
 -- STEP 1 (REVISED): Create training data with 'prompt' and 'completion' columns
 -- ==================================================================
 
+-- ==================================================================
+-- NOTE: the split / 16k / 3k tables below are superseded by
+-- Agents/finetune_dataset.py --domains diabetes, which builds
+-- public.diabetes_finetune_dataset with deterministic hash splits,
+-- stratified sampling, token counts and a size report.
+-- ==================================================================
+
 CREATE OR REPLACE TABLE public.diabetes_training_set AS
 WITH base_data AS (
     SELECT * FROM public.diabetes_training_prompts
@@ -403,6 +403,13 @@ SELECT
 FROM mental_health_training_prompts
 LIMIT 10;
 
+-- ==================================================================
+-- NOTE: the split / 16k / 3k tables below are superseded by
+-- Agents/finetune_dataset.py --domains mental_health, which builds
+-- public.mental_health_finetune_dataset with deterministic hash splits,
+-- stratified sampling, token counts and a size report.
+-- ==================================================================
+
 -- ==================================================================
 -- Recreate training/validation sets with fixed prompts
 -- ==================================================================
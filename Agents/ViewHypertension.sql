@@ -348,6 +348,13 @@ FROM prompt_components;
 
 --Creating the training and validation datasets
 
+-- ==================================================================
+-- NOTE: the split / 16k / 3k tables below are superseded by
+-- Agents/finetune_dataset.py --domains hypertension, which builds
+-- public.hypertension_finetune_dataset with deterministic hash splits,
+-- stratified sampling, token counts and a size report.
+-- ==================================================================
+
 -- Training set (80%)
 CREATE OR REPLACE TABLE public.hypertension_training_set AS
 WITH base_data AS (
@@ -0,0 +1,292 @@
+# =============================================================================
+# WELLNEST - FINE-TUNING DATASET BUILDER
+# =============================================================================
+# One parameterized builder for the Cortex fine-tuning sets that the domain
+# scripts (FineTuning Diabetes.sql, FineTuningMentalHealth.sql,
+# ViewHypertension.sql) built with chains of CREATE OR REPLACE TABLE:
+#   - deterministic split: MOD(ABS(HASH(patient_id)), 100) < --train-pct
+#   - deterministic stratified sample per urgency label: rows are ranked by
+#     HASH(patient_id, --seed) inside each (split, label), so the same seed
+#     always picks the same rows and class shares match the full split
+#   - prompt / completion token counts (SNOWFLAKE.CORTEX.COUNT_TOKENS, or a
+#     chars/4 estimate with --estimate-tokens) and length buckets, computed
+#     for the sampled rows only
+#   - one table <domain>_finetune_dataset per domain; the source fingerprint
+#     and build parameters are kept in its COMMENT and an unchanged rebuild
+#     is skipped
+#   - --export streams the sampled rows to JSONL without loading them all
+# The size report (rows, tokens x epochs, rows over the context window) is
+# printed before any FINETUNE job is started.
+#
+# Connection settings come from SNOWFLAKE_ACCOUNT / SNOWFLAKE_USER /
+# SNOWFLAKE_PASSWORD / SNOWFLAKE_ROLE / SNOWFLAKE_WAREHOUSE.
+# Usage:  python Agents/finetune_dataset.py --domains all [--train-rows 16000] [--validation-rows 3000] [--export]
+# =============================================================================
+
+import argparse
+import hashlib
+import json
+import os
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+DEFAULT_EXPORT_DIR = os.path.join(REPO_ROOT, "data", "finetune")
+SCHEMA = "WELLNEST.PUBLIC"
+
+SYSTEM_PROMPTS = {
+    "diabetes": (
+        "You are a medical AI assistant specializing in diabetes and metabolic disease management. "
+        "Your role is to assess patient presentations, evaluate urgency (Emergency/Urgent/Routine), "
+        "identify key symptoms for inquiry, provide evidence-based management recommendations, "
+        "and suggest appropriate patient education. You must prioritize patient safety, "
+        "detect emergencies (severe hyperglycemia/hypoglycemia), provide clear triage recommendations "
+        "based on ADA clinical guidelines, and recommend specialist referral when appropriate.\n\n"
+        "Patient Case:\n"
+    ),
+    "hypertension": (
+        "You are a medical AI assistant specializing in hypertension and cardiovascular disease management. "
+        "Your role is to assess patient presentations, evaluate urgency (Emergency/Urgent/Routine), "
+        "identify key symptoms for inquiry, provide evidence-based management recommendations, "
+        "and suggest appropriate patient education. You must prioritize patient safety, "
+        "detect hypertensive emergencies (BP ≥180/120 with symptoms), provide clear triage recommendations "
+        "based on ACC/AHA guidelines, and recommend specialist referral when appropriate. "
+        "You serve as a clinical decision support tool, not a replacement for medical diagnosis.\n\n"
+        "Patient Case:\n"
+    ),
+    "mental_health": (
+        "You are a compassionate mental health AI assistant specializing in depression, anxiety, and psychiatric triage. "
+        "Your role is to assess mental health presentations, evaluate urgency (Emergency/Urgent/Needs_Attention/Routine), "
+        "conduct safety assessments for suicide risk when indicated, identify key symptoms, "
+        "provide evidence-based treatment recommendations, and suggest appropriate referrals. "
+        "CRITICAL: If suicide risk screening is indicated, directly and compassionately ask about suicidal thoughts. "
+        "Use non-judgmental, validating language that acknowledges suffering while instilling hope. "
+        "Follow APA guidelines for depression and anxiety management.\n\n"
+        "Patient Presentation:\n"
+    ),
+}
+
+# Prompt + completion token limit per base model for Cortex fine-tuning
+CONTEXT_TOKENS = {
+    "llama3-8b": 8192,
+    "llama3-70b": 8192,
+    "llama3.1-8b": 24576,
+    "llama3.1-70b": 8192,
+    "mistral-7b": 32768,
+    "mixtral-8x7b": 32768,
+}
+LENGTH_BUCKETS = [512, 1024, 2048, 4096, 8192]
+MAX_TRAINING_STEPS = 50_000  # Cortex limit on training rows x epochs
+
+
+def get_session():
+    from snowflake.snowpark import Session
+
+    config = {
+        key: os.environ[f"SNOWFLAKE_{key.upper()}"]
+        for key in ("account", "user", "password", "role", "warehouse")
+        if os.environ.get(f"SNOWFLAKE_{key.upper()}")
+    }
+    return Session.builder.configs(config).create()
+
+
+def dataset_table(domain):
+    return f"{SCHEMA}.{domain.upper()}_FINETUNE_DATASET"
+
+
+# =============================================================================
+# BUILD
+# =============================================================================
+
+def token_sql(column, base_model, estimate):
+    if estimate:
+        return f"CEIL(LENGTH({column}) / 4)"
+    return f"SNOWFLAKE.CORTEX.COUNT_TOKENS('{base_model}', {column})"
+
+
+def bucket_sql(column):
+    cases = " ".join(f"WHEN {column} <= {limit} THEN '<={limit}'" for limit in LENGTH_BUCKETS)
+    return f"CASE {cases} ELSE '>{LENGTH_BUCKETS[-1]}' END"
+
+
+def build_sql(domain, args):
+    """CTAS for one domain; parameters bound as (system prompt,)"""
+    prompt_tokens = token_sql("prompt", args.base_model, args.estimate_tokens)
+    completion_tokens = token_sql("completion", args.base_model, args.estimate_tokens)
+    return f"""
+CREATE OR REPLACE TABLE {dataset_table(domain)} AS
+WITH base AS (
+    SELECT
+        patient_id,
+        ground_truth_urgency,
+        CONCAT(?, user_prompt) AS prompt,
+        assistant_response AS completion,
+        IFF(MOD(ABS(HASH(patient_id)), 100) < {int(args.train_pct)}, 'train', 'validation') AS split
+    FROM {SCHEMA}.{domain.upper()}_TRAINING_PROMPTS
+),
+ranked AS (
+    SELECT
+        *,
+        ROW_NUMBER() OVER (PARTITION BY split, ground_truth_urgency
+                           ORDER BY HASH(patient_id, {int(args.seed)}), patient_id) AS sample_rank,
+        COUNT(*) OVER (PARTITION BY split, ground_truth_urgency) AS class_rows,
+        COUNT(*) OVER (PARTITION BY split) AS split_rows
+    FROM base
+),
+sampled AS (
+    SELECT
+        *,
+        sample_rank <= ROUND(IFF(split = 'train', {int(args.train_rows)}, {int(args.validation_rows)})
+                             * class_rows / split_rows) AS selected
+    FROM ranked
+),
+counted AS (
+    SELECT
+        *,
+        IFF(selected, {prompt_tokens}, NULL) AS prompt_tokens,
+        IFF(selected, {completion_tokens}, NULL) AS completion_tokens
+    FROM sampled
+)
+SELECT
+    patient_id,
+    ground_truth_urgency,
+    split,
+    selected,
+    sample_rank,
+    prompt,
+    completion,
+    prompt_tokens,
+    completion_tokens,
+    prompt_tokens + completion_tokens AS total_tokens,
+    {bucket_sql("prompt_tokens + completion_tokens")} AS length_bucket
+FROM counted
+"""
+
+
+def fingerprint(session, domain, args):
+    """Hash of the source rows plus every build parameter"""
+    # sqlcheck: ok - table name is an identifier
+    source = session.sql(f"""
+        SELECT HASH_AGG(patient_id, ground_truth_urgency, user_prompt, assistant_response)
+        FROM {SCHEMA}.{domain.upper()}_TRAINING_PROMPTS
+    """).collect()[0][0]
+    params = [args.train_pct, args.seed, args.train_rows, args.validation_rows,
+              args.base_model, args.estimate_tokens, SYSTEM_PROMPTS[domain]]
+    return f"{source}:{hashlib.sha1(json.dumps(params).encode()).hexdigest()[:12]}"
+
+
+def current_fingerprint(session, domain):
+    database, schema = SCHEMA.split(".")
+    # sqlcheck: ok - database name is an identifier
+    rows = session.sql(f"""
+        SELECT COMMENT FROM {database}.INFORMATION_SCHEMA.TABLES
+        WHERE TABLE_SCHEMA = ? AND TABLE_NAME = ?
+    """, params=[schema, f"{domain.upper()}_FINETUNE_DATASET"]).collect()
+    return rows[0][0] if rows else None
+
+
+def build(session, domain, args):
+    """Rebuild the domain table unless its source and parameters are unchanged"""
+    fp = fingerprint(session, domain, args)
+    if not args.force and current_fingerprint(session, domain) == fp:
+        return False
+    session.sql(build_sql(domain, args), params=[SYSTEM_PROMPTS[domain]]).collect()
+    # sqlcheck: ok - COMMENT takes no bind variables; fp is our own hash
+    session.sql(f"COMMENT ON TABLE {dataset_table(domain)} IS '{fp}'").collect()
+    return True
+
+
+# =============================================================================
+# REPORT / EXPORT
+# =============================================================================
+
+def report(session, domain, args):
+    table = dataset_table(domain)
+    limit = CONTEXT_TOKENS.get(args.base_model, args.context_tokens)
+    # sqlcheck: ok - table name and context limit are ours
+    rows = session.sql(f"""
+        SELECT split, COUNT(*) AS row_count, SUM(prompt_tokens) AS prompt_tokens,
+               SUM(completion_tokens) AS completion_tokens, MAX(total_tokens) AS max_tokens,
+               COUNT_IF(total_tokens > {int(limit)}) AS over_context
+        FROM {table} WHERE selected GROUP BY split ORDER BY split DESC
+    """).collect()
+    print(f"\n{domain} -> {table} (base model {args.base_model}, context {limit:,} tokens)")
+    print(f"  {'split':<11} {'rows':>8} {'prompt tok':>12} {'compl. tok':>12} {'max':>7} {'over ctx':>9}")
+    for row in rows:
+        print(f"  {row['SPLIT']:<11} {row['ROW_COUNT']:>8,} {row['PROMPT_TOKENS'] or 0:>12,} "
+              f"{row['COMPLETION_TOKENS'] or 0:>12,} {row['MAX_TOKENS'] or 0:>7,} {row['OVER_CONTEXT']:>9,}")
+
+    train = next((row for row in rows if row["SPLIT"] == "train"), None)
+    if train:
+        tokens = ((train["PROMPT_TOKENS"] or 0) + (train["COMPLETION_TOKENS"] or 0)) * args.epochs
+        steps = train["ROW_COUNT"] * args.epochs
+        status = "✅ Under limit" if steps <= MAX_TRAINING_STEPS else "❌ Over limit"
+        print(f"  {args.epochs} epochs: {tokens:,} training tokens, {steps:,} rows x epochs ({status})")
+
+    # sqlcheck: ok - table name is an identifier
+    buckets = session.sql(f"""
+        SELECT length_bucket, ground_truth_urgency, COUNT(*) AS row_count
+        FROM {table} WHERE selected AND split = 'train'
+        GROUP BY length_bucket, ground_truth_urgency ORDER BY length_bucket, ground_truth_urgency
+    """).collect()
+    for row in buckets:
+        print(f"    {row['LENGTH_BUCKET']:<8} {row['GROUND_TRUTH_URGENCY']:<18} {row['ROW_COUNT']:>8,}")
+
+
+def export(session, domain, export_dir):
+    """Stream the sampled rows to <domain>_<split>.jsonl"""
+    os.makedirs(export_dir, exist_ok=True)
+    counts = {}
+    for split in ("train", "validation"):
+        path = os.path.join(export_dir, f"{domain}_{split}.jsonl")
+        # sqlcheck: ok - table name is an identifier
+        query = session.sql(f"""
+            SELECT prompt, completion FROM {dataset_table(domain)}
+            WHERE selected AND split = ? ORDER BY ground_truth_urgency, sample_rank
+        """, params=[split])
+        with open(path, "w", encoding="utf-8") as handle:
+            counts[split] = 0
+            for row in query.to_local_iterator():
+                handle.write(json.dumps({"prompt": row["PROMPT"], "completion": row["COMPLETION"]},
+                                        ensure_ascii=False) + "\n")
+                counts[split] += 1
+    return counts
+
+
+def finetune_statement(domain, args):
+    table = dataset_table(domain)
+    return (f"SELECT SNOWFLAKE.CORTEX.FINETUNE('CREATE', '{domain}_llm_{args.train_rows // 1000}k', "
+            f"'{args.base_model}', "
+            f"'SELECT prompt, completion FROM {table} WHERE selected AND split = ''train''', "
+            f"'SELECT prompt, completion FROM {table} WHERE selected AND split = ''validation''');")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build Cortex fine-tuning datasets")
+    parser.add_argument("--domains", nargs="+", default=["all"], choices=sorted(SYSTEM_PROMPTS) + ["all"])
+    parser.add_argument("--train-pct", type=int, default=80, help="Share of patients in the training split")
+    parser.add_argument("--train-rows", type=int, default=16_000)
+    parser.add_argument("--validation-rows", type=int, default=3_000)
+    parser.add_argument("--seed", type=int, default=42, help="Sampling seed; same seed, same rows")
+    parser.add_argument("--base-model", default="llama3.1-8b")
+    parser.add_argument("--context-tokens", type=int, default=8192, help="Limit for models not in CONTEXT_TOKENS")
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--estimate-tokens", action="store_true", help="chars/4 instead of COUNT_TOKENS")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the source is unchanged")
+    parser.add_argument("--export", action="store_true", help="Write JSONL files after building")
+    parser.add_argument("--export-dir", default=DEFAULT_EXPORT_DIR)
+    args = parser.parse_args()
+
+    session = get_session()
+    domains = sorted(SYSTEM_PROMPTS) if "all" in args.domains else args.domains
+    for domain in domains:
+        rebuilt = build(session, domain, args)
+        print(f"{'🔨 Rebuilt' if rebuilt else '✅ Unchanged'}: {dataset_table(domain)}")
+        report(session, domain, args)
+        if args.export:
+            counts = export(session, domain, args.export_dir)
+            print(f"  Exported {counts['train']:,} train / {counts['validation']:,} validation rows "
+                  f"to {os.path.relpath(args.export_dir)}")
+        print(f"  {finetune_statement(domain, args)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 -- =============================================================================
 -- STORED PROCEDURE: CLASSIFY_USER_QUERY (✅ CORRECTED MODEL NAMES)
 -- =============================================================================
+-- Imports thresholds.py from @WELLNEST.MEDICAL_DATA.WELLNEST_CODE: run
+-- Misc/cortexsearch.sql STEP 0 (stage + PUT) before this file.
 
 -- Drop old version first to ensure clean update
 DROP PROCEDURE IF EXISTS WELLNEST.USER_MANAGEMENT.CLASSIFY_USER_QUERY(STRING, STRING);
@@ -13,16 +15,19 @@ RETURNS VARIANT
 LANGUAGE PYTHON
 RUNTIME_VERSION = '3.10'
 PACKAGES = ('snowflake-snowpark-python')
+IMPORTS = ('@WELLNEST.MEDICAL_DATA.WELLNEST_CODE/thresholds.py')
 HANDLER = 'classify_query'
 AS
 $$
 import json
 
+import thresholds
+
 def classify_query(session, user_query, user_id):
     """Classify user health query into specialist domains"""
     
     # Get user medical profile
-    profile_query = f"""
+    profile_query = """
     SELECT 
         u.FULL_NAME,
         u.AGE,
@@ -34,11 +39,11 @@ def classify_query(session, user_query, user_id):
     FROM WELLNEST.USER_MANAGEMENT.USERS u
     LEFT JOIN WELLNEST.USER_MANAGEMENT.USER_MEDICAL_PROFILES p
         ON u.USER_ID = p.USER_ID
-    WHERE u.USER_ID = '{user_id}'
+    WHERE u.USER_ID = ?
     """
     
     try:
-        profile_result = session.sql(profile_query).collect()
+        profile_result = session.sql(profile_query, params=[user_id]).collect()
         profile_data = profile_result[0].as_dict() if profile_result else {}
     except:
         profile_data = {}
@@ -67,10 +72,7 @@ def classify_query(session, user_query, user_id):
 
 **URGENCY ASSESSMENT:**
 
-**EMERGENCY**: Chest pain+sweating, stroke symptoms, suicidal thoughts with plan, blood sugar <54
-**URGENT**: Blood sugar >250, BP >180/110, severe depression
-**NEEDS_ATTENTION**: Uncontrolled symptoms, BP 140-179/90-109
-**ROUTINE**: General health guidance
+__URGENCY_GUIDANCE__
 
 ---
 
@@ -81,6 +83,8 @@ Out of scope:
 
 In scope:
 {"domain": "DIABETES|HEART_DISEASE|MENTAL_HEALTH", "urgency": "EMERGENCY|URGENT|NEEDS_ATTENTION|ROUTINE", "confidence": 0.95, "symptom_assessment": "...", "reasoning": "...", "safety_flags": [...], "immediate_action_needed": true|false, "scope_violation": false}"""
+    # Urgency cut-offs come from the shared clinical thresholds
+    system_context = system_context.replace("__URGENCY_GUIDANCE__", thresholds.router_urgency_guidance())
 
     # Build user context
     profile_context = ""
@@ -100,18 +104,14 @@ In scope:
     
     user_message = f"**Patient Query:** {user_query}{profile_context}"
     full_prompt = f"{system_context}\n\n{user_message}\n\n**Classification (JSON only):**"
-    full_prompt_escaped = full_prompt.replace("'", "''")
     
-    # Call Claude via Cortex
+    # Call Claude via Cortex (prompt bound, so the statement text never changes)
     try:
-        cortex_query = f"""
-        SELECT SNOWFLAKE.CORTEX.COMPLETE(
-            'claude-4-sonnet',
-            '{full_prompt_escaped}'
-        ) as response
+        cortex_query = """
+        SELECT SNOWFLAKE.CORTEX.COMPLETE('claude-4-sonnet', ?) as response
         """
         
-        result = session.sql(cortex_query).collect()
+        result = session.sql(cortex_query, params=[full_prompt]).collect()
         response = result[0]['RESPONSE']
         
         # Parse JSON
@@ -308,18 +308,13 @@ CURRENT PATIENT QUESTION:
 YOUR RESPONSE (Conversational, not structured):
 {'='*70}"""
 
-    prompt_escaped = full_prompt.replace("'", "''")
-    
     # Call specialist model (model name passed from CLASSIFY_USER_QUERY)
-    cortex_query = f"""
-    SELECT SNOWFLAKE.CORTEX.COMPLETE(
-        '{specialist_model}',
-        '{prompt_escaped}'
-    ) AS response
+    cortex_query = """
+    SELECT SNOWFLAKE.CORTEX.COMPLETE(?, ?) AS response
     """
     
     try:
-        result = session.sql(cortex_query).collect()
+        result = session.sql(cortex_query, params=[specialist_model, full_prompt]).collect()
         raw_response = result[0]['RESPONSE'].strip()
         
         # Light formatting cleanup
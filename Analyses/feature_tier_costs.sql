@@ -0,0 +1,68 @@
+-- analyses/feature_tier_costs.sql
+-- Description: Warehouse time and storage of the gold feature tiers, before vs
+-- after switching feature_tier_mode (see macros/feature_tiers.sql)
+--
+-- Compile with the date the mode was switched, then run the output in Snowflake:
+--   dbt compile --select feature_tier_costs --vars '{tier_mode_switched_on: "2026-10-20"}'
+-- Query time is attributed through the node_id in dbt's default query comment;
+-- ACCOUNT_USAGE views lag by up to ~3 hours.
+
+with dbt_queries as (
+    select
+        regexp_substr(query_text, '"node_id": "model\\.[a-z_]+\\.(ftr_[a-z_]+)"', 1, 1, 'e', 1) as model_name,
+        start_time,
+        execution_time / 1000 as execution_seconds,
+        total_elapsed_time / 1000 as elapsed_seconds,
+        bytes_written
+    from snowflake.account_usage.query_history
+    where query_text ilike '%"node_id": "model.%.ftr_%'
+      and execution_status = 'SUCCESS'
+      and start_time >= dateadd(day, -{{ var('tier_cost_lookback_days', 30) }}, current_timestamp())
+),
+
+per_run as (
+    select
+        case
+            when start_time < '{{ var("tier_mode_switched_on", "2100-01-01") }}'::date then 'before'
+            else 'after'
+        end as period,
+        date_trunc('day', start_time) as run_day,
+        sum(execution_seconds) as warehouse_seconds,
+        sum(bytes_written) as bytes_written
+    from dbt_queries
+    where model_name is not null
+    group by 1, 2
+),
+
+query_costs as (
+    select
+        period,
+        count(distinct run_day) as run_days,
+        round(sum(warehouse_seconds) / nullif(count(distinct run_day), 0), 1) as warehouse_seconds_per_day,
+        round(sum(bytes_written) / nullif(count(distinct run_day), 0) / power(1024, 3), 2) as gb_written_per_day
+    from per_run
+    group by period
+),
+
+storage as (
+    select
+        count(*) as feature_tables,
+        round(sum(active_bytes) / power(1024, 3), 2) as active_gb,
+        round(sum(time_travel_bytes + failsafe_bytes) / power(1024, 3), 2) as retained_gb
+    from snowflake.account_usage.table_storage_metrics
+    where table_catalog = '{{ target.database | upper }}'
+      and table_name ilike 'FTR\\_%'
+      and deleted = false
+)
+
+select
+    q.period,
+    q.run_days,
+    q.warehouse_seconds_per_day,
+    q.gb_written_per_day,
+    s.feature_tables as current_feature_tables,
+    s.active_gb as current_active_gb,
+    s.retained_gb as current_time_travel_failsafe_gb
+from query_costs q
+cross join storage s
+order by q.period desc
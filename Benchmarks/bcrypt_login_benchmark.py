@@ -0,0 +1,84 @@
+# =============================================================================
+# WELLNEST - BCRYPT LOGIN THROUGHPUT BENCHMARK
+# =============================================================================
+# Measures password verifications per second against bcrypt work factor,
+# pinned to a single core by default, both inline (old login path) and
+# through the auth worker pool (new login path). Use the results to pick
+# auth.BCRYPT_ROUNDS for the expected morning login peak.
+#
+# Usage:  python Benchmarks/bcrypt_login_benchmark.py [--costs 10 11 12 13] [--cores 1]
+# =============================================================================
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "StreamLit"))
+
+import bcrypt
+
+from wellnest_core import auth
+
+PASSWORD = "WellNest2024!"
+
+
+def pin_to_cores(cores):
+    """Restrict this process to the first `cores` CPUs where supported"""
+    if hasattr(os, "sched_setaffinity"):
+        available = sorted(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, set(available[:cores]))
+        return len(os.sched_getaffinity(0))
+    return None
+
+
+def logins_per_second(verify, hashed, seconds, concurrency):
+    """Run verifications from `concurrency` simulated users for ~`seconds`"""
+    deadline = time.perf_counter() + seconds
+    completed = 0
+
+    def user():
+        count = 0
+        while time.perf_counter() < deadline:
+            verify(PASSWORD, hashed)
+            count += 1
+        return count
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as users:
+        completed = sum(users.map(lambda _: user(), range(concurrency)))
+    return completed / (time.perf_counter() - started)
+
+
+def inline_verify(password, hashed):
+    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="bcrypt login throughput benchmark")
+    parser.add_argument("--costs", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--cores", type=int, default=1)
+    parser.add_argument("--users", type=int, default=8, help="Concurrent simulated logins")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Duration per measurement")
+    args = parser.parse_args()
+
+    pinned = pin_to_cores(args.cores)
+    print(f"CPU cores in use: {pinned if pinned else 'unpinned (affinity unsupported)'}")
+    print(f"Concurrent users: {args.users}, pool workers: {auth.HASH_POOL_WORKERS}\n")
+    print(f"{'cost':>4}  {'ms/verify':>9}  {'inline logins/s':>15}  {'pooled logins/s':>15}")
+
+    for cost in args.costs:
+        hashed = bcrypt.hashpw(PASSWORD.encode('utf-8'), bcrypt.gensalt(rounds=cost)).decode('utf-8')
+
+        started = time.perf_counter()
+        inline_verify(PASSWORD, hashed)
+        single_ms = (time.perf_counter() - started) * 1000
+
+        inline = logins_per_second(inline_verify, hashed, args.seconds, 1)
+        pooled = logins_per_second(auth.verify_password, hashed, args.seconds, args.users)
+        print(f"{cost:>4}  {single_ms:>9.1f}  {inline:>15.1f}  {pooled:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
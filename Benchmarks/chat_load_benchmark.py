@@ -0,0 +1,329 @@
+# =============================================================================
+# WELLNEST - END-TO-END CHAT LOAD TEST (FAKE SNOWPARK SESSION)
+# =============================================================================
+# Runs the real StreamLit/app.py code paths headlessly under concurrent
+# simulated users, with no Snowflake account:
+#   login (authenticate_user + session token) -> dashboard -> chat page ->
+#   N chat turns (st.chat_input -> process_user_message -> rerun) -> dashboard
+# Tables live in an in-memory SQLite copy of the WELLNEST schema and the
+# stored procedures are stubs with simulated Cortex latency
+# (Benchmarks/fake_snowpark.py); Streamlit is replaced by a per-thread
+# headless module (Benchmarks/headless_streamlit.py). Chat messages come from
+# the router regression suite.
+#
+# Reports throughput, latency percentiles, SQL statements / procedure calls
+# per page render and chat turn, steps over the wellnest_core.query_profiler
+# budgets, and statements repeated within one step.
+#
+# --oltp local serves the wellnest_core.oltp hot paths from a second SQLite
+# database with its own round trip (--store-ms, a hybrid-table point lookup)
+# and replicates its writes into the warehouse copy in the background; the
+# report then splits statements and DB time between warehouse and store and
+# checks that replication caught up.
+#
+# --triage-artifact (a joblib path, or `synthetic` for the model from
+# triage_batching_benchmark.py) turns on the ML second opinion and reports
+# how many DIABETES turns it scored.
+#
+# --query-ms and --store-ms are assumed round trips, not measurements: the DB
+# time columns are statement counts multiplied by them, so any warehouse vs
+# store speedup read off the report is whatever ratio was passed in (the
+# defaults, 30 vs 3, build in 10x). Only the statement counts and the
+# replication check come from the code under test; measure hybrid-table
+# latency on a real account before quoting one.
+#
+# Usage:  python Benchmarks/chat_load_benchmark.py [--users 20] [--turns 5] [--query-ms 30]
+#                                                  [--router-ms 300] [--specialist-ms 1200]
+#                                                  [--oltp warehouse|local] [--store-ms 3]
+#                                                  [--triage-artifact synthetic]
+# =============================================================================
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "StreamLit"))
+
+from fake_snowpark import FakeSession, QueryTrace
+from headless_streamlit import RerunRequested, StopRequested, load_app
+from router_benchmark import SUITE_VERSION, load_suite
+
+from wellnest_core import auth, oltp, query_profiler
+from wellnest_core.hedging import percentile
+
+PASSWORD = "WellNest2024!"
+DOMAINS = ["DIABETES", "HEART_DISEASE", "MENTAL_HEALTH"]
+
+
+# =============================================================================
+# DATA
+# =============================================================================
+
+def seed_users(session, count, history, messages, rng):
+    """Users with a medical profile and `history` past conversation turns"""
+    hashed = auth.hash_password(PASSWORD)
+    users = []
+    for index in range(count):
+        user_id = str(uuid.uuid4())
+        email = f"loadtest{index}@wellnest.test"
+        session.raw("""
+            INSERT INTO WELLNEST.USER_MANAGEMENT.USERS
+                (USER_ID, EMAIL, HASHED_PASSWORD, FULL_NAME, DATE_OF_BIRTH, ACCOUNT_STATUS)
+            VALUES (?, ?, ?, ?, ?, 'active')
+        """, [user_id, email, hashed, f"Load Test {index}", f"{rng.randint(1950, 2000)}-01-01"])
+        session.raw("""
+            INSERT INTO WELLNEST.USER_MANAGEMENT.USER_MEDICAL_PROFILES
+                (PROFILE_ID, USER_ID, HEIGHT_CM, WEIGHT_KG, HAS_DIABETES)
+            VALUES (?, ?, ?, ?, ?)
+        """, [str(uuid.uuid4()), user_id, rng.randint(150, 195), rng.randint(50, 120), rng.random() < 0.3])
+        past_session = str(uuid.uuid4())
+        for turn in range(history):
+            session.raw("""
+                INSERT INTO WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY
+                    (CONVERSATION_ID, USER_ID, SESSION_ID, MESSAGE_TIMESTAMP, USER_MESSAGE,
+                     ASSISTANT_RESPONSE, ROUTED_TO_DOMAIN, URGENCY_LEVEL)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 'routine')
+            """, [str(uuid.uuid4()), user_id, past_session, datetime.now() - timedelta(hours=history - turn),
+                  rng.choice(messages), "Earlier answer.", rng.choice(DOMAINS)])
+        users.append({"user_id": user_id, "email": email})
+    return users
+
+
+def copy_tables(source, target, tables):
+    """Backfill the store from the warehouse copy (Misc/oltp_hybrid.sql step 2)"""
+    for table in tables:
+        rows = source.raw(f"SELECT * FROM {table}")
+        if rows:
+            slots = ", ".join("?" * len(rows[0]))
+            for row in rows:
+                target.raw(f"INSERT INTO {table} VALUES ({slots})", list(row))
+
+
+def triage_artifact_path(artifact):
+    """Joblib path for --triage-artifact, training the synthetic model if asked"""
+    if artifact != "synthetic":
+        return artifact
+    import tempfile
+    import joblib
+    from triage_batching_benchmark import synthetic_artifact
+    path = os.path.join(tempfile.mkdtemp(prefix="wellnest-triage-"), "synthetic_rf.joblib")
+    joblib.dump(synthetic_artifact(), path)
+    return path
+
+
+# =============================================================================
+# SIMULATED USER
+# =============================================================================
+
+def run_script(app):
+    """One Streamlit script run of the current page (a rerun ends it)"""
+    try:
+        app.main()
+    except (RerunRequested, StopRequested):
+        return True
+    return False
+
+
+def sql_ms(trace):
+    return sum(ms for kind, _, ms in trace.statements if kind == "sql")
+
+
+def simulate_user(app, st, session, store, user, messages, turns, rng):
+    st.new_browser_session()
+    # app.py's module-level session state init runs on every script run
+    st.session_state.authenticated = False
+    st.session_state.current_page = 'dashboard'
+    samples = []
+
+    def step(operation, action):
+        shown = len(st.messages)
+        error = None
+        # With --oltp warehouse the store is the warehouse session: nothing separate to trace
+        store_tracking = store.track() if store is not session else nullcontext(QueryTrace())
+        with session.track() as trace, store_tracking as store_trace, \
+                query_profiler.rerun(operation.replace("page:", "")) as profile:
+            started = time.perf_counter()
+            try:
+                action()
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        report = profile.report()
+        ui_errors = [text for kind, text in st.messages[shown:] if kind in ("error", "exception")]
+        samples.append({"operation": operation, "ms": elapsed_ms, "queries": trace.queries,
+                        "store_queries": store_trace.queries, "calls": trace.calls,
+                        "db_ms": sql_ms(trace) + sql_ms(store_trace),
+                        "ui_errors": ui_errors, "error": error,
+                        "over_budget": report["over_budget"], "repeated": report["repeated"]})
+
+    def login():
+        result = app.authenticate_user(user["email"], PASSWORD)
+        if not result:
+            raise RuntimeError("login rejected")
+        app.session_tokens.start_session(result)
+
+    def open_page(page):
+        st.session_state.current_page = page
+        run_script(app)
+
+    def chat_turn(message):
+        st.submit_chat(message)
+        if run_script(app):     # Submission run ends in st.rerun(); the rerun shows the answer
+            run_script(app)
+
+    step("login", login)
+    step("page:dashboard", lambda: open_page('dashboard'))
+    step("page:chat", lambda: open_page('chat'))
+    for message in rng.sample(messages, min(turns, len(messages))):
+        step("chat_turn", lambda message=message: chat_turn(message))
+    step("page:dashboard", lambda: open_page('dashboard'))
+    return samples
+
+
+# =============================================================================
+# REPORT
+# =============================================================================
+
+def summarize(samples):
+    by_operation = defaultdict(list)
+    for sample in samples:
+        by_operation[sample["operation"]].append(sample)
+    report = {}
+    for operation, rows in by_operation.items():
+        latencies = [row["ms"] for row in rows]
+        report[operation] = {
+            "count": len(rows),
+            "errors": sum(1 for row in rows if row["error"]),
+            "ui_errors": sum(len(row["ui_errors"]) for row in rows),
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+            "p99_ms": round(percentile(latencies, 99), 1),
+            "queries_mean": round(sum(row["queries"] for row in rows) / len(rows), 2),
+            "queries_max": max(row["queries"] for row in rows),
+            "store_queries_mean": round(sum(row["store_queries"] for row in rows) / len(rows), 2),
+            "db_ms_mean": round(sum(row["db_ms"] for row in rows) / len(rows), 1),
+            "calls_mean": round(sum(row["calls"] for row in rows) / len(rows), 2),
+            "over_budget": sum(1 for row in rows if row["over_budget"]),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end chat load test with a fake Snowpark session")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent simulated users")
+    parser.add_argument("--turns", type=int, default=5, help="Chat turns per user")
+    parser.add_argument("--history", type=int, default=20, help="Seeded past turns per user")
+    parser.add_argument("--query-ms", type=float, default=30.0, help="Simulated round trip per SQL statement")
+    parser.add_argument("--router-ms", type=float, default=300.0)
+    parser.add_argument("--specialist-ms", type=float, default=1200.0)
+    parser.add_argument("--oltp", choices=["warehouse", "local"], default="warehouse",
+                        help="Where the wellnest_core.oltp hot paths run")
+    parser.add_argument("--store-ms", type=float, default=3.0, help="Simulated round trip per store statement")
+    parser.add_argument("--triage-artifact", help="Enable the triage second opinion (joblib path or 'synthetic')")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    messages = [case["query"] for case in load_suite(SUITE_VERSION)["cases"]]
+    session = FakeSession(query_ms=args.query_ms, seed=args.seed, procedure_ms={
+        "CLASSIFY_USER_QUERY": args.router_ms, "QUERY_SPECIALIST_LLM": args.specialist_ms})
+    users = seed_users(session, args.users, args.history, messages, rng)
+    store, replicator = session, None
+    if args.oltp == "local":
+        store = FakeSession(query_ms=args.store_ms, seed=args.seed)
+        copy_tables(session, store, oltp.HYBRID_TABLES)
+        replicator = oltp.Replicator(session)
+        oltp.set_store(oltp.Store(store, replicator=replicator))
+    query_profiler.ENABLED = True   # Per-step repeated-statement detection
+    app, st = load_app(session)
+    if args.triage_artifact:
+        app.TRIAGE_MODEL_PATH = triage_artifact_path(args.triage_artifact)
+
+    print(f"{args.users} users x {args.turns} turns, SQL {args.query_ms:.0f}ms, "
+          f"router {args.router_ms:.0f}ms, specialist {args.specialist_ms:.0f}ms, "
+          f"OLTP {args.oltp}" + (f" ({args.store_ms:.0f}ms)" if replicator else "") + "\n")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        futures = [pool.submit(simulate_user, app, st, session, store, user, messages, args.turns,
+                               random.Random(args.seed + index))
+                   for index, user in enumerate(users)]
+        samples = [sample for future in futures for sample in future.result()]
+    wall_seconds = time.perf_counter() - started
+
+    report = summarize(samples)
+    turns = report.get("chat_turn", {}).get("count", 0)
+    print(f"{'operation':<16} {'n':>5} {'err':>4} {'st.err':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'SQL/op':>7} {'max':>4} {'store/op':>8} {'DB ms':>7} {'calls/op':>8} {'>budget':>7}")
+    for operation, row in report.items():
+        print(f"{operation:<16} {row['count']:>5} {row['errors']:>4} {row['ui_errors']:>6} {row['p50_ms']:>9.1f} "
+              f"{row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['queries_mean']:>7.1f} {row['queries_max']:>4} "
+              f"{row['store_queries_mean']:>8.1f} {row['db_ms_mean']:>7.1f} {row['calls_mean']:>8.1f} "
+              f"{row['over_budget']:>7}")
+    print(f"\nWall time {wall_seconds:.1f}s: {len(samples) / wall_seconds:.1f} operations/s, "
+          f"{turns / wall_seconds:.2f} chat turns/s")
+
+    failures = Counter(f"{s['operation']}: {s['error']}" for s in samples if s["error"])
+    shown = Counter(f"{s['operation']}: {text[:90]}" for s in samples for text in s["ui_errors"])
+    for title, counts in (("Exceptions", failures), ("st.error / st.exception shown", shown)):
+        if counts:
+            print(f"\n{title}:")
+            for text, count in counts.most_common(5):
+                print(f"  {count:>4}x {text}")
+
+    # Same statement shape issued more than once within one step (N+1 candidates)
+    repeats = defaultdict(lambda: [0, 0, set()])
+    for sample in samples:
+        for row in sample["repeated"]:
+            entry = repeats[(sample["operation"], row["statement"])]
+            entry[0] += 1
+            entry[1] = max(entry[1], row["count"])
+            entry[2].update(row["callers"])
+    if repeats:
+        print("\nRepeated within one step (steps affected, max repeats, callers):")
+        for (operation, statement), (steps, most, callers) in sorted(repeats.items(), key=lambda item: -item[1][0])[:8]:
+            print(f"  {operation:<16} {steps:>4} {most:>3}x  {', '.join(sorted(callers))}: {statement[:80]}")
+
+    # Errors the app caught and logged (APPLICATION_LOGS via the buffered handler)
+    for handler in app.logger.handlers:
+        handler.flush()
+    logged = session.raw("SELECT LOG_LEVEL, COUNT(*) FROM WELLNEST.APP_LOGS.APPLICATION_LOGS GROUP BY LOG_LEVEL")
+    if logged:
+        print("\nAPPLICATION_LOGS: " + ", ".join(f"{level} {count}" for level, count in logged))
+
+    # The second opinion must have run on every DIABETES turn
+    if args.triage_artifact:
+        diabetes_turns = session.raw("SELECT COUNT(*) FROM WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY "
+                                     "WHERE ROUTED_TO_DOMAIN = 'DIABETES' AND ASSISTANT_RESPONSE <> 'Earlier answer.'")[0][0]
+        scored = app.get_triage_batcher().stats()["requests"]
+        print(f"\nTriage model: {scored} scores for {diabetes_turns} DIABETES turns"
+              + ("" if scored >= diabetes_turns else " (second opinion skipped)"))
+
+    # Every store write must have reached the warehouse copy
+    if replicator:
+        caught_up = replicator.sync(timeout=30)
+        table = "WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY"
+        stored, replicated = (db.raw(f"SELECT COUNT(*) FROM {table}")[0][0] for db in (store, session))
+        stats = replicator.stats()
+        print(f"\nReplication: {stats['replicated']} writes, last lag {stats['last_lag_ms']:.0f}ms, "
+              f"{stats['failed_writes']} failed, {stats['dropped']} dropped; "
+              f"turns in store {stored - args.users * args.history}, "
+              f"new in warehouse {replicated - args.users * args.history}"
+              + ("" if caught_up else " (timed out)"))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump({"args": vars(args), "wall_seconds": wall_seconds, "operations": report}, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# =============================================================================
+# WELLNEST - DBT FULL VS INCREMENTAL RUN BENCHMARK
+# =============================================================================
+# Builds a synthetic RAW_DIABETES_DATA table (10M rows by default) in a local
+# DuckDB file, then times the diabetes chain
+# (stg_diabetes_cleaned -> core_clinical -> risk_urgency -> conversation_prompts):
+#   1. full build          (--full-refresh)
+#   2. incremental run     after appending a small batch of new raw rows
+#   3. full rebuild        of the same data, to compare time and row counts
+#
+# Requires dbt-core and dbt-duckdb; uses Pipeline/profiles.yml.
+# Usage:  python Benchmarks/dbt_incremental_benchmark.py [--rows 10000000] [--append 100000]
+# =============================================================================
+
+import argparse
+import os
+import subprocess
+import time
+
+import duckdb
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+PROFILES_DIR = os.path.join(REPO_ROOT, "Pipeline")
+SELECTOR = "stg_diabetes_cleaned+"
+CHAIN = [
+    "stg_diabetes_cleaned",
+    "ftr_diabetes_core_clinical",
+    "ftr_diabetes_risk_urgency",
+    "ftr_diabetes_conversation_prompts",
+]
+
+# Roughly the value ranges of the Kaggle diabetes set; coarse rounding leaves
+# a realistic share of exact duplicates for the dedup step
+SYNTHETIC_ROWS_SQL = """
+SELECT
+    CASE WHEN random() < 0.52 THEN 'Female' ELSE 'Male' END AS GENDER,
+    round(10 + random() * 70) AS AGE,
+    CASE WHEN random() < 0.08 THEN 1 ELSE 0 END AS HYPERTENSION,
+    CASE WHEN random() < 0.04 THEN 1 ELSE 0 END AS HEART_DISEASE,
+    ['never', 'No Info', 'current', 'former', 'ever', 'not current'][1 + floor(random() * 6)::INT] AS SMOKING_HISTORY,
+    round(15 + random() * 30, 1) AS BMI,
+    round(4 + random() * 6, 1) AS HBA1C_LEVEL,
+    round(80 + random() * 220) AS BLOOD_GLUCOSE_LEVEL,
+    CASE WHEN random() < 0.09 THEN 1 ELSE 0 END AS DIABETES
+FROM range({rows})
+"""
+
+
+def load_raw(db_path, rows, append=False):
+    """Create (or append to) WELLNEST.PUBLIC.RAW_DIABETES_DATA"""
+    con = duckdb.connect(db_path)
+    try:
+        con.execute("SELECT setseed(?)", [0.42 if not append else 0.24])
+        con.execute("CREATE SCHEMA IF NOT EXISTS PUBLIC")
+        select = SYNTHETIC_ROWS_SQL.format(rows=int(rows))
+        if append:
+            con.execute(f"INSERT INTO PUBLIC.RAW_DIABETES_DATA {select}")
+        else:
+            con.execute(f"CREATE OR REPLACE TABLE PUBLIC.RAW_DIABETES_DATA AS {select}")
+        return con.execute("SELECT count(*) FROM PUBLIC.RAW_DIABETES_DATA").fetchone()[0]
+    finally:
+        con.close()
+
+
+def row_counts(db_path):
+    con = duckdb.connect(db_path, read_only=True)
+    try:
+        return {model: con.execute(f"SELECT count(*) FROM main.{model}").fetchone()[0] for model in CHAIN}
+    finally:
+        con.close()
+
+
+def dbt_run(full_refresh):
+    """Time one `dbt run` of the diabetes chain"""
+    command = ["dbt", "run", "--project-dir", REPO_ROOT, "--profiles-dir", PROFILES_DIR,
+               "--select", SELECTOR]
+    if full_refresh:
+        command.append("--full-refresh")
+    started = time.perf_counter()
+    subprocess.run(command, check=True, capture_output=True, text=True)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="dbt full vs incremental run benchmark")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="Initial raw rows")
+    parser.add_argument("--append", type=int, default=100_000, help="New raw rows per incremental run")
+    parser.add_argument("--db-dir", default=os.path.join(REPO_ROOT, "target"))
+    args = parser.parse_args()
+
+    os.makedirs(args.db_dir, exist_ok=True)
+    os.environ["WELLNEST_DUCKDB_DIR"] = args.db_dir
+    db_path = os.path.join(args.db_dir, "wellnest.duckdb")
+
+    print(f"Loading {args.rows:,} synthetic raw rows into {db_path}")
+    load_raw(db_path, args.rows)
+
+    print("Full build (initial)...")
+    initial_full = dbt_run(full_refresh=True)
+
+    total = load_raw(db_path, args.append, append=True)
+    print(f"Appended {args.append:,} raw rows ({total:,} total), incremental run...")
+    incremental = dbt_run(full_refresh=False)
+    incremental_counts = row_counts(db_path)
+
+    print("Full rebuild of the same data...")
+    rebuild = dbt_run(full_refresh=True)
+    rebuild_counts = row_counts(db_path)
+
+    print(f"\n{'run':<24} {'seconds':>9}")
+    print(f"{'full (initial)':<24} {initial_full:>9.1f}")
+    print(f"{'incremental (+append)':<24} {incremental:>9.1f}")
+    print(f"{'full rebuild':<24} {rebuild:>9.1f}")
+    print(f"Incremental speedup vs full rebuild: {rebuild / incremental:.1f}x\n")
+
+    print(f"{'model':<36} {'incremental rows':>16} {'full rows':>12}")
+    for model in CHAIN:
+        flag = "" if incremental_counts[model] == rebuild_counts[model] else "  MISMATCH"
+        print(f"{model:<36} {incremental_counts[model]:>16,} {rebuild_counts[model]:>12,}{flag}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# =============================================================================
+# WELLNEST - DEMO CHAT CONTEXT SIZE BENCHMARK
+# =============================================================================
+# Compares the per-turn prompt size of the original demo (SYSTEM_PROMPT plus
+# the full transcript rebuilt into one string every message) with the
+# rolling-window ChatSession, over long conversations, using the offline
+# StubModel - no API key or network needed.
+#
+# Usage:  python Benchmarks/demo_context_benchmark.py [--turns 100] [--window 6]
+# =============================================================================
+
+import argparse
+import ast
+import os
+import sys
+
+DEMO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Demo App")
+sys.path.insert(0, DEMO_DIR)
+
+from chat_session import ChatSession, StubModel
+
+
+def demo_system_prompt_chars():
+    """Length of the demo's SYSTEM_PROMPT, read with ast (the module starts Streamlit on import)"""
+    with open(os.path.join(DEMO_DIR, "WellNest Paper demo.py"), encoding="utf-8") as handle:
+        tree = ast.parse(handle.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(target, "id", None) == "SYSTEM_PROMPT"
+                                                for target in node.targets):
+            return len(ast.literal_eval(node.value))
+    raise RuntimeError("SYSTEM_PROMPT not found in the demo")
+
+
+SYSTEM_PROMPT_CHARS = demo_system_prompt_chars()
+
+USER_MESSAGE = "I've been feeling tired and thirsty lately and my glucose was 180 this morning. "
+
+
+def legacy_prompt_chars(history, user_message):
+    """Size of the string the original chat_with_model() sent"""
+    conversation = "x" * SYSTEM_PROMPT_CHARS + "\n\n"
+    for role, content in history:
+        conversation += f"{role}: {content}\n\n"
+    conversation += f"User: {user_message}\n\nAssistant:"
+    return len(conversation)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Demo chat context size benchmark")
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--window", type=int, default=6)
+    parser.add_argument("--summarize-batch", type=int, default=4)
+    parser.add_argument("--reply-chars", type=int, default=600)
+    args = parser.parse_args()
+
+    model = StubModel(reply_chars=args.reply_chars)
+    summary_model = StubModel()
+    chat = ChatSession(model, system_prompt="x" * SYSTEM_PROMPT_CHARS,
+                       window_turns=args.window, summarize_batch=args.summarize_batch,
+                       summary_model=summary_model)
+
+    history = []
+    legacy_sizes = []
+    for turn in range(args.turns):
+        message = f"{USER_MESSAGE}(turn {turn + 1})"
+        legacy_sizes.append(legacy_prompt_chars(history, message))
+        reply = "".join(chat.send(message))
+        chat.compact()
+        history.append(("User", message))
+        history.append(("Assistant", reply))
+
+    print(f"{args.turns}-turn conversation, window={args.window}, "
+          f"summarize every {args.summarize_batch} turns\n")
+    print(f"{'turn':>5}  {'legacy chars':>12}  {'session chars':>13}")
+    checkpoints = sorted({1, 10, 25, 50, args.turns} & set(range(1, args.turns + 1)))
+    for turn in checkpoints:
+        print(f"{turn:>5}  {legacy_sizes[turn - 1]:>12,}  {chat.prompt_sizes[turn - 1]:>13,}")
+
+    legacy_total = sum(legacy_sizes)
+    session_total = sum(chat.prompt_sizes)
+    summary_total = sum(summary_model.request_chars)
+    print(f"\nTotal prompt chars  legacy: {legacy_total:,}   session: {session_total:,} "
+          f"(+{summary_total:,} in {chat.summary_calls} summary calls)")
+    print(f"Reduction: {1 - (session_total + summary_total) / legacy_total:.1%} "
+          f"(~{legacy_total // 4:,} vs ~{(session_total + summary_total) // 4:,} tokens)")
+
+
+if __name__ == "__main__":
+    main()
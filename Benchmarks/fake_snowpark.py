@@ -0,0 +1,341 @@
+# =============================================================================
+# WELLNEST - FAKE SNOWPARK SESSION (LOCAL TEST / LOAD HARNESS)
+# =============================================================================
+# A stand-in for the Snowpark session the app gets from get_active_session():
+#   - session.sql(...).collect() / .to_pandas() run against an in-memory
+#     SQLite copy of the WELLNEST tables (DDL read from Misc/userDatabase.sql
+#     and Misc/cortexsearch.sql, Snowflake-only syntax rewritten on the fly)
+#   - session.call(...) dispatches to Python stubs of the stored procedures
+#     (router, specialist, metric extraction, trends, summaries) with a
+#     configurable simulated latency
+#   - every statement and call is counted, per thread inside session.track()
+#     (one page render / chat turn) and in total per normalized statement
+# Statements SQLite cannot run raise FakeSnowparkError, which the app handles
+# like any Snowflake error.
+# =============================================================================
+
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, datetime
+
+from router_benchmark import LocalRouter
+from wellnest_core.query_profiler import normalize_statement
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+DDL_FILES = [
+    os.path.join(REPO_ROOT, "Misc", "userDatabase.sql"),
+    os.path.join(REPO_ROOT, "Misc", "cortexsearch.sql"),
+]
+
+CREATE_TABLE_PATTERN = re.compile(r"CREATE TABLE IF NOT EXISTS WELLNEST\.\w+\.\w+\s*\(.*?\n\)", re.DOTALL)
+TABLE_NAME_PATTERN = re.compile(r"\bWELLNEST\.(\w+)\.(\w+)\b", re.IGNORECASE)
+FROM_VALUES_PATTERN = re.compile(r"\bFROM\s+VALUES\s+(.*)$", re.IGNORECASE | re.DOTALL)
+CURRENT_TIMESTAMP_PATTERN = re.compile(r"\b(?:CURRENT_TIMESTAMP|SYSDATE)\(\)", re.IGNORECASE)
+NOW_SQL = "(STRFTIME('%Y-%m-%d %H:%M:%f', 'now'))"
+
+# Mean simulated latency (ms) of the Cortex-backed procedures
+PROCEDURE_MS = {
+    "CLASSIFY_USER_QUERY": 300.0,
+    "QUERY_SPECIALIST_LLM": 1200.0,
+    "EXTRACT_AND_SAVE_METRICS": 150.0,
+    "GET_METRIC_TRENDS": 50.0,
+    "SUMMARIZE_SESSION": 600.0,
+}
+
+
+class FakeSnowparkError(Exception):
+    """Raised for statements or procedures the fake session cannot run"""
+
+
+# =============================================================================
+# SQL TRANSLATION
+# =============================================================================
+
+def to_sqlite(query):
+    """Rewrite the Snowflake syntax the app uses into SQLite"""
+    query = TABLE_NAME_PATTERN.sub(lambda m: f"{m.group(1)}__{m.group(2)}".upper(), query)
+    query = CURRENT_TIMESTAMP_PATTERN.sub(NOW_SQL, query)
+    # Snowflake: FROM VALUES (..), (..)   SQLite: FROM (VALUES (..), (..))
+    query = FROM_VALUES_PATTERN.sub(lambda m: f"FROM (VALUES {m.group(1).rstrip().rstrip(';')})", query.strip())
+    return query
+
+
+def _parse_timestamp(value):
+    return datetime.fromisoformat(value.decode())
+
+
+def _to_timestamp(value):
+    if value is None or isinstance(value, (int, float)):
+        return value
+    return datetime.fromisoformat(str(value).replace("T", " ")).isoformat(" ")
+
+
+def _array_construct(*values):
+    return json.dumps(list(values))
+
+
+def _try_parse_json(value):
+    try:
+        return None if value is None else json.dumps(json.loads(value))
+    except ValueError:
+        return None
+
+
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(dict, json.dumps)
+sqlite3.register_adapter(list, json.dumps)
+sqlite3.register_converter("TIMESTAMP_NTZ", _parse_timestamp)
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()[:10]))
+sqlite3.register_converter("BOOLEAN", lambda value: value not in (b"0", b"false", b"FALSE"))
+
+
+# =============================================================================
+# RESULT OBJECTS
+# =============================================================================
+
+class FakeRow:
+    """Snowpark Row look-alike: row['COL'], row[0], row.COL, row.asDict()"""
+
+    __slots__ = ("_columns", "_values")
+
+    def __init__(self, columns, values):
+        self._columns = columns
+        self._values = tuple(values)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, slice)):
+            return self._values[key]
+        try:
+            return self._values[self._columns.index(key.upper())]
+        except ValueError:
+            raise KeyError(key) from None
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def asDict(self):
+        return dict(zip(self._columns, self._values))
+
+    def __repr__(self):
+        return f"Row({', '.join(f'{c}={v!r}' for c, v in zip(self._columns, self._values))})"
+
+
+class FakeDataFrame:
+    """Lazy result of session.sql(); runs when collected"""
+
+    def __init__(self, session, query, params):
+        self.session = session
+        self.query = query
+        self.params = params
+
+    def collect(self):
+        return self.session.execute(self.query, self.params)
+
+    def to_pandas(self):
+        import pandas as pd
+        return pd.DataFrame([row.asDict() for row in self.collect()])
+
+    def first(self):
+        rows = self.collect()
+        return rows[0] if rows else None
+
+
+class QueryTrace:
+    """Statements and procedure calls issued by one thread inside session.track()"""
+
+    def __init__(self):
+        self.statements = []   # (kind, name or normalized SQL, duration ms)
+
+    @property
+    def queries(self):
+        return sum(1 for kind, _, _ in self.statements if kind == "sql")
+
+    @property
+    def calls(self):
+        return sum(1 for kind, _, _ in self.statements if kind == "call")
+
+
+# =============================================================================
+# SESSION
+# =============================================================================
+
+class FakeSession:
+    """In-process Snowpark session over SQLite with stubbed stored procedures"""
+
+    def __init__(self, query_ms=0.0, procedure_ms=None, procedures=None, seed=None):
+        self.query_ms = query_ms
+        self.procedure_ms = dict(PROCEDURE_MS, **(procedure_ms or {}))
+        self.rng = random.Random(seed)
+        self.conn = sqlite3.connect(":memory:", check_same_thread=False, detect_types=sqlite3.PARSE_DECLTYPES)
+        self.conn.create_function("IFF", 3, lambda cond, a, b: a if cond else b)
+        self.conn.create_function("TO_VARCHAR", 1, lambda value: None if value is None else str(value))
+        self.conn.create_function("TO_TIMESTAMP_NTZ", 1, _to_timestamp)
+        self.conn.create_function("PARSE_JSON", 1, lambda value: value)
+        self.conn.create_function("TRY_PARSE_JSON", 1, _try_parse_json)
+        self.conn.create_function("TO_ARRAY", 1, lambda value: value)
+        self.conn.create_function("TO_DATE", 1, lambda value: None if value is None else str(value)[:10])
+        self.conn.create_function("ARRAY_CONSTRUCT", -1, _array_construct)
+        self.conn.create_function("UUID_STRING", 0, lambda: str(uuid.uuid4()))
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.statement_counts = Counter()
+        self.procedures = dict(default_procedures())
+        self.procedures.update(procedures or {})
+        self.create_schema()
+
+    def create_schema(self):
+        for path in DDL_FILES:
+            with open(path, encoding="utf-8") as handle:
+                for ddl in CREATE_TABLE_PATTERN.findall(handle.read()):
+                    self.conn.execute(to_sqlite(ddl))
+        self.conn.commit()
+
+    # -------------------------------------------------------------------------
+    # Snowpark surface
+    # -------------------------------------------------------------------------
+
+    def sql(self, query, params=None):
+        return FakeDataFrame(self, query, params)
+
+    def call(self, name, *args):
+        short_name = name.split(".")[-1].upper()
+        procedure = self.procedures.get(short_name)
+        if procedure is None:
+            raise FakeSnowparkError(f"Unknown stored procedure {name}")
+        started = time.perf_counter()
+        try:
+            if self.procedure_ms.get(short_name):
+                time.sleep(self.simulated_seconds(self.procedure_ms[short_name]))
+            return procedure(self, *args)
+        finally:
+            self._record("call", short_name, started)
+
+    def execute(self, query, params=None):
+        started = time.perf_counter()
+        if self.query_ms:
+            time.sleep(self.simulated_seconds(self.query_ms))
+        try:
+            with self._lock:
+                cursor = self.conn.execute(to_sqlite(query), params or [])
+                rows = cursor.fetchall()
+                self.conn.commit()
+        except sqlite3.Error as e:
+            raise FakeSnowparkError(f"{e} in: {' '.join(query.split())[:200]}") from e
+        finally:
+            self._record("sql", normalize_statement(query), started)
+        if cursor.description is None:
+            return [FakeRow(["NUMBER OF ROWS AFFECTED"], [cursor.rowcount])]
+        columns = [description[0].upper() for description in cursor.description]
+        return [FakeRow(columns, row) for row in rows]
+
+    # -------------------------------------------------------------------------
+    # Harness helpers
+    # -------------------------------------------------------------------------
+
+    def simulated_seconds(self, mean_ms):
+        """Jittered latency (0.5x-1.5x of the mean)"""
+        return mean_ms * self.rng.uniform(0.5, 1.5) / 1000
+
+    def _record(self, kind, name, started):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self.statement_counts[(kind, name)] += 1
+        trace = getattr(self._local, "trace", None)
+        if trace is not None:
+            trace.statements.append((kind, name, elapsed_ms))
+
+    @contextmanager
+    def track(self):
+        """Collect the statements this thread issues inside the block"""
+        previous = getattr(self._local, "trace", None)
+        trace = self._local.trace = QueryTrace()
+        try:
+            yield trace
+        finally:
+            self._local.trace = previous
+
+    def raw(self, query, params=None):
+        """Run SQL without counting it (seeding and inspection)"""
+        with self._lock:
+            rows = self.conn.execute(to_sqlite(query), params or []).fetchall()
+            self.conn.commit()
+        return rows
+
+
+# =============================================================================
+# STORED PROCEDURE STUBS (latency is added by FakeSession.call)
+# =============================================================================
+
+SPECIALIST_REPLY = ("Thanks for sharing that. Based on what you've described, here are a few practical steps "
+                    "you can take today, plus signs that mean you should contact your doctor sooner.")
+
+GLUCOSE_PATTERN = re.compile(r"(?:sugar|glucose)\D{0,20}(\d{2,3})", re.IGNORECASE)
+BLOOD_PRESSURE_PATTERN = re.compile(r"\b(\d{2,3})/(\d{2,3})\b")
+
+
+def classify_user_query(session, user_query, user_id):
+    return json.dumps(LocalRouter().classify(user_query))
+
+
+def query_specialist_llm(session, user_query, domain, user_id, specialist_model, session_id):
+    return f"{SPECIALIST_REPLY} ({domain.replace('_', ' ').title()})"
+
+
+def extract_and_save_metrics(session, user_message, assistant_response, user_id, conversation_id, domain):
+    metrics = []
+    glucose = GLUCOSE_PATTERN.search(user_message)
+    if glucose:
+        metrics.append(("blood_sugar", float(glucose.group(1)), "mg/dL"))
+    pressure = BLOOD_PRESSURE_PATTERN.search(user_message)
+    if pressure:
+        metrics.append(("blood_pressure_systolic", float(pressure.group(1)), "mmHg"))
+        metrics.append(("blood_pressure_diastolic", float(pressure.group(2)), "mmHg"))
+    for metric_type, value, unit in metrics:
+        session.raw(
+            "INSERT INTO WELLNEST.MEDICAL_DATA.HEALTH_METRICS (METRIC_ID, USER_ID, CONVERSATION_ID, METRIC_TYPE, "
+            "METRIC_VALUE, METRIC_UNIT, MEASUREMENT_DATE) VALUES (?, ?, ?, ?, ?, ?, DATE('now'))",
+            [str(uuid.uuid4()), user_id, conversation_id, metric_type, value, unit])
+    return json.dumps({"extracted": len(metrics), "metrics": [m[0] for m in metrics]})
+
+
+def get_metric_trends(session, user_id, metric_type, days):
+    values = [row[0] for row in session.raw(
+        "SELECT METRIC_VALUE FROM WELLNEST.MEDICAL_DATA.HEALTH_METRICS "
+        "WHERE USER_ID = ? AND METRIC_TYPE = ? AND MEASUREMENT_DATE >= DATE('now', ?) ORDER BY REPORTED_DATE",
+        [user_id, metric_type, f"-{int(days)} days"])]
+    if not values:
+        return json.dumps({"data_points": 0})
+    change = (values[-1] - values[0]) / values[0] * 100 if values[0] else 0.0
+    return json.dumps({"data_points": len(values), "current_value": values[-1], "percent_change": change})
+
+
+def summarize_session(session, user_id, session_id):
+    return json.dumps({"summary_created": True})
+
+
+def default_procedures():
+    return {
+        "CLASSIFY_USER_QUERY": classify_user_query,
+        "QUERY_SPECIALIST_LLM": query_specialist_llm,
+        "EXTRACT_AND_SAVE_METRICS": extract_and_save_metrics,
+        "GET_METRIC_TRENDS": get_metric_trends,
+        "SUMMARIZE_SESSION": summarize_session,
+    }
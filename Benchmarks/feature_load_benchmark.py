@@ -0,0 +1,114 @@
+# =============================================================================
+# WELLNEST - FEATURE LOAD BENCHMARK (CSV vs PARQUET)
+# =============================================================================
+# Times the training notebook's data load: the hand-exported CSV read with
+# pd.read_csv against the Parquet export from Pipeline/export_features.py read
+# through "ML Models/feature_store.py" with column projection. The synthetic
+# table mimics FTR_DIABETES_CONVERSATION_PROMPTS: numeric measurements and
+# scores, *_stage / *_category strings and boolean flags.
+#
+# Usage:  python Benchmarks/feature_load_benchmark.py [--rows 2000000] [--wide 60]
+# =============================================================================
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "Pipeline"))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "ML Models"))
+
+from export_features import COMPRESSION, PARTITION_COLUMN, normalize, save_manifest
+from feature_store import load_features
+
+TABLE_NAME = "FTR_DIABETES_CONVERSATION_PROMPTS"
+TRAINING_COLUMNS = ["AGE", "BMI", "DIABETES_STAGE", "BMI_CATEGORY", "HAS_DIABETES",
+                    "IS_OBESE", "CARDIOVASCULAR_RISK_SCORE", "GLUCOSE_URGENCY_LEVEL"]
+
+
+def synthetic_table(rows, wide):
+    """Gold-like Arrow table with roughly `wide` columns"""
+    rng = np.random.default_rng(42)
+    columns = {
+        "AGE": rng.integers(1, 90, rows),
+        "BMI": rng.normal(27, 6, rows).round(2),
+        "DIABETES_STAGE": rng.choice(["normal", "prediabetes", "diabetes_controlled", "diabetes_uncontrolled"], rows),
+        "BMI_CATEGORY": rng.choice(["underweight", "normal", "overweight", "obese"], rows),
+        "GLUCOSE_URGENCY_LEVEL": rng.choice(["routine", "needs_attention", "urgent", "emergency"], rows),
+        "HAS_DIABETES": rng.random(rows) < 0.1,
+        "IS_OBESE": rng.random(rows) < 0.3,
+        "CARDIOVASCULAR_RISK_SCORE": rng.integers(0, 10, rows),
+    }
+    for index in range(len(columns), wide):
+        kind = index % 3
+        if kind == 0:
+            columns[f"SCORE_{index}"] = rng.random(rows).round(4)
+        elif kind == 1:
+            columns[f"SHOULD_ASK_{index}"] = rng.random(rows) < 0.5
+        else:
+            columns[f"PROMPT_{index}_CATEGORY"] = rng.choice(["low", "medium", "high"], rows)
+    table = pa.table(columns)
+    return table.append_column("DBT_LOADED_AT", pa.array(
+        np.full(rows, np.datetime64("2026-01-01T00:00:00", "us")), pa.timestamp("us")))
+
+
+def timed(fn, repeats):
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV vs Parquet feature load benchmark")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--wide", type=int, default=60)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    table = synthetic_table(args.rows, args.wide)
+    with tempfile.TemporaryDirectory() as work_dir:
+        csv_path = os.path.join(work_dir, "diabetes_feature_engineered.csv")
+        table.to_pandas().to_csv(csv_path, index=False)
+        table_dir = os.path.join(work_dir, TABLE_NAME.lower())
+        paths = []
+        pq.write_to_dataset(normalize(table), root_path=table_dir,
+                            partition_cols=[PARTITION_COLUMN], compression=COMPRESSION,
+                            file_visitor=lambda written_file: paths.append(written_file.path))
+        save_manifest(table_dir, {"table": TABLE_NAME, "watermark": None, "schema": {},
+                                  "files": [{"path": os.path.relpath(path, table_dir)} for path in paths]})
+
+        csv_bytes = os.path.getsize(csv_path)
+        parquet_bytes = sum(os.path.getsize(os.path.join(root, name))
+                            for root, _, names in os.walk(os.path.join(work_dir, TABLE_NAME.lower()))
+                            for name in names)
+
+        results = [
+            ("read_csv (all columns)", timed(lambda: pd.read_csv(csv_path), args.repeats)),
+            ("read_csv (usecols)", timed(lambda: pd.read_csv(csv_path, usecols=TRAINING_COLUMNS), args.repeats)),
+            ("parquet (all columns)", timed(lambda: load_features(TABLE_NAME, feature_dir=work_dir), args.repeats)),
+            ("parquet (projected)", timed(
+                lambda: load_features(TABLE_NAME, columns=TRAINING_COLUMNS, feature_dir=work_dir), args.repeats)),
+        ]
+        projected = load_features(TABLE_NAME, columns=TRAINING_COLUMNS, feature_dir=work_dir)
+
+    print(f"{args.rows:,} rows x {table.num_columns} columns (median of {args.repeats})")
+    print(f"CSV {csv_bytes / 1e6:,.0f} MB, Parquet ({COMPRESSION}) {parquet_bytes / 1e6:,.0f} MB\n")
+    baseline = results[0][1]
+    for label, seconds in results:
+        print(f"{label:<24} {seconds:>8.2f}s  {baseline / seconds:>6.1f}x")
+    print("\nProjected dtypes: " + ", ".join(f"{name}={dtype}" for name, dtype in projected.dtypes.items()))
+
+
+if __name__ == "__main__":
+    main()
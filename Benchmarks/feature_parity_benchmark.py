@@ -0,0 +1,146 @@
+# =============================================================================
+# WELLNEST - VECTORIZED FEATURE PARITY AND THROUGHPUT
+# =============================================================================
+# Builds the diabetes and hypertension chains with dbt on synthetic raw data
+# in a local DuckDB file, recomputes the same features from the staging
+# tables with wellnest_core/features.py, and compares every derived column
+# row by row (joined on row_hash). Then times the library on the staging rows.
+# The mental health staging model uses Snowflake-only timestamp parsing, so
+# depression_features is not covered by this local run.
+#
+# Requires dbt-core and dbt-duckdb; uses Pipeline/profiles.yml.
+# Usage:  python Benchmarks/feature_parity_benchmark.py [--rows 1000000]
+# =============================================================================
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "StreamLit"))
+
+from dbt_incremental_benchmark import PROFILES_DIR, REPO_ROOT, load_raw
+from wellnest_core import features
+
+SYNTHETIC_BP_SQL = """
+SELECT
+    ['USA', 'India', 'UK', 'Germany'][1 + floor(random() * 4)::INT] AS COUNTRY,
+    CASE WHEN random() < 0.5 THEN 'Female' ELSE 'Male' END AS GENDER,
+    round(18 + random() * 72) AS AGE,
+    ['primary', 'secondary', 'tertiary'][1 + floor(random() * 3)::INT] AS EDUCATION_LEVEL,
+    ['employed', 'unemployed', 'retired'][1 + floor(random() * 3)::INT] AS EMPLOYMENT_STATUS,
+    round(16 + random() * 30, 1) AS BMI,
+    round(120 + random() * 200) AS CHOLESTEROL,
+    round(95 + random() * 110) AS SYSTOLIC_BP,
+    round(60 + random() * 65) AS DIASTOLIC_BP,
+    round(50 + random() * 80) AS HEART_RATE,
+    round(60 + random() * 150) AS LDL,
+    round(25 + random() * 60) AS HDL,
+    round(60 + random() * 500) AS TRIGLYCERIDES,
+    round(70 + random() * 120) AS GLUCOSE,
+    ['Never', 'Former', 'Current'][1 + floor(random() * 3)::INT] AS SMOKING_STATUS,
+    ['Low', 'Moderate', 'High'][1 + floor(random() * 3)::INT] AS PHYSICAL_ACTIVITY_LEVEL,
+    round(random() * 20, 1) AS ALCOHOL_INTAKE,
+    round(2 + random() * 12, 1) AS SALT_INTAKE,
+    round(4 + random() * 7, 1) AS SLEEP_DURATION,
+    round(1 + random() * 9) AS STRESS_LEVEL,
+    random() < 0.3 AS FAMILY_HISTORY,
+    random() < 0.15 AS DIABETES,
+    CASE WHEN random() < 0.4 THEN 'High' ELSE 'Low' END AS HYPERTENSION
+FROM range({rows})
+"""
+
+CHAINS = [
+    # (staging relation, gold relation, feature function)
+    ("stg_diabetes_cleaned", "ftr_diabetes_risk_urgency", features.diabetes_features),
+    ("stg_bloodpressure_cleaned", "ftr_hypertension_risk_urgency", features.hypertension_features),
+]
+SELECTOR = "+ftr_diabetes_risk_urgency +ftr_hypertension_risk_urgency"
+
+
+def load_raw_bp(db_path, rows):
+    con = duckdb.connect(db_path)
+    try:
+        con.execute("SELECT setseed(0.17)")
+        con.execute(f"CREATE OR REPLACE TABLE PUBLIC.RAW_BLOODPRESSURE_DATA AS {SYNTHETIC_BP_SQL.format(rows=int(rows))}")
+    finally:
+        con.close()
+
+
+def dbt(command):
+    subprocess.run(["dbt", command, "--project-dir", REPO_ROOT, "--profiles-dir", PROFILES_DIR,
+                    "--select", SELECTOR, "--full-refresh"], check=True, capture_output=True, text=True)
+
+
+def read(db_path, relation):
+    con = duckdb.connect(db_path, read_only=True)
+    try:
+        return con.execute(f"SELECT * FROM main.{relation}").df().rename(columns=str.upper)
+    finally:
+        con.close()
+
+
+def same(expected, actual):
+    """Element-wise equality with NULL == NULL and a float tolerance"""
+    if pd.api.types.is_numeric_dtype(expected) and not pd.api.types.is_bool_dtype(expected):
+        return np.isclose(pd.to_numeric(expected, errors="coerce"), pd.to_numeric(actual, errors="coerce"),
+                          equal_nan=True)
+    as_text = lambda series: series.astype(object).where(series.notna(), "<null>").astype(str).to_numpy()
+    return as_text(expected) == as_text(actual)
+
+
+def compare(staging, gold, fn):
+    """(rows compared, {column: mismatching rows}) for the derived columns"""
+    derived = [column for column in gold.columns if column not in staging.columns]
+    computed = fn(staging.drop(columns=["DBT_LOADED_AT"]))
+    merged = gold[["ROW_HASH"] + derived].merge(computed[["ROW_HASH"] + derived], on="ROW_HASH",
+                                                suffixes=("_DBT", "_PY"))
+    mismatches = {}
+    for column in derived:
+        bad = int((~same(merged[f"{column}_DBT"], merged[f"{column}_PY"])).sum())
+        if bad:
+            mismatches[column] = bad
+    return len(merged), len(derived), mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized feature parity against dbt")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--db-dir", default=os.path.join(REPO_ROOT, "target", "parity"))
+    args = parser.parse_args()
+
+    os.makedirs(args.db_dir, exist_ok=True)
+    os.environ["WELLNEST_DUCKDB_DIR"] = args.db_dir
+    db_path = os.path.join(args.db_dir, "wellnest.duckdb")
+
+    print(f"Loading {args.rows:,} synthetic raw rows per domain and building with dbt...")
+    load_raw(db_path, args.rows)
+    load_raw_bp(db_path, args.rows)
+    dbt("seed")
+    dbt("run")
+
+    failed = False
+    print(f"\n{'chain':<32} {'rows':>10} {'columns':>8} {'py s':>7} {'rows/s':>12}  parity")
+    for staging_name, gold_name, fn in CHAINS:
+        staging, gold = read(db_path, staging_name), read(db_path, gold_name)
+        started = time.perf_counter()
+        fn(staging)
+        seconds = time.perf_counter() - started
+        rows, columns, mismatches = compare(staging, gold, fn)
+        failed |= bool(mismatches) or rows != len(gold)
+        status = "ok" if not mismatches and rows == len(gold) else "MISMATCH"
+        print(f"{gold_name:<32} {rows:>10,} {columns:>8} {seconds:>7.2f} {len(staging) / seconds:>12,.0f}  {status}")
+        for column, bad in sorted(mismatches.items()):
+            print(f"    {column:<40} {bad:>10,} rows differ")
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
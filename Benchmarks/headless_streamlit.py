@@ -0,0 +1,204 @@
+# =============================================================================
+# WELLNEST - HEADLESS STREAMLIT FOR THE LOAD HARNESS
+# =============================================================================
+# Imports StreamLit/app.py outside `streamlit run` so its functions can be
+# driven directly by many simulated users at once:
+#   - a minimal `streamlit` module: per-thread session_state / query_params
+#     (one thread = one browser session), process-wide cache_resource, widgets
+#     that return their defaults, and display calls that only record
+#     errors / warnings for the report
+#   - st.submit_chat(text) makes the next st.chat_input() return text
+#   - get_active_session() returns the given (fake) Snowpark session
+# st.rerun() / st.stop() raise RerunRequested / StopRequested, which the
+# caller treats as the end of a script run.
+# =============================================================================
+
+import functools
+import importlib
+import os
+import sys
+import threading
+import types
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+STREAMLIT_DIR = os.path.join(REPO_ROOT, "StreamLit")
+
+
+class RerunRequested(Exception):
+    """st.rerun() was called"""
+
+
+class StopRequested(Exception):
+    """st.stop() was called"""
+
+
+class SessionState(dict):
+    """st.session_state: attribute and item access over one browser session"""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(f"st.session_state has no attribute \"{name}\"") from None
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+    def __delattr__(self, name):
+        del self[name]
+
+
+class Block:
+    """Container / column / form / spinner placeholder; forwards calls to st"""
+
+    def __init__(self, st):
+        self._st = st
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def __getattr__(self, name):
+        return getattr(self._st, name)
+
+
+class HeadlessStreamlit(types.ModuleType):
+    """Stand-in for the `streamlit` module with per-thread browser sessions"""
+
+    WIDGET_DEFAULTS = {
+        "button": False, "form_submit_button": False, "download_button": False,
+        "checkbox": False, "toggle": False, "text_input": "", "text_area": "",
+        "file_uploader": None, "date_input": None,
+    }
+    RECORDED = ("error", "warning", "exception")
+
+    def __init__(self):
+        super().__init__("streamlit")
+        self._local = threading.local()
+        self._cache_lock = threading.Lock()
+        self._caches = {}
+        self.secrets = {}
+        self.sidebar = Block(self)
+
+    # -------------------------------------------------------------------------
+    # Per-thread browser session
+    # -------------------------------------------------------------------------
+
+    def _state(self):
+        if not hasattr(self._local, "session_state"):
+            self.new_browser_session()
+        return self._local
+
+    def new_browser_session(self):
+        """Fresh session_state / query_params / messages for the calling thread"""
+        self._local.session_state = SessionState()
+        self._local.query_params = {}
+        self._local.messages = []
+        self._local.pending_chat = None
+
+    @property
+    def session_state(self):
+        return self._state().session_state
+
+    @property
+    def query_params(self):
+        return self._state().query_params
+
+    @property
+    def messages(self):
+        """(kind, text) of the errors and warnings shown to this thread's user"""
+        return self._state().messages
+
+    # -------------------------------------------------------------------------
+    # Caching, control flow, layout
+    # -------------------------------------------------------------------------
+
+    def cache_resource(self, func=None, **kwargs):
+        if func is None:
+            return lambda f: self.cache_resource(f)
+        # Keyed by function like Streamlit's, so a full script rerun that
+        # redefines the function keeps its cached value
+        with self._cache_lock:
+            cache = self._caches.setdefault((func.__module__, func.__qualname__), {})
+
+        @functools.wraps(func)
+        def wrapper(*args, **kw):
+            key = (args, tuple(sorted(kw.items())))
+            with self._cache_lock:
+                if key not in cache:
+                    cache[key] = func(*args, **kw)
+                return cache[key]
+
+        wrapper.clear = cache.clear
+        return wrapper
+
+    cache_data = cache_resource
+
+    def rerun(self, *args, **kwargs):
+        raise RerunRequested()
+
+    def stop(self):
+        raise StopRequested()
+
+    def submit_chat(self, text):
+        """Make the next st.chat_input() in this thread return `text`"""
+        self._state().pending_chat = text
+
+    def chat_input(self, *args, **kwargs):
+        state = self._state()
+        text, state.pending_chat = state.pending_chat, None
+        return text
+
+    def columns(self, spec, **kwargs):
+        return [Block(self) for _ in range(spec if isinstance(spec, int) else len(spec))]
+
+    def tabs(self, labels):
+        return [Block(self) for _ in labels]
+
+    def selectbox(self, label, options, index=0, **kwargs):
+        options = list(options)
+        return options[index] if options and index is not None else None
+
+    radio = selectbox
+
+    def number_input(self, label, min_value=None, max_value=None, value=None, **kwargs):
+        return value if value is not None else min_value
+
+    def slider(self, label, min_value=None, max_value=None, value=None, **kwargs):
+        return value if value is not None else min_value
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if name in self.WIDGET_DEFAULTS:
+            default = self.WIDGET_DEFAULTS[name]
+            return lambda *args, **kwargs: default
+        if name in self.RECORDED:
+            return lambda body=None, *args, **kwargs: self.messages.append((name, str(body)))
+        return lambda *args, **kwargs: Block(self)
+
+
+def install(session):
+    """Register the headless streamlit module and point get_active_session at `session`"""
+    st = HeadlessStreamlit()
+    sys.modules["streamlit"] = st
+    try:
+        context = importlib.import_module("snowflake.snowpark.context")
+    except ImportError:
+        snowflake = sys.modules.setdefault("snowflake", types.ModuleType("snowflake"))
+        snowpark = sys.modules.setdefault("snowflake.snowpark", types.ModuleType("snowflake.snowpark"))
+        context = sys.modules.setdefault("snowflake.snowpark.context", types.ModuleType("snowflake.snowpark.context"))
+        snowflake.snowpark, snowpark.context = snowpark, context
+    context.get_active_session = lambda: session
+    return st
+
+
+def load_app(session):
+    """Import StreamLit/app.py against `session`; returns (app module, st)"""
+    st = install(session)
+    if STREAMLIT_DIR not in sys.path:
+        sys.path.insert(0, STREAMLIT_DIR)
+    app = importlib.import_module("app")
+    return app, st
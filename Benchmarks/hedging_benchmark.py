@@ -0,0 +1,101 @@
+# =============================================================================
+# WELLNEST - HEDGED SPECIALIST CALL BENCHMARK
+# =============================================================================
+# Simulates a long-tailed specialist latency distribution and compares the
+# p50/p90/p99 seen by users with and without hedging, plus the extra compute
+# spent on duplicate requests.
+#
+# Usage:  python Benchmarks/hedging_benchmark.py [--calls 400] [--max-hedge 0.1]
+# =============================================================================
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "StreamLit"))
+
+from wellnest_core.hedging import HedgedCaller, percentile
+
+
+class SimulatedSpecialist:
+    """Lognormal body with occasional multi-second stalls (scaled down)"""
+
+    def __init__(self, median_seconds, tail_probability, tail_seconds, seed):
+        self.median_seconds = median_seconds
+        self.tail_probability = tail_probability
+        self.tail_seconds = tail_seconds
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def __call__(self):
+        with self._lock:
+            self.requests += 1
+            latency = self.median_seconds * self._random.lognormvariate(0, 0.35)
+            if self._random.random() < self.tail_probability:
+                latency += self.tail_seconds * self._random.uniform(0.5, 1.5)
+        time.sleep(latency)
+        return "ok"
+
+
+def run(calls, caller=None, specialist=None):
+    """Serve `calls` sequential turns and return user-visible latencies"""
+    latencies = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        if caller:
+            caller.call(specialist)
+        else:
+            specialist()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def summarize(label, latencies, requests):
+    p50, p90, p99 = (percentile(latencies, p) for p in (50, 90, 99))
+    print(f"{label:<12} p50={p50 * 1000:7.1f}ms  p90={p90 * 1000:7.1f}ms  "
+          f"p99={p99 * 1000:7.1f}ms  requests={requests}")
+    return p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hedged specialist call benchmark")
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--median-ms", type=float, default=20.0)
+    parser.add_argument("--tail-probability", type=float, default=0.04)
+    parser.add_argument("--tail-ms", type=float, default=400.0)
+    parser.add_argument("--max-hedge", type=float, default=0.10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    def specialist():
+        return SimulatedSpecialist(args.median_ms / 1000, args.tail_probability,
+                                   args.tail_ms / 1000, args.seed)
+
+    baseline_model = specialist()
+    baseline = run(args.calls, specialist=baseline_model)
+
+    hedged_model = specialist()
+    caller = HedgedCaller(max_hedge_fraction=args.max_hedge,
+                          initial_deadline_seconds=args.median_ms * 3 / 1000)
+    hedged = run(args.calls, caller=caller, specialist=hedged_model)
+
+    print(f"Simulated {args.calls} specialist turns "
+          f"(median {args.median_ms:.0f}ms, {args.tail_probability:.0%} stalls of ~{args.tail_ms:.0f}ms)\n")
+    base_p99 = summarize("unhedged", baseline, baseline_model.requests)
+    hedge_p99 = summarize("hedged", hedged, hedged_model.requests)
+
+    stats = caller.stats()
+    extra = hedged_model.requests / baseline_model.requests - 1
+    print(f"\nhedged {stats['hedged_calls']} calls ({stats['hedge_fraction']:.1%}), "
+          f"hedge won {stats['hedge_wins']}, budget skips {stats['budget_skips']}, "
+          f"pool-saturated skips {stats['saturation_skips']}")
+    print(f"extra compute: {extra:+.1%}   p99 improvement: "
+          f"{(base_p99 - hedge_p99) / base_p99:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# =============================================================================
+# WELLNEST - STREAMLIT PAGE RERUN BENCHMARK
+# =============================================================================
+# Measures what a user waits for on every interaction: one full script run of
+# StreamLit/app.py, before and after a change. For each revision the
+# StreamLit/ tree is exported from git (or the working tree is used) and run
+# in a fresh interpreter under the load harness (Benchmarks/
+# headless_streamlit.py + fake_snowpark.py), the way `streamlit run` does it:
+# the script is compiled once and re-executed top to bottom per rerun, with
+# st.cache_resource values kept across reruns.
+#
+# Per revision it reports:
+#   - the first run in a new process (module imports, cached resources)
+#   - warm reruns of the login page, the dashboard and the chat page for one
+#     logged-in browser session (median / p95, SQL statements per rerun)
+# SQL round trips are simulated (--query-ms); a revision whose imports are
+# not installed here is reported as not runnable rather than stubbed.
+#
+# Usage:  python Benchmarks/page_startup_benchmark.py [--before-rev HEAD~1] [--after-rev WORKTREE]
+#                                                     [--reruns 50] [--query-ms 0]
+# =============================================================================
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(BENCHMARKS_DIR, ".."))
+STREAMLIT_DIR = os.path.join(REPO_ROOT, "StreamLit")
+WORKTREE = "WORKTREE"
+PAGES = ["dashboard", "chat"]
+PASSWORD = "WellNest2024!"
+
+
+# =============================================================================
+# CHILD: RUN ONE REVISION
+# =============================================================================
+
+def seed_user(session):
+    import bcrypt
+
+    user_id, email = str(uuid.uuid4()), "rerun@wellnest.test"
+    hashed = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds=12)).decode("utf-8")
+    session.raw("""
+        INSERT INTO WELLNEST.USER_MANAGEMENT.USERS
+            (USER_ID, EMAIL, HASHED_PASSWORD, FULL_NAME, DATE_OF_BIRTH, ACCOUNT_STATUS)
+        VALUES (?, ?, ?, 'Rerun Test', '1980-01-01', 'active')
+    """, [user_id, email, hashed])
+    session.raw("""
+        INSERT INTO WELLNEST.USER_MANAGEMENT.USER_MEDICAL_PROFILES (PROFILE_ID, USER_ID, HEIGHT_CM, WEIGHT_KG)
+        VALUES (?, ?, 175, 80)
+    """, [str(uuid.uuid4()), user_id])
+    return email
+
+
+def run_revision(streamlit_dir, reruns, query_ms):
+    """{scenario: samples} for app.py in `streamlit_dir` (runs in a fresh interpreter)"""
+    # The harness imports wellnest_core from the working tree; the revision
+    # under test must bring its own
+    sys.path[:0] = [BENCHMARKS_DIR, STREAMLIT_DIR]
+    from fake_snowpark import FakeSession
+    from headless_streamlit import RerunRequested, StopRequested, install
+    for name in [name for name in sys.modules if name == "wellnest_core" or name.startswith("wellnest_core.")]:
+        del sys.modules[name]
+    sys.path[:] = [streamlit_dir] + [path for path in sys.path if path != STREAMLIT_DIR]
+    os.chdir(streamlit_dir)
+
+    session = FakeSession(query_ms=query_ms)
+    email = seed_user(session)
+    st = install(session)
+    app_path = os.path.join(streamlit_dir, "app.py")
+    with open(app_path, encoding="utf-8") as handle:
+        code = compile(handle.read(), app_path, "exec")
+
+    def rerun():
+        """One script run; (ms, SQL statements, globals)"""
+        namespace = {"__name__": "__main__", "__file__": app_path}
+        with session.track() as trace:
+            started = time.perf_counter()
+            try:
+                exec(code, namespace)
+            except (RerunRequested, StopRequested):
+                pass
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        return elapsed_ms, trace.queries, namespace
+
+    results = {}
+    st.new_browser_session()
+    ms, queries, namespace = rerun()
+    results["first run"] = [(ms, queries)]
+    results["login page"] = [rerun()[:2] for _ in range(reruns)]
+
+    user = namespace["authenticate_user"](email, PASSWORD)
+    if not user:
+        raise RuntimeError("login rejected")
+    namespace["session_tokens"].start_session(user)
+    for page in PAGES:
+        st.session_state.current_page = page
+        rerun()     # First render of the page fills its per-session state
+        results[page] = [rerun()[:2] for _ in range(reruns)]
+    errors = sorted({text for kind, text in st.messages if kind in ("error", "exception")})
+    return {"samples": results, "ui_errors": errors}
+
+
+# =============================================================================
+# PARENT: EXPORT REVISIONS, REPORT
+# =============================================================================
+
+def export_streamlit(rev, target):
+    """StreamLit/ as of `rev`, extracted under `target`"""
+    archive = subprocess.run(["git", "archive", rev, "StreamLit"], cwd=REPO_ROOT,
+                             capture_output=True, check=True).stdout
+    subprocess.run(["tar", "-x", "-C", target], input=archive, check=True)
+    return os.path.join(target, "StreamLit")
+
+
+def measure(rev, reruns, query_ms):
+    workdir = tempfile.mkdtemp(prefix="wellnest-rerun-")
+    try:
+        streamlit_dir = STREAMLIT_DIR if rev == WORKTREE else export_streamlit(rev, workdir)
+        result = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", streamlit_dir,
+                                 "--reruns", str(reruns), "--query-ms", str(query_ms)],
+                                capture_output=True, text=True)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        return {"error": lines[-1] if lines else f"exit code {result.returncode}"}
+    return json.loads(result.stdout)
+
+
+def summarize(samples):
+    times = sorted(ms for ms, _ in samples)
+    return {
+        "median_ms": statistics.median(times),
+        "p95_ms": times[min(len(times) - 1, int(round(0.95 * (len(times) - 1))))],
+        "sql": sum(queries for _, queries in samples) / len(samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streamlit page rerun benchmark")
+    parser.add_argument("--before-rev", default="HEAD~1")
+    parser.add_argument("--after-rev", default=WORKTREE)
+    parser.add_argument("--reruns", type=int, default=50)
+    parser.add_argument("--query-ms", type=float, default=0.0, help="Simulated round trip per SQL statement")
+    parser.add_argument("--json", help="Also write the report to this file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_revision(args.child, args.reruns, args.query_ms)))
+        return
+
+    revisions = [args.before_rev, args.after_rev]
+    report = {}
+    for rev in revisions:
+        measured = measure(rev, args.reruns, args.query_ms)
+        report[rev] = measured if "error" in measured else {
+            "scenarios": {name: summarize(samples) for name, samples in measured["samples"].items()},
+            "ui_errors": measured["ui_errors"],
+        }
+
+    print(f"app.py script runs, {args.reruns} reruns per page, SQL {args.query_ms:.0f}ms\n")
+    header = f"{'':<12}" + "".join(f" {rev[:28]:>30}" for rev in revisions)
+    print(header)
+    print(f"{'':<12}" + "".join(f" {'median':>10} {'p95':>10} {'SQL':>8}" for _ in revisions))
+    scenarios = next((entry["scenarios"] for entry in report.values() if "scenarios" in entry), {})
+    for name in scenarios:
+        line = f"{name:<12}"
+        for rev in revisions:
+            row = report[rev].get("scenarios", {}).get(name)
+            line += (f" {row['median_ms']:>8.2f}ms {row['p95_ms']:>8.2f}ms {row['sql']:>8.1f}" if row
+                     else f" {'-':>10} {'-':>10} {'-':>8}")
+        print(line)
+    for rev in revisions:
+        if "error" in report[rev]:
+            print(f"\n{rev}: not runnable here ({report[rev]['error']})")
+        elif report[rev]["ui_errors"]:
+            print(f"\n{rev}: st.error shown: {'; '.join(report[rev]['ui_errors'])}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
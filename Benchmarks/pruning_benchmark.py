@@ -0,0 +1,281 @@
+# =============================================================================
+# WELLNEST - MICRO-PARTITION PRUNING PER APP QUERY PATTERN
+# =============================================================================
+# Runs every access path the app and the stored procedures use (the named
+# statements in wellnest_core, plus the procedure queries mirrored below)
+# for a fixed sample of real users and records, from the query history:
+# partitions scanned vs total, bytes scanned and elapsed time. The result
+# cache is disabled for the session so every statement really scans.
+#
+# Used to justify Misc/physical_design.sql with data:
+#   1. --label before                   measure the current layout
+#   2. --apply                          run the ALTER TABLE statements of the design
+#   3. --clustering                     clustering depth; wait until automatic
+#                                       clustering has settled
+#   4. --label after --compare before   measure again, print the deltas
+# Runs are appended to Benchmarks/results/pruning_history.jsonl. The user
+# sample is ordered by HASH(USER_ID, seed), so both runs see the same users
+# as long as no users are added in between.
+#
+# Usage:  python Benchmarks/pruning_benchmark.py [--label before] [--users 20] [--compare before]
+#         python Benchmarks/pruning_benchmark.py --apply | --clustering
+# =============================================================================
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "StreamLit"))
+
+from router_benchmark import get_session, git_commit
+
+from wellnest_core import auth, statements
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+DESIGN_SQL = os.path.join(REPO_ROOT, "Misc", "physical_design.sql")
+HISTORY_PATH = os.path.join(REPO_ROOT, "Benchmarks", "results", "pruning_history.jsonl")
+
+SAMPLE_USERS_SQL = """
+SELECT
+    h.USER_ID,
+    u.EMAIL,
+    MAX_BY(h.SESSION_ID, h.MESSAGE_TIMESTAMP) AS SESSION_ID,
+    MAX_BY(h.ROUTED_TO_DOMAIN, h.MESSAGE_TIMESTAMP) AS DOMAIN,
+    ANY_VALUE(d.DOCUMENT_ID) AS DOCUMENT_ID
+FROM WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY h
+JOIN WELLNEST.USER_MANAGEMENT.USERS u ON u.USER_ID = h.USER_ID
+LEFT JOIN (
+    SELECT USER_ID, MAX_BY(DOCUMENT_ID, UPLOAD_TIMESTAMP) AS DOCUMENT_ID
+    FROM WELLNEST.MEDICAL_DATA.UPLOADED_DOCUMENTS
+    GROUP BY USER_ID
+) d ON d.USER_ID = h.USER_ID
+GROUP BY h.USER_ID, u.EMAIL
+ORDER BY HASH(h.USER_ID, ?)
+LIMIT ?
+"""
+
+QUERY_STATS_SQL = """
+SELECT PARTITIONS_SCANNED, PARTITIONS_TOTAL, BYTES_SCANNED, TOTAL_ELAPSED_TIME
+FROM TABLE(WELLNEST.INFORMATION_SCHEMA.QUERY_HISTORY_BY_SESSION(RESULT_LIMIT => 1000))
+WHERE QUERY_ID = ?
+"""
+
+# Procedure queries (Misc/cortexsearch.sql), same text and binds
+METRIC_TREND_SQL = """
+SELECT METRIC_VALUE, METRIC_UNIT, MEASUREMENT_DATE
+FROM WELLNEST.MEDICAL_DATA.HEALTH_METRICS
+WHERE USER_ID = ?
+  AND METRIC_TYPE = ?
+  AND MEASUREMENT_DATE >= DATEADD(day, -?, CURRENT_DATE())
+ORDER BY MEASUREMENT_DATE ASC
+"""
+
+RECENT_SUMMARIES_SQL = """
+SELECT SUMMARY_TEXT, KEY_TOPICS, MENTIONED_METRICS, IMPROVEMENT_AREAS, CONCERN_AREAS
+FROM WELLNEST.USER_MANAGEMENT.CONVERSATION_SUMMARIES
+WHERE USER_ID = ?
+  AND DOMAIN = ?
+  AND TIME_PERIOD_START >= DATEADD(day, -30, CURRENT_TIMESTAMP())
+ORDER BY TIME_PERIOD_START DESC
+LIMIT 2
+"""
+
+# UPDATE_DOCUMENT_STATUS_SQL / DELETE_DOCUMENT_SQL predicate, read-only
+DOCUMENT_BY_ID_SQL = """
+SELECT PROCESSING_STATUS FROM WELLNEST.MEDICAL_DATA.UPLOADED_DOCUMENTS WHERE DOCUMENT_ID = ?
+"""
+
+# name -> (table, statement, binds from one sampled user)
+PATTERNS = {
+    "login_lookup": ("USERS", auth.LOOKUP_USER_SQL, lambda u, a: [u["EMAIL"]]),
+    "profile": ("USERS + USER_MEDICAL_PROFILES", statements.USER_PROFILE_SQL, lambda u, a: [u["USER_ID"]]),
+    "dashboard_stats": ("CONVERSATION_HISTORY + UPLOADED_DOCUMENTS + USER_MEDICAL_PROFILES",
+                        statements.USER_STATS_SQL, lambda u, a: [u["USER_ID"]] * 3),
+    "conversation_history": ("CONVERSATION_HISTORY", statements.with_limit(statements.CONVERSATION_HISTORY_SQL, 50),
+                             lambda u, a: [u["USER_ID"]]),
+    "session_messages": ("CONVERSATION_HISTORY", statements.SESSION_MESSAGES_SQL,
+                         lambda u, a: [u["USER_ID"], u["SESSION_ID"]]),
+    "session_message_count": ("CONVERSATION_HISTORY", statements.SESSION_MESSAGE_COUNT_SQL,
+                              lambda u, a: [u["SESSION_ID"]]),
+    "documents": ("UPLOADED_DOCUMENTS", statements.with_limit(statements.USER_DOCUMENTS_SQL, 50),
+                  lambda u, a: [u["USER_ID"]]),
+    "document_stats": ("UPLOADED_DOCUMENTS", statements.DOCUMENT_STATS_SQL, lambda u, a: [u["USER_ID"]]),
+    "document_by_id": ("UPLOADED_DOCUMENTS", DOCUMENT_BY_ID_SQL, lambda u, a: [u["DOCUMENT_ID"]]),
+    "metric_trend": ("HEALTH_METRICS", METRIC_TREND_SQL,
+                     lambda u, a: [u["USER_ID"], a.metric_type, a.days_back]),
+    "recent_summaries": ("CONVERSATION_SUMMARIES", RECENT_SUMMARIES_SQL,
+                         lambda u, a: [u["USER_ID"], u["DOMAIN"]]),
+}
+
+DESIGN_STATEMENT = re.compile(r"^\s*(ALTER\s+TABLE\s+(\S+)\s+(.*?));", re.IGNORECASE | re.MULTILINE | re.DOTALL)
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+
+def sample_users(session, count, seed):
+    return [row.as_dict() for row in session.sql(SAMPLE_USERS_SQL, params=[seed, count]).collect()]
+
+
+def query_stats(session, query_id, attempts=10):
+    """Scan statistics of one finished query (the history view lags slightly)"""
+    for _ in range(attempts):
+        rows = session.sql(QUERY_STATS_SQL, params=[query_id]).collect()
+        if rows and rows[0]["PARTITIONS_TOTAL"] is not None:
+            return rows[0].as_dict()
+        time.sleep(1)
+    return None
+
+
+def measure(session, statement, params):
+    with session.query_history() as history:
+        session.sql(statement, params=params).collect()
+    return query_stats(session, history.queries[-1].query_id)
+
+
+def run_patterns(session, users, args):
+    totals = defaultdict(lambda: {"runs": 0, "scanned": 0, "total": 0, "bytes": 0, "ms": 0})
+    for user in users:
+        for name, (table, statement, binds) in PATTERNS.items():
+            params = binds(user, args)
+            if None in params:   # e.g. no uploaded documents
+                continue
+            stats = measure(session, statement, params)
+            if stats is None:
+                print(f"  ⚠️  {name}: no query history row")
+                continue
+            entry = totals[name]
+            entry["runs"] += 1
+            entry["scanned"] += stats["PARTITIONS_SCANNED"]
+            entry["total"] += stats["PARTITIONS_TOTAL"]
+            entry["bytes"] += stats["BYTES_SCANNED"] or 0
+            entry["ms"] += stats["TOTAL_ELAPSED_TIME"] or 0
+
+    return {
+        name: {
+            "table": PATTERNS[name][0],
+            "runs": entry["runs"],
+            "partitions_scanned": round(entry["scanned"] / entry["runs"], 1),
+            "partitions_total": round(entry["total"] / entry["runs"], 1),
+            "pruned_pct": round(100 * (1 - entry["scanned"] / entry["total"]), 1) if entry["total"] else None,
+            "mb_scanned": round(entry["bytes"] / entry["runs"] / 1e6, 2),
+            "elapsed_ms": round(entry["ms"] / entry["runs"], 1),
+        }
+        for name, entry in totals.items()
+    }
+
+
+# =============================================================================
+# DESIGN
+# =============================================================================
+
+def design_statements():
+    """(table, statement) for every ALTER TABLE in Misc/physical_design.sql"""
+    with open(DESIGN_SQL, encoding="utf-8") as handle:
+        text = re.sub(r"--[^\n]*", "", handle.read())
+    return [(match.group(2), " ".join(match.group(1).split())) for match in DESIGN_STATEMENT.finditer(text)]
+
+
+def apply_design(session):
+    for table, statement in design_statements():
+        print(f"  {statement}")
+        session.sql(statement).collect()
+
+
+def clustering_report(session):
+    for table, statement in design_statements():
+        if "CLUSTER BY" not in statement.upper():
+            continue
+        info = json.loads(session.sql("SELECT SYSTEM$CLUSTERING_INFORMATION(?)", params=[table]).collect()[0][0])
+        print(f"  {table:<48} partitions {info.get('total_partition_count'):>7}  "
+              f"avg depth {info.get('average_depth'):>7.2f}  avg overlaps {info.get('average_overlaps'):>7.2f}")
+
+
+# =============================================================================
+# REPORT
+# =============================================================================
+
+def latest_run(label):
+    if not os.path.exists(HISTORY_PATH):
+        return None
+    with open(HISTORY_PATH, encoding="utf-8") as handle:
+        runs = [json.loads(line) for line in handle if line.strip()]
+    matching = [run for run in runs if run["label"] == label]
+    return matching[-1] if matching else None
+
+
+def print_report(report, baseline=None):
+    print(f"{'pattern':<22} {'runs':>4} {'scanned':>8} {'total':>8} {'pruned':>7} {'MB':>8} {'ms':>8}"
+          + (f" {'scanned Δ':>10} {'ms Δ':>8}" if baseline else ""))
+    for name, row in report.items():
+        pruned = f"{row['pruned_pct']:.1f}%" if row["pruned_pct"] is not None else "-"
+        line = (f"{name:<22} {row['runs']:>4} {row['partitions_scanned']:>8.1f} {row['partitions_total']:>8.1f} "
+                f"{pruned:>7} {row['mb_scanned']:>8.2f} {row['elapsed_ms']:>8.1f}")
+        before = (baseline or {}).get(name)
+        if before:
+            scanned_delta = row["partitions_scanned"] - before["partitions_scanned"]
+            line += f" {scanned_delta:>+10.1f} {row['elapsed_ms'] - before['elapsed_ms']:>+8.1f}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Partitions scanned per app query pattern")
+    parser.add_argument("--label", default="adhoc", help="Name of this run (e.g. before / after)")
+    parser.add_argument("--users", type=int, default=20, help="Sampled users per pattern")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--metric-type", default="blood_pressure_systolic")
+    parser.add_argument("--days-back", type=int, default=90)
+    parser.add_argument("--compare", help="Label of an earlier run to compare with")
+    parser.add_argument("--apply", action="store_true", help="Run the ALTER TABLE statements of the design")
+    parser.add_argument("--clustering", action="store_true", help="Clustering depth of the designed tables")
+    parser.add_argument("--no-record", action="store_true")
+    args = parser.parse_args()
+
+    session = get_session()
+    if args.apply:
+        print(f"Applying {os.path.relpath(DESIGN_SQL, REPO_ROOT)}:")
+        apply_design(session)
+        print("\nAutomatic clustering runs in the background; check --clustering before measuring again.")
+        return
+    if args.clustering:
+        clustering_report(session)
+        return
+
+    session.sql("ALTER SESSION SET USE_CACHED_RESULT = FALSE").collect()
+    users = sample_users(session, args.users, args.seed)
+    if not users:
+        sys.exit("No users with conversation history to sample")
+    print(f"'{args.label}': {len(PATTERNS)} patterns x {len(users)} users\n")
+    report = run_patterns(session, users, args)
+
+    baseline = None
+    if args.compare:
+        previous = latest_run(args.compare)
+        if previous is None:
+            print(f"⚠️  No recorded run labelled '{args.compare}'\n")
+        else:
+            baseline = previous["patterns"]
+            print(f"Compared with '{args.compare}' ({previous['timestamp']}, {previous['commit']})\n")
+    print_report(report, baseline)
+
+    if not args.no_record:
+        os.makedirs(os.path.dirname(HISTORY_PATH), exist_ok=True)
+        with open(HISTORY_PATH, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps({
+                "label": args.label,
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "commit": git_commit(),
+                "users": len(users),
+                "patterns": report,
+            }) + "\n")
+        print(f"\nRecorded as '{args.label}' in {os.path.relpath(HISTORY_PATH, REPO_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+# =============================================================================
+# WELLNEST - ROUTER REGRESSION BENCHMARK
+# =============================================================================
+# Runs a versioned router suite (Benchmarks/suites/router_<version>.json: the
+# 30 router_evaluation_testcases from Eval/Model Evaluation.sql plus seeded
+# paraphrases) through
+#   - the router: CLASSIFY_USER_QUERY (--backend procedure) or a keyword
+#     stand-in (--backend local, no Snowflake)
+#   - the local emergency detector (wellnest_core.emergency)
+# and reports domain / urgency / safety accuracy, p50/p95 latency and router
+# prompt tokens. Every run is appended to Benchmarks/results/router_history.jsonl
+# and compared with the previous run of the same suite and backend; the run
+# fails (exit 1) when accuracy drops or p95 latency grows past the gates.
+#
+# Usage:  python Benchmarks/router_benchmark.py --build-suite          (regenerate the suite file)
+#         python Benchmarks/router_benchmark.py [--backend local] [--label release-1.4]
+# =============================================================================
+
+import argparse
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "StreamLit"))
+
+from wellnest_core import thresholds
+from wellnest_core.emergency import detect_emergency_keywords
+from wellnest_core.hedging import percentile
+from wellnest_core.telemetry import estimate_tokens
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+SUITE_DIR = os.path.join(REPO_ROOT, "Benchmarks", "suites")
+HISTORY_PATH = os.path.join(REPO_ROOT, "Benchmarks", "results", "router_history.jsonl")
+TESTCASES_SQL = os.path.join(REPO_ROOT, "Eval", "Model Evaluation.sql")
+ROUTER_SQL = os.path.join(REPO_ROOT, "Agents", "workflow.sql")
+
+SUITE_VERSION = "v1"
+PARAPHRASES_PER_CASE = 3
+
+# Test-case domains -> CLASSIFY_USER_QUERY domains (pregnancy and PCOS are out of scope there)
+ROUTER_DOMAINS = {
+    "diabetes": "DIABETES",
+    "hypertension": "HEART_DISEASE",
+    "mental_health": "MENTAL_HEALTH",
+    "maternal_health": "OUT_OF_SCOPE",
+    "womens_wellness": "OUT_OF_SCOPE",
+    "out_of_scope": "OUT_OF_SCOPE",
+}
+
+CASE_PATTERN = re.compile(
+    r"(?:SELECT\s+'(?P<id1>[A-Z]+\d+)' as test_id,\s*'(?P<d1>\w+)' as expected_domain,\s*'(?P<u1>\w+)' as expected_urgency,"
+    r"\s*(?P<s1>true|false) as expected_safety_flag,\s*'(?P<q1>(?:[^']|'')*)' as user_query"
+    r"|UNION ALL SELECT\s+'(?P<id2>[A-Z]+\d+)',\s*'(?P<d2>\w+)',\s*'(?P<u2>\w+)',\s*(?P<s2>true|false),"
+    r"\s*'(?P<q2>(?:[^']|'')*)')",
+    re.IGNORECASE)
+
+
+# =============================================================================
+# SUITE
+# =============================================================================
+
+def base_cases():
+    """router_evaluation_testcases parsed from Eval/Model Evaluation.sql"""
+    with open(TESTCASES_SQL, encoding="utf-8") as handle:
+        text = handle.read()
+    cases = []
+    for match in CASE_PATTERN.finditer(text):
+        group = (lambda name: match.group(f"{name}1") or match.group(f"{name}2"))
+        cases.append({
+            "id": group("id"),
+            "query": group("q").replace("''", "'"),
+            "expected_domain": ROUTER_DOMAINS[group("d")],
+            "source_domain": group("d"),
+            "expected_urgency": group("u").upper(),
+            "expected_safety_flag": group("s").lower() == "true",
+        })
+    return cases
+
+
+def paraphrase(query, rng):
+    """One seeded surface variant: filler, contractions, casing or a typo"""
+    prefixes = ["", "hi, ", "quick question - ", "hello doctor, ", "sorry to bother you but "]
+    suffixes = ["", " what should i do?", " is this serious?", " please help", " any advice?"]
+    text = query
+    swaps = [("i am ", "im "), ("im ", "i am "), ("can't", "cant"), ("cant", "can't"),
+             ("havent", "haven't"), ("ive", "i've"), ("blood pressure", "BP"), ("blood sugar", "glucose")]
+    old, new = rng.choice(swaps)
+    text = text.replace(old, new, 1)
+    words = text.split()
+    long_words = [i for i, word in enumerate(words) if len(word) > 5 and word.isalpha()]
+    if long_words and rng.random() < 0.4:
+        i = rng.choice(long_words)
+        j = rng.randrange(1, len(words[i]) - 2)
+        word = words[i]
+        words[i] = word[:j] + word[j + 1] + word[j] + word[j + 2:]
+        text = " ".join(words)
+    if rng.random() < 0.2:
+        text = text.capitalize()
+    return f"{rng.choice(prefixes)}{text}{rng.choice(suffixes)}".strip()
+
+
+def build_suite(seed=2024):
+    rng = random.Random(seed)
+    cases = []
+    for case in base_cases():
+        cases.append(dict(case, variant="original"))
+        seen = {case["query"]}
+        for index in range(PARAPHRASES_PER_CASE):
+            for _ in range(10):
+                text = paraphrase(case["query"], rng)
+                if text not in seen:
+                    break
+            seen.add(text)
+            cases.append(dict(case, id=f"{case['id']}-P{index + 1}", query=text, variant="paraphrase"))
+    return {"version": SUITE_VERSION, "seed": seed, "source": "Eval/Model Evaluation.sql", "cases": cases}
+
+
+def suite_path(version):
+    return os.path.join(SUITE_DIR, f"router_{version}.json")
+
+
+def load_suite(version):
+    with open(suite_path(version), encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+# =============================================================================
+# ROUTERS
+# =============================================================================
+
+def router_system_prompt():
+    """System prompt of the deployed CLASSIFY_USER_QUERY (for token counts)"""
+    with open(ROUTER_SQL, encoding="utf-8") as handle:
+        match = re.search(r'system_context = """(.*?)"""', handle.read(), re.DOTALL)
+    if not match:
+        return ""
+    return match.group(1).replace("__URGENCY_GUIDANCE__", thresholds.router_urgency_guidance())
+
+
+class ProcedureRouter:
+    """CLASSIFY_USER_QUERY through a Snowpark session"""
+
+    name = "procedure"
+
+    def __init__(self, session, user_id):
+        self.session = session
+        self.user_id = user_id
+
+    def classify(self, query):
+        result = self.session.call("WELLNEST.USER_MANAGEMENT.CLASSIFY_USER_QUERY", query, self.user_id)
+        return json.loads(result) if isinstance(result, str) else result
+
+
+class LocalRouter:
+    """Keyword stand-in with the procedure's output shape (no LLM)"""
+
+    name = "local"
+    SPECIALIST_MODELS = {
+        "DIABETES": "WELLNEST.PUBLIC.DIABETES_LLM_16K1",
+        "HEART_DISEASE": "WELLNEST.PUBLIC.HYPERTENSION_LLM_16K_1",
+        "MENTAL_HEALTH": "WELLNEST.PUBLIC.MENTAL_HEALTH_LLM_16K",
+    }
+    DOMAIN_KEYWORDS = [
+        ("OUT_OF_SCOPE", ["pregnan", "period", "pcos", "cycle", "pharmacy", "hair growth", "pelvic"]),
+        ("DIABETES", ["sugar", "glucose", "a1c", "insulin", "diabet", "lows in the"]),
+        ("HEART_DISEASE", ["blood pressure", "bp", "/9", "/8", "/12", "heart"]),
+        ("MENTAL_HEALTH", ["sad", "anxious", "panic", "depress", "hopeless", "end my life", "worthless",
+                           "stress", "cry", "apartment", "better off without"]),
+    ]
+
+    def classify(self, query):
+        lowered = query.lower()
+        domain = next((name for name, words in self.DOMAIN_KEYWORDS if any(w in lowered for w in words)),
+                      "OUT_OF_SCOPE")
+        is_emergency, urgency, symptoms = detect_emergency_keywords(query)
+        return {
+            "domain": domain,
+            "urgency": "N/A" if domain == "OUT_OF_SCOPE" else urgency.upper(),
+            "confidence": 0.5,
+            "safety_flags": symptoms if is_emergency else [],
+            "immediate_action_needed": is_emergency,
+            "scope_violation": domain == "OUT_OF_SCOPE",
+            "specialist_model": self.SPECIALIST_MODELS.get(domain),
+            "classification_status": "success",
+        }
+
+
+def get_session():
+    from snowflake.snowpark import Session
+
+    config = {
+        key: os.environ[f"SNOWFLAKE_{key.upper()}"]
+        for key in ("account", "user", "password", "role", "warehouse")
+        if os.environ.get(f"SNOWFLAKE_{key.upper()}")
+    }
+    return Session.builder.configs(config).create()
+
+
+# =============================================================================
+# RUN
+# =============================================================================
+
+def safety_flag(classification):
+    return bool(classification.get("safety_flags")) or bool(classification.get("immediate_action_needed")) \
+        or str(classification.get("urgency", "")).upper() == "EMERGENCY"
+
+
+def run_suite(suite, router, system_prompt):
+    rows, router_ms, detector_ms, prompt_tokens = [], [], [], []
+    system_tokens = estimate_tokens(system_prompt)
+    for case in suite["cases"]:
+        started = time.perf_counter()
+        is_emergency, _, _ = detect_emergency_keywords(case["query"])
+        detector_ms.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        try:
+            result, error = router.classify(case["query"]), None
+        except Exception as e:
+            result, error = {}, f"{type(e).__name__}: {e}"
+        router_ms.append((time.perf_counter() - started) * 1000)
+        prompt_tokens.append(system_tokens + estimate_tokens(case["query"]))
+
+        urgency = str(result.get("urgency", "")).upper()
+        if case["expected_domain"] == "OUT_OF_SCOPE":
+            urgency_ok = result.get("domain") == "OUT_OF_SCOPE"  # The router returns N/A urgency there
+        else:
+            urgency_ok = urgency == case["expected_urgency"]
+        rows.append({
+            "id": case["id"],
+            "variant": case["variant"],
+            "domain_ok": result.get("domain") == case["expected_domain"],
+            "urgency_ok": urgency_ok,
+            "safety_ok": safety_flag(result) == case["expected_safety_flag"],
+            "missed_safety": case["expected_safety_flag"] and not safety_flag(result),
+            "detector_ok": is_emergency == case["expected_safety_flag"],
+            "error": error,
+        })
+    return rows, router_ms, detector_ms, prompt_tokens
+
+
+def summarize(rows, router_ms, detector_ms, prompt_tokens):
+    share = lambda key, subset=None: round(sum(r[key] for r in (subset or rows)) / len(subset or rows), 4)
+    originals = [r for r in rows if r["variant"] == "original"]
+    paraphrases = [r for r in rows if r["variant"] == "paraphrase"]
+    return {
+        "cases": len(rows),
+        "errors": sum(r["error"] is not None for r in rows),
+        "domain_accuracy": share("domain_ok"),
+        "urgency_accuracy": share("urgency_ok"),
+        "safety_accuracy": share("safety_ok"),
+        "missed_safety_flags": sum(r["missed_safety"] for r in rows),
+        "original_domain_accuracy": share("domain_ok", originals) if originals else None,
+        "paraphrase_domain_accuracy": share("domain_ok", paraphrases) if paraphrases else None,
+        "detector_safety_accuracy": share("detector_ok"),
+        "router_p50_ms": round(percentile(router_ms, 50), 2),
+        "router_p95_ms": round(percentile(router_ms, 95), 2),
+        "detector_p50_ms": round(percentile(detector_ms, 50), 4),
+        "detector_p95_ms": round(percentile(detector_ms, 95), 4),
+        "prompt_tokens_mean": round(sum(prompt_tokens) / len(prompt_tokens), 1),
+        "prompt_tokens_max": max(prompt_tokens),
+    }
+
+
+def previous_run(suite_version, backend):
+    if not os.path.exists(HISTORY_PATH):
+        return None
+    last = None
+    with open(HISTORY_PATH, encoding="utf-8") as handle:
+        for line in handle:
+            run = json.loads(line)
+            if run["suite"] == suite_version and run["backend"] == backend:
+                last = run
+    return last
+
+
+def check_gates(current, baseline, max_accuracy_drop, max_p95_increase):
+    failures = []
+    for key in ("domain_accuracy", "urgency_accuracy", "safety_accuracy", "detector_safety_accuracy"):
+        if current[key] < baseline[key] - max_accuracy_drop:
+            failures.append(f"{key} {baseline[key]:.1%} -> {current[key]:.1%}")
+    if current["missed_safety_flags"] > baseline["missed_safety_flags"]:
+        failures.append(f"missed_safety_flags {baseline['missed_safety_flags']} -> {current['missed_safety_flags']}")
+    if baseline["router_p95_ms"] and current["router_p95_ms"] > baseline["router_p95_ms"] * (1 + max_p95_increase):
+        failures.append(f"router_p95_ms {baseline['router_p95_ms']:.0f} -> {current['router_p95_ms']:.0f}")
+    return failures
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Router regression benchmark")
+    parser.add_argument("--build-suite", action="store_true", help="Regenerate the suite file and exit")
+    parser.add_argument("--suite", default=SUITE_VERSION)
+    parser.add_argument("--backend", choices=["procedure", "local"], default="procedure")
+    parser.add_argument("--user-id", default=os.environ.get("WELLNEST_BENCHMARK_USER_ID", "benchmark-user"),
+                        help="USER_ID passed to CLASSIFY_USER_QUERY (its profile is added to the prompt)")
+    parser.add_argument("--label", help="Release or branch name stored with the run")
+    parser.add_argument("--max-accuracy-drop", type=float, default=0.02)
+    parser.add_argument("--max-p95-increase", type=float, default=0.25, help="Allowed relative p95 growth")
+    parser.add_argument("--no-record", action="store_true", help="Do not append to the history file")
+    args = parser.parse_args()
+
+    if args.build_suite:
+        suite = build_suite()
+        os.makedirs(SUITE_DIR, exist_ok=True)
+        with open(suite_path(suite["version"]), "w", encoding="utf-8") as handle:
+            json.dump(suite, handle, indent=2, ensure_ascii=False)
+        print(f"Wrote {len(suite['cases'])} cases to {os.path.relpath(suite_path(suite['version']))}")
+        return
+
+    suite = load_suite(args.suite)
+    router = ProcedureRouter(get_session(), args.user_id) if args.backend == "procedure" else LocalRouter()
+    print(f"Router suite {suite['version']}: {len(suite['cases'])} cases, backend {router.name}")
+
+    rows, router_ms, detector_ms, prompt_tokens = run_suite(suite, router, router_system_prompt())
+    summary = summarize(rows, router_ms, detector_ms, prompt_tokens)
+
+    print(f"\n{'metric':<28} {'value':>12}")
+    for key, value in summary.items():
+        shown = f"{value:.1%}" if "accuracy" in key and value is not None else value
+        print(f"{key:<28} {shown!s:>12}")
+    failed_cases = [r["id"] for r in rows if not (r["domain_ok"] and r["urgency_ok"] and r["safety_ok"])]
+    if failed_cases:
+        print(f"\nMisclassified: {', '.join(failed_cases[:30])}{' ...' if len(failed_cases) > 30 else ''}")
+
+    baseline = previous_run(suite["version"], router.name)
+    failures = check_gates(summary, baseline["summary"], args.max_accuracy_drop, args.max_p95_increase) \
+        if baseline else []
+    if baseline:
+        print(f"\nCompared with {baseline.get('label') or baseline['commit'] or baseline['timestamp']}:")
+        for key in ("domain_accuracy", "urgency_accuracy", "safety_accuracy", "router_p95_ms", "prompt_tokens_mean"):
+            print(f"  {key:<22} {baseline['summary'][key]!s:>10} -> {summary[key]!s:>10}")
+
+    if not args.no_record:
+        os.makedirs(os.path.dirname(HISTORY_PATH), exist_ok=True)
+        with open(HISTORY_PATH, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps({
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "suite": suite["version"],
+                "backend": router.name,
+                "label": args.label,
+                "commit": git_commit(),
+                "summary": summary,
+                "failed_cases": failed_cases,
+            }) + "\n")
+
+    if failures:
+        print("\n❌ Regression gates failed:")
+        for failure in failures:
+            print(f"  {failure}")
+        raise SystemExit(1)
+    if baseline:
+        print("\n✅ Gates passed")
+    else:
+        print(f"\nNo previous {router.name} run of suite {suite['version']}" + ("" if args.no_record else "; recorded as baseline"))
+
+
+if __name__ == "__main__":
+    main()
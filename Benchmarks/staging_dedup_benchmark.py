@@ -0,0 +1,112 @@
+# =============================================================================
+# WELLNEST - STAGING DEDUPLICATION BENCHMARK
+# =============================================================================
+# Compares the original staging dedup (row_number over a nine-column partition)
+# with the fingerprint dedup from Macros/deduplicate.sql on a synthetic
+# cleaned diabetes table in DuckDB, for a full build and for an incremental
+# batch that only needs to be checked against the stored fingerprints.
+# The SQL below is what the two patterns render to for stg_diabetes_cleaned.
+#
+# Usage:  python Benchmarks/staging_dedup_benchmark.py [--rows 10000000] [--append 100000]
+# =============================================================================
+
+import argparse
+import statistics
+import time
+
+import duckdb
+
+from dbt_incremental_benchmark import SYNTHETIC_ROWS_SQL
+
+KEY_COLUMNS = [
+    "gender", "age", "has_hypertension", "has_heart_disease", "smoking_history",
+    "bmi", "hba1c_level", "blood_glucose_level", "has_diabetes",
+]
+
+CLEANED_SQL = """
+SELECT
+    lower(trim(GENDER)) AS gender,
+    AGE AS age,
+    HYPERTENSION = 1 AS has_hypertension,
+    HEART_DISEASE = 1 AS has_heart_disease,
+    lower(trim(SMOKING_HISTORY)) AS smoking_history,
+    BMI AS bmi,
+    HBA1C_LEVEL AS hba1c_level,
+    BLOOD_GLUCOSE_LEVEL AS blood_glucose_level,
+    DIABETES = 1 AS has_diabetes
+FROM ({raw})
+"""
+
+ROW_HASH = "md5(concat_ws('|', {}))".format(
+    ", ".join(f"coalesce(cast({column} as varchar), '~')" for column in KEY_COLUMNS))
+
+LEGACY_SQL = f"""
+SELECT * EXCLUDE (row_num) FROM (
+    SELECT *, row_number() OVER (
+        PARTITION BY {', '.join(KEY_COLUMNS)}
+        ORDER BY gender
+    ) AS row_num
+    FROM {{source}}
+) WHERE row_num = 1
+"""
+
+FINGERPRINT_SQL = f"""
+SELECT * FROM (SELECT *, {ROW_HASH} AS row_hash FROM {{source}}) fingerprinted
+{{unseen}}
+QUALIFY row_number() OVER (PARTITION BY row_hash ORDER BY row_hash) = 1
+"""
+
+
+def timed(con, sql, repeats):
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        con.execute(sql)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Staging dedup benchmark")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--append", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    con = duckdb.connect()
+    con.execute("SELECT setseed(0.42)")
+    con.execute(f"CREATE TABLE valid AS {CLEANED_SQL.format(raw=SYNTHETIC_ROWS_SQL.format(rows=args.rows))}")
+    con.execute(f"CREATE TABLE batch AS {CLEANED_SQL.format(raw=SYNTHETIC_ROWS_SQL.format(rows=args.append))}")
+    con.execute("CREATE TABLE valid_after AS SELECT * FROM valid UNION ALL SELECT * FROM batch")
+
+    legacy_full = timed(con, f"CREATE OR REPLACE TABLE legacy AS {LEGACY_SQL.format(source='valid')}", args.repeats)
+    fingerprint_full = timed(
+        con, f"CREATE OR REPLACE TABLE stored AS {FINGERPRINT_SQL.format(source='valid', unseen='')}", args.repeats)
+
+    # Incremental batch: the original pattern has to re-sort everything;
+    # the fingerprint pattern anti-joins the batch against stored hashes
+    legacy_incremental = timed(
+        con, f"CREATE OR REPLACE TABLE legacy AS {LEGACY_SQL.format(source='valid_after')}", args.repeats)
+    unseen = "WHERE row_hash NOT IN (SELECT row_hash FROM stored)"
+    con.execute("CREATE TABLE stored_before AS SELECT * FROM stored")
+    samples = []
+    for _ in range(args.repeats):
+        con.execute("CREATE OR REPLACE TABLE stored AS SELECT * FROM stored_before")
+        started = time.perf_counter()
+        con.execute(f"INSERT INTO stored {FINGERPRINT_SQL.format(source='batch', unseen=unseen)}")
+        samples.append(time.perf_counter() - started)
+    fingerprint_incremental = statistics.median(samples)
+
+    legacy_rows = con.execute("SELECT count(*) FROM legacy").fetchone()[0]
+    fingerprint_rows = con.execute("SELECT count(*) FROM stored").fetchone()[0]
+
+    print(f"{args.rows:,} cleaned rows, incremental batch of {args.append:,} (median of {args.repeats})\n")
+    print(f"{'pattern':<14} {'full s':>8} {'incremental s':>14}")
+    print(f"{'row_number':<14} {legacy_full:>8.2f} {legacy_incremental:>14.2f}")
+    print(f"{'fingerprint':<14} {fingerprint_full:>8.2f} {fingerprint_incremental:>14.2f}")
+    print(f"\nDistinct rows  row_number: {legacy_rows:,}  fingerprint: {fingerprint_rows:,}"
+          f"{'' if legacy_rows == fingerprint_rows else '  MISMATCH'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# =============================================================================
+# WELLNEST - TRIAGE MODEL MICRO-BATCHING BENCHMARK
+# =============================================================================
+# Fires concurrent single-row score requests at a triage model, once with a
+# predict_proba call per request and once through MicroBatcher, and compares
+# throughput and latency. Uses --artifact (a notebook joblib file) if given,
+# otherwise fits a small random forest on synthetic gold features.
+#
+# Usage:  python Benchmarks/triage_batching_benchmark.py [--artifact model.joblib] [--requests 5000] [--clients 32]
+# =============================================================================
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "StreamLit"))
+
+from wellnest_core import features
+from wellnest_core.hedging import percentile
+from wellnest_core.triage_model import MicroBatcher, TriageModel
+
+FEATURES = ["AGE", "GENDER", "BMI", "HAS_HYPERTENSION", "HAS_HEART_DISEASE", "IS_CURRENT_SMOKER",
+            "DIABETES_STAGE", "BMI_CATEGORY", "CARDIOMETABOLIC_DISEASE_COUNT", "CARDIOVASCULAR_RISK_SCORE",
+            "METABOLIC_SYNDROME_SCORE", "HAS_DIABETES", "IS_OBESE"]
+
+
+def synthetic_rows(count, seed=7):
+    rng = np.random.default_rng(seed)
+    raw = pd.DataFrame({
+        "GENDER": rng.choice(["female", "male"], count),
+        "AGE": rng.integers(10, 80, count).astype(float),
+        "HAS_HYPERTENSION": rng.random(count) < 0.08,
+        "HAS_HEART_DISEASE": rng.random(count) < 0.04,
+        "SMOKING_HISTORY": rng.choice(["never", "no info", "current", "former"], count),
+        "BMI": rng.normal(27, 6, count).round(1),
+        "HBA1C_LEVEL": rng.uniform(4, 10, count).round(1),
+        "BLOOD_GLUCOSE_LEVEL": rng.uniform(40, 420, count).round(),
+        "HAS_DIABETES": rng.random(count) < 0.09,
+    })
+    return features.diabetes_features(raw)
+
+
+def synthetic_artifact():
+    """Small model in the notebook's artifact layout"""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+    frame = synthetic_rows(50_000)
+    X = frame[FEATURES].copy()
+    categorical = ["GENDER", "DIABETES_STAGE", "BMI_CATEGORY"]
+    numerical = ["AGE", "BMI", "CARDIOMETABOLIC_DISEASE_COUNT", "CARDIOVASCULAR_RISK_SCORE", "METABOLIC_SYNDROME_SCORE"]
+    medians = X[numerical].astype(float).median().to_dict()
+    modes = {column: X[column].mode().iloc[0] for column in categorical}
+    label_encoders = {}
+    for column in categorical:
+        label_encoders[column] = LabelEncoder().fit(X[column].astype(str))
+        X[column] = label_encoders[column].transform(X[column].astype(str))
+    X[numerical] = X[numerical].astype(float)
+    scaler = StandardScaler().fit(X[numerical])
+    X[numerical] = scaler.transform(X[numerical])
+    target_encoder = LabelEncoder().fit(frame["GLUCOSE_URGENCY_LEVEL"])
+    model = RandomForestClassifier(n_estimators=100, max_depth=12, n_jobs=1, random_state=42)
+    model.fit(X, target_encoder.transform(frame["GLUCOSE_URGENCY_LEVEL"]))
+    return {"model": model, "scaler": scaler, "label_encoders": label_encoders,
+            "medians": medians, "modes": modes,
+            "target_encoder": target_encoder, "feature_names": FEATURES}
+
+
+def run(score_one, rows, clients):
+    latencies = []
+
+    def request(row):
+        started = time.perf_counter()
+        score_one(row)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(request, rows))
+    return time.perf_counter() - started, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Triage model micro-batching benchmark")
+    parser.add_argument("--artifact")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    model = TriageModel.load(args.artifact) if args.artifact else TriageModel(synthetic_artifact(), "synthetic_rf")
+    rows = synthetic_rows(args.requests, seed=11).to_dict("records")
+
+    direct_seconds, direct_latencies = run(lambda row: model.score(pd.DataFrame([row])), rows, args.clients)
+    batcher = MicroBatcher(model, max_batch_size=args.max_batch, max_wait_ms=args.max_wait_ms)
+    batched_seconds, batched_latencies = run(batcher.score, rows, args.clients)
+    stats = batcher.stats()
+    batcher.close()
+
+    print(f"{args.requests:,} requests from {args.clients} concurrent clients, model {model.name}\n")
+    print(f"{'mode':<14} {'req/s':>10} {'p50 ms':>9} {'p95 ms':>9}")
+    for label, seconds, latencies in (("per-request", direct_seconds, direct_latencies),
+                                      ("micro-batched", batched_seconds, batched_latencies)):
+        print(f"{label:<14} {args.requests / seconds:>10,.0f} {percentile(latencies, 50):>9.1f} "
+              f"{percentile(latencies, 95):>9.1f}")
+    print(f"\nBatches: {stats['batches']:,}, mean size {stats['mean_batch_size']}, "
+          f"p50/p95 batch {stats['p50_batch_ms']:.1f}/{stats['p95_batch_ms']:.1f} ms, "
+          f"p95 queue wait {stats['p95_queue_wait_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ import streamlit as st
 import google.generativeai as genai
 from datetime import datetime
 import json
+from chat_session import ChatSession
 
 # Page configuration
 st.set_page_config(
@@ -105,11 +106,14 @@ For urgent symptoms requiring prompt attention, start with "⚡ URGENT:"
 For routine queries, start with "📋 ROUTINE:"
 """
 
+GEMINI_MODEL = 'gemini-2.0-flash-exp'
+
 def initialize_gemini(api_key):
     """Initialize Gemini API"""
     try:
         genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.0-flash-exp')
+        # System prompt is configured once on the model, not re-sent in every message
+        model = genai.GenerativeModel(GEMINI_MODEL, system_instruction=SYSTEM_PROMPT)
         return model
     except Exception as e:
         st.error(f"Error initializing Gemini: {str(e)}")
@@ -141,21 +145,30 @@ def display_urgency_banner(urgency_level):
             </div>
         """, unsafe_allow_html=True)
 
-def chat_with_model(model, user_message, chat_history):
-    """Send message to Gemini and get response"""
+def get_chat_session():
+    """Stateful chat session for the configured model"""
+    if st.session_state.chat_session is None:
+        st.session_state.chat_session = ChatSession(
+            st.session_state.model,
+            system_prompt=SYSTEM_PROMPT,
+            # Summaries must not come back as triage replies
+            summary_model=genai.GenerativeModel(GEMINI_MODEL)
+        )
+    return st.session_state.chat_session
+
+def chat_with_model(chat_session, user_message):
+    """Send only the new turn to Gemini and stream the response"""
     try:
-        # Build conversation context
-        conversation = SYSTEM_PROMPT + "\n\n"
-        for msg in chat_history:
-            role = "User" if msg["role"] == "user" else "Assistant"
-            conversation += f"{role}: {msg['content']}\n\n"
-        conversation += f"User: {user_message}\n\nAssistant:"
-        
-        # Generate response
-        response = model.generate_content(conversation)
-        return response.text
+        response = st.write_stream(chat_session.send(user_message))
     except Exception as e:
         return f"Error generating response: {str(e)}"
+    
+    # The reply is already shown; a failed summary keeps the window for the next turn
+    try:
+        chat_session.compact()
+    except Exception as e:
+        st.warning(f"⚠️ Could not summarize earlier messages: {str(e)}")
+    return response
 
 # Initialize session state
 if 'chat_history' not in st.session_state:
@@ -164,6 +177,8 @@ if 'api_key' not in st.session_state:
     st.session_state.api_key = None
 if 'model' not in st.session_state:
     st.session_state.model = None
+if 'chat_session' not in st.session_state:
+    st.session_state.chat_session = None
 
 # Sidebar
 with st.sidebar:
@@ -181,6 +196,7 @@ with st.sidebar:
     if api_key and api_key != st.session_state.api_key:
         st.session_state.api_key = api_key
         st.session_state.model = initialize_gemini(api_key)
+        st.session_state.chat_session = None
         if st.session_state.model:
             st.success("✅ API Key configured!")
     
@@ -221,6 +237,7 @@ with st.sidebar:
     # Clear chat button
     if st.button("🗑️ Clear Conversation"):
         st.session_state.chat_history = []
+        st.session_state.chat_session = None
         st.rerun()
     
     # Download chat history
@@ -275,11 +292,7 @@ else:
         last_message = st.session_state.chat_history[-1]["content"]
         
         with st.spinner("🤔 Analyzing your query..."):
-            response = chat_with_model(
-                st.session_state.model,
-                last_message,
-                st.session_state.chat_history[:-1]
-            )
+            response = chat_with_model(get_chat_session(), last_message)
             
             st.session_state.chat_history.append({
                 "role": "assistant",
@@ -301,11 +314,7 @@ else:
         
         # Get AI response
         with st.spinner("🤔 Analyzing your query..."):
-            response = chat_with_model(
-                st.session_state.model,
-                user_input,
-                st.session_state.chat_history[:-1]
-            )
+            response = chat_with_model(get_chat_session(), user_input)
             
             st.session_state.chat_history.append({
                 "role": "assistant",
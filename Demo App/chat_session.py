@@ -0,0 +1,134 @@
+# =============================================================================
+# WELLNEST DEMO - STATEFUL CHAT SESSION
+# =============================================================================
+# Keeps the per-turn prompt bounded instead of re-sending SYSTEM_PROMPT plus
+# the whole transcript as one string on every message:
+#   - the system prompt is set once on the model (system_instruction)
+#   - only the last `window_turns` exchanges are sent verbatim
+#   - older exchanges are folded into a running summary in batches
+#     (compact(), called once the streamed reply has been shown) by a
+#     summary model without the triage system instruction
+#   - replies are streamed chunk by chunk
+# =============================================================================
+
+SUMMARY_PROMPT = """Update the running summary of a health-assistant conversation.
+Keep symptoms, durations, severities, urgency assessments, and advice given.
+Be concise (under 150 words). Return only the updated summary.
+
+Current summary:
+{summary}
+
+New exchanges to fold in:
+{exchanges}"""
+
+
+def _content(role, text):
+    return {"role": role, "parts": [text]}
+
+
+def _content_chars(contents):
+    return sum(len(part) for item in contents for part in item["parts"])
+
+
+class ChatSession:
+    """Rolling-window chat over a generate_content()-style model"""
+
+    def __init__(self, model, system_prompt="", window_turns=6, summarize_batch=4, summary_model=None):
+        self.model = model
+        self.summary_model = summary_model or model
+        self.system_prompt = system_prompt
+        self.window_turns = window_turns
+        self.summarize_batch = summarize_batch
+
+        self.summary = ""
+        self.turns = []              # [(user_message, assistant_response), ...]
+        self.prompt_sizes = []       # chars sent per user turn (incl. system prompt)
+        self.summary_calls = 0
+
+    def build_contents(self, user_message):
+        """Contents for the next request: summary, recent window, new message"""
+        contents = []
+        if self.summary:
+            contents.append(_content("user", f"Summary of our earlier conversation:\n{self.summary}"))
+            contents.append(_content("model", "Understood, I'll keep that in mind."))
+        for user_text, assistant_text in self.turns:
+            contents.append(_content("user", user_text))
+            contents.append(_content("model", assistant_text))
+        contents.append(_content("user", user_message))
+        return contents
+
+    def send(self, user_message, stream=True):
+        """Send one new user turn; yields response text chunks (then call compact())"""
+        contents = self.build_contents(user_message)
+        self.prompt_sizes.append(len(self.system_prompt) + _content_chars(contents))
+
+        response = self.model.generate_content(contents, stream=stream)
+        chunks = []
+        for chunk in (response if stream else [response]):
+            try:
+                text = getattr(chunk, "text", "") or ""
+            except ValueError:
+                # Gemini raises for a chunk without text (e.g. blocked by a safety filter)
+                text = ""
+            chunks.append(text)
+            yield text
+
+        self.turns.append((user_message, "".join(chunks)))
+
+    def compact(self):
+        """Fold the oldest exchanges into the summary once the window overflows"""
+        if len(self.turns) <= self.window_turns:
+            return
+
+        batch = self.turns[:self.summarize_batch]
+        exchanges = "\n\n".join(f"User: {u}\nAssistant: {a}" for u, a in batch)
+        prompt = SUMMARY_PROMPT.format(summary=self.summary or "(none)", exchanges=exchanges)
+
+        response = self.summary_model.generate_content(prompt)
+        self.summary_calls += 1
+        try:
+            summary = (getattr(response, "text", "") or "").strip()
+        except ValueError:
+            summary = ""
+        if not summary:
+            # Empty or blocked: keep the old summary and retry with the next turn
+            return
+        self.summary = summary
+        self.turns = self.turns[self.summarize_batch:]
+
+    def reset(self):
+        self.summary = ""
+        self.turns = []
+
+
+# =============================================================================
+# OFFLINE STUB MODEL
+# =============================================================================
+
+class _StubChunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubModel:
+    """Network-free stand-in for GenerativeModel used for prompt-size measurement"""
+
+    def __init__(self, reply_chars=600, summary_chars=700, chunk_chars=80):
+        self.reply_chars = reply_chars
+        self.summary_chars = summary_chars
+        self.chunk_chars = chunk_chars
+        self.calls = 0
+        self.request_chars = []
+
+    def generate_content(self, contents, stream=False):
+        self.calls += 1
+        if isinstance(contents, str):
+            self.request_chars.append(len(contents))
+            return _StubChunk(("summary " * self.summary_chars)[:self.summary_chars])
+
+        self.request_chars.append(_content_chars(contents))
+        reply = ("📋 ROUTINE: stub reply. " * self.reply_chars)[:self.reply_chars]
+        if not stream:
+            return _StubChunk(reply)
+        return (_StubChunk(reply[i:i + self.chunk_chars])
+                for i in range(0, len(reply), self.chunk_chars))
@@ -0,0 +1,186 @@
+-- ==================================================================
+-- CACHED EVALUATION RUNNER
+-- ==================================================================
+-- Calls SNOWFLAKE.CORTEX.COMPLETE exactly once per (model, prompt) and keeps
+-- the answer in eval_response_cache, keyed by model and SHA2 of the prompt.
+-- Parsing and metrics read the cached text, so every column of a result row
+-- comes from the same model answer. Rerunning a model only pays for prompts
+-- that are new or changed (an edited template changes the hash).
+--
+-- Usage:
+--   CALL run_cached_completions('claude-4-sonnet', 'router_evaluation_prompts');
+--   SELECT * FROM router_accuracy_summary;
+-- Any table or view with a PROMPT column can be passed as the source.
+-- ==================================================================
+
+USE DATABASE wellnest;
+USE SCHEMA public;
+
+-- ==================================================================
+-- STEP 1: Response cache
+-- ==================================================================
+
+CREATE TABLE IF NOT EXISTS eval_response_cache (
+    model_name VARCHAR(100) NOT NULL,
+    prompt_hash VARCHAR(64) NOT NULL,                   -- SHA2(prompt, 256)
+    prompt VARCHAR NOT NULL,
+    response VARCHAR,                                   -- Raw COMPLETE output
+    run_id VARCHAR(36),                                 -- Runner call that produced the row
+    created_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    PRIMARY KEY (model_name, prompt_hash)
+);
+
+-- ==================================================================
+-- STEP 2: Runner - one COMPLETE per uncached (model, prompt)
+-- ==================================================================
+
+CREATE OR REPLACE PROCEDURE run_cached_completions(model_name VARCHAR, prompt_source VARCHAR)
+RETURNS VARIANT
+LANGUAGE SQL
+AS
+$$
+DECLARE
+    run_id VARCHAR DEFAULT UUID_STRING();
+    total_prompts INTEGER;
+    new_calls INTEGER;
+    started TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP();
+BEGIN
+    SELECT COUNT(DISTINCT prompt) INTO :total_prompts FROM IDENTIFIER(:prompt_source);
+
+    INSERT INTO eval_response_cache (model_name, prompt_hash, prompt, response, run_id)
+    WITH source_prompts AS (
+        SELECT DISTINCT prompt, SHA2(prompt, 256) AS prompt_hash
+        FROM IDENTIFIER(:prompt_source)
+        WHERE prompt IS NOT NULL
+    ),
+    pending AS (
+        SELECT s.prompt, s.prompt_hash
+        FROM source_prompts s
+        LEFT JOIN eval_response_cache c
+            ON c.model_name = :model_name
+           AND c.prompt_hash = s.prompt_hash
+        WHERE c.prompt_hash IS NULL
+    )
+    SELECT
+        :model_name,
+        prompt_hash,
+        prompt,
+        SNOWFLAKE.CORTEX.COMPLETE(:model_name, prompt),
+        :run_id
+    FROM pending;
+
+    new_calls := SQLROWCOUNT;
+
+    RETURN OBJECT_CONSTRUCT(
+        'run_id', :run_id,
+        'model', :model_name,
+        'source', :prompt_source,
+        'prompts', :total_prompts,
+        'complete_calls', :new_calls,
+        'cache_hits', :total_prompts - :new_calls,
+        'seconds', DATEDIFF('millisecond', :started, CURRENT_TIMESTAMP()) / 1000.0
+    );
+END;
+$$;
+
+-- ==================================================================
+-- STEP 3: Router evaluation on top of the cache
+-- ==================================================================
+
+-- One prompt per test case (system prompt from router_prompt_template)
+CREATE OR REPLACE VIEW router_evaluation_prompts AS
+SELECT
+    t.test_id,
+    t.user_query,
+    t.expected_domain,
+    t.expected_urgency,
+    t.expected_safety_flag,
+    t.test_notes,
+    CONCAT(p.system_prompt, t.user_query) AS prompt
+FROM router_evaluation_testcases t
+CROSS JOIN router_prompt_template p;
+
+-- Every cached model answer for the test cases, parsed once
+CREATE OR REPLACE VIEW router_evaluation_results AS
+WITH cached AS (
+    SELECT
+        c.model_name,
+        p.test_id,
+        p.user_query,
+        p.expected_domain,
+        p.expected_urgency,
+        p.expected_safety_flag,
+        p.test_notes,
+        c.response AS raw_response,
+        TRY_PARSE_JSON(c.response) AS parsed_response,
+        c.created_at AS test_timestamp
+    FROM router_evaluation_prompts p
+    JOIN eval_response_cache c
+        ON c.prompt_hash = SHA2(p.prompt, 256)
+)
+SELECT
+    model_name,
+    test_id,
+    user_query,
+    expected_domain,
+    expected_urgency,
+    expected_safety_flag,
+    test_notes,
+    raw_response,
+    parsed_response,
+    parsed_response:domain::STRING AS classified_domain,
+    parsed_response:urgency::STRING AS classified_urgency,
+    parsed_response:safety_flag::BOOLEAN AS classified_safety_flag,
+    parsed_response:extracted_symptoms AS extracted_symptoms,
+    parsed_response:reasoning::STRING AS reasoning,
+    parsed_response IS NOT NULL AS is_valid_json,
+    test_timestamp
+FROM cached;
+
+-- Accuracy per model
+CREATE OR REPLACE VIEW router_accuracy_summary AS
+WITH accuracy_checks AS (
+    SELECT
+        model_name,
+        is_valid_json,
+        IFF(expected_domain = classified_domain, 1, 0) AS domain_correct,
+        IFF(expected_urgency = classified_urgency, 1, 0) AS urgency_correct,
+        IFF(expected_safety_flag = classified_safety_flag, 1, 0) AS safety_correct,
+        IFF(expected_safety_flag AND NOT COALESCE(classified_safety_flag, FALSE), 1, 0) AS missed_safety_flag,
+        IFF(expected_domain = classified_domain
+            AND expected_urgency = classified_urgency
+            AND expected_safety_flag = classified_safety_flag, 1, 0) AS perfect_match
+    FROM router_evaluation_results
+)
+SELECT
+    model_name,
+    COUNT(*) AS total_cases,
+    COUNT_IF(is_valid_json) AS valid_json_count,
+    ROUND(100.0 * COUNT_IF(is_valid_json) / COUNT(*), 2) AS json_success_rate,
+    SUM(domain_correct) AS domain_correct_count,
+    ROUND(100.0 * SUM(domain_correct) / COUNT(*), 2) AS domain_accuracy,
+    SUM(urgency_correct) AS urgency_correct_count,
+    ROUND(100.0 * SUM(urgency_correct) / COUNT(*), 2) AS urgency_accuracy,
+    SUM(safety_correct) AS safety_correct_count,
+    ROUND(100.0 * SUM(safety_correct) / COUNT(*), 2) AS safety_accuracy,
+    SUM(missed_safety_flag) AS missed_safety_flags,
+    SUM(perfect_match) AS perfect_match_count,
+    ROUND(100.0 * SUM(perfect_match) / COUNT(*), 2) AS perfect_match_rate,
+    CURRENT_TIMESTAMP() AS evaluated_at
+FROM accuracy_checks
+GROUP BY model_name
+ORDER BY perfect_match_rate DESC;
+
+-- ==================================================================
+-- STEP 4: Run and compare
+-- ==================================================================
+
+CALL run_cached_completions('claude-4-sonnet', 'router_evaluation_prompts');
+
+-- A second call costs no inference unless prompts changed
+CALL run_cached_completions('claude-4-sonnet', 'router_evaluation_prompts');
+
+SELECT * FROM router_accuracy_summary;
+
+-- Drop cached answers for one model (forces a fresh run)
+-- DELETE FROM eval_response_cache WHERE model_name = 'claude-4-sonnet';
@@ -392,6 +392,16 @@ test_with_prompts AS (
         CONCAT(p.system_prompt, t.user_query) as complete_prompt
     FROM test_cases t
     CROSS JOIN prompt_template p
+),
+-- One COMPLETE per row; every parsed field comes from that same answer
+model_responses AS (
+    SELECT 
+        *,
+        SNOWFLAKE.CORTEX.COMPLETE(
+            'claude-4-sonnet',
+            complete_prompt
+        ) as model_response
+    FROM test_with_prompts
 )
 SELECT 
     test_id,
@@ -400,97 +410,29 @@ SELECT
     expected_safety_flag,
     user_query,
     test_notes,
-    SNOWFLAKE.CORTEX.COMPLETE(
-        'claude-4-sonnet',
-        complete_prompt
-    ) as model_response,
+    model_response,
     -- Parse JSON to check validity
-    TRY_PARSE_JSON(
-        SNOWFLAKE.CORTEX.COMPLETE('claude-4-sonnet', complete_prompt)
-    ) as parsed_json,
+    TRY_PARSE_JSON(model_response) as parsed_json,
     -- Extract key fields for quick verification
-    TRY_PARSE_JSON(
-        SNOWFLAKE.CORTEX.COMPLETE('claude-4-sonnet', complete_prompt)
-    ):domain::STRING as classified_domain,
-    TRY_PARSE_JSON(
-        SNOWFLAKE.CORTEX.COMPLETE('claude-4-sonnet', complete_prompt)
-    ):urgency::STRING as classified_urgency,
-    TRY_PARSE_JSON(
-        SNOWFLAKE.CORTEX.COMPLETE('claude-4-sonnet', complete_prompt)
-    ):safety_flag::BOOLEAN as classified_safety_flag
-FROM test_with_prompts
+    parsed_json:domain::STRING as classified_domain,
+    parsed_json:urgency::STRING as classified_urgency,
+    parsed_json:safety_flag::BOOLEAN as classified_safety_flag
+FROM model_responses
 ORDER BY test_id;
 
 -- ==================================================================
 -- STEP 3A: Run Claude 4 Sonnet on All 30 Test Cases
 -- ==================================================================
+-- Uses the cached runner from Eval/Evaluation Runner.sql (run that file
+-- once first): COMPLETE is called only for prompts not already cached for
+-- this model, and results are parsed from the cached answers.
 
-CREATE OR REPLACE TABLE router_evaluation_results_claude4 AS
-WITH all_test_cases AS (
-    SELECT 
-        test_id,
-        user_query,
-        expected_domain,
-        expected_urgency,
-        expected_safety_flag,
-        test_notes
-    FROM router_evaluation_testcases
-),
-prompt_template AS (
-    SELECT system_prompt FROM router_prompt_template
-),
-test_with_prompts AS (
-    SELECT 
-        t.test_id,
-        t.user_query,
-        t.expected_domain,
-        t.expected_urgency,
-        t.expected_safety_flag,
-        t.test_notes,
-        CONCAT(p.system_prompt, t.user_query) as complete_prompt
-    FROM all_test_cases t
-    CROSS JOIN prompt_template p
-),
-model_responses AS (
-    SELECT 
-        test_id,
-        user_query,
-        expected_domain,
-        expected_urgency,
-        expected_safety_flag,
-        test_notes,
-        complete_prompt,
-        SNOWFLAKE.CORTEX.COMPLETE(
-            'claude-4-sonnet',
-            complete_prompt
-        ) as raw_response,
-        CURRENT_TIMESTAMP() as test_timestamp
-    FROM test_with_prompts
-)
-SELECT 
-    'claude-4-sonnet' as model_name,
-    test_id,
-    user_query,
-    expected_domain,
-    expected_urgency,
-    expected_safety_flag,
-    test_notes,
-    raw_response,
-    -- Parse JSON response
-    TRY_PARSE_JSON(raw_response) as parsed_response,
-    -- Extract classification fields
-    TRY_PARSE_JSON(raw_response):domain::STRING as classified_domain,
-    TRY_PARSE_JSON(raw_response):urgency::STRING as classified_urgency,
-    TRY_PARSE_JSON(raw_response):safety_flag::BOOLEAN as classified_safety_flag,
-    TRY_PARSE_JSON(raw_response):extracted_symptoms as extracted_symptoms,
-    TRY_PARSE_JSON(raw_response):reasoning::STRING as reasoning,
-    -- JSON validity check
-    CASE 
-        WHEN TRY_PARSE_JSON(raw_response) IS NOT NULL THEN TRUE
-        ELSE FALSE
-    END as is_valid_json,
-    test_timestamp
-FROM model_responses;
+CALL run_cached_completions('claude-4-sonnet', 'router_evaluation_prompts');
+
+CREATE OR REPLACE VIEW router_evaluation_results_claude4 AS
+SELECT *
+FROM router_evaluation_results
+WHERE model_name = 'claude-4-sonnet';
 
 -- ==================================================================
 -- Verify results were created
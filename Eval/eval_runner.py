@@ -0,0 +1,383 @@
+# =============================================================================
+# WELLNEST - OFFLINE MODEL EVALUATION RUNNER
+# =============================================================================
+# Python replacement for the single-CTAS flow in Eval/Evaluation.sql
+# (200 cases x 4 models, then an LLM judge per answer):
+#   - a bounded worker pool issues COMPLETE calls with retries and progress
+#   - every finished call is checkpointed to a local SQLite results store;
+#     rerunning the same --run resumes and skips what is already stored
+#   - urgency accuracy, per-class recall, confusion matrix and JSON validity
+#     are computed locally from the stored answers; the judge model is only
+#     asked for the qualitative 1-10 score
+#   - --backend stub answers deterministically without Snowflake (for CI)
+#
+# Cases come from a Snowflake table (PROMPT, EXPECTED_COMPLETION, PATIENT_ID,
+# EXPECTED_URGENCY; default diabetes_model_evaluation) or a JSONL file with
+# case_id / prompt / expected_completion / expected_urgency per line.
+#
+# Usage:  python Eval/eval_runner.py --run diabetes_v1 [--models llama3.1-8b mistral-large] [--concurrency 8]
+#         python Eval/eval_runner.py --run ci --backend stub --synthetic-cases 50
+# =============================================================================
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+EVAL_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(EVAL_DIR, "results")
+
+DEFAULT_MODELS = ["llama3.1-8b", "llama3.1-70b", "mistral-large", "mixtral-8x7b"]
+DEFAULT_JUDGE = "llama3.1-70b"
+URGENCY_LABELS = ["emergency", "urgent", "needs_attention", "routine", "unclear"]
+
+# Same phrase rules as the urgency extraction in the fine-tuning evaluation SQL
+URGENCY_PATTERNS = [
+    ("emergency", ["immediate emergency", "emergency evaluation", "direct to emergency", "emergency department",
+                   "call 911"]),
+    ("urgent", ["urgent evaluation", "24-48 hours", "urgent medical evaluation", "requires urgent"]),
+    ("needs_attention", ["needs attention", "schedule an appointment", "within 1-2 weeks"]),
+    ("routine", ["routine follow-up", "routine monitoring", "regular monitoring", "routine care"]),
+]
+
+JUDGE_PROMPT = (
+    "You are evaluating a medical AI response. Rate its quality 1-10.\n\n"
+    "ORIGINAL PROMPT:\n{prompt}\n\n"
+    "EXPECTED RESPONSE:\n{expected}\n\n"
+    "MODEL RESPONSE:\n{response}\n\n"
+    "Criteria: clinical accuracy (4 pts), completeness against the expected response (3 pts), "
+    "safety and clarity of recommendations (3 pts). Urgency is scored separately; do not grade it.\n\n"
+    'Return ONLY JSON: {{"score": <1-10>, "reasoning": "<brief explanation>"}}'
+)
+
+
+# =============================================================================
+# BACKENDS
+# =============================================================================
+
+class CortexBackend:
+    """SNOWFLAKE.CORTEX.COMPLETE through a Snowpark session"""
+
+    def __init__(self, session):
+        self.session = session
+
+    def complete(self, model, prompt):
+        rows = self.session.sql("SELECT SNOWFLAKE.CORTEX.COMPLETE(?, ?) AS RESPONSE", params=[model, prompt]).collect()
+        return rows[0]["RESPONSE"]
+
+
+class StubBackend:
+    """Deterministic answers derived from a hash of (model, prompt); no network"""
+
+    def __init__(self, latency_ms=0.0, failure_rate=0.0):
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+
+    @staticmethod
+    def _digest(*parts):
+        return int(hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest(), 16)
+
+    def complete(self, model, prompt):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise RuntimeError("stub backend: injected failure")
+        digest = self._digest(model, prompt)
+        if prompt.startswith("You are evaluating"):
+            return json.dumps({"score": 1 + digest % 10, "reasoning": "stub judgment"})
+        phrase = URGENCY_PATTERNS[digest % len(URGENCY_PATTERNS)][1][0]
+        return f"Stub assessment from {model}: this case calls for {phrase}."
+
+
+def get_session():
+    from snowflake.snowpark import Session
+
+    config = {
+        key: os.environ[f"SNOWFLAKE_{key.upper()}"]
+        for key in ("account", "user", "password", "role", "warehouse")
+        if os.environ.get(f"SNOWFLAKE_{key.upper()}")
+    }
+    return Session.builder.configs(config).create()
+
+
+# =============================================================================
+# CASES
+# =============================================================================
+
+def cases_from_table(session, table, limit):
+    # sqlcheck: ok - table name is an identifier, limit an int
+    rows = session.sql(f"""
+        SELECT PATIENT_ID, PROMPT, EXPECTED_COMPLETION, EXPECTED_URGENCY
+        FROM {table}
+        WHERE EXPECTED_URGENCY IS NOT NULL
+        ORDER BY PATIENT_ID
+        LIMIT {int(limit)}
+    """).collect()
+    return [{"case_id": str(row["PATIENT_ID"]), "prompt": row["PROMPT"],
+             "expected_completion": row["EXPECTED_COMPLETION"],
+             "expected_urgency": str(row["EXPECTED_URGENCY"]).lower()} for row in rows]
+
+
+def cases_from_jsonl(path):
+    with open(path, encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def synthetic_cases(count, seed=7):
+    rng = random.Random(seed)
+    cases = []
+    for index in range(count):
+        urgency = rng.choice(URGENCY_LABELS[:-1])
+        glucose = {"emergency": 460, "urgent": 280, "needs_attention": 190, "routine": 110}[urgency]
+        cases.append({
+            "case_id": f"SYN{index:05d}",
+            "prompt": f"Patient Case: blood glucose {glucose + rng.randint(-10, 10)} mg/dL, "
+                      f"HbA1c {rng.uniform(5, 11):.1f}%. Assess urgency and management.",
+            "expected_completion": f"Urgency: {urgency}.",
+            "expected_urgency": urgency,
+        })
+    return cases
+
+
+# =============================================================================
+# RESULTS STORE (checkpoint / resume)
+# =============================================================================
+
+class ResultStore:
+    """SQLite file per run; one row per completed (stage, case, model)"""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                stage TEXT NOT NULL,            -- 'response' or 'judge'
+                case_id TEXT NOT NULL,
+                model TEXT NOT NULL,            -- evaluated model (judge rows too)
+                output TEXT,
+                latency_ms REAL,
+                attempts INTEGER,
+                error TEXT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (stage, case_id, model)
+            )
+        """)
+        self._db.commit()
+
+    def done(self, stage):
+        """(case_id, model) pairs already completed without error"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT case_id, model FROM results WHERE stage = ? AND error IS NULL", (stage,)).fetchall()
+        return set(rows)
+
+    def save(self, stage, case_id, model, output, latency_ms, attempts, error):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (stage, case_id, model, output, latency_ms, attempts, error) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (stage, case_id, model, output, latency_ms, attempts, error))
+            self._db.commit()
+
+    def outputs(self, stage):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT case_id, model, output, latency_ms FROM results WHERE stage = ? AND error IS NULL",
+                (stage,)).fetchall()
+        return {(case_id, model): (output, latency_ms) for case_id, model, output, latency_ms in rows}
+
+    def errors(self):
+        with self._lock:
+            return self._db.execute(
+                "SELECT stage, COUNT(*) FROM results WHERE error IS NOT NULL GROUP BY stage").fetchall()
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+def call_with_retries(backend, model, prompt, retries, backoff_seconds):
+    attempt = 0
+    while True:
+        attempt += 1
+        started = time.perf_counter()
+        try:
+            output = backend.complete(model, prompt)
+            return output, (time.perf_counter() - started) * 1000, attempt, None
+        except Exception as e:
+            if attempt > retries:
+                return None, (time.perf_counter() - started) * 1000, attempt, f"{type(e).__name__}: {e}"
+            time.sleep(backoff_seconds * 2 ** (attempt - 1))
+
+
+def run_stage(stage, jobs, backend, store, concurrency, retries, backoff_seconds):
+    """jobs: [(case_id, evaluated_model, call_model, prompt)] not yet in the store"""
+    if not jobs:
+        print(f"  {stage}: nothing to do (all checkpointed)")
+        return
+    started = time.perf_counter()
+    completed = failed = 0
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"eval-{stage}") as pool:
+        futures = {
+            pool.submit(call_with_retries, backend, call_model, prompt, retries, backoff_seconds): (case_id, model)
+            for case_id, model, call_model, prompt in jobs
+        }
+        for future in as_completed(futures):
+            case_id, model = futures[future]
+            output, latency_ms, attempts, error = future.result()
+            store.save(stage, case_id, model, output, latency_ms, attempts, error)
+            completed += 1
+            failed += error is not None
+            if completed % 25 == 0 or completed == len(jobs):
+                rate = completed / (time.perf_counter() - started)
+                print(f"  {stage}: {completed:,}/{len(jobs):,} ({failed} failed, {rate:.1f} calls/s)", flush=True)
+
+
+def extract_urgency(text):
+    lowered = (text or "").lower()
+    for label, phrases in URGENCY_PATTERNS:
+        if any(phrase in lowered for phrase in phrases):
+            return label
+    return "unclear"
+
+
+def parse_json(text):
+    try:
+        value = json.loads((text or "").strip())
+        return value if isinstance(value, dict) else None
+    except ValueError:
+        return None
+
+
+def evaluate(cases, models, store):
+    """Deterministic metrics per model plus the judge's mean score"""
+    responses, judgments = store.outputs("response"), store.outputs("judge")
+    report = {}
+    for model in models:
+        confusion = Counter()
+        valid_json = judged = scored = 0
+        score_sum = 0.0
+        latencies = []
+        for case in cases:
+            key = (case["case_id"], model)
+            if key not in responses:
+                continue
+            output, latency_ms = responses[key]
+            latencies.append(latency_ms)
+            confusion[(case["expected_urgency"], extract_urgency(output))] += 1
+            valid_json += parse_json(output) is not None
+            if key in judgments:
+                judged += 1
+                parsed = parse_json(judgments[key][0])
+                if parsed and isinstance(parsed.get("score"), (int, float)):
+                    scored += 1
+                    score_sum += float(parsed["score"])
+
+        answered = sum(confusion.values())
+        correct = sum(count for (expected, predicted), count in confusion.items() if expected == predicted)
+        per_class = {}
+        for label in URGENCY_LABELS[:-1]:
+            total = sum(count for (expected, _), count in confusion.items() if expected == label)
+            if total:
+                per_class[label] = round(confusion[(label, label)] / total, 4)
+        latencies.sort()
+        report[model] = {
+            "answered": answered,
+            "urgency_accuracy": round(correct / answered, 4) if answered else None,
+            "per_class_recall": per_class,
+            "missed_emergencies": sum(count for (expected, predicted), count in confusion.items()
+                                      if expected == "emergency" and predicted != "emergency"),
+            "response_json_valid_rate": round(valid_json / answered, 4) if answered else None,
+            "judge_json_valid_rate": round(scored / judged, 4) if judged else None,
+            "judge_mean_score": round(score_sum / scored, 2) if scored else None,
+            "p50_latency_ms": round(latencies[len(latencies) // 2], 1) if latencies else None,
+            "confusion": {f"{expected}->{predicted}": count for (expected, predicted), count in sorted(confusion.items())},
+        }
+    return report
+
+
+def print_report(report):
+    print(f"\n{'model':<16} {'answered':>8} {'urgency acc':>12} {'missed emerg':>13} {'judge':>6} {'p50 ms':>8}")
+    for model, row in sorted(report.items(), key=lambda item: -(item[1]["urgency_accuracy"] or 0)):
+        accuracy = f"{row['urgency_accuracy']:.1%}" if row["urgency_accuracy"] is not None else "-"
+        judge = f"{row['judge_mean_score']:.2f}" if row["judge_mean_score"] is not None else "-"
+        latency = f"{row['p50_latency_ms']:.0f}" if row["p50_latency_ms"] is not None else "-"
+        print(f"{model:<16} {row['answered']:>8,} {accuracy:>12} {row['missed_emergencies']:>13,} {judge:>6} {latency:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent, resumable offline model evaluation")
+    parser.add_argument("--run", required=True, help="Run name; reusing it resumes from the checkpoint")
+    parser.add_argument("--models", nargs="+", default=DEFAULT_MODELS)
+    parser.add_argument("--judge-model", default=DEFAULT_JUDGE)
+    parser.add_argument("--no-judge", action="store_true", help="Skip the qualitative LLM score")
+    parser.add_argument("--backend", choices=["cortex", "stub"], default="cortex")
+    parser.add_argument("--cases", help="JSONL file of cases (default: --table in Snowflake)")
+    parser.add_argument("--table", default="WELLNEST.PUBLIC.DIABETES_MODEL_EVALUATION")
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--synthetic-cases", type=int, help="Generate N synthetic cases (stub runs)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Calls in flight at once")
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--backoff", type=float, default=1.0, help="Seconds before the first retry")
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0)
+    parser.add_argument("--stub-failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    session = get_session() if args.backend == "cortex" else None
+    backend = CortexBackend(session) if session else StubBackend(args.stub_latency_ms, args.stub_failure_rate)
+
+    if args.synthetic_cases:
+        cases = synthetic_cases(args.synthetic_cases)
+    elif args.cases:
+        cases = cases_from_jsonl(args.cases)[:args.limit]
+    elif session:
+        cases = cases_from_table(session, args.table, args.limit)
+    else:
+        sys.exit("The stub backend needs --cases or --synthetic-cases")
+
+    store = ResultStore(os.path.join(RESULTS_DIR, f"{args.run}.sqlite"))
+    print(f"Run '{args.run}': {len(cases):,} cases x {len(args.models)} models, "
+          f"concurrency {args.concurrency}, store {os.path.relpath(store.path)}")
+
+    done = store.done("response")
+    run_stage("response", [(case["case_id"], model, model, case["prompt"])
+                           for model in args.models for case in cases
+                           if (case["case_id"], model) not in done],
+              backend, store, args.concurrency, args.retries, args.backoff)
+
+    if not args.no_judge:
+        responses, done = store.outputs("response"), store.done("judge")
+        jobs = []
+        for model in args.models:
+            for case in cases:
+                key = (case["case_id"], model)
+                if key in responses and key not in done:
+                    prompt = JUDGE_PROMPT.format(prompt=case["prompt"], expected=case.get("expected_completion", ""),
+                                                 response=responses[key][0])
+                    jobs.append((case["case_id"], model, args.judge_model, prompt))
+        run_stage("judge", jobs, backend, store, args.concurrency, args.retries, args.backoff)
+
+    report = evaluate(cases, args.models, store)
+    print_report(report)
+    for stage, count in store.errors():
+        print(f"⚠️ {count} {stage} call(s) failed after retries; rerun with --run {args.run} to retry them")
+
+    report_path = os.path.join(RESULTS_DIR, f"{args.run}_report.json")
+    with open(report_path, "w", encoding="utf-8") as handle:
+        json.dump({"run": args.run, "judge_model": None if args.no_judge else args.judge_model,
+                   "cases": len(cases), "models": report}, handle, indent=2)
+    print(f"Report: {os.path.relpath(report_path)}")
+
+
+if __name__ == "__main__":
+    main()
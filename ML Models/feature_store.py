@@ -0,0 +1,62 @@
+# =============================================================================
+# WELLNEST - LOCAL FEATURE STORE LOADER
+# =============================================================================
+# Reads the Parquet feature exports written by Pipeline/export_features.py.
+# Only the requested columns are decoded, files are memory-mapped, and the
+# exported dtypes carry through: dictionary columns arrive as pandas
+# categoricals and flags as booleans, so nothing is re-parsed from text.
+# Only the files listed in manifest.json are read: parts left behind by an
+# export that failed before saving its manifest are never loaded.
+#
+# Usage:
+#   from feature_store import load_features
+#   df = load_features('FTR_DIABETES_CONVERSATION_PROMPTS', columns=[...])
+# =============================================================================
+
+import json
+import os
+
+import pyarrow.dataset as ds
+import pyarrow.fs as fs
+import pyarrow.parquet as pq
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+DEFAULT_FEATURE_DIR = os.environ.get("WELLNEST_FEATURE_DIR", os.path.join(REPO_ROOT, "data", "features"))
+
+
+def table_dir(table_name, feature_dir=DEFAULT_FEATURE_DIR):
+    path = os.path.join(feature_dir, table_name.lower())
+    if not os.path.isdir(path):
+        raise FileNotFoundError(f"No export for {table_name} in {feature_dir}; run Pipeline/export_features.py")
+    return path
+
+
+def read_manifest(table_name, feature_dir=DEFAULT_FEATURE_DIR):
+    """Export manifest: watermark, schema and files of one table"""
+    with open(os.path.join(table_dir(table_name, feature_dir), "manifest.json"), encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def manifest_dataset(table_name, feature_dir=DEFAULT_FEATURE_DIR):
+    """Memory-mapped dataset over the files the manifest lists"""
+    path = table_dir(table_name, feature_dir)
+    files = [os.path.join(path, item["path"]) for item in read_manifest(table_name, feature_dir)["files"]]
+    return ds.dataset(files, format="parquet", partitioning="hive", partition_base_dir=path,
+                      filesystem=fs.LocalFileSystem(use_mmap=True))
+
+
+def load_table(table_name, columns=None, since=None, feature_dir=DEFAULT_FEATURE_DIR):
+    """Arrow table with only the requested columns, optionally from LOAD_DATE >= since"""
+    filters = pq.filters_to_expression([("LOAD_DATE", ">=", since)]) if since else None
+    return manifest_dataset(table_name, feature_dir).to_table(columns=columns, filter=filters)
+
+
+def load_features(table_name, columns=None, since=None, feature_dir=DEFAULT_FEATURE_DIR):
+    """Pandas DataFrame of the requested feature columns"""
+    table = load_table(table_name, columns=columns, since=since, feature_dir=feature_dir)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def available_columns(table_name, feature_dir=DEFAULT_FEATURE_DIR):
+    """Column names from the Parquet footers, without reading any data"""
+    return manifest_dataset(table_name, feature_dir).schema.names
@@ -0,0 +1,319 @@
+# =============================================================================
+# WELLNEST - TRIAGE MODEL TRAINING PIPELINE
+# =============================================================================
+# Scripted version of the training notebook, one JSON config per domain in
+# ML Models/configs/. For each domain:
+#   1. load the configured columns from the Parquet feature store
+#   2. stratified train / validation / test split (70-20-10 by default)
+#   3. per CV fold, fit preprocessing (LabelEncoder, StandardScaler, class
+#      weights or SMOTE) once and cache the arrays; every grid candidate of
+#      every model reuses them
+#   4. fan all (model, candidate, fold) fits out over one process pool; each
+#      fit is capped at --threads-per-fit BLAS/OpenMP threads so
+#      workers x threads matches the cores instead of oversubscribing them
+#   5. refit the best candidate per model on the full training split,
+#      calibrate on validation, evaluate on test
+# Each run writes runs/<domain>_<timestamp>/ with metrics.json (scores,
+# best params, stage timings) and the model artifacts in the notebook layout
+# that wellnest_core/triage_model.py loads.
+#
+# Requires scikit-learn >= 1.6 (sklearn.frozen.FrozenEstimator for calibration).
+# Usage:  python "ML Models/train_pipeline.py" --domains all [--workers 8] [--threads-per-fit 1]
+# =============================================================================
+
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.frozen import FrozenEstimator
+from sklearn.metrics import accuracy_score, classification_report, f1_score, get_scorer
+from sklearn.model_selection import StratifiedKFold, train_test_split
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+from sklearn.utils.class_weight import compute_sample_weight
+
+from feature_store import load_features
+
+ML_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_DIR = os.path.join(ML_DIR, "configs")
+RUNS_DIR = os.path.join(ML_DIR, "runs")
+CACHE_DIR = os.path.join(ML_DIR, ".fold_cache")
+DOMAINS = sorted(name[:-5] for name in os.listdir(CONFIG_DIR) if name.endswith(".json"))
+
+
+def load_config(domain):
+    with open(os.path.join(CONFIG_DIR, f"{domain}.json"), encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+# =============================================================================
+# PREPROCESSING
+# =============================================================================
+
+class Preprocessor:
+    """Notebook preprocessing: fill, label-encode categoricals, scale numerics"""
+
+    def fit(self, X):
+        self.columns = list(X.columns)
+        self.categorical = X.select_dtypes(include=["object", "category", "string"]).columns.tolist()
+        self.numerical = X.select_dtypes(include=["number"]).columns.difference(
+            X.select_dtypes(include=["bool"]).columns).tolist()
+        self.medians = X[self.numerical].median().to_dict()
+        self.modes = {column: (X[column].mode().iloc[0] if not X[column].mode().empty else "unknown")
+                      for column in self.categorical}
+        self.label_encoders = {column: LabelEncoder().fit(X[column].fillna(self.modes[column]).astype(str))
+                               for column in self.categorical}
+        self.scaler = StandardScaler()
+        if self.numerical:
+            self.scaler.fit(X[self.numerical].fillna(self.medians).astype(float))
+        return self
+
+    def transform(self, X):
+        X = X[self.columns].copy()
+        for column, encoder in self.label_encoders.items():
+            codes = {label: code for code, label in enumerate(encoder.classes_)}
+            X[column] = X[column].fillna(self.modes[column]).astype(str).map(codes).fillna(0).astype(int)
+        if self.numerical:
+            X[self.numerical] = self.scaler.transform(X[self.numerical].fillna(self.medians).astype(float))
+        # Remaining columns are flags (nullable booleans from Parquet); NULL counts as false
+        for column in X.columns.difference(self.categorical + self.numerical):
+            X[column] = X[column].fillna(False).astype(bool)
+        return X.astype("float32")
+
+
+def balance(X, y, config):
+    """(X, y, sample_weight) after the configured imbalance handling"""
+    if config["imbalance"] == "smote":
+        from imblearn.over_sampling import SMOTE
+        X, y = SMOTE(random_state=config["random_state"]).fit_resample(X, y)
+        return X, y, None
+    return X, y, compute_sample_weight("balanced", y)
+
+
+def cache_folds(X, y, config):
+    """Fit preprocessing per fold once; returns the cached fold file paths"""
+    key = joblib.hash((X, y, config["cv_folds"], config["imbalance"], config["random_state"]))
+    fold_dir = os.path.join(CACHE_DIR, f"{config['domain']}_{key}")
+    os.makedirs(fold_dir, exist_ok=True)
+    splitter = StratifiedKFold(n_splits=config["cv_folds"], shuffle=True, random_state=config["random_state"])
+
+    paths = []
+    for index, (train_idx, valid_idx) in enumerate(splitter.split(X, y)):
+        path = os.path.join(fold_dir, f"fold_{index}.joblib")
+        if not os.path.exists(path):
+            preprocessor = Preprocessor().fit(X.iloc[train_idx])
+            X_train, y_train, weights = balance(preprocessor.transform(X.iloc[train_idx]).to_numpy(),
+                                                y[train_idx], config)
+            joblib.dump({
+                "X_train": X_train, "y_train": y_train, "sample_weight": weights,
+                "X_valid": preprocessor.transform(X.iloc[valid_idx]).to_numpy(), "y_valid": y[valid_idx],
+            }, path)
+        paths.append(path)
+    return paths
+
+
+# =============================================================================
+# GRID SEARCH
+# =============================================================================
+
+def build_estimator(model_name, params, threads, random_state, probability=False):
+    if model_name == "xgboost":
+        from xgboost import XGBClassifier
+        return XGBClassifier(random_state=random_state, eval_metric="mlogloss", n_jobs=threads, **params)
+    if model_name == "random_forest":
+        from sklearn.ensemble import RandomForestClassifier
+        return RandomForestClassifier(random_state=random_state, n_jobs=threads, **params)
+    if model_name == "svm":
+        from sklearn.svm import SVC
+        return SVC(random_state=random_state, probability=probability, **params)
+    raise ValueError(f"Unknown model: {model_name}")
+
+
+def limit_threads(threads):
+    """Pool initializer: cap BLAS/OpenMP threads inside each worker"""
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(threads)
+
+
+def fit_candidate(task):
+    """Fit one (model, candidate, fold) on the cached fold arrays"""
+    fold = joblib.load(task["fold_path"], mmap_mode="r")
+    X_train, y_train, weights = fold["X_train"], fold["y_train"], fold["sample_weight"]
+    if task["max_rows"] and len(y_train) > task["max_rows"]:
+        keep = np.random.default_rng(task["random_state"]).choice(len(y_train), task["max_rows"], replace=False)
+        X_train, y_train = X_train[keep], y_train[keep]
+        weights = weights[keep] if weights is not None else None
+
+    estimator = build_estimator(task["model"], task["params"], task["threads"], task["random_state"])
+    started = time.perf_counter()
+    estimator.fit(X_train, y_train, sample_weight=weights)
+    fit_seconds = time.perf_counter() - started
+    score = get_scorer(task["scoring"])(estimator, fold["X_valid"], fold["y_valid"])
+    return task["model"], task["candidate"], task["fold"], float(score), fit_seconds
+
+
+def candidates(grid):
+    keys = sorted(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def grid_search(fold_paths, config, workers, threads):
+    """Mean CV score per candidate, all models and folds in one process pool"""
+    grids = {model: candidates(grid) for model, grid in config["models"].items()}
+    tasks = [
+        {"model": model, "candidate": index, "params": params, "fold": fold, "fold_path": path,
+         "threads": threads, "scoring": config["scoring"], "random_state": config["random_state"],
+         "max_rows": config.get("svm_max_rows") if model == "svm" else None}
+        for model, params_list in grids.items()
+        for index, params in enumerate(params_list)
+        for fold, path in enumerate(fold_paths)
+    ]
+    # Slowest models first so the long fits do not end up in the tail
+    order = {"svm": 0, "random_forest": 1, "xgboost": 2}
+    tasks.sort(key=lambda task: order.get(task["model"], 3))
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=limit_threads, initargs=(threads,)) as pool:
+        for future in as_completed([pool.submit(fit_candidate, task) for task in tasks]):
+            model, candidate, _, score, fit_seconds = future.result()
+            entry = results.setdefault((model, candidate), {"scores": [], "fit_seconds": 0.0})
+            entry["scores"].append(score)
+            entry["fit_seconds"] += fit_seconds
+
+    summary = {}
+    for model, params_list in grids.items():
+        rows = [{"params": params, "mean_score": float(np.mean(results[(model, index)]["scores"])),
+                 "std_score": float(np.std(results[(model, index)]["scores"])),
+                 "fit_seconds": round(results[(model, index)]["fit_seconds"], 2)}
+                for index, params in enumerate(params_list)]
+        rows.sort(key=lambda row: row["mean_score"], reverse=True)
+        summary[model] = rows
+    return summary, len(tasks)
+
+
+# =============================================================================
+# RUN
+# =============================================================================
+
+def evaluate(estimator, X, y, target_encoder):
+    predicted = estimator.predict(X)
+    return {
+        "accuracy": round(float(accuracy_score(y, predicted)), 4),
+        "f1_weighted": round(float(f1_score(y, predicted, average="weighted")), 4),
+        "report": classification_report(y, predicted, labels=range(len(target_encoder.classes_)),
+                                         target_names=[str(c) for c in target_encoder.classes_],
+                                         output_dict=True, zero_division=0),
+    }
+
+
+def train_domain(domain, workers, threads, feature_dir=None):
+    config = load_config(domain)
+    timings = {}
+    run_started = time.perf_counter()
+    run_dir = os.path.join(RUNS_DIR, f"{domain}_{datetime.now():%Y%m%d_%H%M%S}")
+    os.makedirs(run_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    kwargs = {"feature_dir": feature_dir} if feature_dir else {}
+    df = load_features(config["table"], columns=config["features"] + [config["target"]], **kwargs)
+    df = df[df[config["target"]].notna()].reset_index(drop=True)
+    target_encoder = LabelEncoder().fit(df[config["target"]].astype(str))
+    y = target_encoder.transform(df[config["target"]].astype(str))
+    X = df[config["features"]]
+    timings["load_seconds"] = time.perf_counter() - started
+
+    split, seed = config["split"], config["random_state"]
+    X_train, X_rest, y_train, y_rest = train_test_split(
+        X, y, test_size=split["test_size"] + split["val_size"], random_state=seed, stratify=y)
+    X_val, X_test, y_val, y_test = train_test_split(
+        X_rest, y_rest, test_size=split["test_size"] / (split["test_size"] + split["val_size"]),
+        random_state=seed, stratify=y_rest)
+
+    started = time.perf_counter()
+    fold_paths = cache_folds(X_train.reset_index(drop=True), y_train, config)
+    timings["fold_preprocessing_seconds"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    search, fits = grid_search(fold_paths, config, workers, threads)
+    timings["grid_search_seconds"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    preprocessor = Preprocessor().fit(X_train)
+    X_fit, y_fit, weights = balance(preprocessor.transform(X_train).to_numpy(), y_train, config)
+    X_val_ready, X_test_ready = preprocessor.transform(X_val).to_numpy(), preprocessor.transform(X_test).to_numpy()
+    all_threads = os.cpu_count() or 1
+    limit_threads(all_threads)
+
+    models = {}
+    for model_name, ranked in search.items():
+        estimator = build_estimator(model_name, ranked[0]["params"], all_threads, seed, probability=True)
+        estimator.fit(X_fit, y_fit, sample_weight=weights)
+        calibrator = CalibratedClassifierCV(FrozenEstimator(estimator), method="sigmoid").fit(X_val_ready, y_val)
+        artifact_path = os.path.join(run_dir, f"{domain}_{model_name}.joblib")
+        joblib.dump({
+            "model": estimator,
+            "calibrator": calibrator,
+            "scaler": preprocessor.scaler,
+            "label_encoders": preprocessor.label_encoders,
+            "medians": preprocessor.medians,
+            "modes": preprocessor.modes,
+            "target_encoder": target_encoder,
+            "feature_names": config["features"],
+            "target_column": config["target"],
+        }, artifact_path)
+        models[model_name] = {
+            "best_params": ranked[0]["params"],
+            "cv_score": round(ranked[0]["mean_score"], 4),
+            "validation": evaluate(estimator, X_val_ready, y_val, target_encoder),
+            "test": evaluate(estimator, X_test_ready, y_test, target_encoder),
+            "test_calibrated": evaluate(calibrator, X_test_ready, y_test, target_encoder),
+            "artifact": os.path.basename(artifact_path),
+        }
+    timings["refit_and_evaluate_seconds"] = time.perf_counter() - started
+    timings["total_seconds"] = time.perf_counter() - run_started
+
+    metrics = {
+        "domain": domain,
+        "config": config,
+        "rows": {"train": len(y_train), "validation": len(y_val), "test": len(y_test)},
+        "classes": [str(c) for c in target_encoder.classes_],
+        "parallelism": {"workers": workers, "threads_per_fit": threads, "cpu_count": os.cpu_count(),
+                        "grid_fits": fits},
+        "timings": {name: round(seconds, 2) for name, seconds in timings.items()},
+        "models": models,
+        "grid_search": search,
+    }
+    with open(os.path.join(run_dir, "metrics.json"), "w", encoding="utf-8") as handle:
+        json.dump(metrics, handle, indent=2, default=str)
+    return run_dir, metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train triage models for one or more domains")
+    parser.add_argument("--domains", nargs="+", default=["all"], choices=DOMAINS + ["all"])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes for the grid search")
+    parser.add_argument("--threads-per-fit", type=int, default=1,
+                        help="Threads inside each fit; keep workers x threads <= cores")
+    parser.add_argument("--feature-dir", help="Parquet export root (default: feature_store default)")
+    args = parser.parse_args()
+
+    domains = DOMAINS if "all" in args.domains else args.domains
+    for domain in domains:
+        print(f"Training {domain} with {args.workers} workers x {args.threads_per_fit} thread(s)...")
+        run_dir, metrics = train_domain(domain, args.workers, args.threads_per_fit, args.feature_dir)
+        for model_name, result in metrics["models"].items():
+            print(f"  {model_name:<14} cv {result['cv_score']:.4f}  "
+                  f"test acc {result['test']['accuracy']:.4f}  f1 {result['test']['f1_weighted']:.4f}")
+        print(f"  {metrics['parallelism']['grid_fits']} grid fits, "
+              f"{metrics['timings']['total_seconds']:.0f}s total -> {os.path.relpath(run_dir)}")
+
+
+if __name__ == "__main__":
+    main()
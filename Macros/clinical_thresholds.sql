@@ -0,0 +1,55 @@
+-- macros/clinical_thresholds.sql
+-- Description: Compile CASE ladders from the clinical_thresholds seed so the
+-- feature models, stored procedures and app share one set of cut-offs
+--
+-- Each bound carries an inclusive flag (>= / > and <= / <), so the ladders
+-- keep the operators of the CASE expressions they replaced; an empty bound is
+-- open-ended. The seed is
+-- read once per model at compile time (run `dbt seed` first); while parsing,
+-- the macros only register the dependency on the seed.
+
+
+{% macro clinical_threshold_bands(scale) %}
+    {% set thresholds = ref('clinical_thresholds') %}
+    {% if not execute %}
+        {{ return([]) }}
+    {% endif %}
+    {% set bands = run_query(
+        "select label, min_value, max_value, min_inclusive, max_inclusive from " ~ thresholds
+        ~ " where scale = '" ~ scale ~ "' order by coalesce(min_value, -1e18)"
+    ) %}
+    {% if bands.rows | length == 0 %}
+        {{ exceptions.raise_compiler_error("No clinical_thresholds rows for scale '" ~ scale ~ "'") }}
+    {% endif %}
+    {{ return(bands.rows) }}
+{% endmacro %}
+
+
+-- CASE expression mapping `expression` to the label of its band
+{% macro classify_threshold(expression, scale, default='unknown') %}
+    {%- set bands = clinical_threshold_bands(scale) -%}
+    CASE
+        {%- for band in bands %}
+        WHEN {% if band['min_value'] is not none %}{{ expression }} {{ '>=' if band['min_inclusive'] else '>' }} {{ band['min_value'] }}{% else %}{{ expression }} IS NOT NULL{% endif %}
+            {%- if band['max_value'] is not none %} AND {{ expression }} {{ '<=' if band['max_inclusive'] else '<' }} {{ band['max_value'] }}{% endif %} THEN '{{ band['label'] }}'
+        {%- endfor %}
+        ELSE '{{ default }}'
+    END
+{%- endmacro %}
+
+
+-- Inclusive lower bound of one band (callers compare with >=), for conditions
+-- that combine several measurements
+{% macro threshold_min(scale, label) %}
+    {%- set bands = clinical_threshold_bands(scale) -%}
+    {%- if not execute -%}
+        {{ return(0) }}
+    {%- endif -%}
+    {%- for band in bands if band['label'] == label and band['min_value'] is not none -%}
+        {%- if not band['min_inclusive'] -%}
+            {{ exceptions.raise_compiler_error("Lower bound of '" ~ label ~ "' in scale '" ~ scale ~ "' is exclusive") }}
+        {%- endif -%}
+        {{ return(band['min_value']) }}
+    {%- endfor -%}
+    {{ exceptions.raise_compiler_error("No lower bound for '" ~ label ~ "' in scale '" ~ scale ~ "'") }}
+{%- endmacro %}
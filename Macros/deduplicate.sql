@@ -0,0 +1,25 @@
+-- macros/deduplicate.sql
+-- Description: Fingerprint-based deduplication for the staging models
+--
+-- Instead of row_number() over (partition by <every key column> order by <one
+-- of them>), each row gets one fingerprint (row_hash over the key columns) and
+-- duplicates are removed with a single-column partition. The tie-breaker makes
+-- the kept row deterministic: rows are ordered by the non-key columns, so only
+-- fully identical rows are interchangeable. The fingerprint is stored in the
+-- model, so incremental runs skip already-seen rows before the window runs.
+
+
+{% macro dedup_by_fingerprint(relation, key_columns, tie_breaker=[], fingerprint_column='row_hash') %}
+    select *
+    from (
+        select
+            *,
+            {{ row_hash(key_columns) }} as {{ fingerprint_column }}
+        from {{ relation }}
+    ) fingerprinted
+    {{ where_unseen_row_hash(fingerprint_column) }}
+    qualify row_number() over (
+        partition by {{ fingerprint_column }}
+        order by {{ (tie_breaker + [fingerprint_column]) | join(', ') }}
+    ) = 1
+{% endmacro %}
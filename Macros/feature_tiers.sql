@@ -0,0 +1,23 @@
+-- macros/feature_tiers.sql
+-- Description: Physical layout of the core_clinical -> risk_urgency ->
+-- conversation_prompts feature chain, selected with the feature_tier_mode var
+--
+--   tables     every tier is its own incremental table (default)
+--   views      tier1/tier2 are views; only tier3 is written, in one pass
+--   ephemeral  tier1/tier2 are inlined as CTEs into tier3 (no objects created)
+--
+-- ref() targets and the schema.yml tests are the same in every mode.
+-- Example:  dbt run --full-refresh --vars '{feature_tier_mode: views}'
+
+
+{% macro feature_tier_materialization(tier) %}
+    {% set mode = var('feature_tier_mode', 'tables') %}
+    {% set modes = {'tables': 'incremental', 'views': 'view', 'ephemeral': 'ephemeral'} %}
+    {% if mode not in modes %}
+        {{ exceptions.raise_compiler_error("feature_tier_mode must be one of tables, views, ephemeral; got '" ~ mode ~ "'") }}
+    {% endif %}
+    {% if tier == 'tier3' %}
+        {{ return('incremental') }}
+    {% endif %}
+    {{ return(modes[mode]) }}
+{% endmacro %}
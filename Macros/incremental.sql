@@ -0,0 +1,39 @@
+-- macros/incremental.sql
+-- Description: Helpers for the incremental staging -> gold feature chain
+--
+-- The raw layer is append-only and has no load timestamp column, so:
+--   - staging models fingerprint each cleaned row (row_hash) and, on
+--     incremental runs, only keep raw rows whose hash is not already stored
+--   - gold feature models use the staging dbt_loaded_at as a watermark and
+--     only recompute rows loaded since their last run
+-- Run `dbt run --full-refresh` to rebuild everything from scratch.
+
+
+-- Deterministic hash over a list of (already cleaned) columns; NULLs are
+-- folded to a sentinel so they hash consistently on Snowflake and DuckDB
+{% macro row_hash(columns) -%}
+    md5(concat_ws('|'
+        {%- for column in columns %},
+        coalesce(cast({{ column }} as varchar), '~')
+        {%- endfor %}
+    ))
+{%- endmacro %}
+
+
+-- Anti-join against hashes already stored in this model (incremental runs only)
+{% macro where_unseen_row_hash(hash_column='row_hash') -%}
+    {%- if is_incremental() %}
+    where {{ hash_column }} not in (select {{ hash_column }} from {{ this }})
+    {%- endif %}
+{%- endmacro %}
+
+
+-- Watermark filter on the upstream load timestamp (incremental runs only)
+{% macro where_loaded_since_last_run(timestamp_column='dbt_loaded_at') -%}
+    {%- if is_incremental() %}
+    where {{ timestamp_column }} > (
+        select coalesce(max({{ timestamp_column }}), cast('1900-01-01' as timestamp))
+        from {{ this }}
+    )
+    {%- endif %}
+{%- endmacro %}
@@ -1,10 +1,34 @@
 -- =============================================================================
 -- CORTEX SEARCH SERVICE FOR CONVERSATIONS
 -- =============================================================================
+-- Deploy order on a fresh account:
+--   1. Misc/userDatabase.sql
+--   2. this file up to STEP 0, then the PUT commands listed there
+--      (SnowSQL / Snowflake CLI); the procedures below and
+--      Agents/workflow.sql import modules from that stage
+--   3. the rest of this file
+--   4. Agents/workflow.sql
+-- =============================================================================
 
 USE DATABASE WELLNEST;
 USE SCHEMA USER_MANAGEMENT;
 
+-- =============================================================================
+-- STEP 0: SHARED CODE STAGE (clinical thresholds, gold features)
+-- =============================================================================
+-- thresholds.py is generated from Seeds/clinical_thresholds.csv by
+-- Pipeline/export_thresholds.py; upload it after every regeneration, and
+-- features.py (used by GET_SMART_CONTEXT) whenever it changes. Both must be
+-- on the stage before any CREATE PROCEDURE below runs:
+--   PUT file://StreamLit/wellnest_core/thresholds.py @WELLNEST.MEDICAL_DATA.WELLNEST_CODE
+--       AUTO_COMPRESS = FALSE OVERWRITE = TRUE;
+--   PUT file://StreamLit/wellnest_core/features.py @WELLNEST.MEDICAL_DATA.WELLNEST_CODE
+--       AUTO_COMPRESS = FALSE OVERWRITE = TRUE;
+
+CREATE STAGE IF NOT EXISTS WELLNEST.MEDICAL_DATA.WELLNEST_CODE
+    COMMENT = 'Python modules shared by WellNest stored procedures';
+
+
 -- Create view WITHOUT non-deterministic functions
 CREATE OR REPLACE VIEW WELLNEST.USER_MANAGEMENT.VW_SEARCHABLE_CONVERSATIONS AS
 SELECT 
@@ -86,16 +110,16 @@ def get_smart_context(session, user_query, user_id, domain, session_id):
     # =========================================================================
     # 1. CURRENT SESSION CONTEXT
     # =========================================================================
-    current_session_query = f"""
+    current_session_query = """
     SELECT USER_MESSAGE, ASSISTANT_RESPONSE
     FROM WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY
-    WHERE USER_ID = '{user_id}' AND SESSION_ID = '{session_id}'
+    WHERE USER_ID = ? AND SESSION_ID = ?
     ORDER BY MESSAGE_TIMESTAMP DESC
     LIMIT 5
     """
     
     try:
-        current = session.sql(current_session_query).collect()
+        current = session.sql(current_session_query, params=[user_id, session_id]).collect()
         current_history = [{"user": r['USER_MESSAGE'], "assistant": r['ASSISTANT_RESPONSE']} for r in current]
         current_history.reverse()
     except:
@@ -104,13 +128,15 @@ def get_smart_context(session, user_query, user_id, domain, session_id):
     # =========================================================================
     # 2. SEMANTIC SEARCH using Cortex Search Service
     # =========================================================================
-    query_escaped = user_query.replace("'", "''")
-    
     # Calculate date 30 days ago for filtering
     thirty_days_ago = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+    search_filter = {
+        '@eq': {'user_id': user_id, 'routed_to_domain': domain},
+        '@gte': {'conversation_date': thirty_days_ago}
+    }
     
     # Use Cortex Search (FIXED - without days_ago filter)
-    search_query = f"""
+    search_query = """
     SELECT 
         conversation_id,
         user_message,
@@ -120,23 +146,15 @@ def get_smart_context(session, user_query, user_id, domain, session_id):
         urgency_level
     FROM TABLE(
         WELLNEST.USER_MANAGEMENT.CONVERSATION_SEARCH_SERVICE(
-            query => '{query_escaped}',
-            filter => {{
-                '@eq': {{
-                    'user_id': '{user_id}',
-                    'routed_to_domain': '{domain}'
-                }},
-                '@gte': {{
-                    'conversation_date': '{thirty_days_ago}'
-                }}
-            }},
+            query => ?,
+            filter => PARSE_JSON(?),
             limit => 3
         )
     )
     """
     
     try:
-        search_results = session.sql(search_query).collect()
+        search_results = session.sql(search_query, params=[user_query, json.dumps(search_filter)]).collect()
         similar_conversations = [
             {
                 "user_message": r['USER_MESSAGE'],
@@ -163,20 +181,20 @@ def get_smart_context(session, user_query, user_id, domain, session_id):
         metric_types = []
     
     for metric_type in metric_types:
-        trend_query = f"""
+        trend_query = """
         SELECT 
             METRIC_VALUE,
             MEASUREMENT_DATE,
             SEVERITY
         FROM WELLNEST.MEDICAL_DATA.HEALTH_METRICS
-        WHERE USER_ID = '{user_id}'
-          AND METRIC_TYPE = '{metric_type}'
+        WHERE USER_ID = ?
+          AND METRIC_TYPE = ?
           AND MEASUREMENT_DATE >= DATEADD(day, -90, CURRENT_DATE())
         ORDER BY MEASUREMENT_DATE ASC
         """
         
         try:
-            trend_results = session.sql(trend_query).collect()
+            trend_results = session.sql(trend_query, params=[user_id, metric_type]).collect()
             
             if trend_results:
                 values = [r['METRIC_VALUE'] for r in trend_results]
@@ -211,7 +229,7 @@ def get_smart_context(session, user_query, user_id, domain, session_id):
     # =========================================================================
     # 4. GET RECENT SUMMARIES
     # =========================================================================
-    summaries_query = f"""
+    summaries_query = """
     SELECT 
         SUMMARY_TEXT,
         KEY_TOPICS,
@@ -219,15 +237,15 @@ def get_smart_context(session, user_query, user_id, domain, session_id):
         IMPROVEMENT_AREAS,
         CONCERN_AREAS
     FROM WELLNEST.USER_MANAGEMENT.CONVERSATION_SUMMARIES
-    WHERE USER_ID = '{user_id}'
-      AND DOMAIN = '{domain}'
+    WHERE USER_ID = ?
+      AND DOMAIN = ?
       AND TIME_PERIOD_START >= DATEADD(day, -30, CURRENT_TIMESTAMP())
     ORDER BY TIME_PERIOD_START DESC
     LIMIT 2
     """
     
     try:
-        summary_results = session.sql(summaries_query).collect()
+        summary_results = session.sql(summaries_query, params=[user_id, domain]).collect()
         recent_summaries = [
             {
                 "summary": r['SUMMARY_TEXT'],
@@ -245,7 +263,7 @@ def get_smart_context(session, user_query, user_id, domain, session_id):
     # =========================================================================
     
     # Patient profile context
-    profile_query = f"""
+    profile_query = """
     SELECT 
         u.AGE, u.GENDER,
         p.BMI, p.HAS_DIABETES, p.HAS_HYPERTENSION, p.HAS_HEART_DISEASE,
@@ -253,11 +271,11 @@ def get_smart_context(session, user_query, user_id, domain, session_id):
         p.EXERCISE_FREQUENCY, p.IS_PREGNANT, p.PREGNANCY_TRIMESTER
     FROM WELLNEST.USER_MANAGEMENT.USERS u
     LEFT JOIN WELLNEST.USER_MANAGEMENT.USER_MEDICAL_PROFILES p ON u.USER_ID = p.USER_ID
-    WHERE u.USER_ID = '{user_id}'
+    WHERE u.USER_ID = ?
     """
     
     try:
-        profile = session.sql(profile_query).collect()[0].as_dict()
+        profile = session.sql(profile_query, params=[user_id]).collect()[0].as_dict()
     except:
         profile = {}
     
@@ -389,6 +407,8 @@ FROM TABLE(
 -- =============================================================================
 -- UPDATED: GET_SMART_CONTEXT with correct Cortex Search syntax
 -- =============================================================================
+-- Scores the user's gold features with features.py (upload it and
+-- thresholds.py to the WELLNEST_CODE stage first, see STEP 0 above)
 
 CREATE OR REPLACE PROCEDURE WELLNEST.USER_MANAGEMENT.GET_SMART_CONTEXT(
     USER_QUERY STRING,
@@ -399,36 +419,45 @@ CREATE OR REPLACE PROCEDURE WELLNEST.USER_MANAGEMENT.GET_SMART_CONTEXT(
 RETURNS VARIANT
 LANGUAGE PYTHON
 RUNTIME_VERSION = '3.10'
-PACKAGES = ('snowflake-snowpark-python')
+PACKAGES = ('snowflake-snowpark-python', 'numpy', 'pandas')
+IMPORTS = ('@WELLNEST.MEDICAL_DATA.WELLNEST_CODE/thresholds.py',
+           '@WELLNEST.MEDICAL_DATA.WELLNEST_CODE/features.py')
 HANDLER = 'get_smart_context'
 AS
 $$
 import json
+import logging
+from datetime import date
+
+import features
+
+logger = logging.getLogger("wellnest.get_smart_context")
 
 def get_smart_context(session, user_query, user_id, domain, session_id):
     """Get smart context using Cortex Search"""
     
-    # Current session
-    current_query = f"""
+    # Current session (with WELLNEST_OLTP_BACKEND=hybrid the app waits for
+    # replication into CONVERSATION_HISTORY before calling the specialist)
+    current_query = """
     SELECT USER_MESSAGE, ASSISTANT_RESPONSE
     FROM WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY
-    WHERE USER_ID = '{user_id}' AND SESSION_ID = '{session_id}'
+    WHERE USER_ID = ? AND SESSION_ID = ?
     ORDER BY MESSAGE_TIMESTAMP DESC
     LIMIT 5
     """
     
     try:
-        current = session.sql(current_query).collect()
+        current = session.sql(current_query, params=[user_id, session_id]).collect()
         current_history = [{"user": r['USER_MESSAGE'], "assistant": r['ASSISTANT_RESPONSE']} for r in current]
         current_history.reverse()
     except:
         current_history = []
     
     # Cortex Search - TRY DIFFERENT SYNTAXES
-    query_escaped = user_query.replace("'", "''")
+    search_filter = {'@eq': {'user_id': user_id, 'routed_to_domain': domain}}
     
     # Try syntax 1: !SEARCH method
-    search_query = f"""
+    search_query = """
     SELECT 
         user_message,
         assistant_response,
@@ -436,13 +465,8 @@ def get_smart_context(session, user_query, user_id, domain, session_id):
         routed_to_domain
     FROM TABLE(
         WELLNEST.USER_MANAGEMENT.CONVERSATION_SEARCH_SERVICE!SEARCH(
-            query => '{query_escaped}',
-            filter => {{
-                '@eq': {{
-                    'user_id': '{user_id}',
-                    'routed_to_domain': '{domain}'
-                }}
-            }}
+            query => ?,
+            filter => PARSE_JSON(?)
         )
     )
     LIMIT 3
@@ -451,7 +475,7 @@ def get_smart_context(session, user_query, user_id, domain, session_id):
     similar_conversations = []
     
     try:
-        search_results = session.sql(search_query).collect()
+        search_results = session.sql(search_query, params=[user_query, json.dumps(search_filter)]).collect()
         similar_conversations = [
             {
                 "user_message": r['USER_MESSAGE'],
@@ -476,25 +500,25 @@ def get_smart_context(session, user_query, user_id, domain, session_id):
             keywords.append("cholesterol")
         
         if keywords:
-            like_conditions = [f"LOWER(USER_MESSAGE) LIKE '%{kw}%'" for kw in keywords]
-            keyword_filter = " OR ".join(like_conditions)
+            # One statement for 1-3 keywords: unused LIKE slots are bound NULL
+            patterns = [f"%{kw}%" for kw in keywords] + [None] * (3 - len(keywords))
             
-            fallback_query = f"""
+            fallback_query = """
             SELECT 
                 USER_MESSAGE,
                 ASSISTANT_RESPONSE,
                 DATE(MESSAGE_TIMESTAMP) as conversation_date
             FROM WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY
-            WHERE USER_ID = '{user_id}'
-              AND ROUTED_TO_DOMAIN = '{domain}'
-              AND SESSION_ID != '{session_id}'
-              AND ({keyword_filter})
+            WHERE USER_ID = ?
+              AND ROUTED_TO_DOMAIN = ?
+              AND SESSION_ID != ?
+              AND (LOWER(USER_MESSAGE) LIKE ? OR LOWER(USER_MESSAGE) LIKE ? OR LOWER(USER_MESSAGE) LIKE ?)
             ORDER BY MESSAGE_TIMESTAMP DESC
             LIMIT 3
             """
             
             try:
-                fallback_results = session.sql(fallback_query).collect()
+                fallback_results = session.sql(fallback_query, params=[user_id, domain, session_id, *patterns]).collect()
                 similar_conversations = [
                     {
                         "user_message": r['USER_MESSAGE'],
@@ -510,24 +534,24 @@ def get_smart_context(session, user_query, user_id, domain, session_id):
     metric_trends = {}
     
     if domain == 'LIFESTYLE_DISEASES':
-        metric_types = ['blood_pressure_systolic', 'blood_sugar', 'hba1c', 'weight']
+        metric_types = ['blood_pressure_systolic', 'blood_pressure_diastolic', 'blood_sugar', 'hba1c', 'weight']
     elif domain == 'WOMEN_WELLNESS':
         metric_types = ['blood_pressure_systolic', 'blood_sugar', 'weight']
     else:
         metric_types = []
     
     for metric_type in metric_types:
-        trend_query = f"""
+        trend_query = """
         SELECT METRIC_VALUE, MEASUREMENT_DATE
         FROM WELLNEST.MEDICAL_DATA.HEALTH_METRICS
-        WHERE USER_ID = '{user_id}'
-          AND METRIC_TYPE = '{metric_type}'
+        WHERE USER_ID = ?
+          AND METRIC_TYPE = ?
           AND MEASUREMENT_DATE >= DATEADD(day, -90, CURRENT_DATE())
         ORDER BY MEASUREMENT_DATE ASC
         """
         
         try:
-            results = session.sql(trend_query).collect()
+            results = session.sql(trend_query, params=[user_id, metric_type]).collect()
             
             if results:
                 values = [r['METRIC_VALUE'] for r in results]
@@ -550,25 +574,38 @@ def get_smart_context(session, user_query, user_id, domain, session_id):
             pass
     
     # Get profile
-    profile_query = f"""
-    SELECT u.AGE, u.GENDER, p.BMI, p.HAS_DIABETES, p.HAS_HYPERTENSION, 
+    profile_query = """
+    SELECT u.DATE_OF_BIRTH, u.GENDER, p.BMI, p.HAS_DIABETES, p.HAS_HYPERTENSION, 
            p.HAS_HEART_DISEASE, p.HAS_MENTAL_HEALTH_HISTORY, p.HAS_PCOS,
            p.IS_PREGNANT, p.PREGNANCY_TRIMESTER, p.SMOKING_STATUS, p.EXERCISE_FREQUENCY
     FROM WELLNEST.USER_MANAGEMENT.USERS u
     LEFT JOIN WELLNEST.USER_MANAGEMENT.USER_MEDICAL_PROFILES p ON u.USER_ID = p.USER_ID
-    WHERE u.USER_ID = '{user_id}'
+    WHERE u.USER_ID = ?
     """
     
     try:
-        profile = session.sql(profile_query).collect()[0].as_dict()
-    except:
+        profile = session.sql(profile_query, params=[user_id]).collect()[0].as_dict()
+    except Exception:
+        logger.exception("Profile lookup failed for user %s", user_id)
         profile = {}
     
+    # Gold features for this user, computed like the dbt feature models
+    # (features.user_inputs derives AGE from DATE_OF_BIRTH)
+    try:
+        latest_metrics = {metric_type: data['current_value'] for metric_type, data in metric_trends.items()}
+        clinical_features = features.score_user(profile, latest_metrics) if profile else {}
+    except Exception:
+        logger.exception("Feature scoring failed for user %s", user_id)
+        clinical_features = {}
+    
     # Build contexts
     patient_context = "PATIENT PROFILE:\n"
     if profile:
-        if profile.get('AGE'):
-            patient_context += f"- Age: {profile['AGE']}\n"
+        birth = profile.get('DATE_OF_BIRTH')
+        if birth:
+            today = date.today()
+            age = today.year - birth.year - ((today.month, today.day) < (birth.month, birth.day))
+            patient_context += f"- Age: {age}\n"
         
         conditions = []
         if profile.get('HAS_DIABETES'): conditions.append("diabetes")
@@ -585,6 +622,10 @@ def get_smart_context(session, user_query, user_id, domain, session_id):
         if profile.get('BMI'):
             patient_context += f"- BMI: {profile['BMI']}\n"
     
+    if clinical_features:
+        patient_context += "- Clinical features: " + ", ".join(
+            f"{name.lower()}={value}" for name, value in clinical_features.items()) + "\n"
+    
     current_context = ""
     if current_history:
         current_context = "\n\nCURRENT CONVERSATION:\n"
@@ -614,6 +655,7 @@ def get_smart_context(session, user_query, user_id, domain, session_id):
         "current_context": current_context,
         "semantic_context": semantic_context,
         "metrics_context": metrics_context,
+        "clinical_features": clinical_features,
         "context_stats": {
             "current_turns": len(current_history),
             "similar_found": len(similar_conversations),
@@ -657,6 +699,7 @@ RETURNS VARIANT
 LANGUAGE PYTHON
 RUNTIME_VERSION = '3.10'
 PACKAGES = ('snowflake-snowpark-python')
+IMPORTS = ('@WELLNEST.MEDICAL_DATA.WELLNEST_CODE/thresholds.py')
 HANDLER = 'extract_metrics'
 AS
 $$
@@ -664,6 +707,8 @@ import json
 import re
 import uuid
 
+import thresholds
+
 def extract_metrics(session, user_message, assistant_response, user_id, conversation_id, domain):
     """Extract health metrics using pattern matching"""
     
@@ -742,62 +787,24 @@ def extract_metrics(session, user_message, assistant_response, user_id, conversa
         value = metric['value']
         unit = metric['unit']
         
-        # Determine severity
-        is_abnormal = False
-        severity = 'normal'
-        
-        if metric_type == 'blood_pressure_systolic':
-            if value >= 180: 
-                is_abnormal, severity = True, 'severe'
-            elif value >= 140: 
-                is_abnormal, severity = True, 'moderate'
-            elif value >= 130: 
-                is_abnormal, severity = True, 'mild'
-        elif metric_type == 'blood_pressure_diastolic':
-            if value >= 110: 
-                is_abnormal, severity = True, 'severe'
-            elif value >= 90: 
-                is_abnormal, severity = True, 'moderate'
-            elif value >= 80: 
-                is_abnormal, severity = True, 'mild'
-        elif metric_type == 'blood_sugar':
-            if value >= 250: 
-                is_abnormal, severity = True, 'severe'
-            elif value >= 180: 
-                is_abnormal, severity = True, 'moderate'
-            elif value >= 140: 
-                is_abnormal, severity = True, 'mild'
-        elif metric_type == 'hba1c':
-            if value >= 9.0: 
-                is_abnormal, severity = True, 'severe'
-            elif value >= 7.0: 
-                is_abnormal, severity = True, 'moderate'
-            elif value >= 6.5: 
-                is_abnormal, severity = True, 'mild'
+        # Determine severity (same bands as the dbt feature models)
+        is_abnormal, severity = thresholds.metric_severity(metric_type, value)
         
-        insert_query = f"""
+        insert_query = """
         INSERT INTO WELLNEST.MEDICAL_DATA.HEALTH_METRICS (
             METRIC_ID, USER_ID, CONVERSATION_ID, METRIC_TYPE,
             METRIC_VALUE, METRIC_UNIT, MEASUREMENT_DATE, REPORTED_DATE,
             SOURCE, CONFIDENCE_SCORE, IS_ABNORMAL, SEVERITY
-        ) VALUES (
-            '{metric_id}', 
-            '{user_id}', 
-            '{conversation_id}', 
-            '{metric_type}',
-            {value}, 
-            '{unit}', 
-            CURRENT_DATE(), 
-            CURRENT_TIMESTAMP(),
-            'conversation_extracted', 
-            0.95,
-            {is_abnormal}, 
-            '{severity}'
         )
+        SELECT ?, ?, ?, ?, ?, ?, CURRENT_DATE(), CURRENT_TIMESTAMP(),
+               'conversation_extracted', 0.95, ?, ?
         """
         
         try:
-            session.sql(insert_query).collect()
+            session.sql(insert_query, params=[
+                metric_id, user_id, conversation_id, metric_type,
+                value, unit, is_abnormal, severity
+            ]).collect()
             saved_count += 1
         except Exception as e:
             errors.append(f"{metric_type}: {str(e)}")
@@ -838,17 +845,17 @@ import json
 def get_trends(session, user_id, metric_type, days_back):
     """Get metric trends"""
     
-    query = f"""
+    query = """
     SELECT METRIC_VALUE, METRIC_UNIT, MEASUREMENT_DATE
     FROM WELLNEST.MEDICAL_DATA.HEALTH_METRICS
-    WHERE USER_ID = '{user_id}'
-      AND METRIC_TYPE = '{metric_type}'
-      AND MEASUREMENT_DATE >= DATEADD(day, -{days_back}, CURRENT_DATE())
+    WHERE USER_ID = ?
+      AND METRIC_TYPE = ?
+      AND MEASUREMENT_DATE >= DATEADD(day, -?, CURRENT_DATE())
     ORDER BY MEASUREMENT_DATE ASC
     """
     
     try:
-        results = session.sql(query).collect()
+        results = session.sql(query, params=[user_id, metric_type, int(days_back)]).collect()
         
         if not results:
             return {"metric_type": metric_type, "data_points": 0, "trend": "no_data"}
@@ -903,15 +910,15 @@ import json
 def summarize_session(session, user_id, session_id):
     """Summarize conversation session"""
     
-    messages_query = f"""
+    messages_query = """
     SELECT USER_MESSAGE, ASSISTANT_RESPONSE, ROUTED_TO_DOMAIN
     FROM WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY
-    WHERE USER_ID = '{user_id}' AND SESSION_ID = '{session_id}'
+    WHERE USER_ID = ? AND SESSION_ID = ?
     ORDER BY MESSAGE_TIMESTAMP ASC
     """
     
     try:
-        results = session.sql(messages_query).collect()
+        results = session.sql(messages_query, params=[user_id, session_id]).collect()
         
         if not results or len(results) < 2:
             return {"summary_created": False, "reason": "Not enough messages"}
@@ -935,13 +942,11 @@ JSON format:
     "summary_text": "2-3 sentences"
 }}"""
 
-        prompt_escaped = summary_prompt.replace("'", "''")
-        
-        claude_query = f"""
-        SELECT SNOWFLAKE.CORTEX.COMPLETE('claude-sonnet-4', '{prompt_escaped}') AS summary
+        claude_query = """
+        SELECT SNOWFLAKE.CORTEX.COMPLETE('claude-sonnet-4', ?) AS summary
         """
         
-        result = session.sql(claude_query).collect()
+        result = session.sql(claude_query, params=[summary_prompt]).collect()
         response = result[0]['SUMMARY'].strip()
         
         if '```json' in response:
@@ -953,28 +958,27 @@ JSON format:
         summary_id = str(__import__('uuid').uuid4())
         
         concerns = summary_data.get('key_concerns', [])
-        topics_sql = "NULL"
-        if concerns:
-            topics_sql = f"ARRAY_CONSTRUCT('" + "', '".join(concerns) + "')"
-        
-        metrics_json = json.dumps(summary_data.get('metrics_mentioned', {})).replace("'", "''")
-        summary_escaped = summary_data.get('summary_text', '').replace("'", "''")
+        topics_json = json.dumps(concerns) if concerns else None
+        metrics_json = json.dumps(summary_data.get('metrics_mentioned', {}))
         
-        insert_query = f"""
+        insert_query = """
         INSERT INTO WELLNEST.USER_MANAGEMENT.CONVERSATION_SUMMARIES (
             SUMMARY_ID, USER_ID, SUMMARY_TYPE, SUMMARY_TEXT,
             KEY_TOPICS, DOMAIN, MENTIONED_METRICS,
             TIME_PERIOD_START, TIME_PERIOD_END, CREATED_AT
         )
         SELECT 
-            '{summary_id}', '{user_id}', 'session_summary', '{summary_escaped}',
-            {topics_sql}, '{domain}', PARSE_JSON('{metrics_json}'),
+            ?, ?, 'session_summary', ?,
+            TO_ARRAY(TRY_PARSE_JSON(?)), ?, PARSE_JSON(?),
             MIN(MESSAGE_TIMESTAMP), MAX(MESSAGE_TIMESTAMP), CURRENT_TIMESTAMP()
         FROM WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY
-        WHERE SESSION_ID = '{session_id}'
+        WHERE SESSION_ID = ?
         """
         
-        session.sql(insert_query).collect()
+        session.sql(insert_query, params=[
+            summary_id, user_id, summary_data.get('summary_text', ''),
+            topics_json, domain, metrics_json, session_id
+        ]).collect()
         
         return {"summary_created": True, "summary_id": summary_id, "summary": summary_data}
     
@@ -1066,7 +1070,6 @@ Pregnancy complications need immediate medical evaluation."""
     }
     
     system_prompt = system_prompts.get(domain, system_prompts["LIFESTYLE_DISEASES"])
-    user_query_escaped = user_query.replace("'", "''")
     
     full_prompt = f"""{system_prompt}
 
@@ -1078,21 +1081,16 @@ Pregnancy complications need immediate medical evaluation."""
 
 {context.get('semantic_context', '')}
 
-CURRENT QUESTION: {user_query_escaped}
+CURRENT QUESTION: {user_query}
 
 Provide a helpful, personalized response:"""
 
-    prompt_escaped = full_prompt.replace("'", "''")
-    
-    cortex_query = f"""
-    SELECT SNOWFLAKE.CORTEX.COMPLETE(
-        '{specialist_model}',
-        '{prompt_escaped}'
-    ) AS response
+    cortex_query = """
+    SELECT SNOWFLAKE.CORTEX.COMPLETE(?, ?) AS response
     """
     
     try:
-        result = session.sql(cortex_query).collect()
+        result = session.sql(cortex_query, params=[specialist_model, full_prompt]).collect()
         return result[0]['RESPONSE']
     except Exception as e:
         return f"Error: {str(e)}"
@@ -1195,15 +1193,7 @@ CREATE TABLE IF NOT EXISTS WELLNEST.MEDICAL_DATA.HEALTH_METRICS (
         REFERENCES WELLNEST.USER_MANAGEMENT.USERS(USER_ID)
 );
 
--- Create indexes for performance
-CREATE INDEX IF NOT EXISTS idx_health_metrics_user 
-    ON WELLNEST.MEDICAL_DATA.HEALTH_METRICS(USER_ID);
-
-CREATE INDEX IF NOT EXISTS idx_health_metrics_type 
-    ON WELLNEST.MEDICAL_DATA.HEALTH_METRICS(METRIC_TYPE);
-
-CREATE INDEX IF NOT EXISTS idx_health_metrics_date 
-    ON WELLNEST.MEDICAL_DATA.HEALTH_METRICS(MEASUREMENT_DATE);
+-- Clustering key (USER_ID, METRIC_TYPE, MEASUREMENT_DATE): Misc/physical_design.sql
 
 -- Grant permissions
 GRANT SELECT, INSERT, UPDATE, DELETE ON TABLE WELLNEST.MEDICAL_DATA.HEALTH_METRICS 
@@ -1245,12 +1235,7 @@ CREATE TABLE IF NOT EXISTS WELLNEST.USER_MANAGEMENT.CONVERSATION_SUMMARIES (
         REFERENCES WELLNEST.USER_MANAGEMENT.USERS(USER_ID)
 );
 
--- Create indexes
-CREATE INDEX IF NOT EXISTS idx_conversation_summaries_user 
-    ON WELLNEST.USER_MANAGEMENT.CONVERSATION_SUMMARIES(USER_ID);
-
-CREATE INDEX IF NOT EXISTS idx_conversation_summaries_time 
-    ON WELLNEST.USER_MANAGEMENT.CONVERSATION_SUMMARIES(TIME_PERIOD_START);
+-- Clustering key (USER_ID, TO_DATE(TIME_PERIOD_START)): Misc/physical_design.sql
 
 -- Grant permissions
 GRANT SELECT, INSERT, UPDATE, DELETE ON TABLE WELLNEST.USER_MANAGEMENT.CONVERSATION_SUMMARIES 
@@ -0,0 +1,248 @@
+-- =============================================================================
+-- WELLNEST - HYBRID TABLES FOR THE PER-USER HOT PATHS
+-- =============================================================================
+-- Login, registration, profile edits, saving a chat turn and reading the
+-- current chat session are single-row statements. Served from standard
+-- tables each one costs a warehouse round trip; hybrid tables keep a row
+-- store with primary-key and secondary indexes that answers them in
+-- milliseconds.
+--
+-- The app reaches these tables through StreamLit/wellnest_core/oltp.py with
+-- WELLNEST_OLTP_BACKEND=hybrid:
+--   - statements are pointed from the analytical table to its WELLNEST.OLTP
+--     counterpart by name
+--   - every successful write is replayed against the analytical table by a
+--     background thread (seconds of lag), so Cortex Search, the stored
+--     procedures and the dbt models keep reading USER_MANAGEMENT.*
+--   - OLTP_RECONCILE merges anything a process lost before shipping it
+--
+-- Column definitions mirror Misc/userDatabase.sql; keep them in sync.
+-- Run after userDatabase.sql, then set WELLNEST_OLTP_BACKEND=hybrid.
+-- =============================================================================
+
+USE DATABASE WELLNEST;
+USE WAREHOUSE WELLNEST;
+
+CREATE SCHEMA IF NOT EXISTS WELLNEST.OLTP;
+
+
+-- =============================================================================
+-- Step 1: HYBRID TABLES
+-- =============================================================================
+
+CREATE HYBRID TABLE IF NOT EXISTS WELLNEST.OLTP.USERS (
+    USER_ID VARCHAR(36) PRIMARY KEY,
+    EMAIL VARCHAR(255) NOT NULL,
+    HASHED_PASSWORD VARCHAR(255) NOT NULL,
+    FULL_NAME VARCHAR(255) NOT NULL,
+    DATE_OF_BIRTH DATE,
+    GENDER VARCHAR(50),
+    PHONE_NUMBER VARCHAR(20),
+    ACCOUNT_STATUS VARCHAR(20) DEFAULT 'active',
+    CREATED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    LAST_LOGIN TIMESTAMP_NTZ,
+    FAILED_LOGIN_ATTEMPTS INTEGER DEFAULT 0,
+    ACCOUNT_LOCKED_UNTIL TIMESTAMP_NTZ,
+    EMAIL_VERIFIED BOOLEAN DEFAULT FALSE,
+    TERMS_ACCEPTED BOOLEAN DEFAULT FALSE,
+    PRIVACY_CONSENT BOOLEAN DEFAULT FALSE,
+    TOKENS_VALID_AFTER INTEGER,
+    UNIQUE (EMAIL)                                      -- Enforced here: login lookup + duplicate signups
+);
+
+CREATE HYBRID TABLE IF NOT EXISTS WELLNEST.OLTP.USER_MEDICAL_PROFILES (
+    PROFILE_ID VARCHAR(36) PRIMARY KEY,
+    USER_ID VARCHAR(36) NOT NULL,
+    HEIGHT_CM FLOAT,
+    WEIGHT_KG FLOAT,
+    BMI FLOAT,
+    BLOOD_TYPE VARCHAR(10),
+    HAS_DIABETES BOOLEAN DEFAULT FALSE,
+    HAS_HYPERTENSION BOOLEAN DEFAULT FALSE,
+    HAS_HEART_DISEASE BOOLEAN DEFAULT FALSE,
+    HAS_MENTAL_HEALTH_HISTORY BOOLEAN DEFAULT FALSE,
+    HAS_PCOS BOOLEAN DEFAULT FALSE,
+    SMOKING_STATUS VARCHAR(50),
+    ALCOHOL_CONSUMPTION VARCHAR(50),
+    EXERCISE_FREQUENCY VARCHAR(50),
+    IS_PREGNANT BOOLEAN DEFAULT FALSE,
+    PREGNANCY_TRIMESTER INTEGER,
+    MENSTRUAL_CYCLE_REGULAR BOOLEAN,
+    LAST_MENSTRUAL_PERIOD DATE,
+    EMERGENCY_CONTACT_NAME VARCHAR(255),
+    EMERGENCY_CONTACT_PHONE VARCHAR(20),
+    EMERGENCY_CONTACT_RELATIONSHIP VARCHAR(100),
+    CREATED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    LAST_UPDATED TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    INDEX IDX_PROFILES_USER (USER_ID)
+);
+
+-- Recent turns only (see OLTP_PURGE_TURNS); full history lives in
+-- USER_MANAGEMENT.CONVERSATION_HISTORY
+CREATE HYBRID TABLE IF NOT EXISTS WELLNEST.OLTP.CONVERSATION_TURNS (
+    CONVERSATION_ID VARCHAR(36) PRIMARY KEY,
+    USER_ID VARCHAR(36) NOT NULL,
+    SESSION_ID VARCHAR(36) NOT NULL,
+    MESSAGE_TIMESTAMP TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    USER_MESSAGE VARCHAR(10000) NOT NULL,
+    ASSISTANT_RESPONSE VARCHAR(10000) NOT NULL,
+    ROUTED_TO_DOMAIN VARCHAR(50),
+    USED_LLM_MODEL VARCHAR(100),
+    ROUTER_CONFIDENCE_SCORE FLOAT,
+    URGENCY_LEVEL VARCHAR(20),
+    DETECTED_SYMPTOMS ARRAY,
+    FOLLOW_UP_RECOMMENDED BOOLEAN DEFAULT FALSE,
+    REFERENCED_DOCUMENTS ARRAY,
+    USED_MEDICAL_PROFILE BOOLEAN DEFAULT TRUE,
+    RESPONSE_TIME_SECONDS FLOAT,
+    TOKENS_USED INTEGER,
+    INDEX IDX_TURNS_SESSION (SESSION_ID, MESSAGE_TIMESTAMP),   -- SESSION_MESSAGES_SQL, SESSION_MESSAGE_COUNT_SQL
+    INDEX IDX_TURNS_TIMESTAMP (MESSAGE_TIMESTAMP)              -- Reconcile window and purge
+);
+
+CREATE HYBRID TABLE IF NOT EXISTS WELLNEST.OLTP.REVOKED_SESSIONS (
+    TOKEN_ID VARCHAR(36) PRIMARY KEY,
+    USER_ID VARCHAR(36) NOT NULL,
+    REVOKED_AT TIMESTAMP_NTZ DEFAULT SYSDATE(),                 -- UTC
+    EXPIRES_AT TIMESTAMP_NTZ NOT NULL,
+    INDEX IDX_REVOKED_EXPIRES (EXPIRES_AT)                      -- ACTIVE_REVOCATIONS_SQL
+);
+
+
+-- =============================================================================
+-- Step 2: BACKFILL FROM THE ANALYTICAL TABLES
+-- =============================================================================
+
+INSERT INTO WELLNEST.OLTP.USERS
+SELECT * FROM WELLNEST.USER_MANAGEMENT.USERS;
+
+INSERT INTO WELLNEST.OLTP.USER_MEDICAL_PROFILES
+SELECT * FROM WELLNEST.USER_MANAGEMENT.USER_MEDICAL_PROFILES;
+
+INSERT INTO WELLNEST.OLTP.CONVERSATION_TURNS
+SELECT * FROM WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY
+WHERE MESSAGE_TIMESTAMP >= DATEADD(day, -7, CURRENT_TIMESTAMP());
+
+INSERT INTO WELLNEST.OLTP.REVOKED_SESSIONS
+SELECT * FROM WELLNEST.USER_MANAGEMENT.REVOKED_SESSIONS
+WHERE EXPIRES_AT > SYSDATE();              -- EXPIRES_AT is UTC
+
+
+-- =============================================================================
+-- Step 3: RECONCILE (safety net for the in-process replication)
+-- =============================================================================
+-- Writes are replayed by the app within seconds; this catches the ones a
+-- process lost (crash, restart, dropped after retries). The store wins.
+
+CREATE OR REPLACE PROCEDURE WELLNEST.OLTP.RECONCILE_ANALYTICAL()
+RETURNS VARCHAR
+LANGUAGE SQL
+AS
+$$
+BEGIN
+    MERGE INTO WELLNEST.USER_MANAGEMENT.USERS t
+    USING WELLNEST.OLTP.USERS s
+    ON t.USER_ID = s.USER_ID
+    WHEN MATCHED AND HASH(t.*) <> HASH(s.*) THEN UPDATE SET
+        EMAIL = s.EMAIL, HASHED_PASSWORD = s.HASHED_PASSWORD, FULL_NAME = s.FULL_NAME,
+        DATE_OF_BIRTH = s.DATE_OF_BIRTH, GENDER = s.GENDER, PHONE_NUMBER = s.PHONE_NUMBER,
+        ACCOUNT_STATUS = s.ACCOUNT_STATUS, LAST_LOGIN = s.LAST_LOGIN,
+        FAILED_LOGIN_ATTEMPTS = s.FAILED_LOGIN_ATTEMPTS, ACCOUNT_LOCKED_UNTIL = s.ACCOUNT_LOCKED_UNTIL,
+        EMAIL_VERIFIED = s.EMAIL_VERIFIED, TERMS_ACCEPTED = s.TERMS_ACCEPTED,
+        PRIVACY_CONSENT = s.PRIVACY_CONSENT, TOKENS_VALID_AFTER = s.TOKENS_VALID_AFTER
+    WHEN NOT MATCHED THEN INSERT VALUES (
+        s.USER_ID, s.EMAIL, s.HASHED_PASSWORD, s.FULL_NAME, s.DATE_OF_BIRTH, s.GENDER,
+        s.PHONE_NUMBER, s.ACCOUNT_STATUS, s.CREATED_AT, s.LAST_LOGIN, s.FAILED_LOGIN_ATTEMPTS,
+        s.ACCOUNT_LOCKED_UNTIL, s.EMAIL_VERIFIED, s.TERMS_ACCEPTED, s.PRIVACY_CONSENT,
+        s.TOKENS_VALID_AFTER);
+
+    MERGE INTO WELLNEST.USER_MANAGEMENT.USER_MEDICAL_PROFILES t
+    USING WELLNEST.OLTP.USER_MEDICAL_PROFILES s
+    ON t.PROFILE_ID = s.PROFILE_ID
+    WHEN MATCHED AND HASH(t.*) <> HASH(s.*) THEN UPDATE SET
+        HEIGHT_CM = s.HEIGHT_CM, WEIGHT_KG = s.WEIGHT_KG, BMI = s.BMI, BLOOD_TYPE = s.BLOOD_TYPE,
+        HAS_DIABETES = s.HAS_DIABETES, HAS_HYPERTENSION = s.HAS_HYPERTENSION,
+        HAS_HEART_DISEASE = s.HAS_HEART_DISEASE, HAS_MENTAL_HEALTH_HISTORY = s.HAS_MENTAL_HEALTH_HISTORY,
+        HAS_PCOS = s.HAS_PCOS, SMOKING_STATUS = s.SMOKING_STATUS,
+        ALCOHOL_CONSUMPTION = s.ALCOHOL_CONSUMPTION, EXERCISE_FREQUENCY = s.EXERCISE_FREQUENCY,
+        IS_PREGNANT = s.IS_PREGNANT, PREGNANCY_TRIMESTER = s.PREGNANCY_TRIMESTER,
+        MENSTRUAL_CYCLE_REGULAR = s.MENSTRUAL_CYCLE_REGULAR, LAST_MENSTRUAL_PERIOD = s.LAST_MENSTRUAL_PERIOD,
+        EMERGENCY_CONTACT_NAME = s.EMERGENCY_CONTACT_NAME, EMERGENCY_CONTACT_PHONE = s.EMERGENCY_CONTACT_PHONE,
+        EMERGENCY_CONTACT_RELATIONSHIP = s.EMERGENCY_CONTACT_RELATIONSHIP, LAST_UPDATED = s.LAST_UPDATED
+    WHEN NOT MATCHED THEN INSERT VALUES (
+        s.PROFILE_ID, s.USER_ID, s.HEIGHT_CM, s.WEIGHT_KG, s.BMI, s.BLOOD_TYPE,
+        s.HAS_DIABETES, s.HAS_HYPERTENSION, s.HAS_HEART_DISEASE, s.HAS_MENTAL_HEALTH_HISTORY, s.HAS_PCOS,
+        s.SMOKING_STATUS, s.ALCOHOL_CONSUMPTION, s.EXERCISE_FREQUENCY,
+        s.IS_PREGNANT, s.PREGNANCY_TRIMESTER, s.MENSTRUAL_CYCLE_REGULAR, s.LAST_MENSTRUAL_PERIOD,
+        s.EMERGENCY_CONTACT_NAME, s.EMERGENCY_CONTACT_PHONE, s.EMERGENCY_CONTACT_RELATIONSHIP,
+        s.CREATED_AT, s.LAST_UPDATED);
+
+    -- Turns are insert-only; look back past the longest replication backlog
+    MERGE INTO WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY t
+    USING (
+        SELECT * FROM WELLNEST.OLTP.CONVERSATION_TURNS
+        WHERE MESSAGE_TIMESTAMP >= DATEADD(hour, -2, CURRENT_TIMESTAMP())
+    ) s
+    ON t.CONVERSATION_ID = s.CONVERSATION_ID
+    WHEN NOT MATCHED THEN INSERT VALUES (
+        s.CONVERSATION_ID, s.USER_ID, s.SESSION_ID, s.MESSAGE_TIMESTAMP, s.USER_MESSAGE,
+        s.ASSISTANT_RESPONSE, s.ROUTED_TO_DOMAIN, s.USED_LLM_MODEL, s.ROUTER_CONFIDENCE_SCORE,
+        s.URGENCY_LEVEL, s.DETECTED_SYMPTOMS, s.FOLLOW_UP_RECOMMENDED, s.REFERENCED_DOCUMENTS,
+        s.USED_MEDICAL_PROFILE, s.RESPONSE_TIME_SECONDS, s.TOKENS_USED);
+
+    MERGE INTO WELLNEST.USER_MANAGEMENT.REVOKED_SESSIONS t
+    USING WELLNEST.OLTP.REVOKED_SESSIONS s
+    ON t.TOKEN_ID = s.TOKEN_ID
+    WHEN NOT MATCHED THEN INSERT VALUES (s.TOKEN_ID, s.USER_ID, s.REVOKED_AT, s.EXPIRES_AT);
+
+    RETURN 'reconciled';
+END;
+$$;
+
+CREATE OR REPLACE TASK WELLNEST.OLTP.OLTP_RECONCILE
+    WAREHOUSE = WELLNEST
+    SCHEDULE = '15 MINUTE'
+AS
+    CALL WELLNEST.OLTP.RECONCILE_ANALYTICAL();
+
+
+-- =============================================================================
+-- Step 4: KEEP THE ROW STORE SMALL
+-- =============================================================================
+-- Only the current session is read from CONVERSATION_TURNS; older turns are
+-- dropped once the analytical table has them.
+
+CREATE OR REPLACE TASK WELLNEST.OLTP.OLTP_PURGE_TURNS
+    WAREHOUSE = WELLNEST
+    SCHEDULE = 'USING CRON 0 3 * * * UTC'
+AS
+    DELETE FROM WELLNEST.OLTP.CONVERSATION_TURNS t
+    USING WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY h
+    WHERE t.CONVERSATION_ID = h.CONVERSATION_ID
+      AND t.MESSAGE_TIMESTAMP < DATEADD(day, -7, CURRENT_TIMESTAMP());
+
+CREATE OR REPLACE TASK WELLNEST.OLTP.OLTP_PURGE_REVOCATIONS
+    WAREHOUSE = WELLNEST
+    SCHEDULE = 'USING CRON 15 3 * * * UTC'
+AS
+    DELETE FROM WELLNEST.OLTP.REVOKED_SESSIONS
+    WHERE EXPIRES_AT < SYSDATE();          -- EXPIRES_AT is UTC
+
+ALTER TASK WELLNEST.OLTP.OLTP_RECONCILE RESUME;
+ALTER TASK WELLNEST.OLTP.OLTP_PURGE_TURNS RESUME;
+ALTER TASK WELLNEST.OLTP.OLTP_PURGE_REVOCATIONS RESUME;
+
+
+-- =============================================================================
+-- Step 5: VERIFY
+-- =============================================================================
+
+SHOW HYBRID TABLES IN SCHEMA WELLNEST.OLTP;
+SHOW INDEXES IN SCHEMA WELLNEST.OLTP;
+
+SELECT
+    (SELECT COUNT(*) FROM WELLNEST.OLTP.USERS) AS OLTP_USERS,
+    (SELECT COUNT(*) FROM WELLNEST.USER_MANAGEMENT.USERS) AS ANALYTICAL_USERS,
+    (SELECT COUNT(*) FROM WELLNEST.OLTP.CONVERSATION_TURNS) AS OLTP_TURNS;
+
+SELECT '✅ OLTP hybrid tables ready - set WELLNEST_OLTP_BACKEND=hybrid' AS STATUS;
@@ -0,0 +1,98 @@
+-- =============================================================================
+-- WELLNEST - PHYSICAL DESIGN (CLUSTERING KEYS + SEARCH OPTIMIZATION)
+-- =============================================================================
+-- Snowflake standard tables have no secondary indexes (CREATE INDEX only
+-- applies to hybrid tables), so the app's access paths are served by
+-- micro-partition pruning:
+--   - clustering keys for the user-scoped tables, which are always read as
+--     "one user's rows, newest first / within a date range"
+--   - search optimization for point lookups on columns that are not the
+--     leading clustering key (login by EMAIL, session by SESSION_ID,
+--     document by DOCUMENT_ID)
+--
+-- Query patterns and the statements they come from:
+--   CONVERSATION_HISTORY   USER_ID (+ SESSION_ID), ORDER BY MESSAGE_TIMESTAMP
+--                          statements.CONVERSATION_HISTORY_SQL, SESSION_MESSAGES_SQL,
+--                          GET_SMART_CONTEXT current session / fallback search
+--                          SESSION_ID only: SESSION_MESSAGE_COUNT_SQL, SUMMARIZE_SESSION
+--   UPLOADED_DOCUMENTS     USER_ID, ORDER BY UPLOAD_TIMESTAMP; DOCUMENT_ID updates
+--   HEALTH_METRICS         USER_ID + METRIC_TYPE + MEASUREMENT_DATE range
+--   CONVERSATION_SUMMARIES USER_ID + DOMAIN + TIME_PERIOD_START range
+--   USERS                  EMAIL (login), USER_ID (profile joins)
+--
+-- Every pattern filters on one USER_ID first, but USER_ID is a random UUID:
+-- as a raw clustering key it has one distinct value per user, so clustering
+-- depth and reclustering cost grow with the user base. The keys lead with
+-- the bucket SUBSTR(USER_ID, 1, 3) instead - at most 4096 values however
+-- many users sign up (uuid4 hex digits are uniform, so buckets stay even).
+-- Partitions then hold a narrow USER_ID range, and `USER_ID = ?` still
+-- prunes to the user's bucket, about 1/4096 of the table, before the
+-- second key (date, or metric type + date) narrows it further. Timestamps
+-- are reduced to dates for the same reason. The cost is that a user's rows
+-- share their partitions with the other users of the bucket; compare
+-- partitions scanned per pattern before and after.
+-- Automatic clustering and search optimization both bill credits in
+-- the background; they only pay off once a table spans many
+-- micro-partitions. Measure before and after with
+-- Benchmarks/pruning_benchmark.py:
+--   python Benchmarks/pruning_benchmark.py --label before
+--   python Benchmarks/pruning_benchmark.py --apply
+--   (wait for automatic clustering, see --clustering)
+--   python Benchmarks/pruning_benchmark.py --label after --compare before
+--
+-- Single-row hot paths (login, profile, current chat session) can be moved
+-- off these tables entirely onto hybrid tables: Misc/oltp_hybrid.sql.
+-- =============================================================================
+
+USE DATABASE WELLNEST;
+
+
+-- =============================================================================
+-- Step 1: CLUSTERING KEYS (user-scoped tables)
+-- =============================================================================
+
+-- Leading key is the USER_ID bucket SUBSTR(USER_ID, 1, 3) (see header)
+
+ALTER TABLE WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY
+    CLUSTER BY (SUBSTR(USER_ID, 1, 3), TO_DATE(MESSAGE_TIMESTAMP));
+
+ALTER TABLE WELLNEST.MEDICAL_DATA.UPLOADED_DOCUMENTS
+    CLUSTER BY (SUBSTR(USER_ID, 1, 3), TO_DATE(UPLOAD_TIMESTAMP));
+
+ALTER TABLE WELLNEST.MEDICAL_DATA.HEALTH_METRICS
+    CLUSTER BY (SUBSTR(USER_ID, 1, 3), METRIC_TYPE, MEASUREMENT_DATE);
+
+ALTER TABLE WELLNEST.USER_MANAGEMENT.CONVERSATION_SUMMARIES
+    CLUSTER BY (SUBSTR(USER_ID, 1, 3), TO_DATE(TIME_PERIOD_START));
+
+
+-- =============================================================================
+-- Step 2: SEARCH OPTIMIZATION (point lookups)
+-- =============================================================================
+
+ALTER TABLE WELLNEST.USER_MANAGEMENT.USERS
+    ADD SEARCH OPTIMIZATION ON EQUALITY(EMAIL, USER_ID);
+
+ALTER TABLE WELLNEST.USER_MANAGEMENT.USER_MEDICAL_PROFILES
+    ADD SEARCH OPTIMIZATION ON EQUALITY(USER_ID);
+
+ALTER TABLE WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY
+    ADD SEARCH OPTIMIZATION ON EQUALITY(SESSION_ID, CONVERSATION_ID);
+
+ALTER TABLE WELLNEST.MEDICAL_DATA.UPLOADED_DOCUMENTS
+    ADD SEARCH OPTIMIZATION ON EQUALITY(DOCUMENT_ID);
+
+
+-- =============================================================================
+-- Step 3: VERIFY
+-- =============================================================================
+
+SHOW TABLES LIKE 'CONVERSATION_HISTORY' IN SCHEMA WELLNEST.USER_MANAGEMENT;
+
+SELECT SYSTEM$CLUSTERING_INFORMATION('WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY');
+SELECT SYSTEM$CLUSTERING_INFORMATION('WELLNEST.MEDICAL_DATA.HEALTH_METRICS');
+
+DESCRIBE SEARCH OPTIMIZATION ON WELLNEST.USER_MANAGEMENT.USERS;
+DESCRIBE SEARCH OPTIMIZATION ON WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY;
+
+SELECT '✅ Physical design applied' AS STATUS;
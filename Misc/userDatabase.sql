@@ -42,9 +42,13 @@ CREATE TABLE IF NOT EXISTS WELLNEST.USER_MANAGEMENT.USERS (
     ACCOUNT_LOCKED_UNTIL TIMESTAMP_NTZ,                 -- Temporary lock after failed attempts
     EMAIL_VERIFIED BOOLEAN DEFAULT FALSE,               -- Email verification status
     TERMS_ACCEPTED BOOLEAN DEFAULT FALSE,               -- Legal agreement tracking
-    PRIVACY_CONSENT BOOLEAN DEFAULT FALSE               -- HIPAA/privacy consent
+    PRIVACY_CONSENT BOOLEAN DEFAULT FALSE,              -- HIPAA/privacy consent
+    TOKENS_VALID_AFTER INTEGER                          -- Unix time; session tokens issued earlier are revoked
 );
 
+-- Existing deployments
+ALTER TABLE WELLNEST.USER_MANAGEMENT.USERS ADD COLUMN IF NOT EXISTS TOKENS_VALID_AFTER INTEGER;
+
 -- Security indexes
 -- CREATE INDEX IF NOT EXISTS idx_users_email 
 --     ON WELLNEST.USER_MANAGEMENT.USERS(EMAIL);
@@ -202,6 +206,21 @@ CREATE TABLE IF NOT EXISTS WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY (
 -- CREATE INDEX IF NOT EXISTS idx_conv_history_timestamp 
 --     ON WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY(MESSAGE_TIMESTAMP);
 
+-- =============================================================================
+-- Step 5B: REVOKED SESSION TOKENS
+-- =============================================================================
+
+-- 5B.1: Logged-out session tokens (signed tokens are otherwise validated locally)
+CREATE TABLE IF NOT EXISTS WELLNEST.USER_MANAGEMENT.REVOKED_SESSIONS (
+    TOKEN_ID VARCHAR(36) PRIMARY KEY,                   -- Token jti claim
+    USER_ID VARCHAR(36) NOT NULL,                       -- Token owner
+    REVOKED_AT TIMESTAMP_NTZ DEFAULT SYSDATE(),         -- UTC
+    EXPIRES_AT TIMESTAMP_NTZ NOT NULL,                  -- UTC; row can be purged after this
+    
+    -- Foreign Key Constraint
+    FOREIGN KEY (USER_ID) REFERENCES WELLNEST.USER_MANAGEMENT.USERS(USER_ID)
+);
+
 -- =============================================================================
 -- Step 6: APPLICATION LOGS TABLE (Optional but recommended)
 -- =============================================================================
@@ -237,6 +256,25 @@ CREATE TABLE IF NOT EXISTS WELLNEST.APP_LOGS.APPLICATION_LOGS (
 -- CREATE INDEX IF NOT EXISTS idx_logs_level 
 --     ON WELLNEST.APP_LOGS.APPLICATION_LOGS(LOG_LEVEL);
 
+-- 6.2: Per-stage chat turn latency (one row per stage per turn, written by
+--      wellnest_core/telemetry.py; stage 'total' is the whole turn)
+CREATE TABLE IF NOT EXISTS WELLNEST.APP_LOGS.TURN_SPANS (
+    SPAN_ID VARCHAR(36) PRIMARY KEY,
+    CONVERSATION_ID VARCHAR(36) NOT NULL,               -- CONVERSATION_HISTORY row of the turn
+    USER_ID VARCHAR(36),
+    SESSION_ID VARCHAR(36),
+    TURN_TIMESTAMP TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    
+    -- Span Details
+    ROUTED_TO_DOMAIN VARCHAR(50),                       -- Router domain / out_of_scope / emergency_triage
+    STAGE VARCHAR(50) NOT NULL,                         -- emergency_scan/router/context/specialist/...
+    STAGE_ORDER INTEGER,                                -- Position of the stage within the turn
+    START_OFFSET_MS FLOAT,                              -- Start relative to the turn start
+    DURATION_MS FLOAT NOT NULL,
+    LLM_MODEL VARCHAR(100)                              -- Specialist model of the turn
+)
+CLUSTER BY (TO_DATE(TURN_TIMESTAMP));
+
 -- =============================================================================
 -- Step 7: CREATE INITIAL ADMIN USER (For Testing)
 -- =============================================================================
@@ -370,8 +408,7 @@ SELECT
 FROM WELLNEST.USER_MANAGEMENT.USERS;
 
 
--- 3. Check indexes
-SHOW INDEXES IN SCHEMA WELLNEST.USER_MANAGEMENT;
+-- 3. Clustering keys and search optimization: Misc/physical_design.sql
 
 ALTER TABLE WELLNEST.MEDICAL_DATA.UPLOADED_DOCUMENTS
    ADD COLUMN FILE_CONTENT_BASE64 VARCHAR(16777216);
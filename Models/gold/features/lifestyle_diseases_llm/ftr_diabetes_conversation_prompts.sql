@@ -2,13 +2,15 @@
 
 {{
     config(
-        materialized='table',
+        materialized=feature_tier_materialization('tier3'),
+        unique_key='row_hash',
         tags=['features', 'lifestyle_diseases', 'tier3']
     )
 }}
 
 WITH risk_features AS (
     SELECT * FROM {{ ref('ftr_diabetes_risk_urgency') }}
+    {{ where_loaded_since_last_run() }}
 ),
 
 conversation_features AS (
@@ -2,13 +2,15 @@
 
 {{
     config(
-        materialized='table',
+        materialized=feature_tier_materialization('tier1'),
+        unique_key='row_hash',
         tags=['features', 'lifestyle_diseases', 'tier1']
     )
 }}
 
 WITH base_data AS (
     SELECT * FROM {{ ref('stg_diabetes_cleaned') }}
+    {{ where_loaded_since_last_run() }}
 ),
 
 core_features AS (
@@ -18,24 +20,10 @@ core_features AS (
         -- ===== DIABETES SEVERITY FEATURES =====
         
         -- HbA1c-based diabetes staging (ADA guidelines)
-        CASE 
-            WHEN HBA1C_LEVEL < 5.7 THEN 'normal'
-            WHEN HBA1C_LEVEL BETWEEN 5.7 AND 6.4 THEN 'prediabetes'
-            WHEN HBA1C_LEVEL BETWEEN 6.5 AND 7.9 THEN 'diabetes_controlled'
-            WHEN HBA1C_LEVEL BETWEEN 8.0 AND 9.9 THEN 'diabetes_uncontrolled'
-            WHEN HBA1C_LEVEL >= 10.0 THEN 'diabetes_severe'
-            ELSE 'unknown'
-        END AS diabetes_stage,
+        {{ classify_threshold('HBA1C_LEVEL', 'diabetes_stage') }} AS diabetes_stage,
         
         -- Glucose control status (fasting glucose assumption)
-        CASE 
-            WHEN BLOOD_GLUCOSE_LEVEL < 100 THEN 'normal'
-            WHEN BLOOD_GLUCOSE_LEVEL BETWEEN 100 AND 125 THEN 'prediabetes_range'
-            WHEN BLOOD_GLUCOSE_LEVEL BETWEEN 126 AND 180 THEN 'diabetes_mild'
-            WHEN BLOOD_GLUCOSE_LEVEL BETWEEN 181 AND 250 THEN 'diabetes_moderate'
-            WHEN BLOOD_GLUCOSE_LEVEL > 250 THEN 'diabetes_severe'
-            ELSE 'unknown'
-        END AS glucose_control_status,
+        {{ classify_threshold('BLOOD_GLUCOSE_LEVEL', 'glucose_control_status') }} AS glucose_control_status,
         
         -- Glucose-HbA1c concordance (are they telling same story?)
         CASE 
@@ -49,15 +37,7 @@ core_features AS (
         -- ===== BMI & METABOLIC FEATURES =====
         
         -- BMI categories (WHO classification)
-        CASE 
-            WHEN BMI < 18.5 THEN 'underweight'
-            WHEN BMI BETWEEN 18.5 AND 24.9 THEN 'normal'
-            WHEN BMI BETWEEN 25.0 AND 29.9 THEN 'overweight'
-            WHEN BMI BETWEEN 30.0 AND 34.9 THEN 'obese_class1'
-            WHEN BMI BETWEEN 35.0 AND 39.9 THEN 'obese_class2'
-            WHEN BMI >= 40.0 THEN 'obese_class3_severe'
-            ELSE 'unknown'
-        END AS bmi_category,
+        {{ classify_threshold('BMI', 'bmi_category') }} AS bmi_category,
         
         -- Obesity flag (BMI >= 30)
         CASE WHEN BMI >= 30.0 THEN TRUE ELSE FALSE END AS is_obese,
@@ -2,13 +2,15 @@
 
 {{
     config(
-        materialized='table',
+        materialized=feature_tier_materialization('tier2'),
+        unique_key='row_hash',
         tags=['features', 'lifestyle_diseases', 'tier2']
     )
 }}
 
 WITH core_features AS (
     SELECT * FROM {{ ref('ftr_diabetes_core_clinical') }}
+    {{ where_loaded_since_last_run() }}
 ),
 
 risk_urgency_features AS (
@@ -18,27 +20,13 @@ risk_urgency_features AS (
         -- ===== EMERGENCY/URGENCY INDICATORS =====
         
         -- Hyperglycemic emergency risk (DKA/HHS risk)
-        CASE 
-            WHEN BLOOD_GLUCOSE_LEVEL > 400 THEN 'emergency_hyperglycemia'
-            WHEN BLOOD_GLUCOSE_LEVEL BETWEEN 300 AND 400 THEN 'urgent_hyperglycemia'
-            WHEN BLOOD_GLUCOSE_LEVEL BETWEEN 250 AND 299 THEN 'concerning_hyperglycemia'
-            ELSE 'stable'
-        END AS hyperglycemia_urgency,
+        {{ classify_threshold('BLOOD_GLUCOSE_LEVEL', 'hyperglycemia_urgency', default='stable') }} AS hyperglycemia_urgency,
         
         -- Hypoglycemia risk (especially dangerous)
-        CASE 
-            WHEN BLOOD_GLUCOSE_LEVEL < 54 THEN 'emergency_hypoglycemia'
-            WHEN BLOOD_GLUCOSE_LEVEL BETWEEN 54 AND 70 THEN 'urgent_hypoglycemia'
-            ELSE 'no_hypoglycemia'
-        END AS hypoglycemia_urgency,
+        {{ classify_threshold('BLOOD_GLUCOSE_LEVEL', 'hypoglycemia_urgency', default='no_hypoglycemia') }} AS hypoglycemia_urgency,
         
         -- Overall glucose urgency flag
-        CASE 
-            WHEN BLOOD_GLUCOSE_LEVEL < 54 OR BLOOD_GLUCOSE_LEVEL > 400 THEN 'emergency'
-            WHEN (BLOOD_GLUCOSE_LEVEL BETWEEN 54 AND 70) OR (BLOOD_GLUCOSE_LEVEL BETWEEN 300 AND 400) THEN 'urgent'
-            WHEN BLOOD_GLUCOSE_LEVEL BETWEEN 250 AND 299 THEN 'needs_attention'
-            ELSE 'routine'
-        END AS glucose_urgency_level,
+        {{ classify_threshold('BLOOD_GLUCOSE_LEVEL', 'glucose_urgency_level', default='routine') }} AS glucose_urgency_level,
         
         -- ===== COMPOSITE RISK SCORES =====
         
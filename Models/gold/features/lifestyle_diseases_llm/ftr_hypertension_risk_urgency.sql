@@ -2,13 +2,15 @@
 
 {{
     config(
-        materialized='table',
+        materialized=feature_tier_materialization('tier2'),
+        unique_key='row_hash',
         tags=['features', 'lifestyle_diseases', 'hypertension', 'tier2']
     )
 }}
 
 WITH core_features AS (
     SELECT * FROM {{ ref('ftr_hypertension_core_clinical') }}
+    {{ where_loaded_since_last_run() }}
 ),
 
 risk_urgency_features AS (
@@ -19,8 +21,8 @@ risk_urgency_features AS (
         
         -- Hypertensive crisis detection
         CASE 
-            WHEN SYSTOLIC_BP >= 180 OR DIASTOLIC_BP >= 120 THEN 'hypertensive_crisis_emergency'
-            WHEN SYSTOLIC_BP >= 160 OR DIASTOLIC_BP >= 100 THEN 'severe_urgency'
+            WHEN SYSTOLIC_BP >= {{ threshold_min('bp_systolic_urgency', 'hypertensive_crisis_emergency') }} OR DIASTOLIC_BP >= {{ threshold_min('bp_diastolic_urgency', 'hypertensive_crisis_emergency') }} THEN 'hypertensive_crisis_emergency'
+            WHEN SYSTOLIC_BP >= {{ threshold_min('bp_systolic_urgency', 'severe_urgency') }} OR DIASTOLIC_BP >= {{ threshold_min('bp_diastolic_urgency', 'severe_urgency') }} THEN 'severe_urgency'
             WHEN bp_stage = 'stage2_hypertension' THEN 'moderate_urgency'
             WHEN bp_stage = 'stage1_hypertension' THEN 'needs_attention'
             ELSE 'routine'
@@ -28,7 +30,7 @@ risk_urgency_features AS (
         
         -- Crisis with symptoms flag (would need symptom data, but flag for discussion)
         CASE 
-            WHEN SYSTOLIC_BP >= 180 OR DIASTOLIC_BP >= 120 THEN TRUE 
+            WHEN SYSTOLIC_BP >= {{ threshold_min('bp_systolic_urgency', 'hypertensive_crisis_emergency') }} OR DIASTOLIC_BP >= {{ threshold_min('bp_diastolic_urgency', 'hypertensive_crisis_emergency') }} THEN TRUE 
             ELSE FALSE 
         END AS potential_hypertensive_emergency,
         
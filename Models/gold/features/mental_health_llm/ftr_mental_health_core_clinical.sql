@@ -2,13 +2,15 @@
 
 {{
     config(
-        materialized='table',
+        materialized=feature_tier_materialization('tier1'),
+        unique_key='row_hash',
         tags=['features', 'mental_health', 'tier1']
     )
 }}
 
 WITH base_data AS (
     SELECT * FROM {{ ref('stg_mental_health_cleaned') }}
+    {{ where_loaded_since_last_run() }}
 ),
 
 core_features AS (
@@ -18,6 +20,7 @@ core_features AS (
         -- ===== AGE CALCULATION & CATEGORIZATION =====
         
         -- Calculate age from survey timestamp (assuming survey was in 2014 based on data)
+        -- (incremental runs keep the value computed at load; --full-refresh recomputes it)
         YEAR(CURRENT_DATE()) - YEAR(SURVEY_TIMESTAMP) AS calculated_age,
         
         -- Age category for mental health risk
@@ -2,13 +2,15 @@
 
 {{
     config(
-        materialized='table',
+        materialized=feature_tier_materialization('tier3'),
+        unique_key='row_hash',
         tags=['features', 'womens_wellness', 'maternal_health', 'tier3']
     )
 }}
 
 WITH risk_features AS (
     SELECT * FROM {{ ref('ftr_maternal_health_risk_urgency') }}
+    {{ where_loaded_since_last_run() }}
 ),
 
 conversation_features AS (
@@ -2,13 +2,15 @@
 
 {{
     config(
-        materialized='table',
+        materialized=feature_tier_materialization('tier1'),
+        unique_key='row_hash',
         tags=['features', 'womens_wellness', 'maternal_health', 'tier1']
     )
 }}
 
 WITH base_data AS (
     SELECT * FROM {{ ref('stg_maternal_health_cleaned') }}
+    {{ where_loaded_since_last_run() }}
 ),
 
 core_features AS (
@@ -2,13 +2,15 @@
 
 {{
     config(
-        materialized='table',
+        materialized=feature_tier_materialization('tier2'),
+        unique_key='row_hash',
         tags=['features', 'womens_wellness', 'maternal_health', 'tier2']
     )
 }}
 
 WITH core_features AS (
     SELECT * FROM {{ ref('ftr_maternal_health_core_clinical') }}
+    {{ where_loaded_since_last_run() }}
 ),
 
 risk_urgency_features AS (
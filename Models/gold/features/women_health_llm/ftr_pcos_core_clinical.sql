@@ -2,13 +2,15 @@
 
 {{
     config(
-        materialized='table',
+        materialized=feature_tier_materialization('tier1'),
+        unique_key='row_hash',
         tags=['features', 'womens_wellness', 'pcos', 'tier1']
     )
 }}
 
 WITH base_data AS (
     SELECT * FROM {{ ref('stg_pcos_cleaned') }}
+    {{ where_loaded_since_last_run() }}
 ),
 
 core_features AS (
@@ -127,15 +129,7 @@ core_features AS (
         -- ===== BMI FEATURES (Metabolic Component) =====
         
         -- BMI category (WHO classification)
-        CASE 
-            WHEN BMI < 18.5 THEN 'underweight'
-            WHEN BMI BETWEEN 18.5 AND 24.9 THEN 'normal'
-            WHEN BMI BETWEEN 25.0 AND 29.9 THEN 'overweight'
-            WHEN BMI BETWEEN 30.0 AND 34.9 THEN 'obese_class1'
-            WHEN BMI BETWEEN 35.0 AND 39.9 THEN 'obese_class2'
-            WHEN BMI >= 40.0 THEN 'obese_class3_severe'
-            ELSE 'unknown'
-        END AS bmi_category,
+        {{ classify_threshold('BMI', 'bmi_category') }} AS bmi_category,
         
         -- Obesity flag (BMI >= 30, worsens PCOS)
         CASE 
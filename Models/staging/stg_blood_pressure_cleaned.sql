@@ -3,7 +3,8 @@
 -- Source: WELLNEST.PUBLIC.RAW_DIABETES_DATA
 
 {{ config(
-    materialized='table',
+    materialized='incremental',
+    unique_key='row_hash',
     alias='stg_bloodpressure_cleaned',
     tags=['bloddpressure', 'cleaning']
 ) }}
@@ -62,25 +63,30 @@ cleaned as (
         end as is_valid_record,
         
         -- Metadata
-        current_timestamp() as dbt_loaded_at
+        {{ dbt.current_timestamp() }} as dbt_loaded_at
         
     from source_data
 ),
 
-deduplicated as (
-    select 
-        *,
-        row_number() over (
-            partition by 
-                country, gender, age, bmi, cholesterol,
-                systolic_bp, diastolic_bp, smoking_status,
-                physical_activity_level, hypertension_status
-            order by country
-        ) as row_num
-    from cleaned
+valid as (
+    select * from cleaned
     where is_valid_record = true
 ),
 
+-- One row per fingerprint; incremental runs skip fingerprints already stored
+deduplicated as (
+    {{ dedup_by_fingerprint('valid', [
+        'country', 'gender', 'age', 'bmi',
+        'cholesterol', 'systolic_bp', 'diastolic_bp', 'smoking_status',
+        'physical_activity_level', 'hypertension_status'
+    ], tie_breaker=[
+        'education_level', 'employment_status', 'heart_rate', 'ldl',
+        'hdl', 'triglycerides', 'glucose', 'alcohol_intake',
+        'salt_intake', 'sleep_duration', 'stress_level', 'has_family_history',
+        'has_diabetes'
+    ]) }}
+),
+
 final as (
     select 
         country,
@@ -106,9 +112,9 @@ final as (
         has_family_history,
         has_diabetes,
         hypertension_status,
+        row_hash,
         dbt_loaded_at
     from deduplicated
-    where row_num = 1
 )
 
 select * from final
\ No newline at end of file
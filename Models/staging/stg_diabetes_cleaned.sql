@@ -3,7 +3,8 @@
 -- Source: WELLNEST.PUBLIC.RAW_DIABETES_DATA
 
 {{ config(
-    materialized='table',
+    materialized='incremental',
+    unique_key='row_hash',
     alias='stg_diabetes_cleaned',
     tags=['diabetes', 'cleaning']
 ) }}
@@ -43,31 +44,25 @@ cleaned as (
         end as is_valid_record,
         
         -- Metadata
-        current_timestamp() as dbt_loaded_at
+        {{ dbt.current_timestamp() }} as dbt_loaded_at
         
     from source_data
 ),
 
-deduplicated as (
-    select 
-        *,
-        row_number() over (
-            partition by 
-                gender,
-                age,
-                has_hypertension,
-                has_heart_disease,
-                smoking_history,
-                bmi,
-                hba1c_level,
-                blood_glucose_level,
-                has_diabetes
-            order by gender
-        ) as row_num
-    from cleaned
+valid as (
+    select * from cleaned
     where is_valid_record = true
 ),
 
+-- One row per fingerprint; incremental runs skip fingerprints already stored
+deduplicated as (
+    {{ dedup_by_fingerprint('valid', [
+        'gender', 'age', 'has_hypertension', 'has_heart_disease',
+        'smoking_history', 'bmi', 'hba1c_level', 'blood_glucose_level',
+        'has_diabetes'
+    ]) }}
+),
+
 final as (
     select 
         gender,
@@ -79,9 +74,9 @@ final as (
         hba1c_level,
         blood_glucose_level,
         has_diabetes,
+        row_hash,
         dbt_loaded_at
     from deduplicated
-    where row_num = 1
 )
 
 select * from final
\ No newline at end of file
@@ -3,7 +3,8 @@
 -- Source: WELLNEST.PUBLIC.RAW_MATERNALHEALTH_DATA
 
 {{ config(
-    materialized='table',
+    materialized='incremental',
+    unique_key='row_hash',
     alias='stg_maternalhealth_cleaned',
     tags=['maternal_health', 'cleaning']
 ) }}
@@ -39,25 +40,24 @@ cleaned as (
         end as is_valid_record,
         
         -- Metadata
-        current_timestamp() as dbt_loaded_at
+        {{ dbt.current_timestamp() }} as dbt_loaded_at
         
     from source_data
 ),
 
-deduplicated as (
-    select 
-        *,
-        row_number() over (
-            partition by 
-                age, systolic_bp, diastolic_bp,
-                blood_sugar, body_temperature, heart_rate,
-                risk_level
-            order by age
-        ) as row_num
-    from cleaned
+valid as (
+    select * from cleaned
     where is_valid_record = true
 ),
 
+-- One row per fingerprint; incremental runs skip fingerprints already stored
+deduplicated as (
+    {{ dedup_by_fingerprint('valid', [
+        'age', 'systolic_bp', 'diastolic_bp', 'blood_sugar',
+        'body_temperature', 'heart_rate', 'risk_level'
+    ]) }}
+),
+
 final as (
     select 
         age,
@@ -67,9 +67,9 @@ final as (
         body_temperature,
         heart_rate,
         risk_level,
+        row_hash,
         dbt_loaded_at
     from deduplicated
-    where row_num = 1
 )
 
 select * from final
\ No newline at end of file
@@ -4,7 +4,8 @@
 -- Target: WELLNEST.PUBLIC.stg_mental_health_cleaned
 
 {{ config(
-    materialized='table',
+    materialized='incremental',
+    unique_key='row_hash',
     alias='stg_mental_health_cleaned',
     tags=['mental_health']
 ) }}
@@ -58,39 +59,27 @@ cleaned as (
         end as is_valid_record,
         
         -- Metadata
-        current_timestamp() as dbt_loaded_at
+        {{ dbt.current_timestamp() }} as dbt_loaded_at
         
     from source_data
 ),
 
-deduplicated as (
-    select 
-        *,
-        row_number() over (
-            partition by 
-                survey_timestamp,
-                gender,
-                country,
-                occupation,
-                is_self_employed,
-                has_family_history,
-                receiving_treatment,
-                days_indoors,
-                growing_stress,
-                changes_habits,
-                mental_health_history,
-                mood_swings,
-                has_coping_struggles,
-                work_interest,
-                social_weakness,
-                mental_health_interview,
-                care_options
-            order by survey_timestamp
-        ) as row_num
-    from cleaned
+valid as (
+    select * from cleaned
     where is_valid_record = true
 ),
 
+-- One row per fingerprint; incremental runs skip fingerprints already stored
+deduplicated as (
+    {{ dedup_by_fingerprint('valid', [
+        'survey_timestamp', 'gender', 'country', 'occupation',
+        'is_self_employed', 'has_family_history', 'receiving_treatment', 'days_indoors',
+        'growing_stress', 'changes_habits', 'mental_health_history', 'mood_swings',
+        'has_coping_struggles', 'work_interest', 'social_weakness', 'mental_health_interview',
+        'care_options'
+    ]) }}
+),
+
 final as (
     select 
         survey_timestamp,
@@ -110,9 +99,9 @@ final as (
         social_weakness,
         mental_health_interview,
         care_options,
+        row_hash,
         dbt_loaded_at
     from deduplicated
-    where row_num = 1
 )
 
 select * from final
\ No newline at end of file
@@ -3,7 +3,8 @@
 -- Source: WELLNEST.PUBLIC.RAW_PCOS_DATA
 
 {{ config(
-    materialized='table',
+    materialized='incremental',
+    unique_key='row_hash',
     alias='stg_pcos_cleaned',
     tags=['pcos', 'womens_health', 'hormonal', 'cleaning']
 ) }}
@@ -46,24 +47,26 @@ cleaned as (
         end as is_valid_record,
         
         -- Metadata
-        current_timestamp() as dbt_loaded_at
+        {{ dbt.current_timestamp() }} as dbt_loaded_at
         
     from source_data
 ),
 
-deduplicated as (
-    select 
-        *,
-        row_number() over (
-            partition by 
-                age, amh_level, lh_level, fsh_level,
-                testosterone_level, bmi, menstrual_cycle_pattern
-            order by age
-        ) as row_num
-    from cleaned
+valid as (
+    select * from cleaned
     where is_valid_record = true
 ),
 
+-- One row per fingerprint; incremental runs skip fingerprints already stored
+deduplicated as (
+    {{ dedup_by_fingerprint('valid', [
+        'age', 'amh_level', 'lh_level', 'fsh_level',
+        'testosterone_level', 'bmi', 'menstrual_cycle_pattern'
+    ], tie_breaker=[
+        'has_family_history'
+    ]) }}
+),
+
 final as (
     select 
         age,
@@ -74,9 +77,9 @@ final as (
         bmi,
         has_family_history,
         menstrual_cycle_pattern,
+        row_hash,
         dbt_loaded_at
     from deduplicated
-    where row_num = 1
 )
 
 select * from final
\ No newline at end of file
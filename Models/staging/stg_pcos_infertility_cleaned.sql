@@ -3,7 +3,8 @@
 -- Source: WELLNEST.PUBLIC.RAW_PCOS_INFERTILITY_DATA
 
 {{ config(
-    materialized='table',
+    materialized='incremental',
+    unique_key='row_hash',
     alias='stg_pcos_infertility_cleaned',
     tags=['pcos', 'infertility', 'womens_health', 'cleaning']
 ) }}
@@ -39,26 +40,24 @@ cleaned as (
         end as is_valid_record,
         
         -- Metadata
-        current_timestamp() as dbt_loaded_at
+        {{ dbt.current_timestamp() }} as dbt_loaded_at
         
     from source_data
 ),
 
-deduplicated as (
-    select 
-        *,
-        row_number() over (
-            partition by 
-                patient_id, has_pcos, 
-                beta_hcg_first_measurement,
-                beta_hcg_second_measurement,
-                amh_level
-            order by patient_id
-        ) as row_num
-    from cleaned
+valid as (
+    select * from cleaned
     where is_valid_record = true
 ),
 
+-- One row per fingerprint; incremental runs skip fingerprints already stored
+deduplicated as (
+    {{ dedup_by_fingerprint('valid', [
+        'patient_id', 'has_pcos', 'beta_hcg_first_measurement', 'beta_hcg_second_measurement',
+        'amh_level'
+    ]) }}
+),
+
 final as (
     select 
         patient_id,
@@ -66,9 +65,9 @@ final as (
         beta_hcg_first_measurement,
         beta_hcg_second_measurement,
         amh_level,
+        row_hash,
         dbt_loaded_at
     from deduplicated
-    where row_num = 1
 )
 
 select * from final
\ No newline at end of file
@@ -0,0 +1,213 @@
+# =============================================================================
+# WELLNEST - GOLD FEATURE PARQUET EXPORT
+# =============================================================================
+# Exports the gold feature tables to partitioned, zstd-compressed Parquet for
+# local ML training, replacing the hand-exported CSVs:
+#   - explicit dtypes: *_stage / *_category / *_level / *_status / *_urgency
+#     strings become dictionary (categorical) columns, IS_/HAS_/SHOULD_/NEEDS_
+#     flags become booleans, numbers stay numeric
+#   - incremental: only rows with DBT_LOADED_AT after the last export are
+#     fetched and written as new files (hive partitions by load date)
+#   - a manifest.json per table records the watermark, schema and files;
+#     readers load only the listed files, and parts an interrupted export
+#     wrote without saving the manifest are removed on the next run
+#
+# Connection settings come from SNOWFLAKE_ACCOUNT / SNOWFLAKE_USER /
+# SNOWFLAKE_PASSWORD / SNOWFLAKE_ROLE / SNOWFLAKE_WAREHOUSE; the gold schema from
+# WELLNEST_FEATURE_SCHEMA. Load the files with "ML Models/feature_store.py".
+# Usage:  python Pipeline/export_features.py [--tables FTR_DIABETES_CONVERSATION_PROMPTS] [--full]
+# =============================================================================
+
+import argparse
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime, timezone
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+DEFAULT_OUTPUT_DIR = os.environ.get("WELLNEST_FEATURE_DIR", os.path.join(REPO_ROOT, "data", "features"))
+SOURCE_SCHEMA = os.environ.get("WELLNEST_FEATURE_SCHEMA", "WELLNEST.PUBLIC")
+
+# Tier 3 tables carry every feature column of their domain
+GOLD_TABLES = [
+    "FTR_DIABETES_CONVERSATION_PROMPTS",
+    "FTR_HYPERTENSION_CONVERSATION_PROMPTS",
+    "FTR_MENTAL_HEALTH_CONVERSATION_PROMPTS",
+    "FTR_MATERNAL_HEALTH_CONVERSATION_PROMPTS",
+    "FTR_PCOS_CONVERSATION_PROMPTS",
+]
+
+WATERMARK_COLUMN = "DBT_LOADED_AT"
+PARTITION_COLUMN = "LOAD_DATE"
+CATEGORICAL_SUFFIXES = ("_STAGE", "_CATEGORY", "_LEVEL", "_STATUS", "_URGENCY")
+FLAG_PREFIXES = ("IS_", "HAS_", "SHOULD_", "NEEDS_")
+COMPRESSION = "zstd"
+
+
+def get_session():
+    from snowflake.snowpark import Session
+
+    config = {
+        key: os.environ[f"SNOWFLAKE_{key.upper()}"]
+        for key in ("account", "user", "password", "role", "warehouse")
+        if os.environ.get(f"SNOWFLAKE_{key.upper()}")
+    }
+    return Session.builder.configs(config).create()
+
+
+# =============================================================================
+# DTYPES
+# =============================================================================
+
+def target_type(name, arrow_type):
+    """Explicit Parquet type for one exported column"""
+    if name.endswith(CATEGORICAL_SUFFIXES) and pa.types.is_string(arrow_type):
+        return pa.dictionary(pa.int32(), pa.string())
+    if name.startswith(FLAG_PREFIXES) and not pa.types.is_boolean(arrow_type):
+        if pa.types.is_integer(arrow_type) or pa.types.is_decimal(arrow_type):
+            return pa.bool_()
+    if pa.types.is_decimal(arrow_type):
+        # NUMBER(p,0) -> int64, other NUMBERs -> float64
+        return pa.int64() if arrow_type.scale == 0 else pa.float64()
+    return arrow_type
+
+
+def normalize(table):
+    """Cast a fetched batch to the export schema and add the partition column"""
+    columns, fields = [], []
+    for field, column in zip(table.schema, table.columns):
+        wanted = target_type(field.name, field.type)
+        if wanted != field.type:
+            if pa.types.is_dictionary(wanted):
+                column = pc.dictionary_encode(column)
+            elif pa.types.is_boolean(wanted):
+                column = pc.not_equal(column, pa.scalar(0, column.type))
+            else:
+                column = column.cast(wanted)
+        columns.append(column)
+        fields.append(pa.field(field.name, column.type))
+    table = pa.Table.from_arrays(columns, schema=pa.schema(fields))
+    if WATERMARK_COLUMN in table.column_names:
+        load_date = pc.strftime(table[WATERMARK_COLUMN], format="%Y-%m-%d")
+        table = table.append_column(PARTITION_COLUMN, load_date)
+    return table
+
+
+# =============================================================================
+# MANIFEST
+# =============================================================================
+
+def manifest_path(table_dir):
+    return os.path.join(table_dir, "manifest.json")
+
+
+def load_manifest(table_dir, table_name):
+    path = manifest_path(table_dir)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as handle:
+            return json.load(handle)
+    return {"table": table_name, "watermark": None, "schema": {}, "files": []}
+
+
+def remove_orphans(table_dir, manifest):
+    """Delete Parquet parts the manifest does not list (left by a failed export)"""
+    listed = {os.path.normpath(item["path"]) for item in manifest["files"]}
+    for root, _, names in os.walk(table_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            if name.endswith(".parquet") and os.path.normpath(os.path.relpath(path, table_dir)) not in listed:
+                os.remove(path)
+
+
+def save_manifest(table_dir, manifest):
+    tmp_path = manifest_path(table_dir) + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2)
+    os.replace(tmp_path, manifest_path(table_dir))
+
+
+# =============================================================================
+# EXPORT
+# =============================================================================
+
+def fetch_batches(session, table_name, watermark):
+    """Arrow batches of rows loaded after the watermark"""
+    query = f"SELECT * FROM {SOURCE_SCHEMA}.{table_name}"
+    params = []
+    if watermark:
+        query += f" WHERE {WATERMARK_COLUMN} > TO_TIMESTAMP_LTZ(%s)"
+        params.append(watermark)
+    cursor = session.connection.cursor()
+    try:
+        cursor.execute(query, params)
+        yield from cursor.fetch_arrow_batches()
+    finally:
+        cursor.close()
+
+
+def export_table(session, table_name, output_dir, full=False):
+    table_dir = os.path.join(output_dir, table_name.lower())
+    if full and os.path.isdir(table_dir):
+        shutil.rmtree(table_dir)
+    os.makedirs(table_dir, exist_ok=True)
+
+    manifest = load_manifest(table_dir, table_name)
+    remove_orphans(table_dir, manifest)
+    watermark = manifest["watermark"]
+    new_watermark = watermark
+    written = []
+
+    for batch in fetch_batches(session, table_name, watermark):
+        table = normalize(batch)
+        if table.num_rows == 0:
+            continue
+        if WATERMARK_COLUMN in table.column_names:
+            batch_max = pc.max(table[WATERMARK_COLUMN]).as_py().isoformat()
+            new_watermark = max(filter(None, [new_watermark, batch_max]))
+
+        basename = f"part-{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}-{{i}}.parquet"
+        partition_cols = [PARTITION_COLUMN] if PARTITION_COLUMN in table.column_names else None
+        paths = []
+        pq.write_to_dataset(
+            table, root_path=table_dir, partition_cols=partition_cols,
+            basename_template=basename, compression=COMPRESSION,
+            file_visitor=lambda written_file: paths.append(written_file.path),
+        )
+        for path in paths:
+            written.append({
+                "path": os.path.relpath(path, table_dir),
+                "rows": pq.ParquetFile(path).metadata.num_rows,
+                "bytes": os.path.getsize(path),
+            })
+        manifest["schema"] = {field.name: str(field.type) for field in table.schema}
+
+    manifest["files"].extend(written)
+    manifest["watermark"] = new_watermark
+    manifest["exported_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    save_manifest(table_dir, manifest)
+    return sum(item["rows"] for item in written), len(written)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export gold feature tables to Parquet")
+    parser.add_argument("--tables", nargs="+", default=GOLD_TABLES)
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--full", action="store_true", help="Drop existing files and re-export everything")
+    args = parser.parse_args()
+
+    session = get_session()
+    try:
+        for table_name in args.tables:
+            rows, files = export_table(session, table_name.upper(), args.output_dir, full=args.full)
+            print(f"{table_name:<42} +{rows:>10,} rows in {files} file(s)")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
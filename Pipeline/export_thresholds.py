@@ -0,0 +1,175 @@
+# =============================================================================
+# WELLNEST - CLINICAL THRESHOLD EXPORTER
+# =============================================================================
+# Generates StreamLit/wellnest_core/thresholds.py from the dbt seed
+# Seeds/clinical_thresholds.csv, so the app and the stored procedures classify
+# with the same bands the feature models are compiled against.
+#
+# Usage:  python Pipeline/export_thresholds.py           # regenerate
+#         python Pipeline/export_thresholds.py --check   # fail if out of date
+#
+# After regenerating, upload the module for the stored procedures:
+#   PUT file://StreamLit/wellnest_core/thresholds.py @WELLNEST.MEDICAL_DATA.WELLNEST_CODE
+#       AUTO_COMPRESS = FALSE OVERWRITE = TRUE;
+# =============================================================================
+
+import argparse
+import csv
+import os
+import sys
+from collections import OrderedDict
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+SEED_PATH = os.path.join(REPO_ROOT, "Seeds", "clinical_thresholds.csv")
+MODULE_PATH = os.path.join(REPO_ROOT, "StreamLit", "wellnest_core", "thresholds.py")
+
+MODULE_TEMPLATE = '''# =============================================================================
+# WELLNEST CORE - CLINICAL THRESHOLDS
+# =============================================================================
+# GENERATED by Pipeline/export_thresholds.py from Seeds/clinical_thresholds.csv
+# - edit the seed and re-run the exporter instead of editing this file.
+# Standard library only: the stored procedures IMPORT this same file from
+# @WELLNEST.MEDICAL_DATA.WELLNEST_CODE.
+# =============================================================================
+
+from bisect import bisect_left
+
+# scale -> [(min_value, max_value, label, severity_rank, min_inclusive, max_inclusive), ...];
+# bands are contiguous, each shared cut belongs to exactly one side, and None
+# is open-ended - the same comparison operators as the original CASE ladders
+THRESHOLDS = {thresholds}
+
+
+def _compile(bands):
+    """Cut points, whether each cut belongs to the band above it, per-band (label, rank)"""
+    return ([band[0] for band in bands[1:]], [band[4] for band in bands[1:]],
+            [(band[2], band[3]) for band in bands])
+
+
+_LOOKUP = {{scale: _compile(bands) for scale, bands in THRESHOLDS.items()}}
+
+
+def lookup(scale, value):
+    """(label, severity_rank) of the band containing value, or None"""
+    if value is None or scale not in _LOOKUP:
+        return None
+    cuts, upper_owns, bands = _LOOKUP[scale]
+    value = float(value)
+    index = bisect_left(cuts, value)
+    if index < len(cuts) and cuts[index] == value and upper_owns[index]:
+        index += 1
+    return bands[index]
+
+
+def classify(scale, value, default='unknown'):
+    """Band label for value on a scale"""
+    band = lookup(scale, value)
+    return band[0] if band else default
+
+
+def band_bounds(scale, label):
+    """(min_value, max_value) of the first band with this label"""
+    for min_value, max_value, band_label, *_ in THRESHOLDS[scale]:
+        if band_label == label:
+            return min_value, max_value
+    raise KeyError(f"{{scale}}: {{label}}")
+
+
+def metric_severity(metric_type, value):
+    """(is_abnormal, severity) for a tracked health metric"""
+    band = lookup(f"metric_{{metric_type}}", value)
+    if not band:
+        return False, 'normal'
+    return band[1] > 0, band[0]
+
+
+def _fmt(value):
+    return f"{{value:g}}"
+
+
+def router_urgency_guidance():
+    """Urgency section of the router prompt, rendered from the metric scales"""
+    hypo_emergency = band_bounds('glucose_urgency_level', 'emergency')[1]
+    sugar_severe = band_bounds('metric_blood_sugar', 'severe')[0]
+    sys_severe = band_bounds('metric_blood_pressure_systolic', 'severe')[0]
+    dia_severe = band_bounds('metric_blood_pressure_diastolic', 'severe')[0]
+    sys_low, sys_high = band_bounds('metric_blood_pressure_systolic', 'moderate')
+    dia_low, dia_high = band_bounds('metric_blood_pressure_diastolic', 'moderate')
+    return "\\n".join([
+        f"**EMERGENCY**: Chest pain+sweating, stroke symptoms, suicidal thoughts with plan, "
+        f"blood sugar <{{_fmt(hypo_emergency)}}",
+        f"**URGENT**: Blood sugar >={{_fmt(sugar_severe)}}, BP >={{_fmt(sys_severe)}}/{{_fmt(dia_severe)}}, "
+        f"severe depression",
+        f"**NEEDS_ATTENTION**: Uncontrolled symptoms, BP {{_fmt(sys_low)}}-{{_fmt(sys_high - 1)}}/"
+        f"{{_fmt(dia_low)}}-{{_fmt(dia_high - 1)}}",
+        "**ROUTINE**: General health guidance",
+    ])
+'''
+
+
+def _number(text):
+    return float(text) if text.strip() else None
+
+
+def _flag(text):
+    return {"true": True, "false": False, "": None}[text.strip().lower()]
+
+
+def load_seed(path=SEED_PATH):
+    """Read and validate the seed into {scale: [(min, max, label, rank, min_inclusive, max_inclusive), ...]}"""
+    scales = OrderedDict()
+    with open(path, newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            band = (_number(row["min_value"]), _number(row["max_value"]),
+                    row["label"], int(row["severity_rank"]),
+                    _flag(row["min_inclusive"]), _flag(row["max_inclusive"]))
+            scales.setdefault(row["scale"], []).append(band)
+
+    for scale, bands in scales.items():
+        bands.sort(key=lambda band: float("-inf") if band[0] is None else band[0])
+        if bands[0][0] is not None or bands[-1][1] is not None:
+            raise ValueError(f"{scale}: first band needs an open min and last band an open max")
+        for band in bands:
+            if (band[4] is None) != (band[0] is None) or (band[5] is None) != (band[1] is None):
+                raise ValueError(f"{scale}: {band[2]} needs an inclusive flag on each closed bound only")
+        for lower, upper in zip(bands, bands[1:]):
+            if lower[1] != upper[0]:
+                raise ValueError(f"{scale}: gap or overlap between {lower[2]} and {upper[2]}")
+            if lower[5] == upper[4]:
+                raise ValueError(f"{scale}: cut {lower[1]:g} between {lower[2]} and {upper[2]} "
+                                 f"must be inclusive on exactly one side")
+    return scales
+
+
+def render(scales):
+    lines = ["{"]
+    for scale, bands in scales.items():
+        lines.append(f"    {scale!r}: [")
+        lines.extend(f"        {band!r}," for band in bands)
+        lines.append("    ],")
+    lines.append("}")
+    return MODULE_TEMPLATE.format(thresholds="\n".join(lines))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export clinical thresholds to Python")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if the module is out of date")
+    args = parser.parse_args()
+
+    generated = render(load_seed())
+    current = open(MODULE_PATH, encoding="utf-8").read() if os.path.exists(MODULE_PATH) else ""
+
+    if args.check:
+        if generated != current:
+            print(f"{os.path.relpath(MODULE_PATH, REPO_ROOT)} is out of date; run Pipeline/export_thresholds.py")
+            sys.exit(1)
+        print("thresholds.py is up to date")
+        return
+
+    with open(MODULE_PATH, "w", encoding="utf-8") as handle:
+        handle.write(generated)
+    print(f"Wrote {os.path.relpath(MODULE_PATH, REPO_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
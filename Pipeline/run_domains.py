@@ -0,0 +1,214 @@
+# =============================================================================
+# WELLNEST - PARALLEL PER-DOMAIN DBT RUNNER
+# =============================================================================
+# Builds the three domain subgraphs (selectors.yml) concurrently, each in its
+# own dbt process and target path, after building the shared seeds once. Every
+# run_results.json is appended to a per-model timing history (once per dbt
+# invocation_id), and a report shows the slowest models and models that
+# regressed against their history.
+# Concurrent domains need a warehouse target such as Snowflake; the local
+# DuckDB profile allows a single writer, so use --domains one at a time there.
+#
+# Usage:  python Pipeline/run_domains.py [--command build] [--threads 4] [--full-refresh]
+#         python Pipeline/run_domains.py --report-only
+# =============================================================================
+
+import argparse
+import csv
+import json
+import os
+import statistics
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+DOMAINS = ["lifestyle_diseases", "mental_health", "womens_wellness"]
+DOMAIN_TARGET_ROOT = os.path.join(REPO_ROOT, "target", "domains")
+HISTORY_PATH = os.path.join(REPO_ROOT, "Pipeline", "history", "model_timings.csv")
+HISTORY_FIELDS = ["run_started_at", "invocation_id", "domain", "unique_id",
+                  "status", "execution_time", "rows_affected"]
+
+SLOWEST_COUNT = 5
+REGRESSION_FACTOR = 1.5   # latest run slower than 1.5x the historical median
+HISTORY_RUNS = 10         # runs used for the historical median
+
+
+def dbt_command(command, args, domain=None):
+    """dbt CLI invocation; each domain gets its own target and log path"""
+    cmd = ["dbt", command, "--project-dir", REPO_ROOT, "--threads", str(args.threads)]
+    if args.profiles_dir:
+        cmd += ["--profiles-dir", args.profiles_dir]
+    if args.target:
+        cmd += ["--target", args.target]
+    if args.vars:
+        cmd += ["--vars", args.vars]
+    if args.full_refresh and command in ("run", "build", "seed"):
+        cmd.append("--full-refresh")
+    if domain:
+        domain_dir = os.path.join(DOMAIN_TARGET_ROOT, domain)
+        cmd += ["--selector", domain, "--target-path", domain_dir,
+                "--log-path", os.path.join(domain_dir, "logs")]
+    return cmd
+
+
+def run_domain(command, args, domain):
+    # A dbt run that fails before writing results must not leave the previous
+    # run's file behind to be recorded again
+    results_path = os.path.join(DOMAIN_TARGET_ROOT, domain, "run_results.json")
+    if os.path.exists(results_path):
+        os.remove(results_path)
+    started = time.perf_counter()
+    result = subprocess.run(dbt_command(command, args, domain), cwd=REPO_ROOT,
+                            capture_output=True, text=True)
+    return {
+        "domain": domain,
+        "returncode": result.returncode,
+        "seconds": time.perf_counter() - started,
+        "output": result.stdout[-2000:] + result.stderr[-2000:],
+    }
+
+
+# =============================================================================
+# TIMING HISTORY
+# =============================================================================
+
+def parse_run_results(path, domain):
+    """Per-model rows from one run_results.json"""
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    metadata = data.get("metadata", {})
+    rows = []
+    for result in data.get("results", []):
+        adapter_response = result.get("adapter_response") or {}
+        rows.append({
+            "run_started_at": metadata.get("generated_at", ""),
+            "invocation_id": metadata.get("invocation_id", ""),
+            "domain": domain,
+            "unique_id": result["unique_id"],
+            "status": result.get("status", ""),
+            "execution_time": round(result.get("execution_time") or 0.0, 3),
+            "rows_affected": adapter_response.get("rows_affected", ""),
+        })
+    return rows
+
+
+def append_history(rows):
+    """Append rows, skipping dbt invocations already recorded"""
+    recorded = {row["invocation_id"] for row in load_history()}
+    rows = [row for row in rows if row["invocation_id"] not in recorded]
+    if not rows:
+        return
+    os.makedirs(os.path.dirname(HISTORY_PATH), exist_ok=True)
+    is_new = not os.path.exists(HISTORY_PATH)
+    with open(HISTORY_PATH, "a", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=HISTORY_FIELDS)
+        if is_new:
+            writer.writeheader()
+        writer.writerows(rows)
+
+
+def load_history():
+    if not os.path.exists(HISTORY_PATH):
+        return []
+    with open(HISTORY_PATH, newline="", encoding="utf-8") as handle:
+        return list(csv.DictReader(handle))
+
+
+def timing_report(history):
+    """Latest vs historical median per model, slowest first"""
+    by_model = {}
+    for row in sorted(history, key=lambda r: r["run_started_at"]):
+        if row["unique_id"].startswith("model.") and row["status"] == "success":
+            by_model.setdefault((row["domain"], row["unique_id"]), []).append(float(row["execution_time"]))
+
+    report = []
+    for (domain, unique_id), times in by_model.items():
+        latest = times[-1]
+        previous = times[-(HISTORY_RUNS + 1):-1]
+        median = statistics.median(previous) if previous else None
+        report.append({
+            "domain": domain,
+            "model": unique_id.split(".")[-1],
+            "latest": latest,
+            "median": median,
+            "runs": len(times),
+            "regressed": bool(median and latest > REGRESSION_FACTOR * median),
+        })
+    report.sort(key=lambda r: r["latest"], reverse=True)
+    for rank, row in enumerate(report):
+        row["slowest"] = rank < SLOWEST_COUNT
+    return report
+
+
+def print_report(report):
+    if not report:
+        print("No timing history yet.")
+        return
+    print(f"\n{'domain':<20} {'model':<42} {'latest s':>9} {'median s':>9} {'trend':>8} {'runs':>5}  flags")
+    for row in report:
+        trend = f"{(row['latest'] / row['median'] - 1):+.0%}" if row["median"] else "-"
+        median = f"{row['median']:.1f}" if row["median"] is not None else "-"
+        flags = " ".join(flag for flag, on in (("SLOWEST", row["slowest"]), ("REGRESSED", row["regressed"])) if on)
+        print(f"{row['domain']:<20} {row['model']:<42} {row['latest']:>9.1f} {median:>9} {trend:>8} {row['runs']:>5}  {flags}")
+
+    total = sum(row["latest"] for row in report)
+    print(f"\nModel time in latest runs: {total:.1f}s across {len(report)} models")
+    for domain in sorted({row["domain"] for row in report}):
+        domain_total = sum(row["latest"] for row in report if row["domain"] == domain)
+        print(f"  {domain:<20} {domain_total:>8.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel per-domain dbt runner")
+    parser.add_argument("--command", default="build", choices=["build", "run", "test"])
+    parser.add_argument("--domains", nargs="+", default=DOMAINS, choices=DOMAINS)
+    parser.add_argument("--threads", type=int, default=4, help="dbt threads per domain process")
+    parser.add_argument("--profiles-dir")
+    parser.add_argument("--target")
+    parser.add_argument("--vars")
+    parser.add_argument("--full-refresh", action="store_true")
+    parser.add_argument("--skip-seeds", action="store_true")
+    parser.add_argument("--report-only", action="store_true")
+    args = parser.parse_args()
+
+    if args.report_only:
+        print_report(timing_report(load_history()))
+        return
+
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    wall_started = time.perf_counter()
+
+    if not args.skip_seeds:
+        print("Building shared seeds...")
+        subprocess.run(dbt_command("seed", args), cwd=REPO_ROOT, check=True)
+
+    print(f"Running dbt {args.command} for {', '.join(args.domains)} in parallel...")
+    with ThreadPoolExecutor(max_workers=len(args.domains)) as pool:
+        outcomes = list(pool.map(lambda domain: run_domain(args.command, args, domain), args.domains))
+
+    rows = []
+    for outcome in outcomes:
+        status = "ok" if outcome["returncode"] == 0 else f"FAILED ({outcome['returncode']})"
+        print(f"  {outcome['domain']:<20} {outcome['seconds']:>7.1f}s  {status}")
+        if outcome["returncode"] != 0:
+            print(outcome["output"])
+        results_path = os.path.join(DOMAIN_TARGET_ROOT, outcome["domain"], "run_results.json")
+        if os.path.exists(results_path):
+            rows.extend(parse_run_results(results_path, outcome["domain"]))
+
+    wall = time.perf_counter() - wall_started
+    serial = sum(outcome["seconds"] for outcome in outcomes)
+    print(f"\nWall clock {wall:.1f}s (domains serially would take ~{serial:.1f}s), started {started_at}")
+
+    if rows:
+        append_history(rows)
+    print_report(timing_report(load_history()))
+
+    if any(outcome["returncode"] != 0 for outcome in outcomes):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,14 @@
 # =============================================================================
 
 import streamlit as st
-from snowflake.snowpark.context import get_active_session
 from datetime import datetime, date
+from wellnest_core import session_tokens
+from wellnest_core.connection import get_oltp_store
+from wellnest_core.health import calculate_bmi, get_bmi_category, calculate_age, get_profile_completeness
+from wellnest_core.profiles import get_user_profile, update_user_info, update_medical_profile
 
-# Get Snowflake session
-session = get_active_session()
+# OLTP store (shared with app.py); this page only issues single-row statements
+oltp_store = get_oltp_store()
 
 # =============================================================================
 # PAGE CONFIGURATION
@@ -27,179 +30,13 @@ st.set_page_config(
 
 def check_authentication():
     """Redirect to login if not authenticated"""
-    if 'authenticated' not in st.session_state or not st.session_state.authenticated:
+    # Same signed-token restore as app.py, so a reload here needs no login
+    if not session_tokens.restore_session(oltp_store):
         st.warning("⚠️ Please log in to access your profile.")
         st.stop()
 
 check_authentication()
 
-# =============================================================================
-# HELPER FUNCTIONS
-# =============================================================================
-
-def calculate_bmi(weight_kg, height_cm):
-    """Calculate BMI from weight and height"""
-    if weight_kg and height_cm and weight_kg > 0 and height_cm > 0:
-        height_m = height_cm / 100
-        return round(weight_kg / (height_m ** 2), 1)
-    return None
-
-def get_bmi_category(bmi):
-    """Get BMI category and color"""
-    if not bmi:
-        return "Unknown", "gray"
-    elif bmi < 18.5:
-        return "Underweight", "orange"
-    elif bmi < 25:
-        return "Normal Weight", "green"
-    elif bmi < 30:
-        return "Overweight", "orange"
-    else:
-        return "Obese", "red"
-
-def calculate_age(dob):
-    """Calculate age from date of birth"""
-    if dob:
-        today = date.today()
-        return today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
-    return None
-
-def get_profile_completeness(profile):
-    """Calculate profile completeness percentage"""
-    fields_to_check = [
-        'HEIGHT_CM', 'WEIGHT_KG', 'BLOOD_TYPE', 'SMOKING_STATUS',
-        'ALCOHOL_CONSUMPTION', 'EXERCISE_FREQUENCY', 'EMERGENCY_CONTACT_NAME',
-        'EMERGENCY_CONTACT_PHONE'
-    ]
-    
-    completed = sum(1 for field in fields_to_check if profile.get(field) is not None)
-    return int((completed / len(fields_to_check)) * 100)
-
-# =============================================================================
-# DATABASE FUNCTIONS
-# =============================================================================
-
-def get_user_profile(user_id):
-    """Fetch user profile from database"""
-    query = f"""
-    SELECT 
-        u.USER_ID,
-        u.EMAIL,
-        u.FULL_NAME,
-        u.DATE_OF_BIRTH,
-        u.GENDER,
-        u.PHONE_NUMBER,
-        u.CREATED_AT,
-        p.PROFILE_ID,
-        p.HEIGHT_CM,
-        p.WEIGHT_KG,
-        p.BMI,
-        p.BLOOD_TYPE,
-        p.HAS_DIABETES,
-        p.HAS_HYPERTENSION,
-        p.HAS_HEART_DISEASE,
-        p.HAS_MENTAL_HEALTH_HISTORY,
-        p.HAS_PCOS,
-        p.SMOKING_STATUS,
-        p.ALCOHOL_CONSUMPTION,
-        p.EXERCISE_FREQUENCY,
-        p.IS_PREGNANT,
-        p.PREGNANCY_TRIMESTER,
-        p.MENSTRUAL_CYCLE_REGULAR,
-        p.LAST_MENSTRUAL_PERIOD,
-        p.EMERGENCY_CONTACT_NAME,
-        p.EMERGENCY_CONTACT_PHONE,
-        p.EMERGENCY_CONTACT_RELATIONSHIP,
-        p.LAST_UPDATED
-    FROM WELLNEST.USER_MANAGEMENT.USERS u
-    LEFT JOIN WELLNEST.USER_MANAGEMENT.USER_MEDICAL_PROFILES p
-        ON u.USER_ID = p.USER_ID
-    WHERE u.USER_ID = '{user_id}'
-    """
-    
-    result = session.sql(query).collect()
-    
-    if result:
-        row = result[0]
-        return {k: row[k] for k in row.asDict().keys()}
-    return None
-
-def update_user_info(user_id, full_name, phone_number):
-    """Update basic user information"""
-    phone_sql = f"'{phone_number}'" if phone_number else "NULL"
-    
-    query = f"""
-    UPDATE WELLNEST.USER_MANAGEMENT.USERS
-    SET 
-        FULL_NAME = '{full_name}',
-        PHONE_NUMBER = {phone_sql}
-    WHERE USER_ID = '{user_id}'
-    """
-    
-    session.sql(query).collect()
-
-def update_medical_profile(user_id, profile_data):
-    """Update medical profile information"""
-    
-    # Build SET clause dynamically
-    set_clauses = []
-    
-    # Physical measurements
-    if profile_data.get('height_cm'):
-        set_clauses.append(f"HEIGHT_CM = {profile_data['height_cm']}")
-    if profile_data.get('weight_kg'):
-        set_clauses.append(f"WEIGHT_KG = {profile_data['weight_kg']}")
-    if profile_data.get('bmi'):
-        set_clauses.append(f"BMI = {profile_data['bmi']}")
-    
-    # Blood type
-    if profile_data.get('blood_type'):
-        set_clauses.append(f"BLOOD_TYPE = '{profile_data['blood_type']}'")
-    
-    # Medical history flags
-    set_clauses.append(f"HAS_DIABETES = {profile_data.get('has_diabetes', False)}")
-    set_clauses.append(f"HAS_HYPERTENSION = {profile_data.get('has_hypertension', False)}")
-    set_clauses.append(f"HAS_HEART_DISEASE = {profile_data.get('has_heart_disease', False)}")
-    set_clauses.append(f"HAS_MENTAL_HEALTH_HISTORY = {profile_data.get('has_mental_health_history', False)}")
-    set_clauses.append(f"HAS_PCOS = {profile_data.get('has_pcos', False)}")
-    
-    # Lifestyle factors
-    if profile_data.get('smoking_status'):
-        set_clauses.append(f"SMOKING_STATUS = '{profile_data['smoking_status']}'")
-    if profile_data.get('alcohol_consumption'):
-        set_clauses.append(f"ALCOHOL_CONSUMPTION = '{profile_data['alcohol_consumption']}'")
-    if profile_data.get('exercise_frequency'):
-        set_clauses.append(f"EXERCISE_FREQUENCY = '{profile_data['exercise_frequency']}'")
-    
-    # Women's health
-    if profile_data.get('gender') == 'Female':
-        set_clauses.append(f"IS_PREGNANT = {profile_data.get('is_pregnant', False)}")
-        if profile_data.get('pregnancy_trimester'):
-            set_clauses.append(f"PREGNANCY_TRIMESTER = {profile_data['pregnancy_trimester']}")
-        set_clauses.append(f"MENSTRUAL_CYCLE_REGULAR = {profile_data.get('menstrual_cycle_regular', False)}")
-        if profile_data.get('last_menstrual_period'):
-            set_clauses.append(f"LAST_MENSTRUAL_PERIOD = '{profile_data['last_menstrual_period']}'")
-    
-    # Emergency contact
-    if profile_data.get('emergency_contact_name'):
-        set_clauses.append(f"EMERGENCY_CONTACT_NAME = '{profile_data['emergency_contact_name']}'")
-    if profile_data.get('emergency_contact_phone'):
-        set_clauses.append(f"EMERGENCY_CONTACT_PHONE = '{profile_data['emergency_contact_phone']}'")
-    if profile_data.get('emergency_contact_relationship'):
-        set_clauses.append(f"EMERGENCY_CONTACT_RELATIONSHIP = '{profile_data['emergency_contact_relationship']}'")
-    
-    # Always update timestamp
-    set_clauses.append("LAST_UPDATED = CURRENT_TIMESTAMP()")
-    
-    # Execute update
-    query = f"""
-    UPDATE WELLNEST.USER_MANAGEMENT.USER_MEDICAL_PROFILES
-    SET {', '.join(set_clauses)}
-    WHERE USER_ID = '{user_id}'
-    """
-    
-    session.sql(query).collect()
-
 # =============================================================================
 # PAGE LAYOUT
 # =============================================================================
@@ -216,6 +53,7 @@ with st.sidebar:
         st.switch_page("app.py")
     
     if st.button("🚪 Logout", use_container_width=True):
+        session_tokens.end_session(oltp_store)
         for key in list(st.session_state.keys()):
             del st.session_state[key]
         st.rerun()
@@ -353,6 +191,7 @@ with tab1:
                         'gender': gender
                     }
                     update_medical_profile(st.session_state.user_id, profile_data)
+                    st.session_state.pop('triage_features', None)
                     
                     st.success("✅ Profile updated successfully!")
                     st.rerun()
@@ -427,6 +266,7 @@ with tab2:
                     'gender': profile['GENDER']
                 }
                 update_medical_profile(st.session_state.user_id, profile_data)
+                st.session_state.pop('triage_features', None)
                 
                 st.success("✅ Medical history updated successfully!")
                 st.rerun()
@@ -470,6 +310,7 @@ with tab3:
                     'exercise_frequency': exercise
                 }
                 update_medical_profile(st.session_state.user_id, profile_data)
+                st.session_state.pop('triage_features', None)
                 
                 st.success("✅ Lifestyle information updated successfully!")
                 st.rerun()
@@ -512,6 +353,7 @@ with tab4:
                     'emergency_contact_relationship': emergency_relationship
                 }
                 update_medical_profile(st.session_state.user_id, profile_data)
+                st.session_state.pop('triage_features', None)
                 
                 st.success("✅ Emergency contact updated successfully!")
                 st.rerun()
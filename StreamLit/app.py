@@ -3,15 +3,42 @@
 # =============================================================================
 
 import streamlit as st
-from snowflake.snowpark.context import get_active_session
-import pandas as pd
-import bcrypt
+import base64
+import re
 import uuid
 from datetime import datetime, timedelta, date
 import json
-
-# Get Snowflake session
-session = get_active_session()
+from wellnest_core import auth, query_profiler, session_tokens, statements, thresholds
+from wellnest_core.connection import get_oltp_store, get_session
+from wellnest_core.hedging import HedgedCaller
+from wellnest_core.health import calculate_bmi, get_bmi_category, calculate_age, get_profile_completeness
+from wellnest_core.profiles import get_user_profile, update_user_info, update_medical_profile
+from wellnest_core.telemetry import TurnTrace, spans_insert, stage_latency
+from wellnest_core.app_logging import get_logger
+from wellnest_core.emergency import detect_emergency_keywords
+
+# Get Snowflake session (shared across pages and reruns)
+session = get_session()
+
+# Single-row per-user statements (login, profile, saving / reading the current
+# chat session) go to the OLTP store; analytical reads stay on `session`
+oltp_store = get_oltp_store()
+
+# Buffered APPLICATION_LOGS writer; records are flushed by a background thread
+logger = get_logger(session)
+
+# Opt-in hedging for specialist calls: duplicate a request that is slower than
+# the rolling p90 and keep whichever answer returns first
+SPECIALIST_HEDGING_ENABLED = False
+SPECIALIST_HEDGE_MODEL = None          # None = same model, e.g. 'llama3.1-8b' for base fallback
+SPECIALIST_MAX_HEDGE_FRACTION = 0.10   # At most 10% of calls may be hedged
+
+# Opt-in ML second opinion on router urgency for diabetes questions: path to a
+# joblib artifact saved by the training notebook (None disables it). The
+# artifact is the GLUCOSE_URGENCY_LEVEL model, so only DIABETES turns use it.
+TRIAGE_MODEL_PATH = None
+TRIAGE_DOMAIN = 'DIABETES'
+TRIAGE_ESCALATION_CONFIDENCE = 0.8
 
 # =============================================================================
 # PAGE CONFIGURATION
@@ -65,25 +92,19 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # =============================================================================
-# HELPER FUNCTIONS (EXISTING - PRESERVED)
+# HELPER FUNCTIONS (BMI/AGE/COMPLETENESS LIVE IN wellnest_core.health)
 # =============================================================================
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt"""
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed.decode('utf-8')
+    """Hash a password using bcrypt (runs in the auth worker pool)"""
+    return auth.hash_password(password)
 
 def verify_password(password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return bcrypt.checkpw(
-        password.encode('utf-8'), 
-        hashed_password.encode('utf-8')
-    )
+    """Verify a password against its hash (runs in the auth worker pool)"""
+    return auth.verify_password(password, hashed_password)
 
 def validate_email(email: str) -> bool:
     """Basic email validation"""
-    import re
     pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
     return re.match(pattern, email) is not None
 
@@ -99,42 +120,13 @@ def validate_password_strength(password: str) -> tuple:
         return False, "Password must contain at least one number"
     return True, "Password is strong"
 
-def calculate_bmi(weight_kg, height_cm):
-    """Calculate BMI from weight and height"""
-    if weight_kg and height_cm and weight_kg > 0 and height_cm > 0:
-        height_m = height_cm / 100
-        return round(weight_kg / (height_m ** 2), 1)
-    return None
-
-def get_bmi_category(bmi):
-    """Get BMI category and color"""
-    if not bmi:
-        return "Unknown", "gray"
-    elif bmi < 18.5:
-        return "Underweight", "orange"
-    elif bmi < 25:
-        return "Normal Weight", "green"
-    elif bmi < 30:
-        return "Overweight", "orange"
-    else:
-        return "Obese", "red"
-
-def calculate_age(dob):
-    """Calculate age from date of birth"""
-    if dob:
-        today = date.today()
-        return today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
-    return None
-
-def get_profile_completeness(profile):
-    """Calculate profile completeness percentage"""
-    fields_to_check = [
-        'HEIGHT_CM', 'WEIGHT_KG', 'BLOOD_TYPE', 'SMOKING_STATUS',
-        'ALCOHOL_CONSUMPTION', 'EXERCISE_FREQUENCY', 'EMERGENCY_CONTACT_NAME',
-        'EMERGENCY_CONTACT_PHONE'
-    ]
-    completed = sum(1 for field in fields_to_check if profile.get(field) is not None)
-    return int((completed / len(fields_to_check)) * 100)
+def log_context(**payload) -> dict:
+    """extra= for logger calls: current user/session plus an optional payload"""
+    return {
+        'user_id': st.session_state.get('user_id'),
+        'session_id': st.session_state.get('session_id'),
+        'payload': payload or None,
+    }
 
 def format_file_size(size_bytes: int) -> str:
     """Convert bytes to human-readable format"""
@@ -145,27 +137,17 @@ def format_file_size(size_bytes: int) -> str:
     return f"{size_bytes:.1f} TB"
 
 # =============================================================================
-# DATABASE FUNCTIONS (EXISTING - PRESERVED)
+# DATABASE FUNCTIONS (PROFILE DATA ACCESS LIVES IN wellnest_core.profiles)
 # =============================================================================
 
 def authenticate_user(email: str, password: str):
     """Authenticate user by email and password"""
-    query = f"""
-    SELECT 
-        USER_ID, EMAIL, HASHED_PASSWORD, FULL_NAME, 
-        ACCOUNT_STATUS, FAILED_LOGIN_ATTEMPTS, ACCOUNT_LOCKED_UNTIL
-    FROM WELLNEST.USER_MANAGEMENT.USERS
-    WHERE EMAIL = '{email}'
-    """
-    
     try:
-        result = session.sql(query).collect()
+        user = auth.lookup_user(oltp_store, email)
         
-        if not result:
+        if not user:
             return None
         
-        user = result[0]
-        
         if user['ACCOUNT_LOCKED_UNTIL']:
             if datetime.now() < user['ACCOUNT_LOCKED_UNTIL']:
                 st.error("⚠️ Account is temporarily locked. Please try again later.")
@@ -176,14 +158,9 @@ def authenticate_user(email: str, password: str):
             return None
         
         if verify_password(password, user['HASHED_PASSWORD']):
-            update_query = f"""
-            UPDATE WELLNEST.USER_MANAGEMENT.USERS
-            SET LAST_LOGIN = CURRENT_TIMESTAMP(),
-                FAILED_LOGIN_ATTEMPTS = 0,
-                ACCOUNT_LOCKED_UNTIL = NULL
-            WHERE USER_ID = '{user['USER_ID']}'
-            """
-            session.sql(update_query).collect()
+            # Upgrade hashes made with an older work factor while we have the password
+            new_hash = auth.rehash_if_needed(password, user['HASHED_PASSWORD'])
+            auth.record_login_attempt(oltp_store, user['USER_ID'], success=True, new_hash=new_hash)
             
             return {
                 'user_id': user['USER_ID'],
@@ -191,43 +168,34 @@ def authenticate_user(email: str, password: str):
                 'full_name': user['FULL_NAME']
             }
         else:
-            failed_attempts = user['FAILED_LOGIN_ATTEMPTS'] + 1
+            failed_attempts = (user['FAILED_LOGIN_ATTEMPTS'] or 0) + 1
             
-            if failed_attempts >= 5:
-                lock_until = datetime.now() + timedelta(minutes=15)
-                update_query = f"""
-                UPDATE WELLNEST.USER_MANAGEMENT.USERS
-                SET FAILED_LOGIN_ATTEMPTS = {failed_attempts},
-                    ACCOUNT_LOCKED_UNTIL = '{lock_until}'
-                WHERE USER_ID = '{user['USER_ID']}'
-                """
-                session.sql(update_query).collect()
-                st.error("🔒 Too many failed attempts. Account locked for 15 minutes.")
+            if failed_attempts >= auth.MAX_FAILED_LOGIN_ATTEMPTS:
+                lock_until = datetime.now() + timedelta(minutes=auth.LOCKOUT_MINUTES)
+                auth.record_login_attempt(oltp_store, user['USER_ID'], success=False,
+                                          failed_attempts=failed_attempts, locked_until=lock_until)
+                st.error(f"🔒 Too many failed attempts. Account locked for {auth.LOCKOUT_MINUTES} minutes.")
             else:
-                update_query = f"""
-                UPDATE WELLNEST.USER_MANAGEMENT.USERS
-                SET FAILED_LOGIN_ATTEMPTS = {failed_attempts}
-                WHERE USER_ID = '{user['USER_ID']}'
-                """
-                session.sql(update_query).collect()
-                remaining = 5 - failed_attempts
+                auth.record_login_attempt(oltp_store, user['USER_ID'], success=False,
+                                          failed_attempts=failed_attempts)
+                remaining = auth.MAX_FAILED_LOGIN_ATTEMPTS - failed_attempts
                 st.error(f"❌ Invalid password. {remaining} attempt(s) remaining.")
             
             return None
     
+    except auth.AuthBusyError as e:
+        st.error(f"⏳ {str(e)}")
+        return None
     except Exception as e:
+        logger.exception("Authentication error", extra=log_context())
         st.error(f"Authentication error: {str(e)}")
         return None
 
 def register_user(email: str, password: str, full_name: str, 
                   date_of_birth: str = None, gender: str = None) -> bool:
     """Register a new user"""
-    check_query = f"""
-    SELECT EMAIL FROM WELLNEST.USER_MANAGEMENT.USERS WHERE EMAIL = '{email}'
-    """
-    
     try:
-        existing = session.sql(check_query).collect()
+        existing = statements.fetch(oltp_store, statements.EMAIL_EXISTS_SQL, email)
         
         if existing:
             st.error("❌ An account with this email already exists.")
@@ -236,269 +204,97 @@ def register_user(email: str, password: str, full_name: str,
         user_id = str(uuid.uuid4())
         profile_id = str(uuid.uuid4())
         hashed_pw = hash_password(password)
+        created_at = statements.timestamp()
         
-        dob_sql = f"'{date_of_birth}'" if date_of_birth else "NULL"
-        gender_sql = f"'{gender}'" if gender else "NULL"
-        
-        insert_query = f"""
-        INSERT INTO WELLNEST.USER_MANAGEMENT.USERS (
-            USER_ID, EMAIL, HASHED_PASSWORD, FULL_NAME,
-            DATE_OF_BIRTH, GENDER, ACCOUNT_STATUS,
-            EMAIL_VERIFIED, TERMS_ACCEPTED, PRIVACY_CONSENT, CREATED_AT
-        ) VALUES (
-            '{user_id}', '{email}', '{hashed_pw}', '{full_name}',
-            {dob_sql}, {gender_sql}, 'active',
-            FALSE, TRUE, TRUE, CURRENT_TIMESTAMP()
-        )
-        """
-        
-        session.sql(insert_query).collect()
-        
-        profile_query = f"""
-        INSERT INTO WELLNEST.USER_MANAGEMENT.USER_MEDICAL_PROFILES (
-            PROFILE_ID, USER_ID, CREATED_AT, LAST_UPDATED
-        ) VALUES (
-            '{profile_id}', '{user_id}',
-            CURRENT_TIMESTAMP(), CURRENT_TIMESTAMP()
-        )
-        """
-        
-        session.sql(profile_query).collect()
+        statements.execute(oltp_store, statements.INSERT_USER_SQL, user_id, email, hashed_pw, full_name,
+                           str(date_of_birth) if date_of_birth else None, gender or None, created_at)
+        statements.execute(oltp_store, statements.INSERT_EMPTY_PROFILE_SQL, profile_id, user_id, created_at, created_at)
         
         return True
     
     except Exception as e:
+        logger.exception("Registration failed", extra=log_context())
         st.error(f"Registration failed: {str(e)}")
         return False
 
 def get_user_stats(user_id: str) -> dict:
     """Get user statistics for dashboard"""
     try:
-        conv_query = f"""
-        SELECT COUNT(*) AS CONV_COUNT
-        FROM WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY
-        WHERE USER_ID = '{user_id}'
-        """
-        conv_result = session.sql(conv_query).collect()
-        conv_count = conv_result[0]['CONV_COUNT'] if conv_result else 0
-        
-        doc_query = f"""
-        SELECT COUNT(*) AS DOC_COUNT
-        FROM WELLNEST.MEDICAL_DATA.UPLOADED_DOCUMENTS
-        WHERE USER_ID = '{user_id}'
-        """
-        doc_result = session.sql(doc_query).collect()
-        doc_count = doc_result[0]['DOC_COUNT'] if doc_result else 0
-        
-        profile_query = f"""
-        SELECT 
-            CASE WHEN HEIGHT_CM IS NOT NULL THEN 1 ELSE 0 END +
-            CASE WHEN WEIGHT_KG IS NOT NULL THEN 1 ELSE 0 END +
-            CASE WHEN BLOOD_TYPE IS NOT NULL THEN 1 ELSE 0 END +
-            CASE WHEN SMOKING_STATUS IS NOT NULL THEN 1 ELSE 0 END +
-            CASE WHEN EXERCISE_FREQUENCY IS NOT NULL THEN 1 ELSE 0 END
-            AS COMPLETED_FIELDS
-        FROM WELLNEST.USER_MANAGEMENT.USER_MEDICAL_PROFILES
-        WHERE USER_ID = '{user_id}'
-        """
-        profile_result = session.sql(profile_query).collect()
-        completed = profile_result[0]['COMPLETED_FIELDS'] if profile_result else 0
-        profile_completeness = int((completed / 5) * 100)
+        row = statements.fetch(session, statements.USER_STATS_SQL, user_id, user_id, user_id)[0]
+        completed = row['COMPLETED_FIELDS'] or 0
         
         return {
-            'conversations': conv_count,
-            'documents': doc_count,
-            'profile_completeness': profile_completeness
+            'conversations': row['CONV_COUNT'],
+            'documents': row['DOC_COUNT'],
+            'profile_completeness': int((completed / 5) * 100)
         }
     
     except Exception as e:
+        logger.exception("Error fetching stats", extra=log_context())
         st.error(f"Error fetching stats: {str(e)}")
         return {'conversations': 0, 'documents': 0, 'profile_completeness': 0}
 
-def get_user_profile(user_id):
-    """Fetch user profile from database"""
-    query = f"""
-    SELECT 
-        u.USER_ID, u.EMAIL, u.FULL_NAME, u.DATE_OF_BIRTH, u.GENDER,
-        u.PHONE_NUMBER, u.CREATED_AT,
-        p.PROFILE_ID, p.HEIGHT_CM, p.WEIGHT_KG, p.BMI, p.BLOOD_TYPE,
-        p.HAS_DIABETES, p.HAS_HYPERTENSION, p.HAS_HEART_DISEASE,
-        p.HAS_MENTAL_HEALTH_HISTORY, p.HAS_PCOS,
-        p.SMOKING_STATUS, p.ALCOHOL_CONSUMPTION, p.EXERCISE_FREQUENCY,
-        p.IS_PREGNANT, p.PREGNANCY_TRIMESTER, p.MENSTRUAL_CYCLE_REGULAR,
-        p.LAST_MENSTRUAL_PERIOD, p.EMERGENCY_CONTACT_NAME,
-        p.EMERGENCY_CONTACT_PHONE, p.EMERGENCY_CONTACT_RELATIONSHIP,
-        p.LAST_UPDATED
-    FROM WELLNEST.USER_MANAGEMENT.USERS u
-    LEFT JOIN WELLNEST.USER_MANAGEMENT.USER_MEDICAL_PROFILES p
-        ON u.USER_ID = p.USER_ID
-    WHERE u.USER_ID = '{user_id}'
-    """
-    
-    result = session.sql(query).collect()
-    
-    if result:
-        row = result[0]
-        return {k: row[k] for k in row.asDict().keys()}
-    return None
-
-def update_user_info(user_id, full_name, phone_number):
-    """Update basic user information"""
-    phone_sql = f"'{phone_number}'" if phone_number else "NULL"
-    
-    query = f"""
-    UPDATE WELLNEST.USER_MANAGEMENT.USERS
-    SET FULL_NAME = '{full_name}', PHONE_NUMBER = {phone_sql}
-    WHERE USER_ID = '{user_id}'
-    """
-    session.sql(query).collect()
-
-def update_medical_profile(user_id, profile_data):
-    """Update medical profile information"""
-    set_clauses = []
-    
-    if profile_data.get('height_cm'):
-        set_clauses.append(f"HEIGHT_CM = {profile_data['height_cm']}")
-    if profile_data.get('weight_kg'):
-        set_clauses.append(f"WEIGHT_KG = {profile_data['weight_kg']}")
-    if profile_data.get('bmi'):
-        set_clauses.append(f"BMI = {profile_data['bmi']}")
-    if profile_data.get('blood_type'):
-        set_clauses.append(f"BLOOD_TYPE = '{profile_data['blood_type']}'")
-    
-    set_clauses.append(f"HAS_DIABETES = {profile_data.get('has_diabetes', False)}")
-    set_clauses.append(f"HAS_HYPERTENSION = {profile_data.get('has_hypertension', False)}")
-    set_clauses.append(f"HAS_HEART_DISEASE = {profile_data.get('has_heart_disease', False)}")
-    set_clauses.append(f"HAS_MENTAL_HEALTH_HISTORY = {profile_data.get('has_mental_health_history', False)}")
-    set_clauses.append(f"HAS_PCOS = {profile_data.get('has_pcos', False)}")
-    
-    if profile_data.get('smoking_status'):
-        set_clauses.append(f"SMOKING_STATUS = '{profile_data['smoking_status']}'")
-    if profile_data.get('alcohol_consumption'):
-        set_clauses.append(f"ALCOHOL_CONSUMPTION = '{profile_data['alcohol_consumption']}'")
-    if profile_data.get('exercise_frequency'):
-        set_clauses.append(f"EXERCISE_FREQUENCY = '{profile_data['exercise_frequency']}'")
-    
-    if profile_data.get('gender') == 'Female':
-        set_clauses.append(f"IS_PREGNANT = {profile_data.get('is_pregnant', False)}")
-        if profile_data.get('pregnancy_trimester'):
-            set_clauses.append(f"PREGNANCY_TRIMESTER = {profile_data['pregnancy_trimester']}")
-        set_clauses.append(f"MENSTRUAL_CYCLE_REGULAR = {profile_data.get('menstrual_cycle_regular', False)}")
-        if profile_data.get('last_menstrual_period'):
-            set_clauses.append(f"LAST_MENSTRUAL_PERIOD = '{profile_data['last_menstrual_period']}'")
-    
-    if profile_data.get('emergency_contact_name'):
-        set_clauses.append(f"EMERGENCY_CONTACT_NAME = '{profile_data['emergency_contact_name']}'")
-    if profile_data.get('emergency_contact_phone'):
-        set_clauses.append(f"EMERGENCY_CONTACT_PHONE = '{profile_data['emergency_contact_phone']}'")
-    if profile_data.get('emergency_contact_relationship'):
-        set_clauses.append(f"EMERGENCY_CONTACT_RELATIONSHIP = '{profile_data['emergency_contact_relationship']}'")
-    
-    set_clauses.append("LAST_UPDATED = CURRENT_TIMESTAMP()")
-    
-    query = f"""
-    UPDATE WELLNEST.USER_MANAGEMENT.USER_MEDICAL_PROFILES
-    SET {', '.join(set_clauses)}
-    WHERE USER_ID = '{user_id}'
-    """
-    
-    session.sql(query).collect()
-
 # =============================================================================
 # CONVERSATION FUNCTIONS (EXISTING - PRESERVED)
 # =============================================================================
 
 def save_conversation(user_id: str, user_message: str, assistant_response: str,
                       routed_domain: str = None, urgency_level: str = None,
-                      detected_symptoms: list = None):
-    """Save a conversation turn"""
-    conversation_id = str(uuid.uuid4())
+                      detected_symptoms: list = None, conversation_id: str = None,
+                      telemetry: dict = None):
+    """Save a conversation turn (telemetry: TurnTrace.columns())"""
+    conversation_id = conversation_id or str(uuid.uuid4())
+    telemetry = telemetry or {}
     
     if 'session_id' not in st.session_state:
         st.session_state.session_id = str(uuid.uuid4())
     
     session_id = st.session_state.session_id
-    
-    symptoms_sql = "NULL"
-    if detected_symptoms and len(detected_symptoms) > 0:
-        symptoms_clean = [s.replace("'", "''") for s in detected_symptoms]
-        symptoms_str = "', '".join(symptoms_clean)
-        symptoms_sql = f"ARRAY_CONSTRUCT('{symptoms_str}')"
-    
-    query = f"""
-    INSERT INTO WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY (
-        CONVERSATION_ID,
-        USER_ID,
-        SESSION_ID,
-        MESSAGE_TIMESTAMP,
-        USER_MESSAGE,
-        ASSISTANT_RESPONSE,
-        ROUTED_TO_DOMAIN,
-        URGENCY_LEVEL,
-        DETECTED_SYMPTOMS
-    ) 
-    SELECT 
-        '{conversation_id}',
-        '{user_id}',
-        '{session_id}',
-        CURRENT_TIMESTAMP(),
-        TO_VARCHAR(?),
-        TO_VARCHAR(?),
-        {f"'{routed_domain}'" if routed_domain else "NULL"},
-        {f"'{urgency_level}'" if urgency_level else "NULL"},
-        {symptoms_sql}
-    """
+    symptoms_json = json.dumps(list(detected_symptoms)) if detected_symptoms else None
     
     try:
-        session.sql(query, params=[user_message, assistant_response]).collect()
+        statements.execute(
+            oltp_store, statements.INSERT_CONVERSATION_SQL,
+            conversation_id, user_id, session_id, statements.timestamp(),
+            user_message, assistant_response,
+            routed_domain or None, urgency_level or None, symptoms_json,
+            telemetry.get('response_time_seconds'), telemetry.get('tokens_used'),
+            telemetry.get('used_llm_model'), telemetry.get('router_confidence')
+        )
+        if st.session_state.get('conversation_count') is not None:
+            st.session_state.conversation_count += 1
         return True
     except Exception as e:
+        logger.exception("Error saving conversation", extra=log_context())
         st.error(f"❌ Error saving conversation: {str(e)}")
         return False
 
 def get_conversation_history(user_id: str, limit: int = 50):
     """Retrieve conversation history for a user"""
-    query = f"""
-    SELECT 
-        CONVERSATION_ID,
-        SESSION_ID,
-        MESSAGE_TIMESTAMP,
-        USER_MESSAGE,
-        ASSISTANT_RESPONSE,
-        ROUTED_TO_DOMAIN,
-        URGENCY_LEVEL,
-        DETECTED_SYMPTOMS
-    FROM WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY
-    WHERE USER_ID = '{user_id}'
-    ORDER BY MESSAGE_TIMESTAMP DESC
-    LIMIT {limit}
-    """
-    
     try:
-        result = session.sql(query).collect()
-        return [{k: row[k] for k in row.asDict().keys()} for row in result]
+        return statements.fetch(session, statements.with_limit(statements.CONVERSATION_HISTORY_SQL, limit), user_id)
     except Exception as e:
+        logger.exception("Error loading conversation history", extra=log_context())
         st.error(f"Error loading conversation history: {str(e)}")
         return []
 
+def get_conversation_count(user_id: str) -> int:
+    """Saved turns for the user: counted once per browser session, then kept current by save_conversation"""
+    if st.session_state.get('conversation_count') is None:
+        try:
+            st.session_state.conversation_count = statements.fetch(
+                session, statements.USER_CONVERSATION_COUNT_SQL, user_id)[0]['CNT']
+        except Exception:
+            logger.exception("Error counting conversations", extra=log_context())
+            return 0
+    return st.session_state.conversation_count
+
 def get_current_session_messages(user_id: str, session_id: str):
     """Get messages from current session only"""
-    query = f"""
-    SELECT 
-        MESSAGE_TIMESTAMP,
-        USER_MESSAGE,
-        ASSISTANT_RESPONSE,
-        ROUTED_TO_DOMAIN,
-        URGENCY_LEVEL
-    FROM WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY
-    WHERE USER_ID = '{user_id}' AND SESSION_ID = '{session_id}'
-    ORDER BY MESSAGE_TIMESTAMP ASC
-    """
-    
     try:
-        result = session.sql(query).collect()
-        return [{k: row[k] for k in row.asDict().keys()} for row in result]
-    except Exception as e:
+        return statements.fetch(oltp_store, statements.SESSION_MESSAGES_SQL, user_id, session_id)
+    except Exception:
+        logger.exception("Error loading session messages", extra=log_context())
         return []
 
 # =============================================================================
@@ -510,68 +306,24 @@ def save_uploaded_document(user_id: str, file_name: str, file_size: int,
     """Save uploaded document with content to database"""
     document_id = str(uuid.uuid4())
     
-    import base64
     file_content_b64 = base64.b64encode(file_content).decode('utf-8')
     
     try:
-        safe_filename = file_name.replace("'", "''")
-        
-        insert_query = f"""
-        INSERT INTO WELLNEST.MEDICAL_DATA.UPLOADED_DOCUMENTS (
-            DOCUMENT_ID,
-            USER_ID,
-            ORIGINAL_FILENAME,
-            DOCUMENT_TYPE,
-            UPLOAD_TIMESTAMP,
-            FILE_SIZE_BYTES,
-            FILE_CONTENT_BASE64,
-            PROCESSING_STATUS,
-            PROCESSING_STARTED_AT
-        ) VALUES (
-            '{document_id}',
-            '{user_id}',
-            '{safe_filename}',
-            '{document_type if document_type else "unknown"}',
-            CURRENT_TIMESTAMP(),
-            {file_size},
-            '{file_content_b64}',
-            'pending',
-            CURRENT_TIMESTAMP()
-        )
-        """
-        
-        session.sql(insert_query).collect()
-        
+        statements.execute(session, statements.INSERT_DOCUMENT_SQL, document_id, user_id, file_name,
+                           document_type or "unknown", file_size, file_content_b64)
         return document_id
     
     except Exception as e:
+        logger.exception("Error saving document", extra=log_context())
         st.error(f"Error saving document: {str(e)}")
         return None
 
 def get_user_documents(user_id: str, limit: int = 50):
     """Retrieve all documents uploaded by a user"""
-    query = f"""
-    SELECT 
-        DOCUMENT_ID,
-        ORIGINAL_FILENAME,
-        DOCUMENT_TYPE,
-        UPLOAD_TIMESTAMP,
-        FILE_SIZE_BYTES,
-        PROCESSING_STATUS,
-        PROCESSING_COMPLETED_AT,
-        EXTRACTED_DATA,
-        EXTRACTION_CONFIDENCE_SCORE,
-        DETECTED_TEST_TYPES
-    FROM WELLNEST.MEDICAL_DATA.UPLOADED_DOCUMENTS
-    WHERE USER_ID = '{user_id}'
-    ORDER BY UPLOAD_TIMESTAMP DESC
-    LIMIT {limit}
-    """
-    
     try:
-        result = session.sql(query).collect()
-        return [{k: row[k] for k in row.asDict().keys()} for row in result]
+        return statements.fetch(session, statements.with_limit(statements.USER_DOCUMENTS_SQL, limit), user_id)
     except Exception as e:
+        logger.exception("Error loading documents", extra=log_context())
         st.error(f"Error loading documents: {str(e)}")
         return []
 
@@ -580,46 +332,23 @@ def update_document_processing_status(document_id: str, status: str,
                                       confidence_score: float = None,
                                       error_message: str = None):
     """Update document processing status after extraction"""
-    set_clauses = [
-        f"PROCESSING_STATUS = '{status}'",
-        "PROCESSING_COMPLETED_AT = CURRENT_TIMESTAMP()"
-    ]
-    
-    if extracted_data:
-        json_str = json.dumps(extracted_data).replace("'", "''")
-        set_clauses.append(f"EXTRACTED_DATA = PARSE_JSON('{json_str}')")
-    
-    if confidence_score is not None:
-        set_clauses.append(f"EXTRACTION_CONFIDENCE_SCORE = {confidence_score}")
-    
-    if error_message:
-        error_escaped = error_message.replace("'", "''")
-        set_clauses.append(f"PROCESSING_ERROR_MESSAGE = '{error_escaped}'")
-    
-    query = f"""
-    UPDATE WELLNEST.MEDICAL_DATA.UPLOADED_DOCUMENTS
-    SET {', '.join(set_clauses)}
-    WHERE DOCUMENT_ID = '{document_id}'
-    """
-    
     try:
-        session.sql(query).collect()
+        statements.execute(session, statements.UPDATE_DOCUMENT_STATUS_SQL, status,
+                           json.dumps(extracted_data) if extracted_data else None,
+                           confidence_score, error_message or None, document_id)
         return True
     except Exception as e:
+        logger.exception("Error updating document status", extra=log_context())
         st.error(f"Error updating document status: {str(e)}")
         return False
 
 def delete_document(document_id: str, user_id: str):
     """Delete a document"""
-    query = f"""
-    DELETE FROM WELLNEST.MEDICAL_DATA.UPLOADED_DOCUMENTS
-    WHERE DOCUMENT_ID = '{document_id}' AND USER_ID = '{user_id}'
-    """
-    
     try:
-        session.sql(query).collect()
+        statements.execute(session, statements.DELETE_DOCUMENT_SQL, document_id, user_id)
         return True
     except Exception as e:
+        logger.exception("Error deleting document", extra=log_context())
         st.error(f"Error deleting document: {str(e)}")
         return False
 
@@ -660,17 +389,7 @@ def process_pdf_document(file_content: bytes, filename: str) -> dict:
 def get_document_stats(user_id: str) -> dict:
     """Get document statistics for dashboard"""
     try:
-        query = f"""
-        SELECT 
-            COUNT(*) as TOTAL_DOCS,
-            SUM(CASE WHEN PROCESSING_STATUS = 'completed' THEN 1 ELSE 0 END) as PROCESSED,
-            SUM(CASE WHEN PROCESSING_STATUS = 'pending' THEN 1 ELSE 0 END) as PENDING,
-            SUM(FILE_SIZE_BYTES) as TOTAL_SIZE
-        FROM WELLNEST.MEDICAL_DATA.UPLOADED_DOCUMENTS
-        WHERE USER_ID = '{user_id}'
-        """
-        
-        result = session.sql(query).collect()
+        result = statements.fetch(session, statements.DOCUMENT_STATS_SQL, user_id)
         
         if result:
             row = result[0]
@@ -682,62 +401,10 @@ def get_document_stats(user_id: str) -> dict:
             }
         return {'total': 0, 'processed': 0, 'pending': 0, 'total_size': 0}
     
-    except Exception as e:
+    except Exception:
+        logger.exception("Error loading document stats", extra=log_context())
         return {'total': 0, 'processed': 0, 'pending': 0, 'total_size': 0}
 
-# =============================================================================
-# EMERGENCY DETECTION (EXISTING - PRESERVED)
-# =============================================================================
-
-def detect_emergency_keywords(message: str) -> tuple:
-    """Detect emergency keywords in user message"""
-    message_lower = message.lower()
-    
-    emergency_keywords = [
-        'chest pain', 'heart attack', 'stroke', 'seizure',
-        'unconscious', 'severe bleeding', 'not breathing',
-        'suicide', 'kill myself', 'end my life',
-        'severe headache', 'can\'t breathe', 'choking'
-    ]
-    
-    urgent_keywords = [
-        'high fever', 'vomiting blood', 'severe pain',
-        'can\'t move', 'vision loss', 'confusion',
-        'severe allergic', 'broken bone', 'severe burn'
-    ]
-    
-    symptom_keywords = [
-        'headache', 'fever', 'cough', 'fatigue', 'nausea',
-        'dizziness', 'pain', 'swelling', 'rash', 'shortness of breath',
-        'anxiety', 'depression', 'insomnia', 'stress',
-        'blood pressure', 'blood sugar', 'diabetes', 'hypertension'
-    ]
-    
-    detected_symptoms = []
-    
-    for keyword in emergency_keywords:
-        if keyword in message_lower:
-            detected_symptoms.append(keyword)
-            return True, 'emergency', detected_symptoms
-    
-    for keyword in urgent_keywords:
-        if keyword in message_lower:
-            detected_symptoms.append(keyword)
-    
-    if detected_symptoms:
-        return False, 'urgent', detected_symptoms
-    
-    for keyword in symptom_keywords:
-        if keyword in message_lower:
-            detected_symptoms.append(keyword)
-    
-    if len(detected_symptoms) >= 3:
-        return False, 'needs_attention', detected_symptoms
-    elif detected_symptoms:
-        return False, 'routine', detected_symptoms
-    else:
-        return False, 'routine', []
-
 # =============================================================================
 # 🆕 SMART CONTEXT FUNCTIONS - NEW ADDITIONS
 # =============================================================================
@@ -758,11 +425,13 @@ def extract_and_track_metrics(user_message: str, assistant_response: str,
         data = result if isinstance(result, dict) else json.loads(result)
         
         if data.get('extracted', 0) > 0:
+            st.session_state.pop('triage_features', None)
             with st.sidebar:
                 st.success(f"📊 Tracked {data['extracted']} metric(s)")
         
         return data
     except Exception as e:
+        logger.exception("Metric extraction failed", extra=log_context(conversation_id=conversation_id, domain=domain))
         return {"extracted": 0, "error": str(e)}
 
 def display_metric_trends(user_id: str, domain: str):
@@ -810,6 +479,8 @@ def display_metric_trends(user_id: str, domain: str):
                 change = data.get('percent_change', 0)
                 points = data['data_points']
                 
+                is_abnormal, severity = thresholds.metric_severity(metric_type, current)
+                
                 with st.sidebar:
                     st.metric(
                         label=name,
@@ -817,8 +488,10 @@ def display_metric_trends(user_id: str, domain: str):
                         delta=f"{change:+.1f}%" if abs(change) > 0.1 else "stable",
                         delta_color="inverse" if lower_better else "normal"
                     )
-                    st.caption(f"Based on {points} reading{'s' if points > 1 else ''}")
-        except:
+                    severity_note = f" · ⚠️ {severity}" if is_abnormal else ""
+                    st.caption(f"Based on {points} reading{'s' if points > 1 else ''}{severity_note}")
+        except Exception:
+            logger.exception("Metric trend failed", extra=log_context(metric_type=metric_type, domain=domain))
             continue
 
 def summarize_current_session():
@@ -827,15 +500,13 @@ def summarize_current_session():
         return False
     
     try:
-        check = session.sql(f"""
-            SELECT COUNT(*) as cnt
-            FROM WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY
-            WHERE SESSION_ID = '{st.session_state.session_id}'
-        """).collect()
+        check = statements.fetch(oltp_store, statements.SESSION_MESSAGE_COUNT_SQL, st.session_state.session_id)
         
         if check[0]['CNT'] < 2:
             return False
         
+        # The procedure reads CONVERSATION_HISTORY; let replication catch up first
+        oltp_store.sync()
         result = session.call(
             'WELLNEST.USER_MANAGEMENT.SUMMARIZE_SESSION',
             st.session_state.user_id,
@@ -844,7 +515,8 @@ def summarize_current_session():
         
         data = result if isinstance(result, dict) else json.loads(result)
         return data.get('summary_created', False)
-    except:
+    except Exception:
+        logger.exception("Session summary failed", extra=log_context())
         return False
 
 # =============================================================================
@@ -868,6 +540,7 @@ def call_router_llm(user_message: str, user_id: str) -> dict:
         return classification
     
     except Exception as e:
+        logger.exception("Router classification error", extra=log_context())
         st.error(f"🔴 Router classification error: {str(e)}")
         
         return {
@@ -880,6 +553,51 @@ def call_router_llm(user_message: str, user_id: str) -> dict:
             "classification_status": "error"
         }
 
+@st.cache_resource
+def get_triage_batcher():
+    """Load the triage model once per process; requests from all sessions share its batches"""
+    from wellnest_core.triage_model import MicroBatcher, TriageModel
+    return MicroBatcher(TriageModel.load(TRIAGE_MODEL_PATH))
+
+def get_triage_features(user_id: str):
+    """Model input row for the user, cached per session until a profile edit or new metric"""
+    cached = st.session_state.get('triage_features')
+    if cached and cached[0] == user_id:
+        return cached[1]
+    import pandas as pd
+    from wellnest_core import features
+    profile = get_user_profile(user_id)
+    if not profile:
+        return None
+    metrics = pd.DataFrame(statements.fetch(session, statements.LATEST_HEALTH_METRICS_SQL, user_id),
+                           columns=['USER_ID', 'METRIC_TYPE', 'METRIC_VALUE', 'MEASUREMENT_DATE'])
+    row = features.diabetes_features(features.user_inputs(pd.DataFrame([profile]), metrics)).iloc[0].to_dict()
+    st.session_state.triage_features = (user_id, row)
+    return row
+
+def score_triage_model(user_id: str):
+    """ML urgency for the user's profile and latest metrics, or None (logged) when unavailable"""
+    if not TRIAGE_MODEL_PATH:
+        return None
+    try:
+        row = get_triage_features(user_id)
+    except Exception:
+        logger.exception("Triage feature lookup failed", extra=log_context())
+        return None
+    if row is None:
+        logger.warning("Triage model skipped: no profile", extra=log_context())
+        return None
+    try:
+        return get_triage_batcher().score(row)
+    except Exception:
+        logger.exception("Triage model scoring failed", extra=log_context())
+        return None
+
+@st.cache_resource
+def get_specialist_hedger():
+    """Process-wide hedger so latency history survives reruns"""
+    return HedgedCaller(max_hedge_fraction=SPECIALIST_MAX_HEDGE_FRACTION)
+
 def call_specialist_llm(user_message: str, classification: dict, user_id: str) -> str:
     """
     🆕 UPDATED: Call specialist with SESSION_ID for smart context
@@ -889,19 +607,37 @@ def call_specialist_llm(user_message: str, classification: dict, user_id: str) -
         if 'session_id' not in st.session_state:
             st.session_state.session_id = str(uuid.uuid4())
         
-        # Call specialist with session_id for context-aware responses
-        response = session.call(
-            'WELLNEST.USER_MANAGEMENT.QUERY_SPECIALIST_LLM',
-            user_message,                           # USER_QUERY
-            classification['domain'],               # DOMAIN
-            user_id,                                # USER_ID
-            classification['specialist_model'],     # SPECIALIST_MODEL
-            st.session_state.session_id             # 🆕 SESSION_ID for context
-        )
+        # Read session state up front - hedged calls run in worker threads
+        session_id = st.session_state.session_id
+        
+        # The procedure reads the current session from CONVERSATION_HISTORY;
+        # let replication of the earlier turns catch up first
+        oltp_store.sync()
+        
+        def query_specialist(model):
+            # Call specialist with session_id for context-aware responses
+            return session.call(
+                'WELLNEST.USER_MANAGEMENT.QUERY_SPECIALIST_LLM',
+                user_message,                           # USER_QUERY
+                classification['domain'],               # DOMAIN
+                user_id,                                # USER_ID
+                model,                                  # SPECIALIST_MODEL
+                session_id                              # 🆕 SESSION_ID for context
+            )
+        
+        primary_model = classification['specialist_model']
+        
+        if not SPECIALIST_HEDGING_ENABLED:
+            return query_specialist(primary_model)
         
-        return response
+        hedge_model = SPECIALIST_HEDGE_MODEL or primary_model
+        return get_specialist_hedger().call(
+            lambda: query_specialist(primary_model),
+            lambda: query_specialist(hedge_model)
+        )
     
     except Exception as e:
+        logger.exception("Specialist LLM error", extra=log_context())
         st.error(f"🔴 Specialist LLM error: {str(e)}")
         
         return f"""I apologize, but I encountered an error processing your request.
@@ -917,10 +653,7 @@ I'm here to help once the technical issue is resolved!"""
 
 def remove_hallucinated_phrases(response: str, user_id: str) -> str:
     """Strip out hallucinated conversation references"""
-    import re
-    
-    history = get_conversation_history(user_id, limit=1)
-    has_history = len(history) > 0
+    has_history = get_conversation_count(user_id) > 0
     
     if not has_history:
         removal_patterns = [
@@ -982,17 +715,31 @@ def format_llm_response(specialist_response: str, classification: dict) -> str:
     
     return formatted_response
 
+def finish_turn_telemetry(trace: TurnTrace, conversation_id: str):
+    """Write the turn's stage spans (off the request path when replicating); telemetry never fails a turn"""
+    try:
+        oltp_store.defer(*spans_insert(trace, conversation_id,
+                                       st.session_state.user_id, st.session_state.session_id))
+    except Exception:
+        logger.warning("Turn telemetry write failed", exc_info=True,
+                       extra=log_context(conversation_id=conversation_id))
+
 def process_user_message(user_message: str) -> str:
     """
-    🆕 UPDATED: Complete pipeline with metric tracking
+    🆕 UPDATED: Complete pipeline with metric tracking and per-stage telemetry
     """
+    trace = TurnTrace()
+    conversation_id = str(uuid.uuid4())
     
     # Step 1: Emergency detection
-    is_emergency_local, urgency_local, symptoms_local = detect_emergency_keywords(user_message)
+    with trace.span('emergency_scan'):
+        is_emergency_local, urgency_local, symptoms_local = detect_emergency_keywords(user_message)
     
     # Step 2: Router classification
-    with st.spinner("🔍 Analyzing your question..."):
+    with st.spinner("🔍 Analyzing your question..."), trace.span('router'):
         classification = call_router_llm(user_message, st.session_state.user_id)
+    trace.router_confidence = classification.get('confidence')
+    trace.add_tokens(user_message)
     
     # Step 3: Check scope
     if classification.get('scope_violation', False) or classification.get('domain') == 'OUT_OF_SCOPE':
@@ -1013,14 +760,20 @@ Your question appears to be outside these areas.
 
 Please feel free to ask about any of these health topics! 🩺"""
         
-        save_conversation(
-            st.session_state.user_id,
-            user_message,
-            out_of_scope_response,
-            routed_domain='out_of_scope',
-            urgency_level='routine',
-            detected_symptoms=[]
-        )
+        trace.domain = 'out_of_scope'
+        trace.mark_response()
+        with trace.span('persistence'):
+            save_conversation(
+                st.session_state.user_id,
+                user_message,
+                out_of_scope_response,
+                routed_domain='out_of_scope',
+                urgency_level='routine',
+                detected_symptoms=[],
+                conversation_id=conversation_id,
+                telemetry=trace.columns()
+            )
+        finish_turn_telemetry(trace, conversation_id)
         
         return out_of_scope_response
     
@@ -1029,6 +782,17 @@ Please feel free to ask about any of these health topics! 🩺"""
         if symptoms_local:
             classification['safety_flags'] = symptoms_local
     
+    # Step 3B: ML second opinion on router urgency (diabetes model, DIABETES turns only)
+    if classification.get('domain') == TRIAGE_DOMAIN and TRIAGE_MODEL_PATH:
+        from wellnest_core.triage_model import second_opinion
+        with trace.span('triage_model'):
+            model_score = score_triage_model(st.session_state.user_id)
+        if model_score:
+            classification['model_urgency'] = model_score
+            escalated = second_opinion(classification['urgency'], model_score, TRIAGE_ESCALATION_CONFIDENCE)
+            if escalated:
+                classification['urgency'] = escalated
+    
     # Step 4: Handle emergencies
     if classification['urgency'] == 'EMERGENCY':
         emergency_response = f"""🚨 **EMERGENCY DETECTED** 🚨
@@ -1054,66 +818,75 @@ Please feel free to ask about any of these health topics! 🩺"""
 ⚠️ **This is an AI system and CANNOT provide emergency medical care.**  
 ⚠️ **Do not delay seeking professional medical help.**"""
         
-        save_conversation(
-            st.session_state.user_id,
-            user_message,
-            emergency_response,
-            routed_domain='emergency_triage',
-            urgency_level='emergency',
-            detected_symptoms=classification.get('safety_flags', symptoms_local)
-        )
+        trace.domain = 'emergency_triage'
+        trace.mark_response()
+        with trace.span('persistence'):
+            save_conversation(
+                st.session_state.user_id,
+                user_message,
+                emergency_response,
+                routed_domain='emergency_triage',
+                urgency_level='emergency',
+                detected_symptoms=classification.get('safety_flags', symptoms_local),
+                conversation_id=conversation_id,
+                telemetry=trace.columns()
+            )
+        finish_turn_telemetry(trace, conversation_id)
         
         return emergency_response
     
+    trace.domain = classification['domain']
+    trace.model = classification.get('specialist_model')
+    
     # 🆕 Step 5: Display current metrics in sidebar
     st.session_state.last_domain = classification['domain']
-    display_metric_trends(st.session_state.user_id, classification['domain'])
+    with trace.span('context'):
+        display_metric_trends(st.session_state.user_id, classification['domain'])
     
-    # Step 6: Call specialist (now with smart context)
-    with st.spinner(f"💭 Consulting {classification['domain'].replace('_', ' ').title()} specialist..."):
+    # Step 6: Call specialist (now with smart context, built inside the procedure)
+    with st.spinner(f"💭 Consulting {classification['domain'].replace('_', ' ').title()} specialist..."), \
+            trace.span('specialist'):
         specialist_response = call_specialist_llm(
             user_message,
             classification,
             st.session_state.user_id
         )
+    trace.add_tokens(user_message, specialist_response)
     
-    # Step 7: Remove hallucinations
-    cleaned_response = remove_hallucinated_phrases(specialist_response, st.session_state.user_id)
-    
-    # Step 8: Format response
-    final_response = format_llm_response(cleaned_response, classification)
+    # Step 7-8: Remove hallucinations and format response
+    with trace.span('postprocess'):
+        cleaned_response = remove_hallucinated_phrases(specialist_response, st.session_state.user_id)
+        final_response = format_llm_response(cleaned_response, classification)
+    trace.mark_response()
     
     # Step 9: Save conversation
-    save_result = save_conversation(
-        st.session_state.user_id,
-        user_message,
-        final_response,
-        routed_domain=classification['domain'],
-        urgency_level=classification['urgency'].lower(),
-        detected_symptoms=classification.get('safety_flags', [])
-    )
+    with trace.span('persistence'):
+        save_result = save_conversation(
+            st.session_state.user_id,
+            user_message,
+            final_response,
+            routed_domain=classification['domain'],
+            urgency_level=classification['urgency'].lower(),
+            detected_symptoms=classification.get('safety_flags', []),
+            conversation_id=conversation_id,
+            telemetry=trace.columns()
+        )
     
     # 🆕 Step 10: Extract metrics (async - don't block UI)
-    try:
-        conv_id_query = f"""
-        SELECT CONVERSATION_ID
-        FROM WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY
-        WHERE USER_ID = '{st.session_state.user_id}'
-          AND SESSION_ID = '{st.session_state.session_id}'
-        ORDER BY MESSAGE_TIMESTAMP DESC
-        LIMIT 1
-        """
-        
-        conv_result = session.sql(conv_id_query).collect()
-        if conv_result:
-            conversation_id = conv_result[0]['CONVERSATION_ID']
-            extract_and_track_metrics(
-                user_message, final_response,
-                st.session_state.user_id, conversation_id,
-                classification['domain']
-            )
-    except:
-        pass  # Don't fail if metric extraction fails
+    if save_result:
+        try:
+            with trace.span('metric_extraction'):
+                extract_and_track_metrics(
+                    user_message, final_response,
+                    st.session_state.user_id, conversation_id,
+                    classification['domain']
+                )
+        except Exception:
+            # Don't fail the turn if metric extraction fails
+            logger.exception("Metric extraction step failed",
+                             extra=log_context(conversation_id=conversation_id))
+    
+    finish_turn_telemetry(trace, conversation_id)
     
     if save_result:
         st.toast(f"💾 Saved ({classification['domain']})", icon="✅")
@@ -1177,13 +950,26 @@ def render_chat_page():
         
         st.markdown("---")
         
-        total_conversations = len(get_conversation_history(st.session_state.user_id, limit=1000))
+        total_conversations = get_conversation_count(st.session_state.user_id)
         st.metric("Total Conversations", total_conversations)
         
         st.markdown("---")
         
         if st.button("📜 View History", use_container_width=True):
             st.session_state.show_history = True
+        
+        if SPECIALIST_HEDGING_ENABLED:
+            with st.expander("⏱️ Specialist Latency"):
+                hedge_stats = get_specialist_hedger().stats()
+                st.caption(f"Hedged {hedge_stats['hedged_calls']}/{hedge_stats['total_calls']} calls "
+                           f"({hedge_stats['hedge_fraction']:.0%}), hedge won {hedge_stats['hedge_wins']}")
+                if hedge_stats['served_p99'] is not None and hedge_stats['primary_p99'] is not None:
+                    st.metric(
+                        "p99 latency",
+                        f"{hedge_stats['served_p99']:.1f}s",
+                        delta=f"{hedge_stats['served_p99'] - hedge_stats['primary_p99']:+.1f}s vs unhedged",
+                        delta_color="inverse"
+                    )
     
     # Show conversation history modal
     if st.session_state.get('show_history', False):
@@ -1307,9 +1093,14 @@ def render_sidebar():
                 st.session_state.current_page = 'documents'
                 st.rerun()
             
+            if st.button("⏱️ Latency", use_container_width=True):
+                st.session_state.current_page = 'telemetry'
+                st.rerun()
+            
             st.markdown("---")
             
             if st.button("🚪 Logout", use_container_width=True):
+                session_tokens.end_session(oltp_store)
                 for key in list(st.session_state.keys()):
                     del st.session_state[key]
                 st.rerun()
@@ -1337,10 +1128,8 @@ def render_login_page():
                     with st.spinner("Authenticating..."):
                         user = authenticate_user(email, password)
                         if user:
-                            st.session_state.user_id = user['user_id']
-                            st.session_state.email = user['email']
-                            st.session_state.full_name = user['full_name']
-                            st.session_state.authenticated = True
+                            # Signed token lets reloads skip re-authentication
+                            session_tokens.start_session(user)
                             st.session_state.current_page = 'dashboard'
                             st.success(f"✅ Welcome back, {user['full_name']}!")
                             st.rerun()
@@ -1613,6 +1402,7 @@ def render_profile_page():
                             'gender': gender
                         }
                         update_medical_profile(st.session_state.user_id, profile_data)
+                        st.session_state.pop('triage_features', None)
                         
                         st.success("✅ Profile updated successfully!")
                         st.rerun()
@@ -1684,6 +1474,7 @@ def render_profile_page():
                         'gender': profile['GENDER']
                     }
                     update_medical_profile(st.session_state.user_id, profile_data)
+                    st.session_state.pop('triage_features', None)
                     
                     st.success("✅ Medical history updated successfully!")
                     st.rerun()
@@ -1731,6 +1522,7 @@ def render_profile_page():
                         'exercise_frequency': exercise
                     }
                     update_medical_profile(st.session_state.user_id, profile_data)
+                    st.session_state.pop('triage_features', None)
                     
                     st.success("✅ Lifestyle information updated successfully!")
                     st.rerun()
@@ -1777,6 +1569,7 @@ def render_profile_page():
                         'emergency_contact_relationship': emergency_relationship
                     }
                     update_medical_profile(st.session_state.user_id, profile_data)
+                    st.session_state.pop('triage_features', None)
                     
                     st.success("✅ Emergency contact updated successfully!")
                     st.rerun()
@@ -1946,7 +1739,7 @@ def render_documents_page():
                         try:
                             extracted = json.loads(doc['EXTRACTED_DATA']) if isinstance(doc['EXTRACTED_DATA'], str) else doc['EXTRACTED_DATA']
                             st.json(extracted)
-                        except:
+                        except (TypeError, ValueError):
                             st.text(str(doc['EXTRACTED_DATA']))
                     
                     if doc['DETECTED_TEST_TYPES']:
@@ -1975,13 +1768,67 @@ def render_documents_page():
                                 st.success("✅ Document deleted successfully!")
                                 st.rerun()
 
+def render_telemetry_page():
+    """Per-stage chat latency from TURN_SPANS"""
+    st.title("⏱️ Chat Latency")
+    st.caption("Wall time per pipeline stage of each chat turn (ms)")
+    
+    days = st.selectbox("Window", [1, 7, 30], index=1, format_func=lambda d: f"Last {d} day{'s' if d > 1 else ''}")
+    
+    try:
+        latency = stage_latency(session, days)
+    except Exception as e:
+        logger.exception("Error loading telemetry", extra=log_context())
+        st.error(f"❌ Error loading telemetry: {str(e)}")
+        return
+    
+    if latency.empty:
+        st.info("No chat turns recorded in this window yet.")
+        return
+    
+    columns = ['STAGE', 'TURNS', 'P50_MS', 'P95_MS', 'P99_MS']
+    overall = latency[latency['ROUTED_TO_DOMAIN'] == 'ALL']
+    
+    total = overall[overall['STAGE'] == 'total']
+    if not total.empty:
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("💬 Turns", f"{int(total['TURNS'].iloc[0]):,}")
+        col2.metric("p50", f"{total['P50_MS'].iloc[0] / 1000:.2f}s")
+        col3.metric("p95", f"{total['P95_MS'].iloc[0] / 1000:.2f}s")
+        col4.metric("p99", f"{total['P99_MS'].iloc[0] / 1000:.2f}s")
+    
+    st.markdown("### 📊 By Stage")
+    stages = overall[overall['STAGE'] != 'total']
+    st.bar_chart(stages.set_index('STAGE')[['P50_MS', 'P95_MS', 'P99_MS']])
+    st.dataframe(overall[columns].round(1), use_container_width=True, hide_index=True)
+    
+    st.markdown("### 🏥 By Domain")
+    by_domain = latency[latency['ROUTED_TO_DOMAIN'] != 'ALL']
+    for domain in sorted(by_domain['ROUTED_TO_DOMAIN'].unique()):
+        with st.expander(domain.replace('_', ' ').title()):
+            st.dataframe(by_domain[by_domain['ROUTED_TO_DOMAIN'] == domain][columns].round(1),
+                         use_container_width=True, hide_index=True)
+
 # =============================================================================
 # MAIN APPLICATION LOGIC
 # =============================================================================
 
+def log_query_profile(report: dict):
+    """Warn about reruns over their round-trip budget or repeating a statement"""
+    if report['over_budget'] or report['repeated']:
+        logger.warning(
+            f"Query profile: {report['page']} took {report['round_trips']} round trips "
+            f"(budget {report['budget']}), {len(report['repeated'])} repeated statement(s)",
+            extra=log_context(**{k: v for k, v in report.items() if k != 'statements'})
+        )
+
 def main():
     """Main application router"""
     
+    # Reloads and reconnects lose session_state - restore from the signed token
+    # (for a live session this only rotates a token past half its life)
+    session_tokens.restore_session(oltp_store)
+    
     if st.session_state.authenticated:
         render_sidebar()
     
@@ -1996,6 +1843,12 @@ def main():
             render_chat_page()
         elif st.session_state.current_page == 'documents':
             render_documents_page()
+        elif st.session_state.current_page == 'telemetry':
+            render_telemetry_page()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    page = st.session_state.current_page if st.session_state.authenticated else 'login'
+    with query_profiler.rerun(page, on_report=log_query_profile) as profile:
+        main()
+    if profile:
+        query_profiler.render_panel(profile.report())
\ No newline at end of file
@@ -0,0 +1,25 @@
+# =============================================================================
+# WELLNEST CORE
+# =============================================================================
+# Shared code for the Streamlit pages (app.py, Profile.py):
+#   connection.py      - one Snowpark session per process
+#   oltp.py            - row store for per-user hot paths, replicated to the warehouse
+#   query_profiler.py  - opt-in per-rerun query counts and repeat detection
+#   statements.py      - named, parameterized SQL statements for the pages
+#   sqlcheck.py        - static check for SQL built by interpolation
+#   lazy.py            - deferred imports for heavy modules
+#   health.py          - BMI / age / profile completeness helpers
+#   emergency.py       - local emergency keyword scan
+#   profiles.py        - user profile data access
+#   auth.py            - bcrypt pool and login statements
+#   session_tokens.py  - signed session tokens
+#   hedging.py         - hedged specialist requests
+#   thresholds.py      - clinical thresholds (generated from the dbt seed)
+#   features.py        - vectorized gold features (mirrors the dbt models)
+#   triage_model.py    - micro-batched ML urgency scoring
+#   telemetry.py       - per-turn stage timings and token estimates
+#   app_logging.py     - batched background writer for APPLICATION_LOGS
+#
+# Submodules are imported explicitly by the pages so that a rerun only pays
+# for what it uses.
+# =============================================================================
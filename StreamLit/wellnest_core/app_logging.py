@@ -0,0 +1,178 @@
+# =============================================================================
+# WELLNEST CORE - APPLICATION LOGS
+# =============================================================================
+# A logging.Handler that ships records to WELLNEST.APP_LOGS.APPLICATION_LOGS
+# without touching the request path: emit() only appends to an in-memory
+# buffer, and a background thread flushes it in one multi-row INSERT every
+# FLUSH_INTERVAL_SECONDS (or as soon as BATCH_SIZE records are waiting).
+#   - WARNING and above are always kept; INFO / DEBUG are sampled
+#   - the buffer is bounded; when the warehouse is unreachable the oldest
+#     records are dropped and counted instead of growing memory
+#   - user / session IDs travel in extra={...} (see app.log_context), since
+#     the flush thread cannot read st.session_state
+# =============================================================================
+
+import atexit
+import json
+import logging
+import random
+import threading
+import traceback
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+
+from wellnest_core import statements
+
+LOGGER_NAME = 'wellnest'
+BATCH_SIZE = 100
+FLUSH_INTERVAL_SECONDS = 5.0
+MAX_BUFFERED_RECORDS = 5000
+INFO_SAMPLE_RATE = 0.1
+
+# Column limits from the APPLICATION_LOGS DDL
+MAX_MESSAGE_CHARS = 5000
+MAX_STACK_CHARS = 10000
+
+INSERT_LOGS_SQL = """
+INSERT INTO WELLNEST.APP_LOGS.APPLICATION_LOGS (
+    LOG_ID, LOG_TIMESTAMP, LOG_LEVEL, LOG_SOURCE, LOG_MESSAGE,
+    USER_ID, SESSION_ID, FUNCTION_NAME, ERROR_TYPE, STACK_TRACE, REQUEST_PAYLOAD
+)
+SELECT column1, TO_TIMESTAMP_NTZ(column2), column3, column4, column5,
+       column6, column7, column8, column9, column10, PARSE_JSON(column11)
+FROM VALUES {rows}
+"""
+
+_install_lock = threading.Lock()
+_handler = None
+
+
+class SnowflakeLogHandler(logging.Handler):
+    """Buffered, sampled, background-flushed handler for APPLICATION_LOGS"""
+
+    def __init__(self, session, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL_SECONDS,
+                 max_buffered=MAX_BUFFERED_RECORDS, info_sample_rate=INFO_SAMPLE_RATE):
+        super().__init__()
+        self.session = session
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.info_sample_rate = info_sample_rate
+
+        self._buffer = deque(maxlen=max_buffered)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self.dropped = 0
+        self.sampled_out = 0
+        self.failed_flushes = 0
+
+        self._worker = threading.Thread(target=self._run, name='wellnest-log-flush', daemon=True)
+        self._worker.start()
+
+    # -------------------------------------------------------------------------
+    # Request path: no I/O
+    # -------------------------------------------------------------------------
+
+    def emit(self, record):
+        if record.levelno < logging.WARNING and random.random() >= self.info_sample_rate:
+            self.sampled_out += 1
+            return
+        try:
+            row = self._to_row(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1
+            self._buffer.append(row)
+            pending = len(self._buffer)
+        if pending >= self.batch_size:
+            self._wake.set()
+
+    def _to_row(self, record):
+        error_type = stack = None
+        if record.exc_info and record.exc_info[0] is not None:
+            error_type = record.exc_info[0].__name__
+            stack = ''.join(traceback.format_exception(*record.exc_info))[-MAX_STACK_CHARS:]
+        payload = getattr(record, 'payload', None)
+        return [
+            str(uuid.uuid4()),
+            datetime.fromtimestamp(record.created, tz=timezone.utc).strftime('%Y-%m-%d %H:%M:%S.%f'),
+            record.levelname,
+            record.name,
+            record.getMessage()[:MAX_MESSAGE_CHARS],
+            getattr(record, 'user_id', None),
+            getattr(record, 'session_id', None),
+            record.funcName,
+            error_type,
+            stack,
+            json.dumps(payload, default=str) if payload is not None else None,
+        ]
+
+    # -------------------------------------------------------------------------
+    # Background flush
+    # -------------------------------------------------------------------------
+
+    def _take_batch(self):
+        with self._lock:
+            count = min(self.batch_size, len(self._buffer))
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def _write(self, rows):
+        params = [value for row in rows for value in row]
+        self.session.sql(statements.with_rows(INSERT_LOGS_SQL, 11, len(rows)), params=params).collect()
+
+    def flush(self):
+        """Write everything buffered; failed batches go back to the front of the buffer"""
+        while True:
+            rows = self._take_batch()
+            if not rows:
+                return
+            try:
+                self._write(rows)
+            except Exception:
+                self.failed_flushes += 1
+                with self._lock:
+                    space = self._buffer.maxlen - len(self._buffer)
+                    self.dropped += max(0, len(rows) - space)
+                    self._buffer.extendleft(reversed(rows[:space]))
+                return
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self._worker.join(timeout=2.0)
+        self.flush()
+        super().close()
+
+    def stats(self):
+        with self._lock:
+            buffered = len(self._buffer)
+        return {
+            'buffered': buffered,
+            'dropped': self.dropped,
+            'sampled_out': self.sampled_out,
+            'failed_flushes': self.failed_flushes,
+        }
+
+
+def get_logger(session, level=logging.INFO):
+    """Process-wide 'wellnest' logger, with the APPLICATION_LOGS handler installed once"""
+    global _handler
+    logger = logging.getLogger(LOGGER_NAME)
+    with _install_lock:
+        if _handler is None:
+            _handler = SnowflakeLogHandler(session)
+            logger.addHandler(_handler)
+            logger.setLevel(level)
+            logger.propagate = False
+            atexit.register(_handler.close)
+    return logger
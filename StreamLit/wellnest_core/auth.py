@@ -0,0 +1,145 @@
+# =============================================================================
+# WELLNEST - AUTHENTICATION HELPERS
+# =============================================================================
+# bcrypt is CPU-bound, so hashing runs in a small bounded worker pool instead
+# of the Streamlit script thread. Login needs exactly two parameterized
+# statements: one lookup by email and one update recording the outcome
+# (including a transparent rehash when the work factor changes).
+# =============================================================================
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from wellnest_core import statements
+from wellnest_core.lazy import bcrypt
+
+# Work factor for new hashes; stored hashes with a different cost are
+# upgraded on the next successful login
+BCRYPT_ROUNDS = 12
+
+MAX_FAILED_LOGIN_ATTEMPTS = 5
+LOCKOUT_MINUTES = 15
+
+# bcrypt releases the GIL while hashing, so threads run in parallel.
+# Set to 'process' where the runtime allows forking worker processes.
+HASH_POOL_KIND = os.environ.get('WELLNEST_HASH_POOL', 'thread')
+HASH_POOL_WORKERS = int(os.environ.get('WELLNEST_HASH_WORKERS', min(4, os.cpu_count() or 1)))
+HASH_MAX_PENDING = HASH_POOL_WORKERS * 4
+HASH_TIMEOUT_SECONDS = 10
+
+LOOKUP_USER_SQL = """
+SELECT
+    USER_ID, EMAIL, HASHED_PASSWORD, FULL_NAME,
+    ACCOUNT_STATUS, FAILED_LOGIN_ATTEMPTS, ACCOUNT_LOCKED_UNTIL
+FROM WELLNEST.USER_MANAGEMENT.USERS
+WHERE EMAIL = ?
+"""
+
+RECORD_LOGIN_SQL = """
+UPDATE WELLNEST.USER_MANAGEMENT.USERS
+SET LAST_LOGIN = COALESCE(TO_TIMESTAMP_NTZ(?), LAST_LOGIN),
+    FAILED_LOGIN_ATTEMPTS = ?,
+    ACCOUNT_LOCKED_UNTIL = TO_TIMESTAMP_NTZ(?),
+    HASHED_PASSWORD = COALESCE(?, HASHED_PASSWORD),
+    TOKENS_VALID_AFTER = COALESCE(?, TOKENS_VALID_AFTER)
+WHERE USER_ID = ?
+"""
+
+
+class AuthBusyError(Exception):
+    """Raised when the hashing pool is saturated"""
+
+
+# =============================================================================
+# HASHING POOL
+# =============================================================================
+
+_pool = None
+_pool_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(HASH_MAX_PENDING)
+
+
+def _hashpw(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+
+
+def _checkpw(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+def get_hash_pool():
+    """Create the shared hashing pool on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            if HASH_POOL_KIND == 'process':
+                _pool = ProcessPoolExecutor(max_workers=HASH_POOL_WORKERS)
+            else:
+                _pool = ThreadPoolExecutor(max_workers=HASH_POOL_WORKERS,
+                                           thread_name_prefix="wellnest-bcrypt")
+        return _pool
+
+
+def _run_in_pool(fn, *args):
+    """Submit to the pool with backpressure and wait for the result"""
+    if not _pending.acquire(timeout=HASH_TIMEOUT_SECONDS):
+        raise AuthBusyError("Authentication is busy. Please try again in a moment.")
+    try:
+        return get_hash_pool().submit(fn, *args).result(timeout=HASH_TIMEOUT_SECONDS)
+    finally:
+        _pending.release()
+
+
+# =============================================================================
+# PUBLIC HELPERS
+# =============================================================================
+
+def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
+    """Hash a password using bcrypt in the worker pool"""
+    return _run_in_pool(_hashpw, password.encode('utf-8'), rounds).decode('utf-8')
+
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash in the worker pool"""
+    return _run_in_pool(_checkpw, password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+
+def hash_cost(hashed_password: str):
+    """Work factor encoded in a bcrypt hash ($2b$12$... -> 12)"""
+    try:
+        return int(hashed_password.split('$')[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def needs_rehash(hashed_password: str, rounds: int = BCRYPT_ROUNDS) -> bool:
+    """True when the stored hash was made with a different work factor"""
+    return hash_cost(hashed_password) != rounds
+
+
+def rehash_if_needed(password: str, hashed_password: str):
+    """New hash at the current work factor, or None if already current"""
+    if needs_rehash(hashed_password):
+        return hash_password(password)
+    return None
+
+
+def lookup_user(session, email: str):
+    """Fetch the login row for an email (single parameterized statement)"""
+    result = session.sql(LOOKUP_USER_SQL, params=[email]).collect()
+    return result[0] if result else None
+
+
+def record_login_attempt(session, user_id: str, success: bool, failed_attempts: int = 0,
+                         locked_until=None, new_hash: str = None):
+    """Record a login outcome (single parameterized statement); a lockout also revokes session tokens"""
+    session.sql(RECORD_LOGIN_SQL, params=[
+        statements.timestamp() if success else None,
+        failed_attempts,
+        locked_until.strftime('%Y-%m-%d %H:%M:%S') if locked_until else None,
+        new_hash,
+        int(time.time()) if locked_until else None,
+        user_id
+    ]).collect()
@@ -0,0 +1,21 @@
+# =============================================================================
+# WELLNEST CORE - SNOWFLAKE SESSION PROVIDER
+# =============================================================================
+
+import streamlit as st
+from snowflake.snowpark.context import get_active_session
+
+from wellnest_core import oltp, query_profiler
+
+
+# No spinner: pages call this before st.set_page_config, which must be the
+# first Streamlit command of a run
+@st.cache_resource(show_spinner=False)
+def get_session():
+    """Snowpark session shared by every page and rerun in this process (profiled if enabled)"""
+    return query_profiler.wrap(get_active_session())
+
+
+def get_oltp_store():
+    """Row store for the per-user hot paths (see oltp.py); the warehouse session by default"""
+    return oltp.get_store(get_session())
@@ -0,0 +1,56 @@
+# =============================================================================
+# WELLNEST CORE - LOCAL EMERGENCY DETECTION
+# =============================================================================
+# Keyword scan that runs before the router on every chat turn (no warehouse
+# call). Shared by app.py and Benchmarks/router_benchmark.py.
+# =============================================================================
+
+
+def detect_emergency_keywords(message: str) -> tuple:
+    """Detect emergency keywords in user message"""
+    message_lower = message.lower()
+    
+    emergency_keywords = [
+        'chest pain', 'heart attack', 'stroke', 'seizure',
+        'unconscious', 'severe bleeding', 'not breathing',
+        'suicide', 'kill myself', 'end my life',
+        'severe headache', 'can\'t breathe', 'choking'
+    ]
+    
+    urgent_keywords = [
+        'high fever', 'vomiting blood', 'severe pain',
+        'can\'t move', 'vision loss', 'confusion',
+        'severe allergic', 'broken bone', 'severe burn'
+    ]
+    
+    symptom_keywords = [
+        'headache', 'fever', 'cough', 'fatigue', 'nausea',
+        'dizziness', 'pain', 'swelling', 'rash', 'shortness of breath',
+        'anxiety', 'depression', 'insomnia', 'stress',
+        'blood pressure', 'blood sugar', 'diabetes', 'hypertension'
+    ]
+    
+    detected_symptoms = []
+    
+    for keyword in emergency_keywords:
+        if keyword in message_lower:
+            detected_symptoms.append(keyword)
+            return True, 'emergency', detected_symptoms
+    
+    for keyword in urgent_keywords:
+        if keyword in message_lower:
+            detected_symptoms.append(keyword)
+    
+    if detected_symptoms:
+        return False, 'urgent', detected_symptoms
+    
+    for keyword in symptom_keywords:
+        if keyword in message_lower:
+            detected_symptoms.append(keyword)
+    
+    if len(detected_symptoms) >= 3:
+        return False, 'needs_attention', detected_symptoms
+    elif detected_symptoms:
+        return False, 'routine', detected_symptoms
+    else:
+        return False, 'routine', []
@@ -0,0 +1,505 @@
+# =============================================================================
+# WELLNEST CORE - VECTORIZED GOLD FEATURES
+# =============================================================================
+# NumPy/pandas versions of the dbt gold feature models, computed column-wise
+# for a batch of rows:
+#   diabetes_features      - ftr_diabetes_core_clinical + ftr_diabetes_risk_urgency
+#   hypertension_features  - ftr_hypertension_core_clinical + ftr_hypertension_risk_urgency
+#   depression_features    - depression scoring from the mental health models
+#   score_users            - live users (USER_MEDICAL_PROFILES + HEALTH_METRICS)
+#
+# Each CASE is mirrored in order, including BETWEEN gaps and NULL fall-through,
+# so the outputs match the dbt tables (Benchmarks/feature_parity_benchmark.py).
+# Column names are upper case, as Snowflake returns them; threshold bands come
+# from thresholds.py. GET_SMART_CONTEXT IMPORTs this file next to thresholds.py
+# from @WELLNEST.MEDICAL_DATA.WELLNEST_CODE.
+# =============================================================================
+
+import numpy as np
+import pandas as pd
+
+try:
+    from wellnest_core import thresholds
+except ImportError:  # flat import inside the stored procedures
+    import thresholds
+
+
+# =============================================================================
+# SQL HELPERS
+# =============================================================================
+
+def _num(df, column):
+    """Numeric column as float64, NULL as NaN"""
+    return pd.to_numeric(df[column], errors="coerce").to_numpy(dtype="float64")
+
+
+def _flag(df, column):
+    """Boolean column; NULL is false, as in CASE WHEN column THEN ..."""
+    return df[column].fillna(False).astype(bool).to_numpy()
+
+
+def _lower(df, column):
+    return df[column].astype("string").str.lower()
+
+
+def _is_in(text, values):
+    """text IN (values); NULL is false"""
+    return text.isin(values).fillna(False).to_numpy(dtype=bool)
+
+
+def _not_in(text, values):
+    """text NOT IN (values); NULL is false"""
+    return (text.notna() & ~text.isin(values)).fillna(False).to_numpy(dtype=bool)
+
+
+def _between(values, low, high):
+    return (values >= low) & (values <= high)
+
+
+def _case(conditions, choices, default=None):
+    """CASE WHEN ... THEN ... ELSE default END for string results"""
+    return np.select(conditions, choices, default=default).astype(object)
+
+
+def _points(conditions, choices, default=np.nan):
+    """CASE for numeric results; default NaN mirrors a CASE without ELSE"""
+    return np.select(conditions, choices, default=default).astype("float64")
+
+
+def _bool(condition):
+    return np.asarray(condition, dtype=bool).astype(int)
+
+
+def classify_bands(values, scale, default="unknown"):
+    """Vectorized thresholds.classify (classify_threshold in macros/clinical_thresholds.sql)"""
+    bands = thresholds.THRESHOLDS[scale]
+    cuts = np.array([band[0] for band in bands[1:]], dtype="float64")
+    upper_owns = np.array([band[4] for band in bands[1:]] + [False], dtype=bool)
+    labels = np.array([band[2] for band in bands], dtype=object)
+    values = np.asarray(values, dtype="float64")
+    filled = np.nan_to_num(values, nan=0.0)
+    # A value on a cut goes to the side whose bound is inclusive
+    left, right = np.searchsorted(cuts, filled, side="left"), np.searchsorted(cuts, filled, side="right")
+    result = labels[np.where((right > left) & upper_owns[left], right, left)]
+    return np.where(np.isnan(values), default, result).astype(object)
+
+
+def _with(df, columns):
+    """SELECT *, <columns> FROM df"""
+    return pd.concat([df, pd.DataFrame(columns, index=df.index)], axis=1)
+
+
+def _upper(df):
+    return df.rename(columns=str.upper)
+
+
+# =============================================================================
+# DIABETES
+# =============================================================================
+
+def diabetes_core_features(df):
+    """ftr_diabetes_core_clinical"""
+    df = _upper(df)
+    glucose, hba1c, bmi = _num(df, "BLOOD_GLUCOSE_LEVEL"), _num(df, "HBA1C_LEVEL"), _num(df, "BMI")
+    has_diabetes, has_htn, has_heart = _flag(df, "HAS_DIABETES"), _flag(df, "HAS_HYPERTENSION"), _flag(df, "HAS_HEART_DISEASE")
+    smoking = _lower(df, "SMOKING_HISTORY")
+    condition_count = _bool(has_diabetes) + _bool(has_htn) + _bool(has_heart)
+
+    return _with(df, {
+        "DIABETES_STAGE": classify_bands(hba1c, "diabetes_stage"),
+        "GLUCOSE_CONTROL_STATUS": classify_bands(glucose, "glucose_control_status"),
+        "GLUCOSE_HBA1C_CONCORDANCE": _case([
+            (glucose < 126) & (hba1c < 6.5),
+            (glucose >= 126) & (hba1c >= 6.5),
+            (glucose >= 126) & (hba1c < 6.5),
+            (glucose < 126) & (hba1c >= 6.5),
+        ], ["concordant_normal", "concordant_diabetic", "discordant_acute_high", "discordant_chronic_poor"],
+            "unknown"),
+        "BMI_CATEGORY": classify_bands(bmi, "bmi_category"),
+        "IS_OBESE": bmi >= 30.0,
+        "IS_SEVERELY_OBESE": bmi >= 40.0,
+        "CARDIOMETABOLIC_DISEASE_COUNT": condition_count,
+        "HAS_TRIPLE_DIAGNOSIS": has_diabetes & has_htn & has_heart,
+        "HAS_MULTIPLE_CONDITIONS": condition_count >= 2,
+        "SMOKING_STATUS_CLEAN": _case([
+            _is_in(smoking, ["current", "current smoker"]),
+            _is_in(smoking, ["former", "ex-smoker", "not current"]),
+            _is_in(smoking, ["never", "non-smoker"]),
+            _is_in(smoking, ["ever", "yes"]),
+        ], ["current", "former", "never", "ever"], "no_info"),
+        "IS_CURRENT_SMOKER": _is_in(smoking, ["current", "current smoker"]),
+        "HAS_SMOKING_HISTORY": _not_in(smoking, ["never", "non-smoker", "no info"]),
+    })
+
+
+def diabetes_risk_features(df):
+    """ftr_diabetes_risk_urgency, on top of diabetes_core_features"""
+    glucose, hba1c, bmi, age = (_num(df, "BLOOD_GLUCOSE_LEVEL"), _num(df, "HBA1C_LEVEL"),
+                                _num(df, "BMI"), _num(df, "AGE"))
+    has_diabetes, has_htn, has_heart = _flag(df, "HAS_DIABETES"), _flag(df, "HAS_HYPERTENSION"), _flag(df, "HAS_HEART_DISEASE")
+    smoker = _flag(df, "IS_CURRENT_SMOKER")
+
+    return _with(df, {
+        "HYPERGLYCEMIA_URGENCY": classify_bands(glucose, "hyperglycemia_urgency", default="stable"),
+        "HYPOGLYCEMIA_URGENCY": classify_bands(glucose, "hypoglycemia_urgency", default="no_hypoglycemia"),
+        "GLUCOSE_URGENCY_LEVEL": classify_bands(glucose, "glucose_urgency_level", default="routine"),
+        "CARDIOVASCULAR_RISK_SCORE": (2 * _bool(has_diabetes) + 2 * _bool(has_htn) + 3 * _bool(has_heart)
+                                      + 2 * _bool(smoker) + _bool(bmi >= 30)),
+        "METABOLIC_SYNDROME_SCORE": (2 * _bool(bmi >= 30) + 2 * _bool(hba1c >= 5.7) + 2 * _bool(has_htn)
+                                     + 2 * _bool(glucose >= 100)),
+        "DIABETES_COMPLICATION_RISK_SCORE": (
+            np.select([hba1c >= 9.0, hba1c >= 8.0, hba1c >= 7.0, hba1c >= 6.5], [4, 3, 2, 1], 0)
+            + 2 * _bool(has_htn) + 3 * _bool(has_heart) + 2 * _bool(smoker) + _bool(bmi >= 35)),
+        "WEIGHT_MANAGEMENT_PRIORITY": _case([
+            bmi >= 40,
+            (bmi >= 35) & (has_diabetes | has_htn),
+            bmi >= 30,
+            _between(bmi, 25, 29.9),
+        ], ["critical", "high", "moderate", "low"], "maintenance"),
+        "SMOKING_CESSATION_PRIORITY": _case([
+            smoker & (has_heart | has_diabetes),
+            smoker & has_htn,
+            smoker,
+            (df["SMOKING_STATUS_CLEAN"] == "former").to_numpy(),
+        ], ["critical", "high", "moderate", "relapse_prevention"], "not_applicable"),
+        "AGE_RISK_CATEGORY": _case([
+            age < 40, _between(age, 40, 64), age >= 65,
+        ], ["young_onset_high_risk", "standard_risk", "elderly_high_risk"]),
+        "HAS_PREMATURE_DISEASE": (age < 45) & (has_diabetes | has_heart),
+    })
+
+
+def diabetes_features(df):
+    return diabetes_risk_features(diabetes_core_features(df))
+
+
+# =============================================================================
+# HYPERTENSION
+# =============================================================================
+
+def hypertension_core_features(df):
+    """ftr_hypertension_core_clinical"""
+    df = _upper(df)
+    sbp, dbp, bmi = _num(df, "SYSTOLIC_BP"), _num(df, "DIASTOLIC_BP"), _num(df, "BMI")
+    heart_rate, cholesterol = _num(df, "HEART_RATE"), _num(df, "CHOLESTEROL")
+    ldl, hdl, triglycerides, glucose = _num(df, "LDL"), _num(df, "HDL"), _num(df, "TRIGLYCERIDES"), _num(df, "GLUCOSE")
+    alcohol, salt, sleep, stress = (_num(df, "ALCOHOL_INTAKE"), _num(df, "SALT_INTAKE"),
+                                    _num(df, "SLEEP_DURATION"), _num(df, "STRESS_LEVEL"))
+    smoking, activity = _lower(df, "SMOKING_STATUS"), _lower(df, "PHYSICAL_ACTIVITY_LEVEL")
+    htn_status = _lower(df, "HYPERTENSION_STATUS")
+
+    pulse_pressure = sbp - dbp
+    mean_arterial = dbp + (sbp - dbp) / 3.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        chol_hdl = np.where(hdl == 0, np.nan, cholesterol / hdl)
+
+    return _with(df, {
+        # hypertensive_crisis is unreachable after stage2, as in the SQL
+        "BP_STAGE": _case([
+            (sbp < 120) & (dbp < 80),
+            _between(sbp, 120, 129) & (dbp < 80),
+            _between(sbp, 130, 139) | _between(dbp, 80, 89),
+            (sbp >= 140) | (dbp >= 90),
+            (sbp >= 180) | (dbp >= 120),
+        ], ["normal", "elevated", "stage1_hypertension", "stage2_hypertension", "hypertensive_crisis"],
+            "unknown"),
+        "SYSTOLIC_CATEGORY": _case([
+            sbp < 120, _between(sbp, 120, 129), _between(sbp, 130, 139),
+            _between(sbp, 140, 159), _between(sbp, 160, 179), sbp >= 180,
+        ], ["normal", "elevated", "stage1", "stage2_moderate", "stage2_severe", "crisis"], "unknown"),
+        "DIASTOLIC_CATEGORY": _case([
+            dbp < 80, _between(dbp, 80, 89), _between(dbp, 90, 99), _between(dbp, 100, 119), dbp >= 120,
+        ], ["normal", "stage1", "stage2_moderate", "stage2_severe", "crisis"], "unknown"),
+        "PULSE_PRESSURE": pulse_pressure,
+        "PULSE_PRESSURE_CATEGORY": _case([
+            pulse_pressure < 40, _between(pulse_pressure, 40, 60), pulse_pressure > 60,
+        ], ["normal", "borderline", "widened_high_risk"], "unknown"),
+        "HAS_ISOLATED_SYSTOLIC_HTN": (sbp >= 140) & (dbp < 90),
+        "MEAN_ARTERIAL_PRESSURE": np.round(mean_arterial, 1),
+        "MAP_CATEGORY": _case([
+            mean_arterial < 93, _between(mean_arterial, 93, 106), mean_arterial > 106,
+        ], ["normal", "elevated", "high"], "unknown"),
+        "HEART_RATE_CATEGORY": _case([
+            heart_rate < 60, _between(heart_rate, 60, 100), _between(heart_rate, 101, 120), heart_rate > 120,
+        ], ["bradycardia", "normal", "mild_tachycardia", "tachycardia"], "unknown"),
+        "CHOLESTEROL_CATEGORY": _case([
+            cholesterol < 200, _between(cholesterol, 200, 239), cholesterol >= 240,
+        ], ["desirable", "borderline_high", "high"], "unknown"),
+        "LDL_CATEGORY": _case([
+            ldl < 100, _between(ldl, 100, 129), _between(ldl, 130, 159), _between(ldl, 160, 189), ldl >= 190,
+        ], ["optimal", "near_optimal", "borderline_high", "high", "very_high"], "unknown"),
+        "HDL_CATEGORY": _case([
+            hdl < 40, _between(hdl, 40, 59), hdl >= 60,
+        ], ["low_major_risk", "borderline_low", "high_protective"], "unknown"),
+        "TRIGLYCERIDES_CATEGORY": _case([
+            triglycerides < 150, _between(triglycerides, 150, 199),
+            _between(triglycerides, 200, 499), triglycerides >= 500,
+        ], ["normal", "borderline_high", "high", "very_high"], "unknown"),
+        "CHOLESTEROL_HDL_RATIO": np.round(chol_hdl, 2),
+        "CHOLESTEROL_RATIO_RISK": _case([
+            chol_hdl < 3.5, _between(chol_hdl, 3.5, 5.0), chol_hdl > 5.0,
+        ], ["low_risk", "moderate_risk", "high_risk"], "unknown"),
+        "BMI_CATEGORY": classify_bands(bmi, "bmi_category"),
+        "IS_OBESE": bmi >= 30.0,
+        "GLUCOSE_STATUS": _case([
+            glucose < 100, _between(glucose, 100, 125), glucose >= 126,
+        ], ["normal", "prediabetes", "diabetes_range"], "unknown"),
+        "SMOKING_STATUS_CLEAN": _case([
+            _is_in(smoking, ["current"]), _is_in(smoking, ["former"]), _is_in(smoking, ["never"]),
+        ], ["current", "former", "never"], "unknown"),
+        "IS_CURRENT_SMOKER": _is_in(smoking, ["current"]),
+        "ACTIVITY_LEVEL_CLEAN": _case([
+            _is_in(activity, ["low"]), _is_in(activity, ["moderate"]), _is_in(activity, ["high"]),
+        ], ["sedentary", "moderate", "active"], "unknown"),
+        "IS_SEDENTARY": _is_in(activity, ["low"]),
+        "ALCOHOL_RISK_LEVEL": _case([
+            alcohol < 7, _between(alcohol, 7, 14), alcohol > 14,
+        ], ["low_moderate", "moderate_high", "excessive"], "unknown"),
+        "SALT_INTAKE_RISK": _case([
+            salt < 5, _between(salt, 5, 10), salt > 10,
+        ], ["within_guidelines", "elevated", "excessive"], "unknown"),
+        "SLEEP_ADEQUACY": _case([
+            sleep < 6, _between(sleep, 6, 9), sleep > 9,
+        ], ["insufficient", "adequate", "excessive"], "unknown"),
+        "STRESS_CATEGORY": _case([
+            stress <= 3, _between(stress, 4, 6), _between(stress, 7, 8), stress >= 9,
+        ], ["low", "moderate", "high", "very_high"], "unknown"),
+        "HAS_HYPERTENSION_DIAGNOSIS": pd.array(
+            _case([_is_in(htn_status, ["high"]), _is_in(htn_status, ["low"])], [True, False], None),
+            dtype="boolean"),
+    })
+
+
+def framingham_points(df):
+    """Framingham-style CV risk points; NaN where a CASE without ELSE has no match"""
+    age = _num(df, "AGE")
+    bp_stage, cholesterol, hdl = df["BP_STAGE"].to_numpy(), df["CHOLESTEROL_CATEGORY"].to_numpy(), df["HDL_CATEGORY"].to_numpy()
+    diabetic = _flag(df, "HAS_DIABETES") | (df["GLUCOSE_STATUS"] == "diabetes_range").to_numpy()
+    return (
+        _points([age < 40, _between(age, 40, 49), _between(age, 50, 59), _between(age, 60, 69), age >= 70],
+                [0, 1, 2, 3, 4])
+        + _points([np.isin(bp_stage, ["normal", "elevated"]), bp_stage == "stage1_hypertension",
+                   bp_stage == "stage2_hypertension", bp_stage == "hypertensive_crisis"], [0, 2, 3, 4])
+        + _points([cholesterol == "desirable", cholesterol == "borderline_high", cholesterol == "high"], [0, 1, 2])
+        + _points([hdl == "high_protective", hdl == "low_major_risk"], [-1, 2], default=0)
+        + 2 * _bool(_flag(df, "IS_CURRENT_SMOKER"))
+        + 2 * _bool(diabetic)
+        + _bool(_flag(df, "IS_OBESE"))
+    )
+
+
+def hypertension_risk_features(df):
+    """ftr_hypertension_risk_urgency, on top of hypertension_core_features"""
+    sbp, dbp, bmi, age = _num(df, "SYSTOLIC_BP"), _num(df, "DIASTOLIC_BP"), _num(df, "BMI"), _num(df, "AGE")
+    bp_stage = df["BP_STAGE"].to_numpy()
+    cholesterol, hdl = df["CHOLESTEROL_CATEGORY"].to_numpy(), df["HDL_CATEGORY"].to_numpy()
+    smoker, obese, sedentary = _flag(df, "IS_CURRENT_SMOKER"), _flag(df, "IS_OBESE"), _flag(df, "IS_SEDENTARY")
+    diabetic = _flag(df, "HAS_DIABETES") | (df["GLUCOSE_STATUS"] == "diabetes_range").to_numpy()
+    alcohol, stress = df["ALCOHOL_RISK_LEVEL"].to_numpy(), df["STRESS_CATEGORY"].to_numpy()
+
+    normal_or_elevated = np.isin(bp_stage, ["normal", "elevated"])
+    stage1 = bp_stage == "stage1_hypertension"
+    stage2 = bp_stage == "stage2_hypertension"
+    stage2_or_crisis = np.isin(bp_stage, ["stage2_hypertension", "hypertensive_crisis"])
+    stressed = np.isin(stress, ["high", "very_high"])
+
+    crisis = ((sbp >= thresholds.band_bounds("bp_systolic_urgency", "hypertensive_crisis_emergency")[0])
+              | (dbp >= thresholds.band_bounds("bp_diastolic_urgency", "hypertensive_crisis_emergency")[0]))
+    severe = ((sbp >= thresholds.band_bounds("bp_systolic_urgency", "severe_urgency")[0])
+              | (dbp >= thresholds.band_bounds("bp_diastolic_urgency", "severe_urgency")[0]))
+
+    cv_score = framingham_points(df)
+    criteria_count = (_bool(~normal_or_elevated)
+                      + _bool(np.isin(df["GLUCOSE_STATUS"].to_numpy(), ["prediabetes", "diabetes_range"]))
+                      + _bool(np.isin(df["TRIGLYCERIDES_CATEGORY"].to_numpy(), ["high", "very_high"]))
+                      + _bool(hdl == "low_major_risk")
+                      + _bool(bmi >= 30))
+
+    return _with(df, {
+        "BP_URGENCY_LEVEL": _case([crisis, severe, stage2, stage1],
+                                  ["hypertensive_crisis_emergency", "severe_urgency",
+                                   "moderate_urgency", "needs_attention"], "routine"),
+        "POTENTIAL_HYPERTENSIVE_EMERGENCY": crisis,
+        "CARDIOVASCULAR_RISK_SCORE": cv_score,
+        "TEN_YEAR_CV_RISK_CATEGORY": _case([cv_score < 5, _between(cv_score, 5, 9), cv_score >= 10],
+                                           ["low_risk", "moderate_risk", "high_risk"]),
+        "METABOLIC_SYNDROME_CRITERIA_COUNT": criteria_count,
+        "HAS_METABOLIC_SYNDROME": criteria_count >= 3,
+        "STROKE_RISK_FACTORS_COUNT": (_bool(stage2_or_crisis) + _bool(age >= 65) + _bool(diabetic)
+                                      + _bool(smoker) + _bool(cholesterol == "high")
+                                      + _bool(_flag(df, "HAS_FAMILY_HISTORY"))),
+        "DIETARY_MODIFICATION_PRIORITY": _case([
+            stage2_or_crisis,
+            stage1 & (df["SALT_INTAKE_RISK"] == "excessive").to_numpy(),
+            stage1,
+            bp_stage == "elevated",
+        ], ["critical", "high", "moderate", "preventive"], "maintenance"),
+        "EXERCISE_PRIORITY": _case([
+            sedentary & (stage1 | stage2), sedentary & (bp_stage == "elevated"), sedentary,
+        ], ["high", "moderate", "preventive"], "maintenance"),
+        "WEIGHT_LOSS_PRIORITY": _case([
+            obese & stage2_or_crisis, obese & stage1, (bmi >= 25) & np.isin(bp_stage, ["elevated", "stage1_hypertension"]),
+        ], ["critical", "high", "moderate"], "maintenance"),
+        "SMOKING_CESSATION_PRIORITY_HTN": _case([
+            smoker & stage2_or_crisis, smoker & stage1, smoker,
+            (df["SMOKING_STATUS_CLEAN"] == "former").to_numpy(),
+        ], ["critical", "high", "moderate", "relapse_prevention"], "not_applicable"),
+        "ALCOHOL_REDUCTION_PRIORITY": _case([
+            (alcohol == "excessive") & ~normal_or_elevated,
+            alcohol == "excessive",
+            (alcohol == "moderate_high") & ~normal_or_elevated,
+        ], ["high", "moderate", "moderate"], "maintenance"),
+        "STRESS_MANAGEMENT_PRIORITY": _case([stressed & ~normal_or_elevated, stressed],
+                                            ["high", "moderate"], "low"),
+        "LIKELY_NEEDS_MEDICATION": stage2_or_crisis | (stage1 & (cv_score >= 8)) | (stage1 & diabetic),
+        "MEDICATION_URGENCY": _case([
+            bp_stage == "hypertensive_crisis", stage2, stage1 & (cv_score >= 8), stage1,
+        ], ["immediate", "urgent", "prompt", "consider"], "lifestyle_first"),
+        "CARDIAC_DAMAGE_RISK_SCORE": (
+            np.select([bp_stage == "hypertensive_crisis", stage2, stage1, bp_stage == "elevated"], [4, 3, 2, 1], 0)
+            + 2 * _bool(df["PULSE_PRESSURE_CATEGORY"] == "widened_high_risk")
+            + _bool(cholesterol == "high") + _bool(smoker)),
+        "KIDNEY_DAMAGE_RISK": _case([stage2_or_crisis & diabetic, stage2_or_crisis],
+                                    ["high_nephropathy_risk", "moderate_nephropathy_risk"], "low_risk"),
+        "AGE_BP_RISK_CATEGORY": _case([
+            (age < 40) & (stage1 | stage2_or_crisis),
+            _between(age, 40, 64) & stage2_or_crisis,
+            (age >= 65) & stage2_or_crisis,
+            (age >= 65) & _flag(df, "HAS_ISOLATED_SYSTOLIC_HTN"),
+        ], ["young_onset_critical", "midlife_high_risk", "elderly_high_risk", "isolated_systolic_elderly"],
+            "standard_management"),
+    })
+
+
+def hypertension_features(df):
+    return hypertension_risk_features(hypertension_core_features(df))
+
+
+# =============================================================================
+# MENTAL HEALTH
+# =============================================================================
+
+DAYS_INDOORS_SCORE = {
+    "go out every day": 0, "go out everyday": 0, "1-14 days": 1,
+    "15-30 days": 2, "31-60 days": 3, "more than 2 months": 4,
+}
+
+
+def depression_features(df):
+    """Isolation, symptom counts and PHQ-9 style depression scoring"""
+    df = _upper(df)
+    work, mood, habits = _lower(df, "WORK_INTEREST"), _lower(df, "MOOD_SWINGS"), _lower(df, "CHANGES_HABITS")
+    stress, social, days = _lower(df, "GROWING_STRESS"), _lower(df, "SOCIAL_WEAKNESS"), _lower(df, "DAYS_INDOORS")
+    coping = _flag(df, "HAS_COPING_STRUGGLES")
+
+    isolation = days.map(DAYS_INDOORS_SCORE).astype("float64").to_numpy()
+    score = (np.select([_is_in(work, ["no"]), _is_in(work, ["maybe"])], [3, 2], 0)
+             + np.select([_is_in(mood, ["high"]), _is_in(mood, ["medium"]), _is_in(mood, ["low"])], [3, 2, 1], 0)
+             + np.select([isolation >= 3, isolation == 2, isolation == 1], [3, 2, 1], 0)
+             + np.select([_is_in(habits, ["yes"]), _is_in(habits, ["maybe"])], [2, 1], 0)
+             + 3 * _bool(coping))
+
+    return _with(df, {
+        "ISOLATION_SEVERITY_SCORE": isolation,
+        "SYMPTOM_COUNT": (_bool(_is_in(mood, ["medium", "high"])) + _bool(_is_in(stress, ["yes"]))
+                          + _bool(coping) + _bool(_is_in(social, ["yes"])) + _bool(_is_in(work, ["no"]))
+                          + _bool(_is_in(habits, ["yes"]))
+                          + _bool(_not_in(days, ["go out every day", "go out everyday"]))),
+        "SEVERE_SYMPTOM_COUNT": (_bool(_is_in(mood, ["high"])) + _bool(coping) + _bool(_is_in(social, ["yes"]))
+                                 + _bool(_is_in(work, ["no"]))
+                                 + _bool(_is_in(days, ["31-60 days", "more than 2 months"]))),
+        "DEPRESSION_RISK_SCORE": score,
+        "DEPRESSION_SEVERITY": _case([
+            score == 0, _between(score, 1, 4), _between(score, 5, 9), _between(score, 10, 14), score >= 15,
+        ], ["minimal_depression", "mild_depression", "moderate_depression",
+            "moderately_severe_depression", "severe_depression"]),
+    })
+
+
+# =============================================================================
+# LIVE USERS
+# =============================================================================
+
+# HEALTH_METRICS.METRIC_TYPE -> gold input column
+METRIC_COLUMNS = {
+    "blood_sugar": "BLOOD_GLUCOSE_LEVEL",
+    "hba1c": "HBA1C_LEVEL",
+    "blood_pressure_systolic": "SYSTOLIC_BP",
+    "blood_pressure_diastolic": "DIASTOLIC_BP",
+}
+
+# Features that only need what a live profile and its metrics carry
+LIVE_FEATURES = [
+    "DIABETES_STAGE", "GLUCOSE_CONTROL_STATUS", "GLUCOSE_URGENCY_LEVEL", "BMI_CATEGORY",
+    "CARDIOMETABOLIC_DISEASE_COUNT", "CARDIOVASCULAR_RISK_SCORE", "METABOLIC_SYNDROME_SCORE",
+    "DIABETES_COMPLICATION_RISK_SCORE", "WEIGHT_MANAGEMENT_PRIORITY", "SMOKING_CESSATION_PRIORITY",
+    "BP_STAGE", "PULSE_PRESSURE", "MEAN_ARTERIAL_PRESSURE", "BP_URGENCY_LEVEL",
+]
+
+
+def user_inputs(profiles, metrics):
+    """Gold input columns for live users from profile rows and their latest metrics"""
+    users = _upper(profiles).set_index("USER_ID")
+    inputs = pd.DataFrame(index=users.index)
+    if "AGE" in users:
+        inputs["AGE"] = users["AGE"]
+    elif "DATE_OF_BIRTH" in users:
+        born = pd.to_datetime(users["DATE_OF_BIRTH"], errors="coerce")
+        today = pd.Timestamp.today()
+        had_birthday = (born.dt.month < today.month) | ((born.dt.month == today.month) & (born.dt.day <= today.day))
+        inputs["AGE"] = today.year - born.dt.year - (~had_birthday).astype(int)
+    else:
+        inputs["AGE"] = np.nan
+    inputs["GENDER"] = users["GENDER"].astype("string").str.lower() if "GENDER" in users else None
+    inputs["BMI"] = users.get("BMI")
+    for column in ("HAS_DIABETES", "HAS_HYPERTENSION", "HAS_HEART_DISEASE"):
+        inputs[column] = users.get(column, pd.Series(False, index=users.index)).fillna(False).astype(bool)
+    inputs["SMOKING_HISTORY"] = users.get("SMOKING_STATUS")
+
+    metrics = _upper(metrics)
+    if len(metrics):
+        if "MEASUREMENT_DATE" in metrics:
+            metrics = metrics.sort_values("MEASUREMENT_DATE")
+        latest = metrics.pivot_table(index="USER_ID", columns="METRIC_TYPE", values="METRIC_VALUE", aggfunc="last")
+    else:
+        latest = pd.DataFrame(index=users.index)
+    for metric_type, column in METRIC_COLUMNS.items():
+        inputs[column] = latest[metric_type].reindex(users.index) if metric_type in latest else np.nan
+    return inputs.reset_index()
+
+
+def score_users(profiles, metrics):
+    """LIVE_FEATURES per USER_ID for a batch of users"""
+    inputs = user_inputs(profiles, metrics)
+    diabetes = diabetes_features(inputs)
+    bp = hypertension_core_features(inputs.assign(**{
+        column: np.nan for column in ("HEART_RATE", "CHOLESTEROL", "LDL", "HDL", "TRIGLYCERIDES", "GLUCOSE",
+                                      "ALCOHOL_INTAKE", "SALT_INTAKE", "SLEEP_DURATION", "STRESS_LEVEL")
+    }).assign(SMOKING_STATUS=None, PHYSICAL_ACTIVITY_LEVEL=None, HYPERTENSION_STATUS=None))
+    bp_urgency = hypertension_risk_features(bp.assign(HAS_FAMILY_HISTORY=False))["BP_URGENCY_LEVEL"]
+
+    scored = diabetes[["USER_ID"] + [column for column in LIVE_FEATURES if column in diabetes]].copy()
+    for column in ("BP_STAGE", "PULSE_PRESSURE", "MEAN_ARTERIAL_PRESSURE"):
+        scored[column] = bp[column]
+    scored["BP_URGENCY_LEVEL"] = bp_urgency
+    # Bands of missing measurements carry no information for a live user
+    measured = {
+        "DIABETES_STAGE": "HBA1C_LEVEL", "GLUCOSE_CONTROL_STATUS": "BLOOD_GLUCOSE_LEVEL",
+        "GLUCOSE_URGENCY_LEVEL": "BLOOD_GLUCOSE_LEVEL", "BMI_CATEGORY": "BMI",
+        "BP_STAGE": "SYSTOLIC_BP", "BP_URGENCY_LEVEL": "SYSTOLIC_BP",
+    }
+    for feature, source in measured.items():
+        scored.loc[inputs[source].isna(), feature] = None
+    return scored
+
+
+def score_user(profile, latest_metrics):
+    """LIVE_FEATURES for one user as a dict, skipping features without data"""
+    profile = dict(profile, USER_ID=profile.get("USER_ID", "user"))
+    metrics = pd.DataFrame(
+        [{"USER_ID": profile["USER_ID"], "METRIC_TYPE": metric_type, "METRIC_VALUE": value}
+         for metric_type, value in latest_metrics.items() if value is not None],
+        columns=["USER_ID", "METRIC_TYPE", "METRIC_VALUE"])
+    row = score_users(pd.DataFrame([profile]), metrics).iloc[0]
+    return {column: (value.item() if hasattr(value, "item") else value)
+            for column, value in row.items() if column in LIVE_FEATURES and not pd.isna(value)}
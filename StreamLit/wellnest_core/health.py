@@ -0,0 +1,52 @@
+# =============================================================================
+# WELLNEST CORE - HEALTH HELPERS
+# =============================================================================
+
+from datetime import date
+
+from wellnest_core import thresholds
+
+PROFILE_COMPLETENESS_FIELDS = [
+    'HEIGHT_CM', 'WEIGHT_KG', 'BLOOD_TYPE', 'SMOKING_STATUS',
+    'ALCOHOL_CONSUMPTION', 'EXERCISE_FREQUENCY', 'EMERGENCY_CONTACT_NAME',
+    'EMERGENCY_CONTACT_PHONE'
+]
+
+# Display name and color per bmi_category band (bands live in thresholds.py)
+BMI_DISPLAY = {
+    'underweight': ("Underweight", "orange"),
+    'normal': ("Normal Weight", "green"),
+    'overweight': ("Overweight", "orange"),
+    'obese_class1': ("Obese", "red"),
+    'obese_class2': ("Obese", "red"),
+    'obese_class3_severe': ("Obese", "red"),
+}
+
+
+def calculate_bmi(weight_kg, height_cm):
+    """Calculate BMI from weight and height"""
+    if weight_kg and height_cm and weight_kg > 0 and height_cm > 0:
+        height_m = height_cm / 100
+        return round(weight_kg / (height_m ** 2), 1)
+    return None
+
+
+def get_bmi_category(bmi):
+    """Get BMI category and color"""
+    if not bmi:
+        return "Unknown", "gray"
+    return BMI_DISPLAY.get(thresholds.classify('bmi_category', bmi), ("Unknown", "gray"))
+
+
+def calculate_age(dob):
+    """Calculate age from date of birth"""
+    if dob:
+        today = date.today()
+        return today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
+    return None
+
+
+def get_profile_completeness(profile):
+    """Calculate profile completeness percentage"""
+    completed = sum(1 for field in PROFILE_COMPLETENESS_FIELDS if profile.get(field) is not None)
+    return int((completed / len(PROFILE_COMPLETENESS_FIELDS)) * 100)
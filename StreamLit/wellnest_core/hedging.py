@@ -0,0 +1,193 @@
+# =============================================================================
+# WELLNEST - HEDGED SPECIALIST REQUESTS
+# =============================================================================
+# Cuts the latency tail of fine-tuned specialist calls. If the primary call
+# has not returned by the rolling p90 deadline, a duplicate is issued (to the
+# same model or a fallback model) and whichever finishes first wins.
+#   - the primary starts on its own thread at once, so the deadline measures
+#     the call itself and never time spent queued behind other turns
+#   - hedges share a small pool and are skipped when it has no idle worker;
+#     a hedge queued behind other hedges would not cut the tail
+#   - the loser is cancelled if it has not started; a Snowflake call already
+#     in flight cannot be interrupted and runs to completion
+# =============================================================================
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers (None if empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def _start_thread(fn):
+    """Run fn() on a new thread right away; a Future for its result"""
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn())
+        except BaseException as exc:
+            future.set_exception(exc)
+
+    threading.Thread(target=run, name="wellnest-hedge-primary", daemon=True).start()
+    return future
+
+
+class HedgedCaller:
+    """Issue a backup request when the primary call is slower than the rolling p90"""
+
+    def __init__(self, hedge_percentile=90, window_size=200, min_samples=20,
+                 max_hedge_fraction=0.10, initial_deadline_seconds=8.0,
+                 max_workers=8):
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.max_hedge_fraction = max_hedge_fraction
+        self.initial_deadline_seconds = initial_deadline_seconds
+
+        self._lock = threading.Lock()
+        self._max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="wellnest-hedge")
+        self._hedges_in_flight = 0
+
+        # Latency of the primary request alone (what users would see without hedging)
+        self._primary_latencies = deque(maxlen=window_size)
+        # Latency actually returned to the caller (first result wins)
+        self._served_latencies = deque(maxlen=window_size)
+
+        self._total_calls = 0
+        self._hedged_calls = 0
+        self._hedge_wins = 0
+        self._budget_skips = 0
+        self._saturation_skips = 0
+
+    # -------------------------------------------------------------------------
+    # Deadline and budget
+    # -------------------------------------------------------------------------
+
+    def current_deadline(self):
+        """Seconds to wait for the primary before hedging"""
+        with self._lock:
+            if len(self._primary_latencies) < self.min_samples:
+                return self.initial_deadline_seconds
+            return percentile(list(self._primary_latencies), self.hedge_percentile)
+
+    def _take_hedge_budget(self):
+        """Reserve a hedge if a pool worker is idle and the hedged fraction stays under the cap"""
+        with self._lock:
+            if self._hedges_in_flight >= self._max_workers:
+                self._saturation_skips += 1
+                return False
+            if (self._hedged_calls + 1) > self.max_hedge_fraction * self._total_calls:
+                self._budget_skips += 1
+                return False
+            self._hedged_calls += 1
+            self._hedges_in_flight += 1
+            return True
+
+    def _release_hedge(self, future):
+        with self._lock:
+            self._hedges_in_flight -= 1
+
+    def _record_primary(self, started_at, future):
+        """Track primary latency even when the hedge already won"""
+        if future.exception() is None:
+            with self._lock:
+                self._primary_latencies.append(time.perf_counter() - started_at)
+
+    # -------------------------------------------------------------------------
+    # Calling
+    # -------------------------------------------------------------------------
+
+    def call(self, primary_fn, hedge_fn=None):
+        """
+        Run primary_fn(); if it misses the deadline, also run hedge_fn()
+        (defaults to primary_fn) and return the first successful result.
+        Neither callable may touch st.session_state - they run in worker threads.
+        """
+        hedge_fn = hedge_fn or primary_fn
+        deadline = self.current_deadline()
+
+        with self._lock:
+            self._total_calls += 1
+
+        started_at = time.perf_counter()
+        primary = _start_thread(primary_fn)
+        primary.add_done_callback(lambda f: self._record_primary(started_at, f))
+
+        done, _ = wait([primary], timeout=deadline)
+        if done or not self._take_hedge_budget():
+            result = primary.result()
+            self._record_served(started_at)
+            return result
+
+        hedge = self._executor.submit(hedge_fn)
+        hedge.add_done_callback(self._release_hedge)
+        pending = {primary, hedge}
+        last_error = None
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    last_error = future.exception()
+                    continue
+                if future is hedge:
+                    with self._lock:
+                        self._hedge_wins += 1
+                for loser in pending:
+                    loser.cancel()
+                self._record_served(started_at)
+                return future.result()
+
+        raise last_error
+
+    def _record_served(self, started_at):
+        with self._lock:
+            self._served_latencies.append(time.perf_counter() - started_at)
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+
+    def stats(self):
+        """Tail latency with and without hedging plus hedge budget usage"""
+        with self._lock:
+            primary = list(self._primary_latencies)
+            served = list(self._served_latencies)
+            total = self._total_calls
+            hedged = self._hedged_calls
+            wins = self._hedge_wins
+            skips = self._budget_skips
+            saturated = self._saturation_skips
+
+        primary_p99 = percentile(primary, 99)
+        served_p99 = percentile(served, 99)
+        improvement = None
+        if primary_p99 and served_p99 is not None:
+            improvement = round((primary_p99 - served_p99) / primary_p99 * 100, 1)
+
+        return {
+            "total_calls": total,
+            "hedged_calls": hedged,
+            "hedge_fraction": round(hedged / total, 3) if total else 0.0,
+            "hedge_wins": wins,
+            "budget_skips": skips,
+            "saturation_skips": saturated,
+            "deadline_seconds": self.current_deadline(),
+            "primary_p50": percentile(primary, 50),
+            "primary_p99": primary_p99,
+            "served_p50": percentile(served, 50),
+            "served_p99": served_p99,
+            "p99_improvement_pct": improvement
+        }
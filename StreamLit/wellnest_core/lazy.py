@@ -0,0 +1,42 @@
+# =============================================================================
+# WELLNEST CORE - LAZY IMPORTS
+# =============================================================================
+# Heavy modules (pandas, bcrypt, ...) are only needed by a few code paths.
+# Binding them through lazy_import() keeps them off the page-load path until
+# an attribute is first used.
+# =============================================================================
+
+import importlib
+import threading
+
+
+class LazyModule:
+    """Module proxy that imports on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name):
+    """Return a proxy for `name` that defers the real import"""
+    return LazyModule(name)
+
+
+pandas = lazy_import("pandas")
+bcrypt = lazy_import("bcrypt")
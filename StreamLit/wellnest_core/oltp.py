@@ -0,0 +1,253 @@
+# =============================================================================
+# WELLNEST CORE - TRANSACTIONAL STORE FOR THE PER-USER HOT PATHS
+# =============================================================================
+# Login, registration, profile edits, saving a chat turn and reading the
+# current session are single-row operations. On a standard table each one is
+# a warehouse statement (compile + micro-partition scan + commit); a row store
+# answers them in milliseconds. A Store is a session-like front for those
+# statements:
+#   - reads and writes go to the row store
+#   - a write that succeeds is replayed, in order, against the analytical
+#     tables by a background Replicator, so the Cortex Search service, the
+#     stored procedures and dbt keep reading the tables they read today
+#     (seconds behind the store)
+#   - defer() queues append-only analytical writes (turn telemetry) on the
+#     same background thread
+#
+# Backends (WELLNEST_OLTP_BACKEND):
+#   warehouse - pass-through to the Snowpark session (default, no replication)
+#   hybrid    - Snowflake hybrid tables in WELLNEST.OLTP (Misc/oltp_hybrid.sql),
+#               statements are pointed there by table name
+# Benchmarks/chat_load_benchmark.py --oltp local installs a SQLite-backed
+# store with set_store().
+#
+# Replicated writes are buffered in memory; the OLTP_RECONCILE task in
+# Misc/oltp_hybrid.sql merges anything a crashed process did not ship.
+# Replayed statements bind their timestamps (statements.timestamp()) so the
+# analytical rows match the store rows. Callers that hand work to a stored
+# procedure reading the analytical tables (specialist context, session
+# summary) call sync() first; it waits only for writes queued before the
+# call and returns early while the head write is failing (retried with
+# backoff, then dropped and logged).
+# =============================================================================
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+from wellnest_core.app_logging import LOGGER_NAME
+
+BACKEND = os.environ.get('WELLNEST_OLTP_BACKEND', 'warehouse')
+
+# Analytical table -> hybrid table serving the hot path
+HYBRID_TABLES = {
+    'WELLNEST.USER_MANAGEMENT.USERS': 'WELLNEST.OLTP.USERS',
+    'WELLNEST.USER_MANAGEMENT.USER_MEDICAL_PROFILES': 'WELLNEST.OLTP.USER_MEDICAL_PROFILES',
+    'WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY': 'WELLNEST.OLTP.CONVERSATION_TURNS',
+    'WELLNEST.USER_MANAGEMENT.REVOKED_SESSIONS': 'WELLNEST.OLTP.REVOKED_SESSIONS',
+}
+
+WRITE_VERBS = ('INSERT', 'UPDATE', 'DELETE', 'MERGE')
+MAX_PENDING_WRITES = 10000
+MAX_WRITE_ATTEMPTS = 5
+RETRY_BACKOFF_SECONDS = 0.2     # Doubles per failed attempt
+SYNC_TIMEOUT_SECONDS = 5.0
+
+logger = logging.getLogger(f"{LOGGER_NAME}.oltp")
+
+_install_lock = threading.Lock()
+_store = None
+
+
+@lru_cache(maxsize=256)
+def _prepare(statement, tables):
+    """(statement pointed at the store's tables, is it a write)"""
+    for source, target in tables:
+        statement = statement.replace(source, target)
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ''
+    return statement, verb in WRITE_VERBS
+
+
+# =============================================================================
+# REPLICATION (store -> analytical tables)
+# =============================================================================
+
+class Replicator:
+    """Background, in-order replay of store writes against the analytical session"""
+
+    def __init__(self, session, max_pending=MAX_PENDING_WRITES):
+        self.session = session
+        self._pending = deque(maxlen=max_pending)
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._wake = threading.Event()
+        self._closed = False
+        self._queued = 0
+        self._attempts = 0
+        self._retry_at = 0.0
+        self.replicated = 0
+        self.dropped = 0
+        self.failed_writes = 0
+        self.last_lag_ms = 0.0
+
+        self._worker = threading.Thread(target=self._run, name='wellnest-oltp-replicator', daemon=True)
+        self._worker.start()
+
+    def enqueue(self, statement, params):
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped += 1
+                logger.error("Replication queue full, dropped the oldest write: %s", self._pending[0][1][:200])
+            self._queued += 1
+            self._pending.append((self._queued, statement, params, time.monotonic()))
+        self._wake.set()
+
+    def flush(self):
+        """Replay pending writes in order; a failing write is retried with backoff, then dropped"""
+        while True:
+            with self._lock:
+                if not self._pending or time.monotonic() < self._retry_at:
+                    return
+                seq, statement, params, queued_at = self._pending[0]
+            try:
+                self.session.sql(statement, params=params).collect()
+            except Exception:
+                with self._changed:
+                    self.failed_writes += 1
+                    self._attempts += 1
+                    if self._attempts < MAX_WRITE_ATTEMPTS:
+                        self._retry_at = time.monotonic() + RETRY_BACKOFF_SECONDS * 2 ** (self._attempts - 1)
+                        self._changed.notify_all()
+                        return
+                    self._pop(seq)
+                    self.dropped += 1
+                    self._changed.notify_all()
+                logger.exception("Dropped replicated write after %d attempts: %s", MAX_WRITE_ATTEMPTS, statement[:200])
+                continue
+            with self._changed:
+                self._pop(seq)
+                self.replicated += 1
+                self.last_lag_ms = (time.monotonic() - queued_at) * 1000
+                self._changed.notify_all()
+
+    def _pop(self, seq):
+        """Remove the head write `seq` (unless the bounded queue already evicted it); lock held"""
+        if self._pending and self._pending[0][0] == seq:
+            self._pending.popleft()
+        self._attempts = 0
+        self._retry_at = 0.0
+
+    def _caught_up(self, seq):
+        return not self._pending or self._pending[0][0] > seq
+
+    def sync(self, timeout=SYNC_TIMEOUT_SECONDS):
+        """Wait until the writes queued so far have been replayed (False on timeout or while the head write is failing)"""
+        self._wake.set()
+        with self._changed:
+            target = self._queued
+            self._changed.wait_for(lambda: self._caught_up(target) or self._attempts > 0, timeout)
+            return self._caught_up(target)
+
+    def _run(self):
+        while not self._closed:
+            with self._lock:
+                delay = max(0.0, self._retry_at - time.monotonic()) if self._attempts else 1.0
+            self._wake.wait(delay)
+            self._wake.clear()
+            self.flush()
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self._worker.join(timeout=2.0)
+        self.flush()
+
+    def stats(self):
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            'pending': pending,
+            'replicated': self.replicated,
+            'dropped': self.dropped,
+            'failed_writes': self.failed_writes,
+            'last_lag_ms': round(self.last_lag_ms, 1),
+        }
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+class _ReplicatedWrite:
+    """A store write that is queued for replication once it has succeeded"""
+
+    def __init__(self, frame, replicator, statement, params):
+        self._frame = frame
+        self._replicator = replicator
+        self._statement = statement
+        self._params = params
+
+    def collect(self, *args, **kwargs):
+        rows = self._frame.collect(*args, **kwargs)
+        self._replicator.enqueue(self._statement, self._params)
+        return rows
+
+    def __getattr__(self, name):
+        return getattr(self._frame, name)
+
+
+class Store:
+    """Session-like front for the hot-path statements (sql() only; the rest passes through)"""
+
+    def __init__(self, session, tables=None, replicator=None):
+        self.session = session
+        self.tables = tuple(sorted((tables or {}).items()))
+        self.replicator = replicator
+
+    def sql(self, statement, params=None):
+        text, is_write = _prepare(statement, self.tables)
+        frame = self.session.sql(text, params=params)
+        if is_write and self.replicator is not None:
+            return _ReplicatedWrite(frame, self.replicator, statement, params)
+        return frame
+
+    def defer(self, statement, params=None):
+        """Append-only analytical write nothing on the request path reads back: queued when replicating"""
+        if self.replicator is None:
+            self.session.sql(statement, params=params).collect()
+        else:
+            self.replicator.enqueue(statement, params)
+
+    def sync(self, timeout=SYNC_TIMEOUT_SECONDS):
+        """Block until replicated writes have reached the analytical tables"""
+        return self.replicator.sync(timeout) if self.replicator is not None else True
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+
+def set_store(store):
+    """Install the process-wide store (tests and benchmarks)"""
+    global _store
+    with _install_lock:
+        _store = store
+
+
+def get_store(session):
+    """Process-wide store for BACKEND, created on first use"""
+    global _store
+    with _install_lock:
+        if _store is None:
+            if BACKEND == 'hybrid':
+                replicator = Replicator(session)
+                atexit.register(replicator.close)
+                _store = Store(session, tables=HYBRID_TABLES, replicator=replicator)
+            elif BACKEND == 'warehouse':
+                _store = Store(session)
+            else:
+                raise ValueError(f"Unknown WELLNEST_OLTP_BACKEND: {BACKEND}")
+    return _store
@@ -0,0 +1,56 @@
+# =============================================================================
+# WELLNEST CORE - USER PROFILE DATA ACCESS
+# =============================================================================
+# Statements live in statements.py; optional fields are bound NULL and
+# COALESCE keeps the stored value. Profiles are read and written through the
+# OLTP store (oltp.py).
+# =============================================================================
+
+from wellnest_core import statements
+from wellnest_core.connection import get_oltp_store
+
+
+def get_user_profile(user_id):
+    """Fetch user profile from database"""
+    result = get_oltp_store().sql(statements.USER_PROFILE_SQL, params=[user_id]).collect()
+    
+    if result:
+        return result[0].asDict()
+    return None
+
+
+def update_user_info(user_id, full_name, phone_number):
+    """Update basic user information"""
+    get_oltp_store().sql(statements.UPDATE_USER_INFO_SQL, params=[full_name, phone_number or None, user_id]).collect()
+
+
+def update_medical_profile(user_id, profile_data):
+    """Update medical profile information"""
+    def optional(key):
+        return profile_data.get(key) or None
+
+    female = profile_data.get('gender') == 'Female'
+    
+    get_oltp_store().sql(statements.UPDATE_MEDICAL_PROFILE_SQL, params=[
+        optional('height_cm'),
+        optional('weight_kg'),
+        optional('bmi'),
+        optional('blood_type'),
+        bool(profile_data.get('has_diabetes', False)),
+        bool(profile_data.get('has_hypertension', False)),
+        bool(profile_data.get('has_heart_disease', False)),
+        bool(profile_data.get('has_mental_health_history', False)),
+        bool(profile_data.get('has_pcos', False)),
+        optional('smoking_status'),
+        optional('alcohol_consumption'),
+        optional('exercise_frequency'),
+        bool(profile_data.get('is_pregnant', False)) if female else None,
+        optional('pregnancy_trimester') if female else None,
+        bool(profile_data.get('menstrual_cycle_regular', False)) if female else None,
+        str(profile_data['last_menstrual_period']) if female and profile_data.get('last_menstrual_period') else None,
+        optional('emergency_contact_name'),
+        optional('emergency_contact_phone'),
+        optional('emergency_contact_relationship'),
+        statements.timestamp(),
+        user_id,
+    ]).collect()
@@ -0,0 +1,235 @@
+# =============================================================================
+# WELLNEST CORE - QUERY PROFILER
+# =============================================================================
+# Opt-in (WELLNEST_QUERY_PROFILE=1) wrapper around the Snowpark session that
+# records every statement and stored-procedure call of one script rerun:
+#   - count and wall time per round trip, and the function that issued it
+#   - SQL normalized (literals -> ?) so the same statement shape issued
+#     several times in one rerun shows up as a repeat (N+1 / missing batching)
+#   - exact duplicates (same text and parameters) flagged separately - those
+#     could simply be reused
+# Each finished rerun yields a JSON-serializable report: the pages render it
+# in a sidebar debug panel, reruns over the page's round-trip budget are
+# logged as warnings, and WELLNEST_QUERY_PROFILE_PATH appends every report
+# as one JSON line. Statements issued outside a rerun (the log flush thread,
+# hedged calls in worker threads) are not attributed to any rerun.
+# =============================================================================
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+ENABLED = os.environ.get('WELLNEST_QUERY_PROFILE', '').lower() in ('1', 'true', 'yes')
+REPORT_PATH = os.environ.get('WELLNEST_QUERY_PROFILE_PATH')
+
+# Round trips (statements + procedure calls) one rerun of a page may cost
+QUERY_BUDGETS = {
+    'login': 3,
+    'dashboard': 6,
+    'profile': 4,
+    'chat': 10,
+    'documents': 6,
+    'telemetry': 2,
+}
+
+_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(\.\d+)?\b")
+_VALUES_ROWS = re.compile(r"\(\?(?:,\s*\?)+\)(?:,\s*\(\?(?:,\s*\?)+\))+")
+
+# Helper modules between the page code and session.sql()
+_PASS_THROUGH_MODULES = ('wellnest_core.statements', 'wellnest_core.oltp')
+
+_local = threading.local()
+_write_lock = threading.Lock()
+
+
+def normalize_statement(query):
+    """Statement shape: literals and numbers -> ?, multi-row VALUES collapsed"""
+    text = _NUMBER.sub("?", _LITERAL.sub("?", query))
+    text = _VALUES_ROWS.sub("(?, ...), ...", text)
+    return " ".join(text.split())
+
+
+# =============================================================================
+# SESSION WRAPPER
+# =============================================================================
+
+def _caller(depth):
+    """Name of the function that issued the round trip (skipping the statements / store layers)"""
+    frame = sys._getframe(depth + 1)
+    while frame.f_back is not None and frame.f_globals.get('__name__') in _PASS_THROUGH_MODULES:
+        frame = frame.f_back
+    return frame.f_code.co_name
+
+
+def _record(kind, statement, params, caller, started):
+    run = getattr(_local, 'run', None)
+    if run is not None:
+        run.record(kind, statement, params, caller, (time.perf_counter() - started) * 1000)
+
+
+class ProfiledDataFrame:
+    """Times the actions of a session.sql() DataFrame; everything else passes through"""
+
+    def __init__(self, frame, query, params):
+        self._frame = frame
+        self._query = query
+        self._params = params
+
+    def _timed(self, action, *args, **kwargs):
+        caller = _caller(2)
+        started = time.perf_counter()
+        try:
+            return getattr(self._frame, action)(*args, **kwargs)
+        finally:
+            _record('sql', self._query, self._params, caller, started)
+
+    def collect(self, *args, **kwargs):
+        return self._timed('collect', *args, **kwargs)
+
+    def to_pandas(self, *args, **kwargs):
+        return self._timed('to_pandas', *args, **kwargs)
+
+    def first(self, *args, **kwargs):
+        return self._timed('first', *args, **kwargs)
+
+    def count(self, *args, **kwargs):
+        return self._timed('count', *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._frame, name)
+
+
+class ProfiledSession:
+    """Snowpark session proxy that records sql() actions and call()s"""
+
+    def __init__(self, session):
+        self._session = session
+
+    def sql(self, query, params=None):
+        return ProfiledDataFrame(self._session.sql(query, params=params), query, params)
+
+    def call(self, name, *args, **kwargs):
+        caller = _caller(1)
+        started = time.perf_counter()
+        try:
+            return self._session.call(name, *args, **kwargs)
+        finally:
+            _record('call', name, args, caller, started)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+def wrap(session):
+    """The session itself, or a profiled proxy when profiling is enabled"""
+    return ProfiledSession(session) if ENABLED else session
+
+
+# =============================================================================
+# PER-RERUN PROFILE
+# =============================================================================
+
+class RerunProfile:
+    """Round trips of one script rerun"""
+
+    def __init__(self, page):
+        self.page = page
+        self.started = time.perf_counter()
+        self.elapsed_ms = None
+        self.entries = []   # (kind, statement, params, caller, ms)
+
+    def record(self, kind, statement, params, caller, ms):
+        self.entries.append((kind, statement, params, caller, ms))
+
+    def report(self):
+        shapes = defaultdict(lambda: {'count': 0, 'total_ms': 0.0, 'callers': set(), 'exact': defaultdict(int)})
+        for kind, statement, params, caller, ms in self.entries:
+            shape = shapes[(kind, statement if kind == 'call' else normalize_statement(statement))]
+            shape['count'] += 1
+            shape['total_ms'] += ms
+            shape['callers'].add(caller)
+            shape['exact'][(statement, repr(params))] += 1
+
+        statements = sorted((
+            {
+                'kind': kind,
+                'statement': text,
+                'count': shape['count'],
+                'total_ms': round(shape['total_ms'], 1),
+                'callers': sorted(shape['callers']),
+                'duplicates': sum(n - 1 for n in shape['exact'].values()),
+            }
+            for (kind, text), shape in shapes.items()
+        ), key=lambda row: (-row['count'], -row['total_ms']))
+
+        round_trips = len(self.entries)
+        budget = QUERY_BUDGETS.get(self.page)
+        return {
+            'page': self.page,
+            'rerun_ms': round(self.elapsed_ms or 0.0, 1),
+            'queries': sum(1 for entry in self.entries if entry[0] == 'sql'),
+            'calls': sum(1 for entry in self.entries if entry[0] == 'call'),
+            'round_trips': round_trips,
+            'round_trip_ms': round(sum(entry[4] for entry in self.entries), 1),
+            'budget': budget,
+            'over_budget': budget is not None and round_trips > budget,
+            'repeated': [row for row in statements if row['count'] > 1],
+            'statements': statements,
+        }
+
+
+@contextmanager
+def rerun(page, on_report=None):
+    """Profile the enclosed script run; yields the RerunProfile (None when disabled).
+
+    on_report(report) also runs when the rerun ends early (st.rerun / st.stop).
+    """
+    if not ENABLED:
+        yield None
+        return
+    profile = _local.run = RerunProfile(page)
+    try:
+        yield profile
+    finally:
+        _local.run = None
+        profile.elapsed_ms = (time.perf_counter() - profile.started) * 1000
+        report = profile.report()
+        if REPORT_PATH:
+            write_report(report, REPORT_PATH)
+        if on_report:
+            on_report(report)
+
+
+def write_report(report, path):
+    """Append one report as a JSON line"""
+    with _write_lock, open(path, 'a', encoding='utf-8') as handle:
+        handle.write(json.dumps(dict(report, timestamp=time.time())) + "\n")
+
+
+def render_panel(report):
+    """Sidebar debug panel for one rerun report"""
+    import streamlit as st
+
+    with st.sidebar.expander(f"🔎 Queries: {report['round_trips']} round trips, {report['round_trip_ms']:.0f} ms"):
+        if report['over_budget']:
+            st.warning(f"Over the '{report['page']}' budget: {report['round_trips']} > {report['budget']}")
+        for row in report['repeated']:
+            st.warning(f"{row['count']}x the same {row['kind']} from {', '.join(row['callers'])}"
+                       + (f" ({row['duplicates']} exact duplicates)" if row['duplicates'] else ""))
+        st.dataframe([
+            {
+                'kind': row['kind'],
+                'count': row['count'],
+                'ms': row['total_ms'],
+                'duplicates': row['duplicates'],
+                'called from': ', '.join(row['callers']),
+                'statement': row['statement'][:200],
+            }
+            for row in report['statements']
+        ], use_container_width=True, hide_index=True)
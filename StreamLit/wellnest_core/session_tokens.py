@@ -0,0 +1,265 @@
+# =============================================================================
+# WELLNEST - SIGNED SESSION TOKENS
+# =============================================================================
+# A reconnect or page reload loses st.session_state. Instead of sending the
+# user back through bcrypt + two queries, login issues an HMAC-signed token
+# (kept in the page URL) that is validated locally: signature and expiry need
+# no database hit, and revocations come from an in-memory set refreshed from
+# REVOKED_SESSIONS at most once per REVOCATION_REFRESH_SECONDS per process.
+#
+# The URL ends up in browser history and screenshots, so the token carries no
+# identity data (jti, user_id, iat, exp only), lives for SESSION_TTL_SECONDS
+# and is rotated (old jti revoked) once it is past half its life. A restore reads the account
+# by primary key and refuses inactive or locked accounts and tokens issued
+# before USERS.TOKENS_VALID_AFTER (set on lockout; revoke_user_tokens for
+# password changes). Streamlit in Snowflake cannot set cookies, hence the URL.
+# Revocation rows store REVOKED_AT / EXPIRES_AT in UTC and are compared with
+# SYSDATE(), so they hold regardless of the account's time zone.
+# =============================================================================
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import streamlit as st
+
+from wellnest_core import statements
+from wellnest_core.app_logging import LOGGER_NAME
+
+SESSION_TTL_SECONDS = 30 * 60
+ROTATE_AFTER_SECONDS = SESSION_TTL_SECONDS // 2
+REVOCATION_REFRESH_SECONDS = 60
+SESSION_QUERY_PARAM = "session"
+TOKEN_VERSION = "v1"
+
+logger = logging.getLogger(f"{LOGGER_NAME}.session_tokens")
+
+REVOKE_TOKEN_SQL = """
+INSERT INTO WELLNEST.USER_MANAGEMENT.REVOKED_SESSIONS (TOKEN_ID, USER_ID, REVOKED_AT, EXPIRES_AT)
+SELECT ?, ?, TO_TIMESTAMP_NTZ(?), TO_TIMESTAMP_NTZ(?)
+"""
+
+SESSION_USER_SQL = """
+SELECT EMAIL, FULL_NAME, ACCOUNT_STATUS, ACCOUNT_LOCKED_UNTIL, TOKENS_VALID_AFTER
+FROM WELLNEST.USER_MANAGEMENT.USERS
+WHERE USER_ID = ?
+"""
+
+REVOKE_USER_TOKENS_SQL = """
+UPDATE WELLNEST.USER_MANAGEMENT.USERS
+SET TOKENS_VALID_AFTER = ?
+WHERE USER_ID = ?
+"""
+
+ACTIVE_REVOCATIONS_SQL = """
+SELECT TOKEN_ID
+FROM WELLNEST.USER_MANAGEMENT.REVOKED_SESSIONS
+WHERE EXPIRES_AT > SYSDATE()
+"""
+
+
+def _load_secret() -> bytes:
+    """Signing key from Streamlit secrets or the environment"""
+    try:
+        secret = st.secrets.get("WELLNEST_SESSION_SECRET")
+    except Exception:
+        secret = None
+    secret = secret or os.environ.get("WELLNEST_SESSION_SECRET")
+    if not secret:
+        # Tokens stay valid only for the lifetime of this process
+        secret = secrets.token_hex(32)
+    return secret.encode('utf-8')
+
+
+_SECRET = _load_secret()
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+
+def _sign(message: str) -> str:
+    return _b64encode(hmac.new(_SECRET, message.encode('ascii'), hashlib.sha256).digest())
+
+
+# =============================================================================
+# REVOCATION CACHE
+# =============================================================================
+
+class RevocationCache:
+    """Process-wide set of revoked token IDs with periodic refresh"""
+
+    def __init__(self, refresh_seconds=REVOCATION_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._revoked = set()
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _refresh_if_stale(self, session):
+        if time.monotonic() - self._loaded_at < self.refresh_seconds:
+            return
+        with self._lock:
+            if time.monotonic() - self._loaded_at < self.refresh_seconds:
+                return
+            try:
+                rows = session.sql(ACTIVE_REVOCATIONS_SQL).collect()
+                self._revoked = {row['TOKEN_ID'] for row in rows}
+            except Exception:
+                # Keep the last known set; retry on the next refresh window
+                pass
+            self._loaded_at = time.monotonic()
+
+    def is_revoked(self, session, token_id: str) -> bool:
+        self._refresh_if_stale(session)
+        return token_id in self._revoked
+
+    def add(self, token_id: str):
+        with self._lock:
+            self._revoked.add(token_id)
+
+
+_revocations = RevocationCache()
+
+
+# =============================================================================
+# TOKEN ISSUE / VALIDATE / REVOKE
+# =============================================================================
+
+def issue_token(user: dict, ttl_seconds: int = SESSION_TTL_SECONDS) -> str:
+    """Create a signed token for an authenticated user"""
+    now = int(time.time())
+    claims = {
+        'jti': str(uuid.uuid4()),
+        'user_id': user['user_id'],
+        'iat': now,
+        'exp': now + ttl_seconds
+    }
+    payload = _b64encode(json.dumps(claims, separators=(',', ':')).encode('utf-8'))
+    message = f"{TOKEN_VERSION}.{payload}"
+    return f"{message}.{_sign(message)}"
+
+
+def validate_token(session, token: str):
+    """Return the token claims if signature, expiry and revocation all check out"""
+    try:
+        version, payload, signature = token.split('.')
+    except (AttributeError, ValueError):
+        return None
+
+    if version != TOKEN_VERSION:
+        return None
+    if not hmac.compare_digest(signature, _sign(f"{version}.{payload}")):
+        return None
+
+    try:
+        claims = json.loads(_b64decode(payload))
+    except ValueError:
+        return None
+
+    if claims.get('exp', 0) < time.time():
+        return None
+    if _revocations.is_revoked(session, claims['jti']):
+        return None
+    return claims
+
+
+def _utc(epoch_seconds) -> str:
+    """Epoch seconds as a UTC TIMESTAMP_NTZ bind value (compared with SYSDATE())"""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(epoch_seconds))
+
+
+def revoke_token(session, claims: dict):
+    """Revoke a token everywhere (immediately in this process)"""
+    _revocations.add(claims['jti'])
+    session.sql(REVOKE_TOKEN_SQL, params=[claims['jti'], claims['user_id'],
+                                          _utc(time.time()), _utc(claims['exp'])]).collect()
+
+
+def revoke_user_tokens(session, user_id: str):
+    """Invalidate every token issued to a user so far (password change, admin action)"""
+    session.sql(REVOKE_USER_TOKENS_SQL, params=[int(time.time()), user_id]).collect()
+
+
+def load_account(session, claims: dict):
+    """Name and email for valid claims, or None if the account may not use them"""
+    rows = session.sql(SESSION_USER_SQL, params=[claims['user_id']]).collect()
+    if not rows:
+        return None
+    account = rows[0]
+    if account['ACCOUNT_STATUS'] != 'active':
+        return None
+    if account['ACCOUNT_LOCKED_UNTIL'] and datetime.now() < account['ACCOUNT_LOCKED_UNTIL']:
+        return None
+    if claims['iat'] < (account['TOKENS_VALID_AFTER'] or 0):
+        return None
+    return {'user_id': claims['user_id'], 'email': account['EMAIL'], 'full_name': account['FULL_NAME']}
+
+
+# =============================================================================
+# STREAMLIT SESSION HELPERS (shared by app.py and page modules)
+# =============================================================================
+
+def start_session(user: dict):
+    """Issue a token after a real login (or a restore) and keep it in the page URL"""
+    token = issue_token(user)
+    st.query_params[SESSION_QUERY_PARAM] = token
+    st.session_state.user_id = user['user_id']
+    st.session_state.email = user['email']
+    st.session_state.full_name = user['full_name']
+    st.session_state.session_token_claims = json.loads(_b64decode(token.split('.')[1]))
+    st.session_state.authenticated = True
+
+
+def restore_session(session) -> bool:
+    """Re-authenticate from the URL token after a reload: no bcrypt, one primary-key read"""
+    if st.session_state.get('authenticated'):
+        claims = st.session_state.get('session_token_claims')
+        if claims and time.time() - claims['iat'] > ROTATE_AFTER_SECONDS:
+            start_session({'user_id': st.session_state.user_id, 'email': st.session_state.email,
+                           'full_name': st.session_state.full_name})
+            # The replaced token may still sit in a bookmark or another tab
+            _revoke_quietly(session, claims)
+        return True
+
+    token = st.query_params.get(SESSION_QUERY_PARAM)
+    if not token:
+        return False
+
+    claims = validate_token(session, token)
+    user = load_account(session, claims) if claims else None
+    if not user:
+        del st.query_params[SESSION_QUERY_PARAM]
+        return False
+
+    start_session(user)
+    return True
+
+
+def _revoke_quietly(session, claims: dict):
+    """Revoke without failing the page; this process rejects the token either way"""
+    try:
+        revoke_token(session, claims)
+    except Exception:
+        logger.exception("Session token revocation failed",
+                         extra={'user_id': claims.get('user_id'), 'session_id': st.session_state.get('session_id')})
+
+
+def end_session(session):
+    """Revoke the current token and drop it from the URL"""
+    claims = st.session_state.get('session_token_claims')
+    if claims:
+        _revoke_quietly(session, claims)
+    if SESSION_QUERY_PARAM in st.query_params:
+        del st.query_params[SESSION_QUERY_PARAM]
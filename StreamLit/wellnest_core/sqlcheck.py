@@ -0,0 +1,169 @@
+# =============================================================================
+# WELLNEST CORE - STATIC CHECK FOR INTERPOLATED SQL
+# =============================================================================
+# Flags statements whose text is built from values instead of binding them:
+#   - session.sql(...) with an f-string, str.format(), % or + as its text,
+#     directly or through a local / module variable
+#   - manual quote escaping (.replace("'", "''")), which only exists to
+#     splice a value into SQL text
+# Scans Python files and the Python handlers ($$ ... $$ bodies) of the stored
+# procedures in .sql files. A `# sqlcheck: ok` comment on the flagged line or
+# the line above exempts it - for text that varies by construction (table
+# names, placeholder lists), never by user value. Files that do not parse are
+# reported as skipped.
+#
+# Usage (from StreamLit/):  python -m wellnest_core.sqlcheck [paths...]
+# Exits 1 when anything is flagged.
+# =============================================================================
+
+import ast
+import os
+import re
+import sys
+from collections import defaultdict, namedtuple
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+DEFAULT_PATHS = ["StreamLit", "Agents", "Misc", "Eval"]
+ALLOW_MARKER = "sqlcheck: ok"
+
+_PROCEDURE_BODY = re.compile(r"LANGUAGE\s+PYTHON.*?\$\$\n(.*?)\$\$", re.IGNORECASE | re.DOTALL)
+
+Finding = namedtuple("Finding", ["path", "line", "message"])
+
+
+def _is_text(node):
+    return isinstance(node, ast.JoinedStr) or (isinstance(node, ast.Constant) and isinstance(node.value, str))
+
+
+def _interpolation(node):
+    """How `node` builds text from values, or None for constant text"""
+    if isinstance(node, ast.JoinedStr) and any(isinstance(part, ast.FormattedValue) for part in node.values):
+        return "f-string"
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "format":
+        return "str.format()"
+    if isinstance(node, ast.BinOp):
+        if isinstance(node.op, ast.Mod) and _is_text(node.left):
+            return "% formatting"
+        if isinstance(node.op, ast.Add) and (_is_text(node.left) or _is_text(node.right)
+                                             or _interpolation(node.left) or _interpolation(node.right)):
+            return "string concatenation"
+    return None
+
+
+def _is_quote_escape(node):
+    return (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+            and node.func.attr == "replace" and len(node.args) == 2
+            and all(isinstance(arg, ast.Constant) for arg in node.args)
+            and [arg.value for arg in node.args] == ["'", "''"])
+
+
+def _assignments(scope):
+    """name -> assigned value nodes (`+=` counts as concatenation)"""
+    values = defaultdict(list)
+    for node in ast.walk(scope):
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    values[target.id].append(node.value)
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name) and node.value:
+            values[node.target.id].append(node.value)
+        elif isinstance(node, ast.AugAssign) and isinstance(node.target, ast.Name) and isinstance(node.op, ast.Add):
+            values[node.target.id].append(ast.BinOp(left=node.target, op=node.op, right=node.value,
+                                                    lineno=node.lineno))
+    return values
+
+
+class _Checker(ast.NodeVisitor):
+
+    def __init__(self, tree, lines, path, line_offset):
+        self.lines = lines
+        self.path = path
+        self.line_offset = line_offset
+        self.scopes = [_assignments(tree)]
+        self.findings = []
+
+    def _allowed(self, *nodes):
+        return any(ALLOW_MARKER in line
+                   for node in nodes if hasattr(node, "lineno")
+                   for line in self.lines[max(node.lineno - 2, 0):node.lineno])
+
+    def _flag(self, node, message, *related):
+        if not self._allowed(node, *related):
+            self.findings.append(Finding(self.path, node.lineno + self.line_offset, message))
+
+    def _visit_scope(self, node):
+        self.scopes.append(_assignments(node))
+        self.generic_visit(node)
+        self.scopes.pop()
+
+    visit_FunctionDef = visit_AsyncFunctionDef = _visit_scope
+
+    def visit_Call(self, node):
+        if isinstance(node.func, ast.Attribute) and node.func.attr == "sql" and node.args:
+            text = node.args[0]
+            how = _interpolation(text)
+            if how:
+                self._flag(node, f"SQL text built with {how}; bind the values with params=[...]", text)
+            elif isinstance(text, ast.Name):
+                for scope in reversed(self.scopes):
+                    if text.id in scope:
+                        for value in scope[text.id]:
+                            how = _interpolation(value)
+                            if how:
+                                self._flag(node, f"SQL text `{text.id}` built with {how} "
+                                                 f"(line {value.lineno + self.line_offset}); bind the values "
+                                                 f"with params=[...]", value)
+                        break
+        elif _is_quote_escape(node):
+            self._flag(node, "manual quote escaping; bind the value instead of splicing it into SQL")
+        self.generic_visit(node)
+
+
+def check_source(source, path, line_offset=0):
+    """Findings for one piece of Python source (SyntaxError if it does not parse)"""
+    tree = ast.parse(source, filename=path)
+    checker = _Checker(tree, source.splitlines(), path, line_offset)
+    checker.visit(tree)
+    return checker.findings
+
+
+def check_file(path):
+    """Findings for a .py file, or for the Python procedure handlers in a .sql file"""
+    with open(path, encoding="utf-8") as handle:
+        text = handle.read()
+    if not path.endswith(".sql"):
+        return check_source(text, path)
+    findings = []
+    for match in _PROCEDURE_BODY.finditer(text):
+        findings.extend(check_source(match.group(1), path, line_offset=text.count("\n", 0, match.start(1))))
+    return findings
+
+
+def iter_files(paths):
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith((".", "__")))
+            for name in sorted(files):
+                if name.endswith((".py", ".sql")):
+                    yield os.path.join(root, name)
+
+
+def main(argv=None):
+    paths = (argv if argv is not None else sys.argv[1:]) or [os.path.join(REPO_ROOT, p) for p in DEFAULT_PATHS]
+    findings = []
+    for path in iter_files(paths):
+        try:
+            findings.extend(check_file(path))
+        except SyntaxError as e:
+            print(f"{os.path.relpath(path)}: skipped, does not parse ({e.msg}, line {e.lineno})", file=sys.stderr)
+    for finding in findings:
+        print(f"{os.path.relpath(finding.path)}:{finding.line}: {finding.message}")
+    print(f"{len(findings)} interpolated statement(s)" if findings else "✅ No interpolated SQL")
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
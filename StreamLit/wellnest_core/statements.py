@@ -0,0 +1,293 @@
+# =============================================================================
+# WELLNEST CORE - NAMED SQL STATEMENTS
+# =============================================================================
+# Every statement the pages issue, as fixed text with `?` bind variables.
+# The text never changes between users or reruns, so Snowflake compiles
+# each statement once. The result cache is keyed on text plus bind values,
+# so repeated reads (dashboard counts, history) are served from it.
+# Values never go into the SQL text - no quoting or escaping by hand.
+# Writes that the OLTP store replays (oltp.py) bind their timestamps from
+# timestamp() rather than calling CURRENT_TIMESTAMP(), so the analytical
+# copy records when the user acted, not when the replay ran.
+#
+# `python -m wellnest_core.sqlcheck` flags any session.sql() whose text is
+# built by interpolation.
+# =============================================================================
+
+from datetime import datetime
+from functools import lru_cache
+
+# =============================================================================
+# USERS
+# =============================================================================
+
+EMAIL_EXISTS_SQL = """
+SELECT EMAIL FROM WELLNEST.USER_MANAGEMENT.USERS WHERE EMAIL = ?
+"""
+
+INSERT_USER_SQL = """
+INSERT INTO WELLNEST.USER_MANAGEMENT.USERS (
+    USER_ID, EMAIL, HASHED_PASSWORD, FULL_NAME,
+    DATE_OF_BIRTH, GENDER, ACCOUNT_STATUS,
+    EMAIL_VERIFIED, TERMS_ACCEPTED, PRIVACY_CONSENT, CREATED_AT
+)
+SELECT ?, ?, ?, ?, TO_DATE(?), ?, 'active', FALSE, TRUE, TRUE, TO_TIMESTAMP_NTZ(?)
+"""
+
+INSERT_EMPTY_PROFILE_SQL = """
+INSERT INTO WELLNEST.USER_MANAGEMENT.USER_MEDICAL_PROFILES (
+    PROFILE_ID, USER_ID, CREATED_AT, LAST_UPDATED
+)
+SELECT ?, ?, TO_TIMESTAMP_NTZ(?), TO_TIMESTAMP_NTZ(?)
+"""
+
+USER_STATS_SQL = """
+SELECT
+    (SELECT COUNT(*) FROM WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY WHERE USER_ID = ?) AS CONV_COUNT,
+    (SELECT COUNT(*) FROM WELLNEST.MEDICAL_DATA.UPLOADED_DOCUMENTS WHERE USER_ID = ?) AS DOC_COUNT,
+    (SELECT
+        CASE WHEN HEIGHT_CM IS NOT NULL THEN 1 ELSE 0 END +
+        CASE WHEN WEIGHT_KG IS NOT NULL THEN 1 ELSE 0 END +
+        CASE WHEN BLOOD_TYPE IS NOT NULL THEN 1 ELSE 0 END +
+        CASE WHEN SMOKING_STATUS IS NOT NULL THEN 1 ELSE 0 END +
+        CASE WHEN EXERCISE_FREQUENCY IS NOT NULL THEN 1 ELSE 0 END
+     FROM WELLNEST.USER_MANAGEMENT.USER_MEDICAL_PROFILES WHERE USER_ID = ?) AS COMPLETED_FIELDS
+"""
+
+# =============================================================================
+# PROFILES
+# =============================================================================
+
+USER_PROFILE_SQL = """
+SELECT 
+    u.USER_ID, u.EMAIL, u.FULL_NAME, u.DATE_OF_BIRTH, u.GENDER,
+    u.PHONE_NUMBER, u.CREATED_AT,
+    p.PROFILE_ID, p.HEIGHT_CM, p.WEIGHT_KG, p.BMI, p.BLOOD_TYPE,
+    p.HAS_DIABETES, p.HAS_HYPERTENSION, p.HAS_HEART_DISEASE,
+    p.HAS_MENTAL_HEALTH_HISTORY, p.HAS_PCOS,
+    p.SMOKING_STATUS, p.ALCOHOL_CONSUMPTION, p.EXERCISE_FREQUENCY,
+    p.IS_PREGNANT, p.PREGNANCY_TRIMESTER, p.MENSTRUAL_CYCLE_REGULAR,
+    p.LAST_MENSTRUAL_PERIOD, p.EMERGENCY_CONTACT_NAME,
+    p.EMERGENCY_CONTACT_PHONE, p.EMERGENCY_CONTACT_RELATIONSHIP,
+    p.LAST_UPDATED
+FROM WELLNEST.USER_MANAGEMENT.USERS u
+LEFT JOIN WELLNEST.USER_MANAGEMENT.USER_MEDICAL_PROFILES p
+    ON u.USER_ID = p.USER_ID
+WHERE u.USER_ID = ?
+"""
+
+UPDATE_USER_INFO_SQL = """
+UPDATE WELLNEST.USER_MANAGEMENT.USERS
+SET FULL_NAME = ?, PHONE_NUMBER = ?
+WHERE USER_ID = ?
+"""
+
+UPDATE_MEDICAL_PROFILE_SQL = """
+UPDATE WELLNEST.USER_MANAGEMENT.USER_MEDICAL_PROFILES
+SET HEIGHT_CM = COALESCE(?, HEIGHT_CM),
+    WEIGHT_KG = COALESCE(?, WEIGHT_KG),
+    BMI = COALESCE(?, BMI),
+    BLOOD_TYPE = COALESCE(?, BLOOD_TYPE),
+    HAS_DIABETES = ?,
+    HAS_HYPERTENSION = ?,
+    HAS_HEART_DISEASE = ?,
+    HAS_MENTAL_HEALTH_HISTORY = ?,
+    HAS_PCOS = ?,
+    SMOKING_STATUS = COALESCE(?, SMOKING_STATUS),
+    ALCOHOL_CONSUMPTION = COALESCE(?, ALCOHOL_CONSUMPTION),
+    EXERCISE_FREQUENCY = COALESCE(?, EXERCISE_FREQUENCY),
+    IS_PREGNANT = COALESCE(?, IS_PREGNANT),
+    PREGNANCY_TRIMESTER = COALESCE(?, PREGNANCY_TRIMESTER),
+    MENSTRUAL_CYCLE_REGULAR = COALESCE(?, MENSTRUAL_CYCLE_REGULAR),
+    LAST_MENSTRUAL_PERIOD = COALESCE(TO_DATE(?), LAST_MENSTRUAL_PERIOD),
+    EMERGENCY_CONTACT_NAME = COALESCE(?, EMERGENCY_CONTACT_NAME),
+    EMERGENCY_CONTACT_PHONE = COALESCE(?, EMERGENCY_CONTACT_PHONE),
+    EMERGENCY_CONTACT_RELATIONSHIP = COALESCE(?, EMERGENCY_CONTACT_RELATIONSHIP),
+    LAST_UPDATED = TO_TIMESTAMP_NTZ(?)
+WHERE USER_ID = ?
+"""
+
+# =============================================================================
+# CONVERSATIONS
+# =============================================================================
+
+# DETECTED_SYMPTOMS is bound as a JSON array string (or NULL)
+INSERT_CONVERSATION_SQL = """
+INSERT INTO WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY (
+    CONVERSATION_ID,
+    USER_ID,
+    SESSION_ID,
+    MESSAGE_TIMESTAMP,
+    USER_MESSAGE,
+    ASSISTANT_RESPONSE,
+    ROUTED_TO_DOMAIN,
+    URGENCY_LEVEL,
+    DETECTED_SYMPTOMS,
+    RESPONSE_TIME_SECONDS,
+    TOKENS_USED,
+    USED_LLM_MODEL,
+    ROUTER_CONFIDENCE_SCORE
+)
+SELECT
+    ?, ?, ?,
+    TO_TIMESTAMP_NTZ(?),
+    TO_VARCHAR(?),
+    TO_VARCHAR(?),
+    ?, ?,
+    TO_ARRAY(TRY_PARSE_JSON(?)),
+    ?, ?, ?, ?
+"""
+
+CONVERSATION_HISTORY_SQL = """
+SELECT
+    CONVERSATION_ID,
+    SESSION_ID,
+    MESSAGE_TIMESTAMP,
+    USER_MESSAGE,
+    ASSISTANT_RESPONSE,
+    ROUTED_TO_DOMAIN,
+    URGENCY_LEVEL,
+    DETECTED_SYMPTOMS
+FROM WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY
+WHERE USER_ID = ?
+ORDER BY MESSAGE_TIMESTAMP DESC
+LIMIT {limit:d}
+"""
+
+SESSION_MESSAGES_SQL = """
+SELECT
+    MESSAGE_TIMESTAMP,
+    USER_MESSAGE,
+    ASSISTANT_RESPONSE,
+    ROUTED_TO_DOMAIN,
+    URGENCY_LEVEL
+FROM WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY
+WHERE USER_ID = ? AND SESSION_ID = ?
+ORDER BY MESSAGE_TIMESTAMP ASC
+"""
+
+USER_CONVERSATION_COUNT_SQL = """
+SELECT COUNT(*) AS CNT
+FROM WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY
+WHERE USER_ID = ?
+"""
+
+SESSION_MESSAGE_COUNT_SQL = """
+SELECT COUNT(*) AS CNT
+FROM WELLNEST.USER_MANAGEMENT.CONVERSATION_HISTORY
+WHERE SESSION_ID = ?
+"""
+
+# =============================================================================
+# DOCUMENTS
+# =============================================================================
+
+INSERT_DOCUMENT_SQL = """
+INSERT INTO WELLNEST.MEDICAL_DATA.UPLOADED_DOCUMENTS (
+    DOCUMENT_ID,
+    USER_ID,
+    ORIGINAL_FILENAME,
+    DOCUMENT_TYPE,
+    UPLOAD_TIMESTAMP,
+    FILE_SIZE_BYTES,
+    FILE_CONTENT_BASE64,
+    PROCESSING_STATUS,
+    PROCESSING_STARTED_AT
+)
+SELECT ?, ?, ?, ?, CURRENT_TIMESTAMP(), ?, ?, 'pending', CURRENT_TIMESTAMP()
+"""
+
+USER_DOCUMENTS_SQL = """
+SELECT
+    DOCUMENT_ID,
+    ORIGINAL_FILENAME,
+    DOCUMENT_TYPE,
+    UPLOAD_TIMESTAMP,
+    FILE_SIZE_BYTES,
+    PROCESSING_STATUS,
+    PROCESSING_COMPLETED_AT,
+    EXTRACTED_DATA,
+    EXTRACTION_CONFIDENCE_SCORE,
+    DETECTED_TEST_TYPES
+FROM WELLNEST.MEDICAL_DATA.UPLOADED_DOCUMENTS
+WHERE USER_ID = ?
+ORDER BY UPLOAD_TIMESTAMP DESC
+LIMIT {limit:d}
+"""
+
+# Optional columns keep their value when bound NULL
+UPDATE_DOCUMENT_STATUS_SQL = """
+UPDATE WELLNEST.MEDICAL_DATA.UPLOADED_DOCUMENTS
+SET PROCESSING_STATUS = ?,
+    PROCESSING_COMPLETED_AT = CURRENT_TIMESTAMP(),
+    EXTRACTED_DATA = COALESCE(TRY_PARSE_JSON(?), EXTRACTED_DATA),
+    EXTRACTION_CONFIDENCE_SCORE = COALESCE(?, EXTRACTION_CONFIDENCE_SCORE),
+    PROCESSING_ERROR_MESSAGE = COALESCE(?, PROCESSING_ERROR_MESSAGE)
+WHERE DOCUMENT_ID = ?
+"""
+
+DELETE_DOCUMENT_SQL = """
+DELETE FROM WELLNEST.MEDICAL_DATA.UPLOADED_DOCUMENTS
+WHERE DOCUMENT_ID = ? AND USER_ID = ?
+"""
+
+DOCUMENT_STATS_SQL = """
+SELECT
+    COUNT(*) AS TOTAL_DOCS,
+    SUM(CASE WHEN PROCESSING_STATUS = 'completed' THEN 1 ELSE 0 END) AS PROCESSED,
+    SUM(CASE WHEN PROCESSING_STATUS = 'pending' THEN 1 ELSE 0 END) AS PENDING,
+    SUM(FILE_SIZE_BYTES) AS TOTAL_SIZE
+FROM WELLNEST.MEDICAL_DATA.UPLOADED_DOCUMENTS
+WHERE USER_ID = ?
+"""
+
+
+# =============================================================================
+# HEALTH METRICS
+# =============================================================================
+
+# Latest reading per metric type (triage model inputs)
+LATEST_HEALTH_METRICS_SQL = """
+SELECT USER_ID, METRIC_TYPE, METRIC_VALUE, MEASUREMENT_DATE
+FROM (
+    SELECT USER_ID, METRIC_TYPE, METRIC_VALUE, MEASUREMENT_DATE,
+           ROW_NUMBER() OVER (PARTITION BY METRIC_TYPE ORDER BY MEASUREMENT_DATE DESC, REPORTED_DATE DESC) AS RN
+    FROM WELLNEST.MEDICAL_DATA.HEALTH_METRICS
+    WHERE USER_ID = ?
+)
+WHERE RN = 1
+"""
+
+# =============================================================================
+# EXECUTION
+# =============================================================================
+
+@lru_cache(maxsize=None)
+def with_limit(statement, limit):
+    """Statement text with a constant LIMIT (LIMIT does not take a bind variable).
+
+    One text per distinct limit, built once per process.
+    """
+    return statement.format(limit=int(limit))
+
+
+@lru_cache(maxsize=None)
+def with_rows(statement, columns, count):
+    """Multi-row `VALUES {rows}` statement with `count` rows of `columns` binds"""
+    row = "(" + ", ".join(["?"] * columns) + ")"
+    return statement.format(rows=", ".join([row] * count))
+
+
+def timestamp():
+    """Current time as a TO_TIMESTAMP_NTZ(?) bind value"""
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+
+
+def fetch(session, statement, *params):
+    """Run a named statement; rows as dicts"""
+    return [row.asDict() for row in session.sql(statement, params=list(params)).collect()]
+
+
+def execute(session, statement, *params):
+    """Run a named DML statement"""
+    session.sql(statement, params=list(params)).collect()
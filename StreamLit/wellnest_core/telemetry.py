@@ -0,0 +1,108 @@
+# =============================================================================
+# WELLNEST CORE - PER-TURN TELEMETRY
+# =============================================================================
+# Wall time per pipeline stage of one chat turn (emergency scan, router,
+# context, specialist, persistence, metric extraction, ...), plus the model
+# used and token estimates. The turn-level values fill the CONVERSATION_HISTORY
+# columns RESPONSE_TIME_SECONDS / TOKENS_USED / USED_LLM_MODEL /
+# ROUTER_CONFIDENCE_SCORE; the stage spans go to APP_LOGS.TURN_SPANS in one
+# insert per turn and feed the latency page (p50/p95/p99 per stage and domain).
+# =============================================================================
+
+import math
+import time
+import uuid
+from contextlib import contextmanager
+
+from wellnest_core import statements
+
+# Rough Cortex token estimate; COUNT_TOKENS would cost a query per turn
+CHARS_PER_TOKEN = 4
+TOTAL_STAGE_ORDER = 99  # Sorts the end-to-end span after every stage
+
+INSERT_SPANS_SQL = """
+INSERT INTO WELLNEST.APP_LOGS.TURN_SPANS (
+    SPAN_ID, CONVERSATION_ID, USER_ID, SESSION_ID, TURN_TIMESTAMP,
+    ROUTED_TO_DOMAIN, STAGE, STAGE_ORDER, START_OFFSET_MS, DURATION_MS, LLM_MODEL
+)
+SELECT column1, column2, column3, column4, TO_TIMESTAMP_NTZ(column5),
+       column6, column7, column8, column9, column10, column11
+FROM VALUES {rows}
+"""
+
+STAGE_LATENCY_SQL = """
+SELECT
+    STAGE,
+    COALESCE(ROUTED_TO_DOMAIN, 'ALL') AS ROUTED_TO_DOMAIN,
+    COUNT(*) AS TURNS,
+    PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY DURATION_MS) AS P50_MS,
+    PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY DURATION_MS) AS P95_MS,
+    PERCENTILE_CONT(0.99) WITHIN GROUP (ORDER BY DURATION_MS) AS P99_MS,
+    MIN(STAGE_ORDER) AS STAGE_ORDER
+FROM WELLNEST.APP_LOGS.TURN_SPANS
+WHERE TURN_TIMESTAMP >= DATEADD('day', -1 * ?, CURRENT_TIMESTAMP())
+GROUP BY GROUPING SETS ((STAGE), (STAGE, ROUTED_TO_DOMAIN))
+ORDER BY STAGE_ORDER, ROUTED_TO_DOMAIN
+"""
+
+
+def estimate_tokens(text):
+    """Approximate token count of a text (0 for empty)"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+class TurnTrace:
+    """Stage timings and attributes for one chat turn"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = []
+        self.response_seconds = None
+        self.model = None
+        self.domain = None
+        self.router_confidence = None
+        self.tokens = 0
+
+    @contextmanager
+    def span(self, stage):
+        """Time the enclosed block as one stage"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append((stage, (started - self.started) * 1000, (time.perf_counter() - started) * 1000))
+
+    def add_tokens(self, *texts):
+        self.tokens += sum(estimate_tokens(text) for text in texts)
+
+    def mark_response(self):
+        """Latency the user waits for: everything before the turn is persisted"""
+        self.response_seconds = time.perf_counter() - self.started
+
+    def columns(self):
+        """Values for the CONVERSATION_HISTORY telemetry columns"""
+        if self.response_seconds is None:
+            self.mark_response()
+        return {
+            'response_time_seconds': round(self.response_seconds, 3),
+            'tokens_used': self.tokens,
+            'used_llm_model': self.model,
+            'router_confidence': self.router_confidence,
+        }
+
+
+def spans_insert(trace, conversation_id, user_id, session_id):
+    """(statement, params) inserting the turn's stage spans plus a 'total' span"""
+    total_ms = (time.perf_counter() - trace.started) * 1000
+    spans = [(order, *span) for order, span in enumerate(trace.spans)] + [(TOTAL_STAGE_ORDER, 'total', 0.0, total_ms)]
+    turn_timestamp = statements.timestamp()
+    params = []
+    for order, stage, offset_ms, duration_ms in spans:
+        params.extend([str(uuid.uuid4()), conversation_id, user_id, session_id, turn_timestamp, trace.domain,
+                       stage, order, round(offset_ms, 2), round(duration_ms, 2), trace.model])
+    return statements.with_rows(INSERT_SPANS_SQL, 11, len(spans)), params
+
+
+def stage_latency(session, days=7):
+    """p50/p95/p99 per stage, overall ('ALL') and per routed domain"""
+    return session.sql(STAGE_LATENCY_SQL, params=[days]).to_pandas()
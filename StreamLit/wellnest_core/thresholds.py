@@ -0,0 +1,159 @@
+# =============================================================================
+# WELLNEST CORE - CLINICAL THRESHOLDS
+# =============================================================================
+# GENERATED by Pipeline/export_thresholds.py from Seeds/clinical_thresholds.csv
+# - edit the seed and re-run the exporter instead of editing this file.
+# Standard library only: the stored procedures IMPORT this same file from
+# @WELLNEST.MEDICAL_DATA.WELLNEST_CODE.
+# =============================================================================
+
+from bisect import bisect_left
+
+# scale -> [(min_value, max_value, label, severity_rank, min_inclusive, max_inclusive), ...];
+# bands are contiguous, each shared cut belongs to exactly one side, and None
+# is open-ended - the same comparison operators as the original CASE ladders
+THRESHOLDS = {
+    'bmi_category': [
+        (None, 18.5, 'underweight', 1, None, False),
+        (18.5, 25.0, 'normal', 0, True, False),
+        (25.0, 30.0, 'overweight', 1, True, False),
+        (30.0, 35.0, 'obese_class1', 2, True, False),
+        (35.0, 40.0, 'obese_class2', 3, True, False),
+        (40.0, None, 'obese_class3_severe', 4, True, None),
+    ],
+    'diabetes_stage': [
+        (None, 5.7, 'normal', 0, None, False),
+        (5.7, 6.5, 'prediabetes', 1, True, False),
+        (6.5, 8.0, 'diabetes_controlled', 2, True, False),
+        (8.0, 10.0, 'diabetes_uncontrolled', 3, True, False),
+        (10.0, None, 'diabetes_severe', 4, True, None),
+    ],
+    'glucose_control_status': [
+        (None, 100.0, 'normal', 0, None, False),
+        (100.0, 126.0, 'prediabetes_range', 1, True, False),
+        (126.0, 181.0, 'diabetes_mild', 2, True, False),
+        (181.0, 250.0, 'diabetes_moderate', 3, True, True),
+        (250.0, None, 'diabetes_severe', 4, False, None),
+    ],
+    'hyperglycemia_urgency': [
+        (None, 250.0, 'stable', 0, None, False),
+        (250.0, 299.0, 'concerning_hyperglycemia', 1, True, True),
+        (299.0, 300.0, 'stable', 0, False, False),
+        (300.0, 400.0, 'urgent_hyperglycemia', 2, True, True),
+        (400.0, None, 'emergency_hyperglycemia', 3, False, None),
+    ],
+    'hypoglycemia_urgency': [
+        (None, 54.0, 'emergency_hypoglycemia', 3, None, False),
+        (54.0, 70.0, 'urgent_hypoglycemia', 2, True, True),
+        (70.0, None, 'no_hypoglycemia', 0, False, None),
+    ],
+    'glucose_urgency_level': [
+        (None, 54.0, 'emergency', 3, None, False),
+        (54.0, 70.0, 'urgent', 2, True, True),
+        (70.0, 250.0, 'routine', 0, False, False),
+        (250.0, 299.0, 'needs_attention', 1, True, True),
+        (299.0, 300.0, 'routine', 0, False, False),
+        (300.0, 400.0, 'urgent', 2, True, True),
+        (400.0, None, 'emergency', 3, False, None),
+    ],
+    'bp_systolic_urgency': [
+        (None, 160.0, 'routine', 0, None, False),
+        (160.0, 180.0, 'severe_urgency', 3, True, False),
+        (180.0, None, 'hypertensive_crisis_emergency', 4, True, None),
+    ],
+    'bp_diastolic_urgency': [
+        (None, 100.0, 'routine', 0, None, False),
+        (100.0, 120.0, 'severe_urgency', 3, True, False),
+        (120.0, None, 'hypertensive_crisis_emergency', 4, True, None),
+    ],
+    'metric_blood_pressure_systolic': [
+        (None, 130.0, 'normal', 0, None, False),
+        (130.0, 140.0, 'mild', 1, True, False),
+        (140.0, 180.0, 'moderate', 2, True, False),
+        (180.0, None, 'severe', 3, True, None),
+    ],
+    'metric_blood_pressure_diastolic': [
+        (None, 80.0, 'normal', 0, None, False),
+        (80.0, 90.0, 'mild', 1, True, False),
+        (90.0, 110.0, 'moderate', 2, True, False),
+        (110.0, None, 'severe', 3, True, None),
+    ],
+    'metric_blood_sugar': [
+        (None, 140.0, 'normal', 0, None, False),
+        (140.0, 180.0, 'mild', 1, True, False),
+        (180.0, 250.0, 'moderate', 2, True, False),
+        (250.0, None, 'severe', 3, True, None),
+    ],
+    'metric_hba1c': [
+        (None, 6.5, 'normal', 0, None, False),
+        (6.5, 7.0, 'mild', 1, True, False),
+        (7.0, 9.0, 'moderate', 2, True, False),
+        (9.0, None, 'severe', 3, True, None),
+    ],
+}
+
+
+def _compile(bands):
+    """Cut points, whether each cut belongs to the band above it, per-band (label, rank)"""
+    return ([band[0] for band in bands[1:]], [band[4] for band in bands[1:]],
+            [(band[2], band[3]) for band in bands])
+
+
+_LOOKUP = {scale: _compile(bands) for scale, bands in THRESHOLDS.items()}
+
+
+def lookup(scale, value):
+    """(label, severity_rank) of the band containing value, or None"""
+    if value is None or scale not in _LOOKUP:
+        return None
+    cuts, upper_owns, bands = _LOOKUP[scale]
+    value = float(value)
+    index = bisect_left(cuts, value)
+    if index < len(cuts) and cuts[index] == value and upper_owns[index]:
+        index += 1
+    return bands[index]
+
+
+def classify(scale, value, default='unknown'):
+    """Band label for value on a scale"""
+    band = lookup(scale, value)
+    return band[0] if band else default
+
+
+def band_bounds(scale, label):
+    """(min_value, max_value) of the first band with this label"""
+    for min_value, max_value, band_label, *_ in THRESHOLDS[scale]:
+        if band_label == label:
+            return min_value, max_value
+    raise KeyError(f"{scale}: {label}")
+
+
+def metric_severity(metric_type, value):
+    """(is_abnormal, severity) for a tracked health metric"""
+    band = lookup(f"metric_{metric_type}", value)
+    if not band:
+        return False, 'normal'
+    return band[1] > 0, band[0]
+
+
+def _fmt(value):
+    return f"{value:g}"
+
+
+def router_urgency_guidance():
+    """Urgency section of the router prompt, rendered from the metric scales"""
+    hypo_emergency = band_bounds('glucose_urgency_level', 'emergency')[1]
+    sugar_severe = band_bounds('metric_blood_sugar', 'severe')[0]
+    sys_severe = band_bounds('metric_blood_pressure_systolic', 'severe')[0]
+    dia_severe = band_bounds('metric_blood_pressure_diastolic', 'severe')[0]
+    sys_low, sys_high = band_bounds('metric_blood_pressure_systolic', 'moderate')
+    dia_low, dia_high = band_bounds('metric_blood_pressure_diastolic', 'moderate')
+    return "\n".join([
+        f"**EMERGENCY**: Chest pain+sweating, stroke symptoms, suicidal thoughts with plan, "
+        f"blood sugar <{_fmt(hypo_emergency)}",
+        f"**URGENT**: Blood sugar >={_fmt(sugar_severe)}, BP >={_fmt(sys_severe)}/{_fmt(dia_severe)}, "
+        f"severe depression",
+        f"**NEEDS_ATTENTION**: Uncontrolled symptoms, BP {_fmt(sys_low)}-{_fmt(sys_high - 1)}/"
+        f"{_fmt(dia_low)}-{_fmt(dia_high - 1)}",
+        "**ROUTINE**: General health guidance",
+    ])
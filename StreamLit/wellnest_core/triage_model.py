@@ -0,0 +1,209 @@
+# =============================================================================
+# WELLNEST CORE - ML TRIAGE SCORING
+# =============================================================================
+# Serves the urgency classifiers saved by the training notebook
+# (diabetes_<model>_raw_<timestamp>.joblib) as a second opinion on the router:
+#   TriageModel   - loads one artifact once and scores a feature batch with a
+#                   single vectorized predict_proba (calibrated if the
+#                   artifact carries a calibrator)
+#   MicroBatcher  - collects concurrent requests for up to max_wait_ms and
+#                   scores them together, tracking per-batch latency
+# Feature rows come from features.diabetes_features(features.user_inputs(...)).
+# Missing inputs are filled with the training medians / modes stored in the
+# artifact; artifacts saved without them are refused.
+# =============================================================================
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from wellnest_core.hedging import percentile
+
+URGENCY_ORDER = ['routine', 'needs_attention', 'urgent', 'emergency']
+
+
+class TriageModel:
+    """One trained urgency classifier with the notebook's preprocessing"""
+
+    def __init__(self, artifact, name='triage'):
+        missing = [key for key in ('medians', 'modes') if key not in artifact]
+        if missing:
+            raise ValueError(f"{name}: artifact has no training fill values ({', '.join(missing)}); retrain it")
+        self.name = name
+        self.model = artifact['model']
+        self.calibrator = artifact.get('calibrator')
+        self.scaler = artifact['scaler']
+        self.label_encoders = artifact['label_encoders']
+        self.medians = dict(artifact['medians'])
+        self.modes = dict(artifact['modes'])
+        self.target_encoder = artifact['target_encoder']
+        self.feature_names = list(artifact['feature_names'])
+        self.numerical_columns = list(getattr(self.scaler, 'feature_names_in_', []))
+        self.classes = [str(label) for label in self.target_encoder.classes_]
+        # Category -> code lookups; unseen values fall back to code 0
+        self._codes = {
+            column: {label: code for code, label in enumerate(encoder.classes_)}
+            for column, encoder in self.label_encoders.items()
+        }
+
+    @classmethod
+    def load(cls, path):
+        import joblib
+        return cls(joblib.load(path), name=path.rsplit('/', 1)[-1])
+
+    def prepare(self, frame):
+        """Feature matrix in training layout: missing values filled with the training
+        medians / modes, encoded categoricals, scaled numerics"""
+        X = frame.reindex(columns=self.feature_names).copy()
+        for column, codes in self._codes.items():
+            X[column] = X[column].fillna(self.modes.get(column)).astype(str).map(codes).fillna(0).astype(int)
+        if self.numerical_columns:
+            numeric = X[self.numerical_columns].astype(float)
+            numeric = numeric.fillna(self.medians)
+            X[self.numerical_columns] = self.scaler.transform(numeric)
+        for column in X.columns:
+            if X[column].dtype == object:
+                X[column] = X[column].fillna(False).astype(bool)
+        return X
+
+    def predict_proba(self, frame):
+        X = self.prepare(frame)
+        estimator = self.calibrator if self.calibrator is not None else self.model
+        return estimator.predict_proba(X)
+
+    def score(self, frame):
+        """Urgency, confidence and class probabilities per row"""
+        results = []
+        for row in self.predict_proba(frame):
+            best = int(row.argmax())
+            results.append({
+                'urgency': self.classes[best],
+                'confidence': round(float(row[best]), 4),
+                'probabilities': {label: round(float(p), 4) for label, p in zip(self.classes, row)},
+                'calibrated': self.calibrator is not None,
+                'model': self.name,
+            })
+        return results
+
+
+class MicroBatcher:
+    """Coalesce concurrent score requests into one predict_proba call"""
+
+    def __init__(self, model, max_batch_size=64, max_wait_ms=5.0, window_size=500):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_ms / 1000.0
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._batch_sizes = deque(maxlen=window_size)
+        self._batch_latencies = deque(maxlen=window_size)
+        self._queue_waits = deque(maxlen=window_size)
+        self._requests = 0
+        self._batches = 0
+        self._closed = False
+
+        self._worker = threading.Thread(target=self._run, name='wellnest-triage-batcher', daemon=True)
+        self._worker.start()
+
+    # -------------------------------------------------------------------------
+    # Requests
+    # -------------------------------------------------------------------------
+
+    def submit(self, features):
+        """Queue one feature row (dict); the Future resolves to its score"""
+        if self._closed:
+            raise RuntimeError('MicroBatcher is closed')
+        future = Future()
+        self._queue.put((features, future, time.perf_counter()))
+        return future
+
+    def score(self, features, timeout=2.0):
+        return self.submit(features).result(timeout=timeout)
+
+    def close(self):
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join(timeout=1.0)
+
+    # -------------------------------------------------------------------------
+    # Worker
+    # -------------------------------------------------------------------------
+
+    def _collect(self):
+        """Block for the first request, then gather more until full or the wait expires"""
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        import pandas as pd
+
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            started = time.perf_counter()
+            try:
+                scores = self.model.score(pd.DataFrame([features for features, _, _ in batch]))
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            latency_ms = (time.perf_counter() - started) * 1000
+
+            with self._lock:
+                self._batches += 1
+                self._requests += len(batch)
+                self._batch_sizes.append(len(batch))
+                self._batch_latencies.append(latency_ms)
+                self._queue_waits.extend((started - queued) * 1000 for _, _, queued in batch)
+
+            for (_, future, _), result in zip(batch, scores):
+                result['batch_size'] = len(batch)
+                result['batch_latency_ms'] = round(latency_ms, 2)
+                future.set_result(result)
+
+    def stats(self):
+        with self._lock:
+            latencies, waits, sizes = list(self._batch_latencies), list(self._queue_waits), list(self._batch_sizes)
+            return {
+                'requests': self._requests,
+                'batches': self._batches,
+                'mean_batch_size': round(sum(sizes) / len(sizes), 1) if sizes else None,
+                'p50_batch_ms': percentile(latencies, 50),
+                'p95_batch_ms': percentile(latencies, 95),
+                'p95_queue_wait_ms': percentile(waits, 95),
+            }
+
+
+def second_opinion(router_urgency, scored, min_confidence=0.8):
+    """Escalated router urgency, or None when the model does not change it
+
+    The model never lowers the router's urgency and only lifts ROUTINE to
+    NEEDS_ATTENTION; emergencies stay with the router and keyword checks.
+    """
+    if not scored or scored['confidence'] < min_confidence:
+        return None
+    router_rank = URGENCY_ORDER.index(router_urgency.lower()) if router_urgency.lower() in URGENCY_ORDER else 0
+    model_rank = URGENCY_ORDER.index(scored['urgency']) if scored['urgency'] in URGENCY_ORDER else 0
+    if router_rank == 0 and model_rank >= 2:
+        return 'NEEDS_ATTENTION'
+    return None